@@ -0,0 +1,108 @@
+"""
+
+File: backjumping_benchmark.py
+
+Purpose: Pitch solver search nodes and times for the THarmonicTranscription and TReshape example suites, with
+         chronological backtracking and with conflict directed backjumping and nogood learning.
+
+Usage: python -m benchmarks.backjumping_benchmark
+
+"""
+import contextlib
+import importlib
+import io
+import sys
+import time
+
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+
+EXAMPLES = [
+    ('transformation.harmonictranscription.t_harmonic_transcription_examples',
+     ['schubert_d946', 'mozart_c_minor_example_with_italian', 'schubert_a_major_d959_v1', 'schubert_a_major_d959_v2',
+      'mozart_gmajor_kv283', 'mozart_gmajor_kv283_with_step_sequence_motif']),
+    ('transformation.reshape.t_reshape_examples', ['simple_reshape_no_pf', 'reshape_with_pf', 'reshape_to_scale']),
+    ('transformation.reshape.t_reshape_book_examples',
+     ['simple_reshape_cpf', 'reshape_with_spf', 'reshape_to_scale', 'motif_example']),
+]
+
+
+class SearchCounter(object):
+    """
+    Totals the search nodes and nogood prunes of all pitch solver searches while installed.
+    """
+
+    def __init__(self):
+        self.num_nodes = 0
+        self.num_pruned = 0
+        self.solution_keys = list()
+
+    @contextlib.contextmanager
+    def installed(self):
+        search = PitchConstraintSolver._search
+        counter = self
+
+        def counted_search(solver, *args, **kwargs):
+            nodes, pruned = solver.num_nodes, solver.num_pruned
+            result = search(solver, *args, **kwargs)
+            counter.num_nodes += solver.num_nodes - nodes
+            counter.num_pruned += solver.num_pruned - pruned
+            counter.solution_keys.append(tuple(solver.solution_keys))
+            return result
+
+        PitchConstraintSolver._search = counted_search
+        try:
+            yield self
+        finally:
+            PitchConstraintSolver._search = search
+
+
+def run_example(example, backjumping):
+    """
+    Run an example, printing suppressed.
+    :param example: the example function.
+    :param backjumping: Boolean, PitchConstraintSolver.BACKJUMPING for the run.
+    :return: (SearchCounter, seconds)
+    """
+    default = PitchConstraintSolver.BACKJUMPING
+    PitchConstraintSolver.BACKJUMPING = backjumping
+    try:
+        with SearchCounter().installed() as counter, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            example()
+            seconds = time.perf_counter() - start
+    finally:
+        PitchConstraintSolver.BACKJUMPING = default
+    return counter, seconds
+
+
+def run():
+    """
+    Run each example with and without backjumping.
+    :return: list of (example name, nodes without, nodes with, nogood prunes, seconds without, seconds with,
+             True if the solutions match)
+    """
+    results = list()
+    for module_name, example_names in EXAMPLES:
+        # Some example modules run examples on import.
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = importlib.import_module(module_name)
+        for example_name in example_names:
+            example = getattr(module, example_name)
+            before, before_seconds = run_example(example, False)
+            after, after_seconds = run_example(example, True)
+            results.append(('{0}.{1}'.format(module_name.split('.')[-1], example_name),
+                            before.num_nodes, after.num_nodes, after.num_pruned, before_seconds, after_seconds,
+                            before.solution_keys == after.solution_keys))
+    return results
+
+
+def main(argv):
+    print('{0:<72} {1:>10} {2:>10} {3:>8} {4:>9} {5:>9}'.format('example', 'nodes', 'bj nodes', 'pruned',
+                                                                 'sec', 'bj sec'))
+    for name, before, after, pruned, before_seconds, after_seconds, same in run():
+        print('{0:<72} {1:>10} {2:>10} {3:>8} {4:>9.3f} {5:>9.3f}{6}'.format(
+            name, before, after, pruned, before_seconds, after_seconds, '' if same else '  results differ'))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
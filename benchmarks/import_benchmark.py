@@ -0,0 +1,78 @@
+"""
+
+File: import_benchmark.py
+
+Purpose: Import time of the core API, as reported by 'python -X importtime' in a fresh interpreter per import,
+         and a check that costly optional dependencies are not loaded by it.
+
+Usage: python -m benchmarks.import_benchmark [number of repetitions]
+
+"""
+import os
+import subprocess
+import sys
+
+MODULES = ['tonalmodel.tonality', 'tonalmodel.pitch_scale', 'structure.line', 'structure.score',
+           'harmoniccontext.harmonic_context_track', 'harmonicmodel.chord_classifier',
+           'structure.LineGrammar.core.line_grammar_executor', 'melody.solver.melodic_constraint_solver',
+           'transformation.shift.t_shift', 'midi.score_to_midi_converter', 'vstinterface.vst_interface']
+
+# Modules that should be loaded only when used.
+DEFERRED_MODULES = ['antlr4', 'mido', 'PyQt5', 'pyaudio', 'concurrent.futures.process', 'xml.etree.ElementTree']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter.
+    :param module: module name.
+    :return: dict module name --> cumulative import time in seconds, for all modules loaded, or None if the
+             import fails, e.g. for a missing dependency.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module], cwd=ROOT,
+                            stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True)
+    if result.returncode != 0:
+        return None
+    times = dict()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def run(number=5):
+    """
+    Import each module number times, taking the best.
+    :param number: repetitions.
+    :return: list of (module name, seconds or None if the import fails, deferred modules loaded)
+    """
+    results = list()
+    for module in MODULES:
+        best = None
+        deferred = list()
+        for _ in range(0, number):
+            times = import_times(module)
+            if times is None:
+                break
+            best = times[module] if best is None else min(best, times[module])
+            deferred = [m for m in DEFERRED_MODULES if m in times]
+        results.append((module, best, deferred))
+    return results
+
+
+def main(argv):
+    number = int(argv[1]) if len(argv) > 1 else 5
+    for name, seconds, deferred in run(number):
+        if seconds is None:
+            print('{0:<52} import failed'.format(name))
+            continue
+        print('{0:<52} {1:10.1f} us {2}'.format(name, seconds * 1e6,
+                                                 'loads ' + ', '.join(deferred) if len(deferred) > 0 else ''))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
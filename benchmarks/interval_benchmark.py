@@ -0,0 +1,106 @@
+"""
+
+File: interval_benchmark.py
+
+Purpose: Micro-benchmarks for Interval operations, and the scale and chord builds that rely on them.
+
+Usage: python -m benchmarks.interval_benchmark [number of repetitions]
+
+"""
+import sys
+import timeit
+
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.interval import Interval
+from tonalmodel.modality import ModalityType
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.pitch_scale import PitchScale
+from tonalmodel.tonality import Tonality
+
+INTERVALS = [Interval.parse(s) for s in ['P:1', 'm:2', 'M:2', 'm:3', 'M:3', 'P:4', 'A:4', 'P:5', 'm:6', 'M:6',
+                                         'm:7', 'M:7', 'P:8', '-M:3', '-P:5', 'M:10']]
+TONES = [DiatonicToneCache.get_tone(t) for t in ['C', 'D', 'Eb', 'F#', 'G', 'Ab', 'B', 'Cb', 'E#']]
+PITCHES = [DiatonicPitch(octave, tone) for octave in range(2, 6) for tone in TONES]
+
+
+def bench_get_end_pitch():
+    for interval in INTERVALS:
+        for pitch in PITCHES:
+            interval.get_end_pitch(pitch)
+
+
+def bench_get_start_pitch():
+    for interval in INTERVALS:
+        for pitch in PITCHES:
+            interval.get_start_pitch(pitch)
+
+
+def bench_get_end_tone():
+    for interval in INTERVALS:
+        for tone in TONES:
+            interval.get_end_tone(tone)
+
+
+def bench_create_interval():
+    for pitch_a in PITCHES:
+        for pitch_b in PITCHES[::4]:
+            try:
+                Interval.create_interval(pitch_a, pitch_b)
+            except Exception:
+                pass
+
+
+def bench_calculate_tone_interval():
+    for tone1 in TONES:
+        for tone2 in TONES:
+            Interval.calculate_tone_interval(tone1, tone2)
+
+
+def bench_add_intervals():
+    for a in INTERVALS[:8]:
+        for b in INTERVALS[:8]:
+            try:
+                a + b
+            except Exception:
+                pass
+
+
+def bench_pitch_scale():
+    for modality_type in [ModalityType.Major, ModalityType.MelodicMinor]:
+        for tone in TONES[:4]:
+            PitchScale(Tonality.create(modality_type, tone), PitchRange.create('C:2', 'C:7'))
+
+
+def bench_chord_build():
+    tonality = Tonality.create(ModalityType.Major, DiatonicToneCache.get_tone('Eb'))
+    for chord_text in ['tI', 'tIV', 'tVMaj7', 'tii', 'IVDom7@2', 'IVMaj7+b9@3']:
+        TertianChordTemplate.parse(chord_text).create_chord(tonality)
+
+
+BENCHMARKS = [bench_get_end_pitch, bench_get_start_pitch, bench_get_end_tone, bench_create_interval,
+              bench_calculate_tone_interval, bench_add_intervals, bench_pitch_scale, bench_chord_build]
+
+
+def run(number=200):
+    """
+    Run each benchmark number times, taking the best of 3 runs.
+    :param number: repetitions per run.
+    :return: list of (benchmark name, seconds per call)
+    """
+    results = list()
+    for bench in BENCHMARKS:
+        best = min(timeit.repeat(bench, number=number, repeat=3))
+        results.append((bench.__name__, best / number))
+    return results
+
+
+def main(argv):
+    number = int(argv[1]) if len(argv) > 1 else 200
+    for name, seconds in run(number):
+        print('{0:<32} {1:10.1f} us'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
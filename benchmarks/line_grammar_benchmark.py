@@ -0,0 +1,91 @@
+"""
+
+File: line_grammar_benchmark.py
+
+Purpose: Benchmarks LineGrammar parsing, comparing the ANTLR generated parser with the hand-written fast parser,
+         the parse cache, and loading serialized lines.
+
+Usage: python -m benchmarks.line_grammar_benchmark [number of repetitions]
+
+"""
+import sys
+import timeit
+
+from structure.LineGrammar.core.fast_line_grammar_parser import FastLineGrammarParser
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from structure.line_serializer import LineSerializer
+
+LINES = [
+    '{C:4 D:4 E:4 F:4 G:4 A:4 B:4}',
+    '{ <E-Major:iv> C:5 D Eb F ((1:8), 2)[C:3 D:4 E] <:v> [i@C#:3 sBb D:4 Fbb]}',
+    '{<C-Major: I> iC:4 <:V/ii> qD:4 <:IV/V-Natural> E:4 <Eb-Dorian(1): IVDom7> hF:4-}',
+    '{<F-Major: I> qC:4 D E F <:IV> [iG:4 A B C:5] <:V> (q, 3)[iD:5 E F] hG:4 <:I> wC:4}',
+]
+LONG_LINE = '{<Bb-Major: I> ' + ' '.join(['iBb:4 C:5 D Eb <:V> [sF G A Bb] <:I>'] * 16) + ' wBb:4}'
+
+ANTLR_EXECUTOR = LineGrammarExecutor()
+FAST_EXECUTOR = LineGrammarExecutor(use_fast_parser=True)
+CACHED_EXECUTOR = LineGrammarExecutor(use_cache=True)
+
+SERIALIZER = LineSerializer()
+RECORDS = [SERIALIZER.dumps(*FAST_EXECUTOR.parse(line_text)) for line_text in LINES]
+
+
+def bench_antlr_parse():
+    for line_text in LINES:
+        ANTLR_EXECUTOR.parse(line_text)
+
+
+def bench_fast_parse():
+    for line_text in LINES:
+        FAST_EXECUTOR.parse(line_text)
+
+
+def bench_antlr_parse_long():
+    ANTLR_EXECUTOR.parse(LONG_LINE)
+
+
+def bench_fast_parse_long():
+    FAST_EXECUTOR.parse(LONG_LINE)
+
+
+def bench_cached_parse():
+    for line_text in LINES:
+        CACHED_EXECUTOR.parse(line_text)
+
+
+def bench_load_serialized():
+    for record in RECORDS:
+        SERIALIZER.loads(record)
+
+
+def bench_fast_tokenize():
+    for line_text in LINES:
+        FastLineGrammarParser.tokenize(line_text)
+
+
+BENCHMARKS = [bench_antlr_parse, bench_fast_parse, bench_antlr_parse_long, bench_fast_parse_long,
+              bench_cached_parse, bench_load_serialized, bench_fast_tokenize]
+
+
+def run(number=50):
+    """
+    Run each benchmark number times, taking the best of 3 runs.
+    :param number: repetitions per run.
+    :return: list of (benchmark name, seconds per call)
+    """
+    results = list()
+    for bench in BENCHMARKS:
+        best = min(timeit.repeat(bench, number=number, repeat=3))
+        results.append((bench.__name__, best / number))
+    return results
+
+
+def main(argv):
+    number = int(argv[1]) if len(argv) > 1 else 50
+    for name, seconds in run(number):
+        print('{0:<32} {1:10.1f} us'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,106 @@
+"""
+
+File: pmap_solutions_benchmark.py
+
+Purpose: Benchmarks the collection of pitch solver results for a 15 note harmonic transcription: the solve itself,
+         and holding its solutions in sets under the former length based PMap hash, under the content based hash,
+         and as solution keys in PMapSolutions.
+
+Usage: python -m benchmarks.pmap_solutions_benchmark [number of repetitions]
+
+"""
+import sys
+import timeit
+
+from melody.solver.p_map import PMap
+from melody.solver.p_map_solutions import PMapSolutions
+from misc.ordered_set import OrderedSet
+from timemodel.duration import Duration
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from transformation.harmonictranscription.t_harmonic_transcription import THarmonicTranscription
+
+SOURCE_EXPRESSION = '{<C-Major: I> iC:4 D E F G A G F <:V> qG:4 iB:3 D:4 F E D <:I> hC:4}'
+TARGET_HCT_LIST = [('G-Major:I', Duration(1)), ('G-Major:V', Duration(7, 8)), ('G-Major:I', Duration(1, 2))]
+
+T_SUB = THarmonicTranscription.create(SOURCE_EXPRESSION)
+TARGET_HCT = PMap.build_hct(TARGET_HCT_LIST)
+TAG_MAP = {0: DiatonicPitch.parse('G:4')}
+
+
+def transcribe():
+    return T_SUB.apply(TARGET_HCT, 'D:4', TAG_MAP, T_SUB.height + 5)
+
+
+SOLUTIONS = transcribe().pitch_results
+P_MAPS = list(SOLUTIONS)
+
+
+class LengthHashPMap(PMap):
+    """
+    PMap with the former hash and equality, for comparison.
+    """
+
+    def __hash__(self):
+        return hash(len(self.actors))
+
+    def __eq__(self, other):
+        return self is other
+
+
+LENGTH_HASH_P_MAPS = [LengthHashPMap(p_map.p_map) for p_map in P_MAPS]
+
+
+def bench_transcribe_15():
+    transcribe()
+
+
+def bench_set_length_hash():
+    s = OrderedSet()
+    for p_map in LENGTH_HASH_P_MAPS:
+        s.add(p_map)
+    s.union(LENGTH_HASH_P_MAPS[:100])
+
+
+def bench_set_content_hash():
+    s = OrderedSet()
+    for p_map in P_MAPS:
+        s.add(p_map)
+    s.union(P_MAPS[:100])
+
+
+def bench_solution_keys():
+    s = PMapSolutions(SOLUTIONS.template, SOLUTIONS.solution_keys)
+    for p_map in P_MAPS[:100]:
+        s.add_key(p_map.solution_key())
+
+
+def bench_build_all_p_maps():
+    list(PMapSolutions(SOLUTIONS.template, SOLUTIONS.solution_keys))
+
+
+BENCHMARKS = [bench_transcribe_15, bench_set_length_hash, bench_set_content_hash, bench_solution_keys,
+              bench_build_all_p_maps]
+
+
+def run(number=5):
+    """
+    Run each benchmark number times, taking the best of 3 runs.
+    :param number: repetitions per run.
+    :return: list of (benchmark name, seconds per call)
+    """
+    results = list()
+    for bench in BENCHMARKS:
+        best = min(timeit.repeat(bench, number=number, repeat=3))
+        results.append((bench.__name__, best / number))
+    return results
+
+
+def main(argv):
+    number = int(argv[1]) if len(argv) > 1 else 5
+    print('{0} solutions'.format(len(SOLUTIONS)))
+    for name, seconds in run(number):
+        print('{0:<32} {1:10.1f} us'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,392 @@
+"""
+
+File: suite_benchmark.py
+
+Purpose: Benchmark suite across the subsystems - parsing, layout, interval queries, time conversion, search, each
+         transformation and MIDI export - on seeded synthetic workloads of several sizes.  Results are written to
+         JSON, and can be compared with a stored baseline, flagging regressions.
+
+Usage: python -m benchmarks.suite_benchmark [--sizes small,medium] [--filter name,...] [--seed n]
+                                            [--output results.json] [--compare baseline.json] [--threshold 0.2]
+
+    Run with --output to store a baseline, and later with --compare to check against it; the exit status is 1 if
+    any benchmark is slower than its baseline by more than the threshold fraction.
+
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from collections import OrderedDict
+from fractions import Fraction
+
+from benchmarks.synthetic_score import SyntheticScoreGenerator
+
+# Workload sizes, in measures.
+SIZES = OrderedDict([('small', 4), ('medium', 16), ('large', 64)])
+
+# Number of voices of multi-voice scores.
+NUM_VOICES = 4
+
+# Number of solutions asked of the solver based transformations.
+NUM_SOLUTIONS = 20
+
+
+def setup_parse(generator, num_measures):
+    from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+    expression = generator.line(num_measures).expression()
+    executor = LineGrammarExecutor(use_fast_parser=True)
+    return lambda: executor.parse(expression)
+
+
+def setup_layout(generator, num_measures):
+    from instruments.instrument_catalog import InstrumentCatalog
+    from structure.instrument_voice import InstrumentVoice
+    from structure.score import Score
+    score = generator.score(NUM_VOICES, num_measures, num_measures // 4, num_measures // 8)
+    parts = [(iv.instrument, iv.voice(0).lines[0]) for iv in score.instrument_voices]
+    catalog = InstrumentCatalog.instance()
+
+    def layout():
+        new_score = Score()
+        for instrument, line in parts:
+            instrument_voice = InstrumentVoice(catalog.get_instrument(instrument.name))
+            instrument_voice.voice(0).pin(line.clone())
+            new_score.add_instrument_voice(instrument_voice)
+        return new_score
+    return layout
+
+
+def setup_interval_tree(generator, num_measures):
+    from misc.interval import Interval
+    from misc.interval_tree import IntervalTree
+    score, _ = generator.lite_score(num_measures)
+    intervals = [Interval(n.get_absolute_position().position,
+                          n.get_absolute_position().position + n.duration.duration) for n in score.line.get_all_notes()]
+    points = [i.lower + Fraction(1, 32) for i in intervals]
+
+    def query():
+        tree = IntervalTree()
+        for interval in intervals:
+            tree.put(interval, None)
+        for point in points:
+            tree.query_point(point)
+    return query
+
+
+def setup_ordered_map(generator, num_measures):
+    from misc.ordered_map import OrderedMap
+    score, _ = generator.lite_score(num_measures)
+    notes = score.line.get_all_notes()
+    positions = [n.get_absolute_position().position for n in notes]
+    points = [p + Fraction(1, 32) for p in positions]
+
+    def query():
+        ordered_map = OrderedMap([(p, i) for i, p in enumerate(positions)])
+        for point in points:
+            ordered_map.floor(point)
+            ordered_map.ceil(point)
+    return query
+
+
+def setup_score_query(generator, num_measures):
+    from misc.interval import Interval
+    score = generator.score(NUM_VOICES, num_measures, num_measures // 4, num_measures // 8)
+    duration = score.duration.duration
+    windows = [Interval(Fraction(i, 4), Fraction(i + 4, 4)) for i in range(int(duration * 4))]
+
+    def query():
+        for window in windows:
+            score.get_notes_by_wnt_interval(window)
+    return query
+
+
+def setup_time_conversion(generator, num_measures):
+    from timemodel.position import Position
+    from timemodel.time_conversion import TimeConversion
+    score, synthetic_line = generator.lite_score(num_measures, num_measures // 2, num_measures // 4)
+    positions = [n.get_absolute_position() for n in score.line.get_all_notes()]
+    end = Position(synthetic_line.duration)
+
+    def convert():
+        conversion = TimeConversion(score.tempo_sequence, score.time_signature_sequence, end)
+        for position in positions:
+            conversion.actual_time_to_position(conversion.position_to_actual_time(position))
+            conversion.position_to_bp(position)
+    return convert
+
+
+def setup_search(generator, num_measures):
+    from search.melodicsearch.melodic_search import MelodicSearch
+    score, synthetic_line = generator.lite_score(num_measures)
+    # The pattern is a measure of the line, so that there is at least one match.
+    start = generator.random.randrange(num_measures)
+    search = MelodicSearch.create(synthetic_line.expression(start, start + 1))
+    return lambda: search.search(score.line, score.hct)
+
+
+def setup_shift(generator, num_measures):
+    from tonalmodel.interval import Interval as TonalInterval
+    from transformation.shift.t_shift import TShift
+    score, _ = generator.lite_score(num_measures)
+    t_shift = TShift(score.line, score.hct, TonalInterval.parse('P:5'))
+    return lambda: t_shift.apply()
+
+
+def setup_step_shift(generator, num_measures):
+    from transformation.stepshift.t_stepshift import TStepShift
+    score, _ = generator.lite_score(num_measures)
+    t_step_shift = TStepShift(score.line, score.hct)
+    return lambda: t_step_shift.apply(2)
+
+
+def setup_diatonic_reflection(generator, num_measures):
+    from tonalmodel.diatonic_pitch import DiatonicPitch
+    from transformation.reflection.t_diatonic_reflection import TDiatonicReflection
+    score, synthetic_line = generator.lite_score(num_measures)
+    t_reflection = TDiatonicReflection(score.line, score.hct, DiatonicPitch(4, synthetic_line.tonality.diatonic_tone))
+    return lambda: t_reflection.apply()
+
+
+def setup_chromatic_reflection(generator, num_measures):
+    from tonalmodel.diatonic_pitch import DiatonicPitch
+    from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+    from tonalmodel.modality import ModalityType
+    from tonalmodel.tonality import Tonality
+    from transformation.reflection.t_chromatic_reflection import TChromaticReflection
+    # Chromatic reflection maps the pitches of C major, without secondary chords.
+    generator.secondary_chords = False
+    score, _ = generator.lite_score(num_measures,
+                                    tonality=Tonality.create(ModalityType.Major, DiatonicToneCache.get_tone('C')))
+    t_reflection = TChromaticReflection(score.line, score.hct, DiatonicPitch.parse('C:4'))
+    return lambda: t_reflection.apply()
+
+
+def setup_dilation(generator, num_measures):
+    from transformation.dilation.t_dilation import TDilation
+    score, _ = generator.lite_score(num_measures, num_measures // 4, num_measures // 8)
+    t_dilation = TDilation(score)
+    return lambda: t_dilation.apply(Fraction(2), True, True)
+
+
+def setup_retrograde(generator, num_measures):
+    from transformation.retrograde.t_retrograde import TRetrograde
+    score, _ = generator.lite_score(num_measures)
+    t_retrograde = TRetrograde(score)
+    return lambda: t_retrograde.apply()
+
+
+def setup_harmonic_transcription(generator, num_measures):
+    from transformation.harmonictranscription.t_harmonic_transcription import THarmonicTranscription
+    from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+    # Harmonic transcription does not take secondary chords.
+    generator.secondary_chords = False
+    synthetic_line = generator.line(num_measures)
+    t_transcription = THarmonicTranscription.create(synthetic_line.expression())
+    # The target harmony: the chords of another line in the same meter.
+    target = generator.line(num_measures, time_signatures=synthetic_line.time_signatures)
+    _, target_hct = LineGrammarExecutor(use_fast_parser=True).parse(target.expression())
+    return lambda: t_transcription.apply(target_hct, 'C:4', None, t_transcription.height + 5, NUM_SOLUTIONS)
+
+
+def setup_pattern_substitution(generator, num_measures):
+    from transformation.patsub.t_patsub import TPatSub
+    from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+    # Harmonic context expressions do not take secondary chords.
+    generator.secondary_chords = False
+    synthetic_line = generator.line(num_measures)
+    expression = synthetic_line.expression()
+    replacement = generator.line(num_measures, synthetic_line.tonality, synthetic_line.time_signatures)
+    hc_expressions = ['@0:{0}'.format(numeral) for numeral, _ in replacement.measures if numeral is not None]
+    t_pat_sub = TPatSub.create(expression, replacement.expression(), hc_expressions)
+    line, hct = LineGrammarExecutor(use_fast_parser=True).parse(expression)
+    return lambda: t_pat_sub.apply(line, hct, 'C:4', None, t_pat_sub.target_height + 5, NUM_SOLUTIONS)
+
+
+def setup_reshape(generator, num_measures):
+    import math
+    from function.generic_univariate_pitch_function import GenericUnivariatePitchFunction
+    from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+    from melody.solver.solve_budget import SolveBudget
+    from melody.structure.melodic_form import MelodicForm
+    from melody.structure.motif import Motif
+    from timemodel.position import Position
+    from tonalmodel.diatonic_pitch import DiatonicPitch
+    from tonalmodel.range import Range
+    from transformation.reshape.t_reshape import TReshape
+    score, synthetic_line = generator.lite_score(num_measures)
+    # Time ranges are in whole notes, integral.
+    duration = math.ceil(synthetic_line.duration)
+    base = DiatonicPitch.parse('C:4').chromatic_distance
+
+    def contour(v):
+        return base + 12 + 9 * math.sin(2 * math.pi * v / 2)
+
+    pitch_function = GenericUnivariatePitchFunction(contour, Position(0), Position(duration))
+    notes = score.line.get_all_notes()
+    melodic_form = MelodicForm([Motif(score.line, {ChordalPitchConstraint(notes[0])}, 'A')])
+    t_reshape = TReshape(score, pitch_function, Range(0, duration), melodic_form)
+    return lambda: t_reshape.apply(budget=SolveBudget(max_solutions=NUM_SOLUTIONS))
+
+
+def setup_midi_export(generator, num_measures):
+    from midi.score_to_midi_converter import ScoreToMidiConverter
+    score = generator.score(NUM_VOICES, num_measures, num_measures // 4, num_measures // 8)
+    handle, filename = tempfile.mkstemp(suffix='.mid')
+    os.close(handle)
+
+    def export():
+        try:
+            ScoreToMidiConverter(score).create(filename)
+        finally:
+            os.remove(filename)
+    return export
+
+
+# (name, setup): setup(generator, num_measures) builds the workload, and returns the function timed.
+BENCHMARKS = [
+    ('parse', setup_parse),
+    ('layout', setup_layout),
+    ('interval_tree', setup_interval_tree),
+    ('ordered_map', setup_ordered_map),
+    ('score_query', setup_score_query),
+    ('time_conversion', setup_time_conversion),
+    ('search', setup_search),
+    ('shift', setup_shift),
+    ('step_shift', setup_step_shift),
+    ('diatonic_reflection', setup_diatonic_reflection),
+    ('chromatic_reflection', setup_chromatic_reflection),
+    ('dilation', setup_dilation),
+    ('retrograde', setup_retrograde),
+    ('harmonic_transcription', setup_harmonic_transcription),
+    ('pattern_substitution', setup_pattern_substitution),
+    ('reshape', setup_reshape),
+    ('midi_export', setup_midi_export),
+]
+
+
+def run_benchmark(name, setup, num_measures, seed=0, repeat=3):
+    """
+    Time one benchmark on a workload: the best of repeat runs, each of enough calls to take 0.2s.
+    :param name: benchmark name.
+    :param setup: setup function of the benchmark.
+    :param num_measures: workload size.
+    :param seed: generator seed.
+    :param repeat: number of runs.
+    :return: dict of the result.
+    """
+    # Each workload has its own generator, so workloads do not depend on which benchmarks are run.
+    generator = SyntheticScoreGenerator(seed)
+    bench = setup(generator, num_measures)
+    timer = timeit.Timer(bench)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    return OrderedDict([('benchmark', name), ('measures', num_measures), ('seconds', best), ('number', number)])
+
+
+def run(sizes=None, names=None, seed=0, repeat=3):
+    """
+    Run the benchmarks.
+    :param sizes: list of size names of SIZES, None for all.
+    :param names: list of benchmark names, None for all.
+    :param seed: generator seed.
+    :param repeat: number of timing runs per benchmark.
+    :return: OrderedDict 'benchmark/size' --> result dict.
+    """
+    sizes = list(SIZES.keys()) if sizes is None else sizes
+    results = OrderedDict()
+    for name, setup in BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+        for size in sizes:
+            results['{0}/{1}'.format(name, size)] = run_benchmark(name, setup, SIZES[size], seed, repeat)
+    return results
+
+
+def to_json(results, seed):
+    return OrderedDict([('seed', seed),
+                        ('python', platform.python_version()),
+                        ('platform', platform.platform()),
+                        ('time', time.strftime('%Y-%m-%dT%H:%M:%S')),
+                        ('results', results)])
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare results with a baseline.
+    :param results: OrderedDict of results, from run().
+    :param baseline: dict, JSON of a prior run.
+    :param threshold: fraction slower than the baseline that is flagged as a regression.
+    :return: list of (key, seconds, baseline seconds or None, ratio or None, True if a regression)
+    """
+    baseline_results = baseline['results']
+    comparison = list()
+    for key, result in results.items():
+        prior = baseline_results.get(key)
+        if prior is None:
+            comparison.append((key, result['seconds'], None, None, False))
+            continue
+        ratio = result['seconds'] / prior['seconds'] if prior['seconds'] > 0 else None
+        comparison.append((key, result['seconds'], prior['seconds'], ratio,
+                           ratio is not None and ratio > 1 + threshold))
+    return comparison
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite_benchmark')
+    parser.add_argument('--sizes', help='comma separated sizes, of {0}'.format(', '.join(SIZES.keys())))
+    parser.add_argument('--filter', help='comma separated benchmark names')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON file of baseline results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='fraction slower than the baseline flagged as a regression')
+    args = parser.parse_args(argv[1:])
+
+    sizes = args.sizes.split(',') if args.sizes else None
+    for size in sizes or []:
+        if size not in SIZES:
+            parser.error('unknown size {0}'.format(size))
+    names = args.filter.split(',') if args.filter else None
+    known = [name for name, _ in BENCHMARKS]
+    for name in names or []:
+        if name not in known:
+            parser.error('unknown benchmark {0}, of {1}'.format(name, ', '.join(known)))
+
+    # Some modules configure debug logging on import; the MIDI converter logs every note.
+    logging.disable(logging.INFO)
+    results = run(sizes, names, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(to_json(results, args.seed), output_file, indent=2)
+
+    if not args.compare:
+        for key, result in results.items():
+            print('{0:<36} {1:>12.1f} us'.format(key, result['seconds'] * 1e6))
+        return 0
+
+    with open(args.compare) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('seed') != args.seed:
+        print('Baseline seed {0} differs from seed {1}; workloads differ.'.format(baseline.get('seed'), args.seed))
+    regressions = 0
+    for key, seconds, prior, ratio, regression in compare(results, baseline, args.threshold):
+        if prior is None:
+            print('{0:<36} {1:>12.1f} us {2:>12} {3:>7}'.format(key, seconds * 1e6, 'new', ''))
+            continue
+        print('{0:<36} {1:>12.1f} us {2:>12.1f} us {3:>6.2f}x{4}'.format(
+            key, seconds * 1e6, prior * 1e6, ratio if ratio is not None else 0, '  REGRESSION' if regression else ''))
+        regressions += 1 if regression else 0
+    if regressions:
+        print('{0} regressions over {1:.0%}'.format(regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,328 @@
+"""
+
+File: synthetic_score.py
+
+Purpose: Seeded generator of synthetic workloads for the benchmarks: melodic lines in the line grammar, with beams,
+         tuplets, ties and chord changes, tempo and time signature changes, and multi-voice scores, of any size.
+
+"""
+import random
+from fractions import Fraction
+
+from instruments.instrument_catalog import InstrumentCatalog
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from structure.instrument_voice import InstrumentVoice
+from structure.lite_score import LiteScore
+from structure.score import Score
+from structure.tempo import Tempo
+from structure.time_signature import TimeSignature
+from timemodel.duration import Duration
+from timemodel.position import Position
+from timemodel.tempo_event import TempoEvent
+from timemodel.tempo_event_sequence import TempoEventSequence
+from timemodel.time_signature_event import TimeSignatureEvent
+from timemodel.time_signature_event_sequence import TimeSignatureEventSequence
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.modality import ModalityType
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.pitch_scale import PitchScale
+from tonalmodel.tonality import Tonality
+
+
+class SyntheticLine(object):
+    """
+    A generated line: its line grammar text, measure by measure, with the time signature of each measure.
+    """
+
+    def __init__(self, tonality, measures, time_signatures, ties):
+        """
+        Constructor.
+        :param tonality: Tonality of the line.
+        :param measures: list of (chord numeral or None, measure text), the chord changing at the measure start.
+        :param time_signatures: list of beats per measure (quarter note beats), one per measure.
+        :param ties: indices of the notes tied to the next note.
+        """
+        self.tonality = tonality
+        self.measures = measures
+        self.time_signatures = time_signatures
+        self.ties = ties
+
+    @property
+    def duration(self):
+        return Fraction(sum(self.time_signatures), 4)
+
+    def expression(self, start=0, end=None):
+        """
+        The line grammar text of measures [start, end).  The first measure is tagged with the tonality and the
+        chord in effect there.
+        :param start: index of first measure.
+        :param end: index after last measure, None for all.
+        :return: str
+        """
+        end = len(self.measures) if end is None else end
+        chord = None
+        for numeral, _ in self.measures[:start + 1]:
+            chord = numeral if numeral is not None else chord
+        parts = ['<{0}-{1}: {2}>'.format(self.tonality.diatonic_tone.diatonic_symbol,
+                                         self.tonality.modality_type, chord)]
+        for i in range(start, end):
+            numeral, text = self.measures[i]
+            if numeral is not None and i != start:
+                parts.append('<:{0}>'.format(numeral))
+            parts.append(text)
+        return '{' + ' '.join(parts) + '}'
+
+    def parse(self):
+        """
+        Parse the line, and tie its tied notes (the line grammar reads ties, but does not make them).
+        :return: (Line, HarmonicContextTrack)
+        """
+        line, hct = LineGrammarExecutor(use_fast_parser=True).parse(self.expression())
+        notes = line.get_all_notes()
+        for index in self.ties:
+            notes[index].tie()
+        return line, hct
+
+
+class SyntheticScoreGenerator(object):
+    """
+    Generates random but musically plausible workloads from a seed; the same seed gives the same workloads.
+
+    Melodies walk the scale of their tonality, mostly by step, over measures of quarter note beats.  Each beat is a
+    quarter note, a beamed pair of eighths, beamed sixteenths, a dotted eighth and sixteenth, or an eighth note
+    triplet; some quarters are half notes or tied over to the next beat.  Chords follow common progressions, changing
+    every one or two measures.
+    """
+
+    TONALITIES = [(ModalityType.Major, 'C'), (ModalityType.Major, 'G'), (ModalityType.Major, 'F'),
+                  (ModalityType.Major, 'Bb'), (ModalityType.Major, 'D'), (ModalityType.Major, 'Eb'),
+                  (ModalityType.NaturalMinor, 'A'), (ModalityType.NaturalMinor, 'E'),
+                  (ModalityType.NaturalMinor, 'D'), (ModalityType.NaturalMinor, 'C')]
+
+    MAJOR_PROGRESSIONS = [['I', 'IV', 'V', 'I'], ['I', 'vi', 'ii', 'V'], ['I', 'V/V', 'V', 'I'],
+                          ['ii', 'VDom7', 'I', 'I'], ['I', 'iii', 'IV', 'V'], ['I', 'IV', 'I', 'VDom7']]
+    MINOR_PROGRESSIONS = [['i', 'iv', 'V', 'i'], ['i', 'VI', 'iv', 'V'], ['i', 'VII', 'III', 'V']]
+
+    # Beat patterns, each filling one quarter note, as (opening text, number of notes).
+    BEAT_PATTERNS = [('q', 1), ('[i', 2), ('[s', 4), ('[i@s', 2), ('(i, 2)[i', 3)]
+    BEAT_WEIGHTS = [4, 4, 1, 1, 1]
+
+    TIME_SIGNATURES = [4, 3, 2]
+    TEMPOS = [60, 72, 84, 96, 108, 120, 132]
+    INSTRUMENTS = ['violin', 'flute', 'viola', 'clarinet', 'cello', 'bassoon']
+    # Lowest octave of the pitch range walked by each voice, by voice index.
+    VOICE_OCTAVES = [4, 4, 3, 4, 2, 2]
+
+    def __init__(self, seed=0, tie_rate=0.1, half_note_rate=0.1, leap_rate=0.15, secondary_chords=True):
+        """
+        Constructor.
+        :param seed: random seed.
+        :param tie_rate: probability of tying a quarter note over to the next beat.
+        :param half_note_rate: probability of a half note on a beat (with another beat left in the measure).
+        :param leap_rate: probability of a melodic leap, otherwise the melody moves by step.
+        :param secondary_chords: False to leave out progressions with secondary chords, e.g. V/V, which some
+                                 transformations do not take.
+        """
+        self.seed = seed
+        self.secondary_chords = secondary_chords
+        self.tie_rate = tie_rate
+        self.half_note_rate = half_note_rate
+        self.leap_rate = leap_rate
+        self.random = random.Random(seed)
+
+        # The pitches walked by the line being generated, and the index of the current pitch.
+        self.__pitches = None
+        self.__index = 0
+        # The number of notes generated in the line, and the indices of those tied.
+        self.__num_notes = 0
+        self.__ties = None
+
+    def tonality(self):
+        modality_type, tone = self.random.choice(SyntheticScoreGenerator.TONALITIES)
+        return Tonality.create(modality_type, DiatonicToneCache.get_tone(tone))
+
+    def time_signatures(self, num_measures, num_changes=0):
+        """
+        Beats per measure of each measure, with num_changes changes of time signature.
+        :param num_measures: number of measures.
+        :param num_changes: number of time signature changes.
+        :return: list of int
+        """
+        beats = self.random.choice(SyntheticScoreGenerator.TIME_SIGNATURES)
+        change_measures = set(self.random.sample(range(1, num_measures), min(num_changes, num_measures - 1)))
+        signatures = list()
+        for i in range(num_measures):
+            if i in change_measures:
+                beats = self.random.choice([b for b in SyntheticScoreGenerator.TIME_SIGNATURES if b != beats])
+            signatures.append(beats)
+        return signatures
+
+    def chords(self, tonality, num_measures):
+        """
+        Chord changes, as numerals for the measures where the chord changes.
+        :param tonality: Tonality
+        :param num_measures: number of measures.
+        :return: list of chord numeral or None per measure, the first a numeral.
+        """
+        progressions = SyntheticScoreGenerator.MAJOR_PROGRESSIONS if tonality.modality_type == ModalityType.Major \
+            else SyntheticScoreGenerator.MINOR_PROGRESSIONS
+        if not self.secondary_chords:
+            progressions = [p for p in progressions if not any('/' in numeral for numeral in p)]
+        numerals = list()
+        while len(numerals) < num_measures:
+            for numeral in self.random.choice(progressions):
+                numerals.append(numeral)
+                if self.random.random() < 0.3:
+                    numerals.append(None)
+        numerals = numerals[:num_measures]
+        # A tonic at the start, and no repeated chords.
+        numerals[0] = progressions[0][0]
+        prior = None
+        for i, numeral in enumerate(numerals):
+            if numeral == prior:
+                numerals[i] = None
+            elif numeral is not None:
+                prior = numeral
+        return numerals
+
+    def line(self, num_measures, tonality=None, time_signatures=None, octave=4):
+        """
+        Generate a line.
+        :param num_measures: number of measures.
+        :param tonality: Tonality, or None for a random one.
+        :param time_signatures: beats per measure of each measure, or None for a single random time signature.
+        :param octave: lowest octave of the pitch range of the melody, which spans an octave and a half.
+        :return: SyntheticLine
+        """
+        tonality = self.tonality() if tonality is None else tonality
+        time_signatures = self.time_signatures(num_measures) if time_signatures is None else time_signatures
+        scale = PitchScale(tonality, PitchRange.create('C:{0}'.format(octave), 'G:{0}'.format(octave + 1)))
+        pitches = [str(p) for p in scale.pitch_scale]
+        self.__index = len(pitches) // 2
+        self.__pitches = pitches
+        self.__num_notes = 0
+        self.__ties = list()
+
+        measures = list()
+        for numeral, beats in zip(self.chords(tonality, num_measures), time_signatures):
+            measures.append((numeral, self._measure(beats)))
+        return SyntheticLine(tonality, measures, time_signatures, self.__ties)
+
+    def _next_pitch(self):
+        if self.random.random() < self.leap_rate:
+            step = self.random.choice([-4, -3, 3, 4, 5])
+        else:
+            step = self.random.choice([-2, -1, -1, 1, 1, 2])
+        index = self.__index + step
+        if index < 0 or index >= len(self.__pitches):
+            index = self.__index - step
+        self.__index = max(0, min(len(self.__pitches) - 1, index))
+        return self.__pitches[self.__index]
+
+    def _measure(self, beats):
+        elements = list()
+        beat = 0
+        while beat < beats:
+            if beat + 1 < beats and self.random.random() < self.half_note_rate:
+                elements.append('h{0}'.format(self._next_pitch()))
+                self.__num_notes += 1
+                beat += 2
+                continue
+            if beat + 1 < beats and self.random.random() < self.tie_rate:
+                pitch = self._next_pitch()
+                elements.append('q{0}- q{0}'.format(pitch))
+                self.__ties.append(self.__num_notes)
+                self.__num_notes += 2
+                beat += 2
+                continue
+            prefix, count = self.random.choices(SyntheticScoreGenerator.BEAT_PATTERNS,
+                                                SyntheticScoreGenerator.BEAT_WEIGHTS)[0]
+            notes = [self._next_pitch() for _ in range(count)]
+            if prefix == 'q':
+                elements.append('q' + notes[0])
+            elif prefix == '[i@s':
+                elements.append('[i@{0} s{1}]'.format(*notes))
+            else:
+                elements.append(prefix + ' '.join(notes) + ']')
+            self.__num_notes += count
+            beat += 1
+        return ' '.join(elements)
+
+    def tempo_sequence(self, duration, num_changes=0):
+        """
+        A tempo sequence, with num_changes tempo changes on quarter note beats.
+        :param duration: whole note time covered.
+        :param num_changes: number of tempo changes.
+        :return: TempoEventSequence
+        """
+        sequence = TempoEventSequence()
+        sequence.add(TempoEvent(Tempo(self.random.choice(SyntheticScoreGenerator.TEMPOS), Duration(1, 4)),
+                                Position(0)))
+        num_beats = int(duration * 4)
+        for beat in sorted(self.random.sample(range(1, num_beats), min(num_changes, num_beats - 1))):
+            sequence.add(TempoEvent(Tempo(self.random.choice(SyntheticScoreGenerator.TEMPOS), Duration(1, 4)),
+                                    Position(beat, 4)))
+        return sequence
+
+    @staticmethod
+    def time_signature_sequence(time_signatures):
+        """
+        The time signature sequence of the given measures.
+        :param time_signatures: beats per measure of each measure.
+        :return: TimeSignatureEventSequence
+        """
+        sequence = TimeSignatureEventSequence()
+        position = Fraction(0)
+        prior = None
+        for beats in time_signatures:
+            if beats != prior:
+                sequence.add(TimeSignatureEvent(TimeSignature(beats, Duration(1, 4)), Position(position)))
+                prior = beats
+            position += Fraction(beats, 4)
+        return sequence
+
+    def lite_score(self, num_measures, num_tempo_changes=0, num_ts_changes=0, instrument='violin', tonality=None):
+        """
+        A LiteScore of a generated line, with its chords as harmonic context track.
+        :param num_measures: number of measures.
+        :param num_tempo_changes: number of tempo changes.
+        :param num_ts_changes: number of time signature changes.
+        :param instrument: instrument name.
+        :param tonality: Tonality, or None for a random one.
+        :return: (LiteScore, SyntheticLine)
+        """
+        synthetic_line = self.line(num_measures, tonality, self.time_signatures(num_measures, num_ts_changes))
+        line, hct = synthetic_line.parse()
+        score = LiteScore(line, hct, InstrumentCatalog.instance().get_instrument(instrument),
+                          self.tempo_sequence(synthetic_line.duration, num_tempo_changes),
+                          SyntheticScoreGenerator.time_signature_sequence(synthetic_line.time_signatures))
+        return score, synthetic_line
+
+    def score(self, num_voices, num_measures, num_tempo_changes=0, num_ts_changes=0):
+        """
+        A Score of num_voices instruments, one voice each, in a common tonality and meter with their own chords.
+        :param num_voices: number of voices.
+        :param num_measures: number of measures.
+        :param num_tempo_changes: number of tempo changes.
+        :param num_ts_changes: number of time signature changes.
+        :return: Score
+        """
+        tonality = self.tonality()
+        time_signatures = self.time_signatures(num_measures, num_ts_changes)
+        score = Score()
+        for event in SyntheticScoreGenerator.time_signature_sequence(time_signatures).sequence_list:
+            score.time_signature_sequence.add(event)
+        for event in self.tempo_sequence(Fraction(sum(time_signatures), 4), num_tempo_changes).sequence_list:
+            score.tempo_sequence.add(event)
+
+        catalog = InstrumentCatalog.instance()
+        num_instruments = len(SyntheticScoreGenerator.INSTRUMENTS)
+        for i in range(num_voices):
+            instrument_voice = InstrumentVoice(catalog.get_instrument(
+                SyntheticScoreGenerator.INSTRUMENTS[i % num_instruments]))
+            synthetic_line = self.line(num_measures, tonality, time_signatures,
+                                       SyntheticScoreGenerator.VOICE_OCTAVES[i % num_instruments])
+            line, _ = synthetic_line.parse()
+            instrument_voice.voice(0).pin(line)
+            score.add_instrument_voice(instrument_voice)
+        return score
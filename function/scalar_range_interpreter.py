@@ -6,12 +6,11 @@ Purpose: A ScalarRangeInterpreter is a PitchRangeInterpreter that maps numerics
 
 """
 import math
+from bisect import bisect_right
 
 from function.pitch_range_interpreter import PitchRangeInterpreter
 from tonalmodel.diatonic_pitch import DiatonicPitch
-from tonalmodel.pitch_range import PitchRange
-from tonalmodel.pitch_scale import PitchScale
-from misc.ordered_map import OrderedMap
+from tonalmodel.pitch_scale import FullPitchScale
 
 
 class ScalarRangeInterpreter(PitchRangeInterpreter):
@@ -29,13 +28,15 @@ class ScalarRangeInterpreter(PitchRangeInterpreter):
         :param pitch_unit: In the linear map of value to pitches, pitch_unit is the distance between mapping values.
         """
         self.__tonality = tonality
-        self.__pitch_scale = PitchScale(self.tonality, PitchRange.create('A:0', 'C:8')).pitch_scale
+        # The tonality's scale over A:0-C:8, shared across interpreters.
+        full_scale = FullPitchScale.get_full_scale(self.tonality)
+        self.__pitch_scale = full_scale.pitches
 
         self.anchor_pitch = self.pitch_scale[0] if anchor_pitch is None else \
             DiatonicPitch.parse(anchor_pitch) if isinstance(anchor_pitch, str) else anchor_pitch
 
-        anchor_index = self.pitch_scale.index(self.anchor_pitch)
-        if anchor_index == -1:
+        anchor_index = full_scale.index_of(self.anchor_pitch)
+        if anchor_index is None:
             raise Exception('Anchor pitch \'{0}\' not found in pitch scale for tonality \'{1}\''.
                             format(self.anchor_pitch, self.tonality))
 
@@ -47,13 +48,9 @@ class ScalarRangeInterpreter(PitchRangeInterpreter):
         # recall that pitch unit maps to each pitch, making the scalar scale linear in value!
         base_value = anchor_value - anchor_index * pitch_unit
 
-        self.value_to_pitch = OrderedMap()
-        self.pitch_to_value = dict()
-        for i in range(0, len(self.pitch_scale)):
-            pitch = self.pitch_scale[i]
-            value = base_value + i * pitch_unit
-            self.value_to_pitch.insert(value, pitch)
-            self.pitch_to_value[pitch] = value
+        # values[i] is the value mapping to pitch_scale[i].
+        self.__values = tuple(base_value + i * pitch_unit for i in range(0, len(self.pitch_scale)))
+        self.pitch_to_value = dict(zip(self.pitch_scale, self.__values))
 
         PitchRangeInterpreter.__init__(self)
 
@@ -87,18 +84,18 @@ class ScalarRangeInterpreter(PitchRangeInterpreter):
         return self.pitch_to_value[diatonic_pitch] if diatonic_pitch in self.pitch_to_value else None
 
     def eval_as_pitch(self, v):
-        floor_value = self.value_to_pitch.floor(v)
-        low_pitch = self.value_to_pitch[floor_value]
-        index = self.pitch_scale.index(low_pitch)
+        index = self._floor_index(v)
+        floor_value = self.__values[index]
+        low_pitch = self.pitch_scale[index]
 
         if index >= len(self.pitch_scale) - 1 or math.isclose(v, floor_value):
             return [low_pitch]
         return [low_pitch, self.pitch_scale[index + 1]]
 
     def eval_as_accurate_chromatic_distance(self, v):
-        floor_value = self.value_to_pitch.floor(v)
-        low_pitch = self.value_to_pitch[floor_value]
-        index = self.pitch_scale.index(low_pitch)
+        index = self._floor_index(v)
+        floor_value = self.__values[index]
+        low_pitch = self.pitch_scale[index]
 
         if index >= len(self.pitch_scale) - 1 or math.isclose(v, floor_value):
             return low_pitch.chromatic_distance
@@ -106,3 +103,12 @@ class ScalarRangeInterpreter(PitchRangeInterpreter):
         return low_pitch.chromatic_distance + \
                ((v - floor_value) / (self.pitch_unit)) * \
                (high_pitch.chromatic_distance - low_pitch.chromatic_distance)
+
+    def _floor_index(self, v):
+        """
+        Index of the pitch with the highest value not exceeding v.
+        """
+        index = bisect_right(self.__values, v) - 1
+        if index < 0:
+            raise Exception('Value {0} is below the range of values for tonality \'{1}\''.format(v, self.tonality))
+        return index
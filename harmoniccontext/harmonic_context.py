@@ -5,6 +5,8 @@ File: harmonic_context.py
 Purpose: Defines a tonality and chord that serves as a reference point for harmonic analysis of a section of music.
 
 """
+from harmonicmodel.chord import Chord
+from tonalmodel.tonality import Tonality
 from timemodel.duration import Duration
 from timemodel.position import Position
 from misc.interval import Interval
@@ -13,6 +15,9 @@ from misc.interval import Interval
 class HarmonicContext(object):
     """
     Class model for harmonic conext that references a chord and tonality.
+
+    The tonality and chord are interned (see Tonality.intern(), Chord.intern()), so harmonic contexts with equal
+    harmony share their tonality and chord objects.
     """
 
     def __init__(self, tonality, chord, duration, position=Position(0)):
@@ -23,8 +28,9 @@ class HarmonicContext(object):
         :param duration: Duration
         :param position: Position
         """
-        self._tonality = tonality
-        self._chord = chord
+        self._tonality = Tonality.intern(tonality)
+        self._chord = Chord.intern(chord)
+        self._harmony_key = None
         self._duration = Duration(duration.duration)
         self._position = Position(position.position)
 
@@ -56,24 +62,28 @@ class HarmonicContext(object):
     def extent(self):
         return Interval(self.position.position, self.position.position + self.duration.duration)
 
-    def is_equal(self, other):
-        if not other or not isinstance(other, HarmonicContext):
-            return False
+    @property
+    def harmony_key(self):
+        """
+        Hashable key identifying the harmony, i.e. tonality and chord, by value.
+        """
+        if self._harmony_key is None:
+            self._harmony_key = (None if self.tonality is None else self.tonality.value_key,
+                                 None if self.chord is None else self.chord.value_key)
+        return self._harmony_key
 
-        if str(self.tonality) != str(other.tonality) or \
-                str(self.chord) != str(other.chord) or self.duration != other.duration:
+    def is_equal(self, other):
+        if not self.is_same_harmony(other):
             return False
-
-        return True
+        return self.duration == other.duration
 
     def is_same_harmony(self, other):
         if not other or not isinstance(other, HarmonicContext):
             return False
 
-        if str(self.tonality) != str(other.tonality) or str(self.chord) != str(other.chord):
-            return False
-
-        return True
+        if self.tonality is other.tonality and self.chord is other.chord:
+            return True
+        return self.harmony_key == other.harmony_key
 
     def __str__(self):
         return 'h.c.[{0}, {1}, {2}]'.format(self.tonality, self.chord, self.duration)
@@ -64,6 +64,16 @@ class HarmonicContextTrack(object):
 
         self._wnt_duration += harmonic_context.duration.duration
 
+    def extend(self, harmonic_contexts):
+        """
+        Append a list of harmonic contexts to the end of the track.  The track is rebuilt once, so this is the
+        preferred call for building long tracks.
+
+        :param harmonic_contexts: list of HarmonicContext
+        :return:
+        """
+        self._reset_hc_list(self.ordered_map.value_items() + list(harmonic_contexts))
+
     def append_first(self, harmonic_context):
         """
         Append a harmonic context to the beginning of the track, and shove right all existing HC's
@@ -113,12 +123,12 @@ class HarmonicContextTrack(object):
 
     def _reset_hc_list(self, hc_list):
         p = Position(0)
-        new_ordered_map = OrderedMap()
+        items = list()
         for hc in hc_list:
             hc.position = p
-            new_ordered_map.insert(p, hc)
+            items.append((p, hc))
             p += hc.duration
-        self.ordered_map = new_ordered_map
+        self.ordered_map = OrderedMap(items)
         self._wnt_duration = Duration(p.position)
 
     def clear(self):
@@ -0,0 +1,179 @@
+"""
+
+File: vertical_harmony_analyzer.py
+
+Purpose: Derives a harmonic context track from the notes of a score, by classifying the tones sounding together.
+
+"""
+from bisect import insort, bisect_left
+from fractions import Fraction
+from math import lcm
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from harmonicmodel.chord_classifier import ChordClassifier
+from timemodel.duration import Duration
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.interval_tables import IntervalTables
+
+
+class VerticalHarmonyAnalyzer(object):
+    """
+    Sweep line analysis of vertical harmony.  Note onsets and offsets over all instrument voices are sorted and
+    walked once, maintaining the set of sounding pitches.  Each distinct verticality, i.e. span of constant sounding
+    tones, is classified as a chord over the analyzer's tonality, and runs of the same chord become one harmonic
+    context.
+
+    Classifications are memoized by the verticality's tones, bass first, for the life of the analyzer.
+    """
+
+    def __init__(self, tonality):
+        """
+        Constructor.
+        :param tonality: Tonality used for classification, and for the harmonic contexts built.
+        """
+        self.__tonality = tonality
+        # tuple of tone ids, bass first --> Chord, or None if unclassified.
+        self.__chord_cache = dict()
+
+    @property
+    def tonality(self):
+        return self.__tonality
+
+    def analyze(self, score):
+        """
+        Build a harmonic context track for a score.
+        :param score: Score
+        :return: HarmonicContextTrack
+        """
+        notes = list()
+        for instrument_voice in score.instrument_voices:
+            for voice_notes in instrument_voice.get_all_notes().values():
+                notes.extend(voice_notes)
+        return self.analyze_notes(notes)
+
+    def analyze_notes(self, notes):
+        """
+        Build a harmonic context track for a collection of notes.
+
+        The track starts at position 0 and ends with the last sounding note.  A verticality that does not classify
+        as a chord, as well as silence, continues the prior harmonic context.  Leading unclassified spans are
+        covered by the first chord.
+        :param notes: iterable of Note
+        :return: HarmonicContextTrack, empty if no verticality classifies.
+        """
+        # list of [start, chord]
+        changes = list()
+        end = Fraction(0)
+        for start, end, tones in VerticalHarmonyAnalyzer.verticalities(notes):
+            chord = self.classify(tones)
+            if chord is None or (len(changes) > 0 and changes[-1][1] is chord):
+                continue
+            changes.append([start, chord])
+
+        hct = HarmonicContextTrack()
+        if len(changes) == 0:
+            return hct
+        changes[0][0] = Fraction(0)
+        changes.append([end, None])
+        hct.extend([HarmonicContext(self.tonality, changes[i][1], Duration(changes[i + 1][0] - changes[i][0]))
+                    for i in range(0, len(changes) - 1)])
+        return hct
+
+    def classify(self, tones):
+        """
+        Classify tones as a chord over the analyzer's tonality.
+        :param tones: list of distinct DiatonicTone, bass first.
+        :return: Chord, the best ranked classification of ChordClassifier.classify_all_roots(), or None.
+        """
+        key = tuple(IntervalTables.tone_id(tone) for tone in tones)
+        if key in self.__chord_cache:
+            return self.__chord_cache[key]
+        try:
+            chords = ChordClassifier.classify_all_roots(list(tones), self.tonality)
+        except Exception:
+            # e.g. a quartal or secundal root outside the tonality.
+            chords = None
+        chord = chords[0] if chords is not None and len(chords) > 0 else None
+        self.__chord_cache[key] = chord
+        return chord
+
+    @staticmethod
+    def verticalities(notes):
+        """
+        Sweep the notes for spans of constant sounding tones.
+        :param notes: iterable of Note.  Rests are ignored.
+        :return: list of (start, end, tones), start and end being whole note time Fractions, and tones a tuple of
+                 distinct DiatonicTone ordered from the lowest sounding pitch.  Abutting spans have differing
+                 tones.  Spans of silence are omitted.
+        """
+        # Note times are scaled to integers by their common denominator, for fast sorting and comparison.
+        note_times = list()
+        parent_onsets = dict()
+        denominator = 1
+        for note in notes:
+            if note.is_rest:
+                continue
+            start = note.relative_position.offset + VerticalHarmonyAnalyzer.__onset(note.parent, parent_onsets)
+            end = start + note.duration.duration
+            if end <= start:
+                continue
+            note_times.append((start, end, note.diatonic_pitch))
+            denominator = lcm(denominator, start.denominator, end.denominator)
+
+        events = list()
+        for start, end, pitch in note_times:
+            sort_key = (pitch.chromatic_distance, pitch.pitch_key)
+            events.append((start.numerator * (denominator // start.denominator), 1, sort_key))
+            events.append((end.numerator * (denominator // end.denominator), -1, sort_key))
+        events.sort(key=lambda e: e[0])
+
+        results = list()
+        # sounding (chromatic distance, pitch key) --> number of sounding notes, and its keys in ascending order.
+        counts = dict()
+        sounding = list()
+        # [start, tones] of the span in progress, or None in silence.
+        span = None
+        i = 0
+        while i < len(events):
+            time = events[i][0]
+            while i < len(events) and events[i][0] == time:
+                _, delta, sort_key = events[i]
+                count = counts.get(sort_key, 0) + delta
+                if count == 0:
+                    del counts[sort_key]
+                    del sounding[bisect_left(sounding, sort_key)]
+                else:
+                    if count == 1 and delta == 1:
+                        insort(sounding, sort_key)
+                    counts[sort_key] = count
+                i += 1
+
+            tones = VerticalHarmonyAnalyzer.__sounding_tones(sounding) if len(sounding) > 0 else None
+            if span is not None:
+                if tones == span[1]:
+                    continue
+                results.append((Fraction(span[0], denominator), Fraction(time, denominator), span[1]))
+            span = None if tones is None else [time, tones]
+
+        return results
+
+    @staticmethod
+    def __onset(collective, onsets):
+        # Whole note time onset of a note collective, memoized in onsets by id.
+        if collective is None:
+            return Fraction(0)
+        onset = onsets.get(id(collective))
+        if onset is None:
+            onset = collective.relative_position.offset + VerticalHarmonyAnalyzer.__onset(collective.parent, onsets)
+            onsets[id(collective)] = onset
+        return onset
+
+    @staticmethod
+    def __sounding_tones(sounding):
+        tones = list()
+        for _, pitch_key in sounding:
+            tone = DiatonicPitch.from_pitch_key(pitch_key).diatonic_tone
+            if tone not in tones:
+                tones.append(tone)
+        return tuple(tones)
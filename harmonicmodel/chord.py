@@ -6,6 +6,7 @@ Purpose: Defines an abstract class to represent a chord
 
 """
 from abc import ABCMeta, abstractmethod
+from weakref import WeakValueDictionary
 
 
 class Chord(object):
@@ -16,10 +17,15 @@ class Chord(object):
     3) chord type
     4) root_tone
     5) tones
+
+    Chords are compared and hashed by value, see value_key.  intern() maps equal chords to one shared instance.
     """
     
     __metaclass__ = ABCMeta
 
+    # value key --> Chord, see intern().  Entries are dropped when no longer referenced.
+    CHORD_POOL = WeakValueDictionary()
+
     def __init__(self, chord_template, diatonic_tonality=None):
         """
         Constructor
@@ -30,6 +36,7 @@ class Chord(object):
         
         self.__chord_template = chord_template
         self.__diatonic_tonality = diatonic_tonality
+        self.__value_key = None
         
     @property
     def chord_template(self):
@@ -53,3 +60,37 @@ class Chord(object):
     @abstractmethod
     def tones(self):
         raise Exception('Chord type subclass needs tones property')
+
+    @property
+    def value_key(self):
+        """
+        Hashable key identifying the chord by value: chord class, chord text with tones, and tonality.
+        """
+        if self.__value_key is None:
+            self.__value_key = (type(self).__name__, str(self),
+                                None if self.diatonic_tonality is None else self.diatonic_tonality.value_key)
+        return self.__value_key
+
+    @staticmethod
+    def intern(chord):
+        """
+        The shared instance of chords equal to the given chord.
+        :param chord: Chord, or None.
+        :return: Chord, the first interned chord equal to chord, or chord itself.
+        """
+        if chord is None:
+            return None
+        return Chord.CHORD_POOL.setdefault(chord.value_key, chord)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Chord):
+            return False
+        return self.value_key == other.value_key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.value_key)
@@ -0,0 +1,161 @@
+"""
+
+File: chord_classification_tables.py
+
+Purpose: Precomputed chord tone tables and a classification index for ChordClassifier.
+
+"""
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.interval import Interval
+from tonalmodel.interval_tables import IntervalTables
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from harmonicmodel.quartal_chord_template import QuartalChordTemplate
+from harmonicmodel.secundal_chord_template import SecundalChordTemplate
+
+
+class ChordClassificationTables(object):
+    """
+    Tables for chord classification.  A set of tones is represented by a bitmask over tone ids
+    (see IntervalTables.tone_id()), covering the 49 spellings of DiatonicToneCache.
+
+    For each chord family (tertian, quartal, secundal) and root tone, the chord tone table holds the tones of every
+    chord type of the family, with their bitmask.  Classification answers are indexed by
+    (family, root tone id, tones bitmask, bass tone id), and hold only chord types, chord tones and inversions.
+    Chord objects are built from answers by ChordClassifier, for the answers it returns.
+
+    The tables are implemented as a singleton.  The constructor is meant to be 'private', and not called externally.
+    All access should be through the static methods.
+    """
+
+    TERTIAN, QUARTAL, SECUNDAL = range(3)
+
+    CHORD_CLASSIFICATION_TABLES = None
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        # family --> list indexed by root tone id of [(chord type value, chord tones tuple, bitmask), ...]
+        self.chord_tone_tables = [
+            self.__build_chord_tone_table(TertianChordTemplate.TERTIAN_CHORD_TYPE_MAP, False),
+            self.__build_chord_tone_table(QuartalChordTemplate.QUARTAL_CHORD_TYPE_MAP, True),
+            self.__build_chord_tone_table(SecundalChordTemplate.SECUNDAL_CHORD_TYPE_MAP, True),
+        ]
+        # (family, root tone id, tones bitmask, bass tone id) --> tuple of (chord type value, chord tones, inversion)
+        self.answer_index = dict()
+        # (root tone id, tone id) --> tension Interval
+        self.tension_intervals = dict()
+
+    @staticmethod
+    def get_tables():
+        if ChordClassificationTables.CHORD_CLASSIFICATION_TABLES is None:
+            ChordClassificationTables.CHORD_CLASSIFICATION_TABLES = ChordClassificationTables()
+        return ChordClassificationTables.CHORD_CLASSIFICATION_TABLES
+
+    @staticmethod
+    def tone_mask(tones):
+        mask = 0
+        for tone in tones:
+            mask |= 1 << IntervalTables.tone_id(tone)
+        return mask
+
+    @staticmethod
+    def chord_tone_table(family, root_tone):
+        """
+        The chord types of a family over a root tone.
+        :param family: TERTIAN, QUARTAL, or SECUNDAL.
+        :param root_tone: DiatonicTone
+        :return: list of (chord type value, chord tones tuple, bitmask of chord tones), omitting chord types
+                 with tones beyond triple augmentation.
+        """
+        return ChordClassificationTables.get_tables().chord_tone_tables[family][IntervalTables.tone_id(root_tone)]
+
+    @staticmethod
+    def answers(family, root_tone, tones):
+        """
+        Chord types of a family over a root tone that best match a list of tones.  These are the chord types
+        whose tones are all in tones, and of the largest number of chord tones.  For tertian chords, the first tone
+        (the bass) must be a chord tone.  For quartal and secundal chords, all tones must be chord tones.
+        :param family: TERTIAN, QUARTAL, or SECUNDAL.
+        :param root_tone: DiatonicTone
+        :param tones: list of DiatonicTone, the first being the bass.
+        :return: tuple of (chord type value, chord tones tuple, inversion)
+        """
+        tables = ChordClassificationTables.get_tables()
+        root_id = IntervalTables.tone_id(root_tone)
+        mask = ChordClassificationTables.tone_mask(tones)
+        bass_id = IntervalTables.tone_id(tones[0])
+        key = (family, root_id, mask, bass_id)
+        answers = tables.answer_index.get(key)
+        if answers is None:
+            answers = tables.__compute_answers(family, root_id, mask, bass_id)
+            tables.answer_index[key] = answers
+        return answers
+
+    @staticmethod
+    def tension_interval(root_tone, tone):
+        """
+        The tension interval of a non-chord tone above a tertian chord root.  Seconds through fifths are raised
+        an octave, e.g. M:9, P:11, and sixths and sevenths are left as is.
+        :param root_tone: DiatonicTone
+        :param tone: DiatonicTone
+        :return: Interval
+        """
+        tables = ChordClassificationTables.get_tables()
+        key = (IntervalTables.tone_id(root_tone), IntervalTables.tone_id(tone))
+        interval = tables.tension_intervals.get(key)
+        if interval is None:
+            p1 = DiatonicPitch(4, root_tone)
+            p2 = DiatonicPitch(5 if DiatonicPitch.crosses_c(root_tone, tone) else 4, tone)
+            interval = Interval.create_interval(p1, p2)
+            if interval.diatonic_distance < 5:  # We don't want M:13 nor M:14
+                interval = Interval(interval.diatonic_distance + 8, interval.interval_type)
+            tables.tension_intervals[key] = interval
+        return interval
+
+    def __compute_answers(self, family, root_id, mask, bass_id):
+        bass_bit = 1 << bass_id
+        results = list()
+        for chord_type, chord_tones, chord_mask in self.chord_tone_tables[family][root_id]:
+            if chord_mask & ~mask:
+                continue
+            if family == ChordClassificationTables.TERTIAN and not chord_mask & bass_bit:
+                continue
+            results.append((chord_type, chord_tones, chord_mask))
+
+        if len(results) == 0:
+            return tuple()
+        max_len = max(len(r[1]) for r in results)
+        answers = list()
+        for chord_type, chord_tones, chord_mask in results:
+            if len(chord_tones) != max_len:
+                continue
+            #  Tensions not supported in quartal and secundal chords
+            if family != ChordClassificationTables.TERTIAN and mask & ~chord_mask:
+                continue
+            inversion = [IntervalTables.tone_id(t) for t in chord_tones].index(bass_id) + 1
+            answers.append((chord_type, chord_tones, inversion))
+        return tuple(answers)
+
+    @staticmethod
+    def __build_chord_tone_table(chord_type_map, successive):
+        # successive: intervals are from the prior chord tone, else from the root.
+        table = [None] * (7 * DiatonicPitch.NUM_AUGMENTATIONS)
+        for root_tone in DiatonicToneCache.get_tones():
+            entries = list()
+            for chord_type, interval_list in chord_type_map.items():
+                chord_tones = list()
+                last_tone = root_tone
+                for interval in interval_list:
+                    tone = interval.get_end_tone(last_tone)
+                    if tone is None:
+                        break
+                    chord_tones.append(tone)
+                    if successive:
+                        last_tone = tone
+                if len(chord_tones) != len(interval_list):
+                    continue
+                entries.append((chord_type, tuple(chord_tones), ChordClassificationTables.tone_mask(chord_tones)))
+            table[IntervalTables.tone_id(root_tone)] = entries
+        return table
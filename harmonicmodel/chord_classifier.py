@@ -5,8 +5,7 @@ Purpose: Utility class to determine the chord given a set of tones and/or tonali
 
 """
 from tonalmodel.diatonic_tone_cache import DiatonicToneCache
-from tonalmodel.diatonic_pitch import DiatonicPitch
-from tonalmodel.interval import Interval
+from harmonicmodel.chord_classification_tables import ChordClassificationTables
 from harmonicmodel.tertian_chord_template import TertianChordTemplate, TertianChordType
 from harmonicmodel.quartal_chord_template import QuartalChordTemplate, QuartalChordType
 from harmonicmodel.secundal_chord_template import SecundalChordTemplate, SecundalChordType
@@ -105,116 +104,64 @@ class ChordClassifier(object):
         return r
 
     def find_tertian_chords(self):
-        results = list()
-        for chord_type, interval_list in TertianChordTemplate.TERTIAN_CHORD_TYPE_MAP.items():
-            chord_tones = list()
-            for interval in interval_list:
-                chord_tones.append(interval.get_end_tone(self.root_tone))
-            if set(chord_tones) <= set(self.chord_tones):
-                if self.chord_tones[0] not in chord_tones:
-                    continue
-                ct = TertianChordType(chord_type)
-                results.append((ct, chord_tones))
-
-        results.sort(key=lambda x: len(x[1]), reverse=True)
-        rr = [x for x in results if len(x[1]) == len(results[0][1])]
+        answers = ChordClassificationTables.answers(ChordClassificationTables.TERTIAN, self.root_tone,
+                                                    self.chord_tones)
         chords = list()
-        if len(rr):
-            for answer in rr:
-                # inversion computed - must be a chordal tone
-                # if self.chord_tones[0] not in answer[1]:
-                #    raise Exception('Inversion tone \'{0}\' must be a chord tone in [{1}]'.format(
-                #        self.chord_tones[0], ', '.join(v.diatonic_symbol for v in answer[1])))
-                inversion = answer[1].index(self.chord_tones[0]) + 1
-                tensions = list()
-                remainder = set(self.chord_tones) - set(answer[1])
-                for r in remainder:
-                    p1 = DiatonicPitch(4, self.root_tone)
-                    p2 = DiatonicPitch(5 if DiatonicPitch.crosses_c(self.root_tone, r) else 4, r)
-                    interval = Interval.create_interval(p1, p2)
-                    if interval.diatonic_distance < 5:  # We don't want M:13 nor M:14
-                        interval = Interval(interval.diatonic_distance + 8, interval.interval_type)
-                    tensions.append(interval)
-
-                if self.tonality is not None:
-                    index = self.tonality.annotation.index(self.root_tone) \
-                        if self.root_tone in self.tonality.annotation else None
-                    if index is None:
-                        continue
-                        # raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
-                    template = TertianChordTemplate(None, index + 1, answer[0], tensions, inversion)
-                else:
-                    template = TertianChordTemplate(self.root_tone, None, answer[0], tensions, inversion)
-                chords.append(TertianChord(template, self.tonality))
+        for chord_type, chord_tones, inversion in answers:
+            # Tensions in input tone order, so that of enharmonic tensions, the first given is kept.
+            tensions = list()
+            seen = set(chord_tones)
+            for r in self.chord_tones:
+                if r not in seen:
+                    seen.add(r)
+                    tensions.append(ChordClassificationTables.tension_interval(self.root_tone, r))
+
+            if self.tonality is not None:
+                index = self.tonality.annotation.index(self.root_tone) \
+                    if self.root_tone in self.tonality.annotation else None
+                if index is None:
+                    continue
+                    # raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
+                template = TertianChordTemplate(None, index + 1, TertianChordType(chord_type), tensions, inversion)
+            else:
+                template = TertianChordTemplate(self.root_tone, None, TertianChordType(chord_type), tensions,
+                                                inversion)
+            chords.append(TertianChord(template, self.tonality))
 
         return chords
 
     def find_quartal_chords(self):
-        results = list()
-        for chord_type, interval_list in QuartalChordTemplate.QUARTAL_CHORD_TYPE_MAP.items():
-            chord_tones = list()
-            last_tone = self.root_tone
-            for interval in interval_list:
-                chord_tones.append(interval.get_end_tone(last_tone))
-                last_tone = chord_tones[-1]
-            if set(chord_tones) <= set(self.chord_tones):
-                qt = QuartalChordType(chord_type)
-                results.append((qt, list(chord_tones)))
-
-        results.sort(key=lambda x: len(x[1]), reverse=True)
-        rr = [x for x in results if len(x[1]) == len(results[0][1])]
+        answers = ChordClassificationTables.answers(ChordClassificationTables.QUARTAL, self.root_tone,
+                                                    self.chord_tones)
         chords = list()
-        if len(rr):
-            for answer in rr:
-                remainder = set(self.chord_tones) - set(answer[1])
-                if len(remainder) > 0:
-                    #  Tensions not supported in quartal chords
-                    continue
-                # inversion computed - must be a chordal tone
-                inversion = answer[1].index(self.chord_tones[0]) + 1
-                if self.tonality is not None:
-                    index = self.tonality.annotation.index(self.root_tone) \
-                        if self.root_tone in self.tonality.annotation else None
-                    if index is None:
-                        raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
-                    template = QuartalChordTemplate(None, index + 1, answer[0], list(), inversion)
-                else:
-                    template = QuartalChordTemplate(self.root_tone, None, answer[0], list(), inversion)
-                chords.append(QuartalChord(template, self.tonality))
+        for chord_type, _, inversion in answers:
+            if self.tonality is not None:
+                index = self.__root_index()
+                template = QuartalChordTemplate(None, index + 1, QuartalChordType(chord_type), list(), inversion)
+            else:
+                template = QuartalChordTemplate(self.root_tone, None, QuartalChordType(chord_type), list(), inversion)
+            chords.append(QuartalChord(template, self.tonality))
 
         return chords
 
     def find_secundal_chords(self):
-        results = list()
-        for chord_type, interval_list in SecundalChordTemplate.SECUNDAL_CHORD_TYPE_MAP.items():
-            chord_tones = list()
-            last_tone = self.root_tone
-            for interval in interval_list:
-                chord_tones.append(interval.get_end_tone(last_tone))
-                last_tone = chord_tones[-1]
-            if set(chord_tones) <= set(self.chord_tones):
-                qt = SecundalChordType(chord_type)
-                results.append((qt, list(chord_tones)))
-
-        results.sort(key=lambda x: len(x[1]), reverse=True)
-        rr = [x for x in results if len(x[1]) == len(results[0][1])]
+        answers = ChordClassificationTables.answers(ChordClassificationTables.SECUNDAL, self.root_tone,
+                                                    self.chord_tones)
         chords = list()
-        if len(rr):
-            for answer in rr:
-                remainder = set(self.chord_tones) - set(answer[1])
-                if len(remainder) > 0:
-                    #  Tensions not supported in secundal chords
-                    continue
-                # inversion computed - must be a chordal tone
-                inversion = answer[1].index(self.chord_tones[0]) + 1
-                if self.tonality is not None:
-                    index = self.tonality.annotation.index(self.root_tone) \
-                        if self.root_tone in self.tonality.annotation else None
-                    if index is None:
-                        raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
-                    template = SecundalChordTemplate(None, index + 1, answer[0], list(), inversion)
-                else:
-                    template = SecundalChordTemplate(self.root_tone, None, answer[0], list(), inversion)
-                chords.append(SecundalChord(template, self.tonality))
+        for chord_type, _, inversion in answers:
+            if self.tonality is not None:
+                index = self.__root_index()
+                template = SecundalChordTemplate(None, index + 1, SecundalChordType(chord_type), list(), inversion)
+            else:
+                template = SecundalChordTemplate(self.root_tone, None, SecundalChordType(chord_type), list(),
+                                                 inversion)
+            chords.append(SecundalChord(template, self.tonality))
 
         return chords
+
+    def __root_index(self):
+        index = self.tonality.annotation.index(self.root_tone) \
+            if self.root_tone in self.tonality.annotation else None
+        if index is None:
+            raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
+        return index
@@ -9,6 +9,7 @@ from harmonicmodel.chord_template import ChordTemplate
 from tonalmodel.diatonic_tone import DiatonicTone
 from tonalmodel.interval import Interval, IntervalType
 from harmonicmodel.quartal_chord import QuartalChord
+from misc.lazy import LazyClassAttribute
 
 import re
 import logging
@@ -113,7 +114,7 @@ class QuartalChordTemplate(ChordTemplate):
     
     # full parse string and accompanying pattern for the secundal chord grammar.
     QUARTAL_PARSE_STRING = P1_BASIS + ROOT + CHORDS + INVERSIONS + '$'
-    QUARTAL_PATTERN = re.compile(QUARTAL_PARSE_STRING)
+    QUARTAL_PATTERN = LazyClassAttribute(re.compile, QUARTAL_PARSE_STRING)
 
     def __init__(self, diatonic_basis, scale_degree, chord_type, specified_fourths, inversion):
         """
@@ -9,6 +9,7 @@ from harmonicmodel.chord_template import ChordTemplate
 from tonalmodel.diatonic_modality import DiatonicModality
 from harmonicmodel.secondary_chord import SecondaryChord
 from tonalmodel.modality import ModalityType
+from misc.lazy import LazyClassAttribute
 
 import re
 import logging
@@ -41,7 +42,7 @@ class SecondaryChordTemplate(ChordTemplate):
 
     # full parse string and accompanying pattern for the secondary chord grammar.
     SECONDARY_CHORD_PARSE_STRING = INITIAL_CHORD + '/' + SECONDARY_BASIS + '$'
-    SECONDARY_CHORD_PATTERN = re.compile(SECONDARY_CHORD_PARSE_STRING)
+    SECONDARY_CHORD_PATTERN = LazyClassAttribute(re.compile, SECONDARY_CHORD_PARSE_STRING)
 
     def __init__(self, principal_chord_template, secondary_scale_degree, secondary_modality):
         """
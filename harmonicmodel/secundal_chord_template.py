@@ -9,6 +9,7 @@ from harmonicmodel.chord_template import ChordTemplate
 from tonalmodel.diatonic_tone import DiatonicTone
 from tonalmodel.interval import Interval, IntervalType
 from harmonicmodel.secundal_chord import SecundalChord
+from misc.lazy import LazyClassAttribute
 
 import re
 import logging
@@ -129,7 +130,7 @@ class SecundalChordTemplate(ChordTemplate):
     
     # full parse string and accompanying pattern for the secundal chord grammar.
     SECUNDAL_PARSE_STRING = P1_BASIS + ROOT + CHORDS + INVERSIONS + '$'
-    SECUNDAL_PATTERN = re.compile(SECUNDAL_PARSE_STRING)  
+    SECUNDAL_PATTERN = LazyClassAttribute(re.compile, SECUNDAL_PARSE_STRING)  
 
     def __init__(self, diatonic_basis, scale_degree, chord_type, specified_seconds, inversion):
         """
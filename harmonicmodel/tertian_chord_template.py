@@ -9,6 +9,7 @@ from harmonicmodel.chord_template import ChordTemplate
 from tonalmodel.interval import Interval, IntervalType
 from tonalmodel.diatonic_tone import DiatonicTone
 from harmonicmodel.tertian_chord import TertianChord
+from misc.lazy import LazyClassAttribute
 import re
 import logging
 
@@ -332,10 +333,10 @@ class TertianChordTemplate(ChordTemplate):
 
     # full parse string and accompanying pattern for the tertian chord grammar.
     TERTIAN_PARSE_STRING = P1_BASIS + ROOT + CHORDS + TERTIAN_TENSIONS + INVERSIONS + '$'
-    TERTIAN_PATTERN = re.compile(TERTIAN_PARSE_STRING)
+    TERTIAN_PATTERN = LazyClassAttribute(re.compile, TERTIAN_PARSE_STRING)
 
-    TENSION_PATTERN = re.compile(TENSION)
-    INVERSE_TENSION_PATTERN = re.compile(INVERSION_TENSION_STRUCT)
+    TENSION_PATTERN = LazyClassAttribute(re.compile, TENSION)
+    INVERSE_TENSION_PATTERN = LazyClassAttribute(re.compile, INVERSION_TENSION_STRUCT)
 
     def __init__(self, diatonic_basis, scale_degree, chord_type, tension_intervals, inversion, inversion_interval=None):
         """
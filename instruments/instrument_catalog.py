@@ -4,12 +4,15 @@ File: instrument_catalog.py
 
 Purpose: Defines the lead node of a catalog instrument tree.
          InstrumentCatalogue is a singleton object representing the root of an instrument tree, which is 
-         populated by reading an 'instruments.xml' file.
+         populated by reading an 'instruments.xml' file.  The catalog parsed from the bundled xml file is kept in a
+         snapshot file in a per-user cache directory, from which later processes load it.
 
 """
-import xml.etree.ElementTree as ElementTree
+import hashlib
 import os
 import logging
+import pickle
+import stat
 
 from misc.singleton import Singleton
 from instruments.instrument_class import InstrumentClass
@@ -28,27 +31,54 @@ class InstrumentCatalog(InstrumentBase, Singleton):
       InstrumentClass: representing an instrument genre such as woodwinds, bass, etc
       InstrumentFamily: representing a type of instrument that may have several variants, e.g. clarinet
       Instrument: representing the instrument itself and carries details about that instrument. 
+
+    Parsing the xml is comparatively slow.  The catalog parsed from the bundled data/instruments.xml is pickled to
+    a snapshot file in a per-user cache directory (by default $XDG_CACHE_HOME/music_rep, or ~/.cache/music_rep),
+    named by a hash of the xml content.  Later constructions load the snapshot instead, provided the xml is
+    unchanged.  Catalogs of other xml files are always parsed, and never snapshot.  Snapshots that cannot be
+    written or read are ignored.
+
+    Loading a snapshot unpickles it, which can run arbitrary code, so a snapshot is trusted only as far as its
+    directory is private: the cache directory is created readable and writable by the user alone, and a snapshot
+    is loaded only if it and its directory are owned by the user and not writable by group or others.
+
+    Name and family lookups are by dict, and the sounding_index maps each chromatic distance to the instruments
+    whose sounding range covers it (see instruments_sounding()).
     """
     
     DATA_DIRECTORY = 'data'
     # Name of the file sound in ./data
     INSTRUMENT_FILE = 'instruments.xml'
 
+    SNAPSHOT_EXTENSION = '.snapshot'
+    # Directory for snapshots; None for the per-user cache directory.
+    SNAPSHOT_DIRECTORY = None
+    # Change when the layout of the catalog classes changes, to invalidate existing snapshots.
+    SNAPSHOT_VERSION = 1
+
     def __init__(self, *args,  **kwargs):
- 
+        """
+        Constructor.
+        :param xml_file: (keyword) path of the instruments xml file; default is data/instruments.xml.  An empty
+                         string gives an empty catalog.
+        :param use_snapshot: (keyword) if False, always parse the xml, and do not write a snapshot; default True.
+                             Only the default xml file is snapshot.
+        :param snapshot_directory: (keyword) directory for the snapshot; default SNAPSHOT_DIRECTORY.
+        """
         InstrumentBase.__init__(self, '', None)
 
         xml_file = kwargs.get('xml_file', None)
 
-        tree = None
+        xml_path = None
+        # Only the bundled xml file is snapshot.
+        use_snapshot = xml_file is None and kwargs.get('use_snapshot', True)
         if xml_file is None:
             this_dir, this_filename = os.path.split(__file__)
             data_path = os.path.join(this_dir, InstrumentCatalog.DATA_DIRECTORY)
-            tree = ElementTree.parse(os.path.join(data_path, InstrumentCatalog.INSTRUMENT_FILE))
+            xml_path = os.path.join(data_path, InstrumentCatalog.INSTRUMENT_FILE)
         elif isinstance(xml_file, str):
             if len(xml_file) != 0:
-                dirr, fn = os.path.split(xml_file)
-                tree = ElementTree.parse(os.path.join(dirr, fn))
+                xml_path = xml_file
         
         self.inst_classes = []
         
@@ -60,11 +90,102 @@ class InstrumentCatalog(InstrumentBase, Singleton):
         # maps instrument family name to a list of all the instrument members of that family.
         self.instrument_family_map = {}
 
-        if tree is not None and (xml_file is None or len(xml_file) != 0):
-            root = tree.getroot()
-            self._parse_structure(root)
+        # maps chromatic distance to a list of instruments whose sounding range covers it.
+        self.sounding_index = {}
+
+        if xml_path is not None:
+            with open(xml_path, 'rb') as xml:
+                xml_content = xml.read()
+            digest = hashlib.sha1(xml_content).hexdigest()
+            directory = kwargs.get('snapshot_directory', None)
+            directory = InstrumentCatalog.snapshot_directory() if directory is None else directory
+
+            if not use_snapshot or not self._load_snapshot(directory, digest):
+                # ElementTree is imported here, so that its cost is paid only when the xml is parsed.
+                import xml.etree.ElementTree as ElementTree
+
+                self._parse_structure(ElementTree.fromstring(xml_content))
+                if use_snapshot:
+                    self._write_snapshot(directory, digest)
         
             self._build_maps()
+
+    @staticmethod
+    def snapshot_directory():
+        """
+        The directory for snapshots: SNAPSHOT_DIRECTORY if set, otherwise music_rep in the user's cache directory.
+        """
+        if InstrumentCatalog.SNAPSHOT_DIRECTORY is not None:
+            return InstrumentCatalog.SNAPSHOT_DIRECTORY
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(cache_home, 'music_rep')
+
+    @staticmethod
+    def snapshot_path(directory, digest):
+        return os.path.join(directory, 'instruments-{0}{1}'.format(digest, InstrumentCatalog.SNAPSHOT_EXTENSION))
+
+    @staticmethod
+    def _is_private(path):
+        """
+        True if path is owned by the user and not writable by group or others.  Always True where there are no
+        user ids (Windows), whose default per-user directories are private.
+        """
+        if not hasattr(os, 'getuid'):
+            return True
+        status = os.stat(path)
+        return status.st_uid == os.getuid() and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _write_snapshot(self, directory, digest):
+        """
+        Pickle the parsed catalog to its snapshot file in directory.  The catalog itself is pickled by reference,
+        so that on load, the instrument classes are parented to the loading catalog.
+        :param directory: snapshot directory, created private to the user if missing.
+        :param digest: hash of the xml content.
+        """
+        path = InstrumentCatalog.snapshot_path(directory, digest)
+        temp_path = '{0}.{1}'.format(path, os.getpid())
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not InstrumentCatalog._is_private(directory):
+                logging.info('Instrument catalog snapshot directory {0} is not private.'.format(directory))
+                return
+            with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as snapshot:
+                pickler = pickle.Pickler(snapshot, pickle.HIGHEST_PROTOCOL)
+                pickler.persistent_id = lambda obj: 'catalog' if obj is self else None
+                pickler.dump((InstrumentCatalog.SNAPSHOT_VERSION, digest))
+                pickler.dump((self.inst_classes, self.articulations))
+            # Replace atomically, so concurrent readers see either the old or the new snapshot.
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError):
+            logging.info('Instrument catalog snapshot {0} not written.'.format(path))
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _load_snapshot(self, directory, digest):
+        """
+        Load the catalog from its snapshot file in directory, if there is one for the given xml content, and it and
+        the directory are private to the user.
+        :param directory: snapshot directory.
+        :param digest: hash of the xml content.
+        :return: True if loaded.
+        """
+        path = InstrumentCatalog.snapshot_path(directory, digest)
+        try:
+            if not InstrumentCatalog._is_private(directory) or not InstrumentCatalog._is_private(path):
+                logging.info('Instrument catalog snapshot {0} not loaded: not private.'.format(path))
+                return False
+            with open(path, 'rb') as snapshot:
+                unpickler = pickle.Unpickler(snapshot)
+                unpickler.persistent_load = lambda pid: self
+                if unpickler.load() != (InstrumentCatalog.SNAPSHOT_VERSION, digest):
+                    return False
+                self.inst_classes, self.articulations = unpickler.load()
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.info('Instrument catalog snapshot {0} not loaded: {1}'.format(path, e))
+            return False
+        return True
         
     def _parse_structure(self, root):
         for child in root:
@@ -133,6 +254,7 @@ class InstrumentCatalog(InstrumentBase, Singleton):
     def _build_maps(self):
         self.instrument_map = {}
         self.instrument_family_map = {}
+        self.sounding_index = {}
 
         for inst_class in self.inst_classes:
             families = inst_class.families
@@ -141,12 +263,24 @@ class InstrumentCatalog(InstrumentBase, Singleton):
                 self.instrument_family_map[family.name.upper()] = instruments
                 for instrument in instruments:
                     self.instrument_map[instrument.name.upper()] = instrument
+                    for chromatic_distance in range(instrument.sounding_low.chromatic_distance,
+                                                    instrument.sounding_high.chromatic_distance + 1):
+                        self.sounding_index.setdefault(chromatic_distance, []).append(instrument)
                     
     def get_instrument(self, name):
-        return self.instrument_map[name.upper()] if name.upper() in self.instrument_map else None
+        return self.instrument_map.get(name.upper())
     
     def get_instruments(self, name):
-        return self.instrument_family_map[name.upper()] if name.upper() in self.instrument_map else None
+        return self.instrument_family_map.get(name.upper())
+
+    def instruments_sounding(self, pitch):
+        """
+        Find the instruments whose sounding range covers a pitch.
+        :param pitch: DiatonicPitch, or chromatic distance.
+        :return: list of instruments, in catalog order.
+        """
+        chromatic_distance = pitch if isinstance(pitch, int) else pitch.chromatic_distance
+        return list(self.sounding_index.get(chromatic_distance, []))
     
     def instrument_classes(self):
         return list(self.inst_classes)
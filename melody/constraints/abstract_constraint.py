@@ -7,6 +7,8 @@ Purpose: Define a constraint, in an abstract sense, related to a number of actor
 """
 from abc import ABCMeta, abstractmethod
 
+from melody.constraints.pitch_domain import PitchDomain
+
 
 class AbstractConstraint(object):
     """
@@ -51,6 +53,17 @@ class AbstractConstraint(object):
         Note: The return value is a set!
         """
 
+    def value_domain(self, solution_context, v_note):
+        """
+        The pitches of values(solution_context, v_note), as a PitchDomain.  Constraints that can compute their
+        candidate pitches directly should override this, to avoid building notes.
+        :param solution_context: includes parameter map.
+        :param v_note: source actor, whose target values we are computing.
+        :return: PitchDomain
+        """
+        values = self.values(solution_context, v_note)
+        return PitchDomain() if values is None else PitchDomain.from_notes(values)
+
     def __hash__(self):
         return hash(len(self.actors))
 
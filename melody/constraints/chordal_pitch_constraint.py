@@ -5,10 +5,8 @@ Purpose: A policy to ensure a pitch assigns to a chordal tone.
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from structure.note import Note
-from tonalmodel.diatonic_pitch import DiatonicPitch
-from tonalmodel.chromatic_scale import ChromaticScale
-from misc.ordered_set import OrderedSet
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
 
 
 class ChordalPitchConstraint(AbstractConstraint):
@@ -50,7 +48,7 @@ class ChordalPitchConstraint(AbstractConstraint):
         if tone not in tones:
             return False
         return target_contextual_note.policy_context.pitch_range.is_pitch_inbounds(
-            str(target_contextual_note.note.diatonic_pitch))
+            target_contextual_note.note.diatonic_pitch)
 
     def values(self, p_map, v_note):
         """
@@ -71,17 +69,14 @@ class ChordalPitchConstraint(AbstractConstraint):
             raise Exception('Chordal Pitch Policy Violated has {0} should be member of chord {1}'.format(
                 p_map[v_note].note.diatonic_pitch, policy_context.harmonic_context.chord))
 
-        pitch_range = policy_context.pitch_range
-        start_partition = max(ChromaticScale.index_to_location(pitch_range.start_index)[0] - 1, 0)
-        end_partition = min(ChromaticScale.index_to_location(pitch_range.end_index)[0] + 1,
-                            ChromaticScale.CHROMATIC_END[0])
+        return PitchValueTables.notes(ChordalPitchConstraint._pitch_keys(policy_context), self.actor_note)
 
-        valid_set = OrderedSet()
-        for tone in tones:
-            for i in range(start_partition, end_partition + 1):
-                pitch = DiatonicPitch(i, tone[0])
-                if pitch_range.is_pitch_inbounds(str(pitch)):
-                    note = Note(pitch, self.actor_note.base_duration, self.actor_note.num_dots)
-                    valid_set.add(note)
+    def value_domain(self, p_map, v_note):
+        if v_note != self.actor_note or p_map[v_note].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+        return PitchDomain.from_pitch_keys(ChordalPitchConstraint._pitch_keys(p_map[v_note].policy_context))
 
-        return valid_set
+    @staticmethod
+    def _pitch_keys(policy_context):
+        tones = policy_context.harmonic_context.chord.tones
+        return PitchValueTables.tone_pitch_keys([tone[0] for tone in tones], policy_context.pitch_range)
@@ -7,10 +7,10 @@ Purpose: Defines a two note policy where the second note's pitch and first note'
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from structure.note import Note
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
+from tonalmodel.diatonic_pitch import DiatonicPitch
 from tonalmodel.pitch_range import PitchRange
-from tonalmodel.pitch_scale import PitchScale
-from misc.ordered_set import OrderedSet
 
 
 class ComparativePitchConstraint(AbstractConstraint):
@@ -107,6 +107,23 @@ class ComparativePitchConstraint(AbstractConstraint):
               from the inequalities, t-a<=y<t+b - so the reverse map is
               [y-b, y+a] <-- y, which is exactly what happens below.
         """
+        if p_map[v_note].note is not None:
+            return {p_map[v_note].note}
+
+        return PitchValueTables.notes(self._pitch_keys(p_map, v_note), v_note)
+
+    def value_domain(self, p_map, v_note):
+        if p_map[v_note].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+        return PitchDomain.from_pitch_keys(self._pitch_keys(p_map, v_note))
+
+    def _pitch_keys(self, p_map, v_note):
+        """
+        Compute the pitch keys of candidate values for v_note's (unassigned) target.
+        :param p_map: note-->contextual_note
+        :param v_note: Note
+        :return: list of pitch keys, ascending.
+        """
         if v_note == self.note_two:
             source = self.note_one
             target = self.note_two
@@ -118,9 +135,6 @@ class ComparativePitchConstraint(AbstractConstraint):
         else:
             raise Exception('v_note specification does not match any v_note in constraints.')
 
-        if p_map[target].note is not None:
-            return {p_map[target].note}
-
         if p_map[source].note is None:
             answer_range = p_map[target].policy_context.pitch_range
             source_pitch = None
@@ -136,16 +150,13 @@ class ComparativePitchConstraint(AbstractConstraint):
             else:
                 answer_range = PitchRange(source_pitch.chromatic_distance, source_pitch.chromatic_distance)
 
-        pitches = PitchScale.compute_tonal_pitches(p_map[target].policy_context.harmonic_context.tonality,
-                                                   answer_range)
-        if comparative == 4 and len(pitches) > 0 and source_pitch is not None and \
-                source_pitch.chromatic_distance == pitches[-1].chromatic_distance:
-            pitches.pop(-1)
-        if comparative == 0 and len(pitches) > 0 and source_pitch is not None and \
-                source_pitch.chromatic_distance == pitches[0].chromatic_distance:
-            del pitches[0]
-
-        answer = OrderedSet()
-        for pitch in pitches:
-            answer.add(Note(pitch, target.base_duration, target.num_dots))
-        return answer
+        pitch_keys = list(PitchValueTables.tonal_pitch_keys(p_map[target].policy_context.harmonic_context.tonality,
+                                                            answer_range))
+        if comparative == 4 and len(pitch_keys) > 0 and source_pitch is not None and \
+                source_pitch.chromatic_distance == DiatonicPitch.from_pitch_key(pitch_keys[-1]).chromatic_distance:
+            pitch_keys.pop(-1)
+        if comparative == 0 and len(pitch_keys) > 0 and source_pitch is not None and \
+                source_pitch.chromatic_distance == DiatonicPitch.from_pitch_key(pitch_keys[0]).chromatic_distance:
+            del pitch_keys[0]
+
+        return pitch_keys
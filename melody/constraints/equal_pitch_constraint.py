@@ -7,7 +7,6 @@ Purpose: Defines a two note policy where the second note's pitch must equal firs
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
 from structure.note import Note
-from tonalmodel.pitch_scale import PitchScale
 from misc.ordered_set import OrderedSet
 
 
@@ -75,7 +74,7 @@ class EqualPitchConstraint(AbstractConstraint):
         policy_context = p_map[unassigned_note].policy_context
         pitch = p_map[assigned_note].note.diatonic_pitch
         for p in pitch.enharmonics():
-            for t in PitchScale(policy_context.harmonic_context.tonality, policy_context.pitch_range).tone_scale:
+            for t in policy_context.harmonic_context.tonality.annotation:
                 if p.diatonic_tone == t:
                     pitch = p
                     break
@@ -5,12 +5,9 @@ Purpose: Policy to ensure the mapped note (of a given note) is fixed to a tone.
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from structure.note import Note
-from tonalmodel.diatonic_pitch import DiatonicPitch
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
 from tonalmodel.diatonic_tone_cache import DiatonicToneCache
-from tonalmodel.pitch_scale import PitchScale
-from tonalmodel.chromatic_scale import ChromaticScale
-from misc.ordered_set import OrderedSet
 
 
 class FixedToneConstraint(AbstractConstraint):
@@ -49,31 +46,24 @@ class FixedToneConstraint(AbstractConstraint):
             raise Exception('Fixed Tone Policy Violated has {0} should be {1}'.format(
                 p_map[v_note].note.diatonic_pitch.diatonic_tone, self.tone))
 
-        contextual_note = p_map[self.actor_note]
-        policy_context = contextual_note.policy_context
-        pitch_range = contextual_note.policy_context.pitch_range
-        start_partition = max(ChromaticScale.index_to_location(pitch_range.start_index)[0] - 1, 0)
-        end_partition = min(ChromaticScale.index_to_location(pitch_range.end_index)[0] + 1,
-                            ChromaticScale.CHROMATIC_END[0])
+        return PitchValueTables.notes(self._pitch_keys(p_map[self.actor_note].policy_context), self.actor_note)
 
+    def value_domain(self, p_map, v_note):
+        if v_note != self.actor_note or p_map[v_note].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+        return PitchDomain.from_pitch_keys(self._pitch_keys(p_map[v_note].policy_context))
+
+    def _pitch_keys(self, policy_context):
         # Try to find that tone in target's tonality/scale.
         tone = self.tone
         for t_str in self.tone.enharmonics():
             t = DiatonicToneCache.get_tone(t_str)
-            for scale_tone in PitchScale(policy_context.harmonic_context.tonality,
-                                         policy_context.pitch_range).tone_scale:
+            for scale_tone in policy_context.harmonic_context.tonality.annotation:
                 if scale_tone == t:
                     tone = t
                     break
 
-        valid_set = OrderedSet()
-        for i in range(start_partition, end_partition + 1):
-            pitch = DiatonicPitch(i, tone)
-            if pitch_range.is_pitch_inbounds(pitch):
-                note = Note(pitch, self.actor_note.base_duration, self.actor_note.num_dots)
-                valid_set.add(note)
-
-        return valid_set
+        return PitchValueTables.tone_pitch_keys([tone], policy_context.pitch_range)
 
     def verify(self, parameter_map):
         if parameter_map is None or self.actor_note not in parameter_map:
@@ -7,8 +7,6 @@ Purpose: Defines a class indicating for some actor that it must adhere to a give
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
 from structure.time_signature import BeatType
-from timemodel.position import Position
-from timemodel.time_conversion import TimeConversion
 from misc.ordered_set import OrderedSet
 
 
@@ -56,26 +54,21 @@ class OnBeatConstraint(AbstractConstraint):
         :param pdi: PositionDeltaInfo.
         :return: True/False on meeting constraint.
         """
-        conversion = TimeConversion(pdi.tempo_event_sequence, pdi.ts_event_sequence, Position(pdi.line_duration()))
-        new_position = pdi.correct_position(self.actor.get_absolute_position())
-        beat_position = conversion.position_to_bp(new_position)
-        if beat_position.beat_fraction > 0:
+        ts, beat_number = pdi.beat_at(pdi.correct_note_position(self.actor))
+        beat = int(beat_number)
+        if beat_number - beat > 0:
             return False
 
-        beat = beat_position.beat
-        ts = pdi.ts_event_sequence.floor_event(new_position).object
         beat_list = self.beat_ids if self.beat_ids is not None else ts.beats_matching(self.beat_type)
         return beat in beat_list
 
     def values(self, pdi, note):
-        position = pdi.correct_position(note.get_absolute_position())  # position should be adjusted
-        ts = pdi.ts_event_sequence.floor_event(position).object
-        beat_position = TimeConversion(pdi.tempo_event_sequence, pdi.ts_event_sequence, Position(pdi.line_duration())).\
-            position_to_bp(position)
-        num_beats = ts.beats_per_measure if beat_position.beat_fraction > 0 else ts.beats_per_measure - 1
-        beat_index = (beat_position.beat + 1) % ts.beats_per_measure
-        delta_t = ts.beat_duration if beat_position.beat_fraction == 0 else \
-            ts.beat_duration * (1 - beat_position.beat_fraction)
+        ts, beat_number = pdi.beat_at(pdi.correct_note_position(note))  # position should be adjusted
+        beat = int(beat_number)
+        beat_fraction = beat_number - beat
+        num_beats = ts.beats_per_measure if beat_fraction > 0 else ts.beats_per_measure - 1
+        beat_index = (beat + 1) % ts.beats_per_measure
+        delta_t = ts.beat_duration if beat_fraction == 0 else ts.beat_duration * (1 - beat_fraction)
 
         deltas = OrderedSet()
         for i in range(0, num_beats):
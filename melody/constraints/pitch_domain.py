@@ -0,0 +1,103 @@
+"""
+
+File: pitch_domain.py
+
+Purpose: A set of candidate pitches held as a bitset over pitch keys, for use in constraint solving.
+
+"""
+from tonalmodel.diatonic_pitch import DiatonicPitch
+
+
+class PitchDomain(object):
+    """
+    Set of pitches represented as a bitset in a Python int, bit i being set if the pitch with pitch key i
+    (see DiatonicPitch.pitch_key) is in the set.  Intersection, union and size are word-level operations, and
+    iteration is in ascending pitch key order, i.e. by diatonic distance, then by augmentation.
+
+    PitchDomain's are immutable.
+    """
+
+    def __init__(self, bits=0):
+        """
+        Constructor.
+        :param bits: int bitset over pitch keys.
+        """
+        self.__bits = bits
+
+    @staticmethod
+    def from_pitch_keys(pitch_keys):
+        bits = 0
+        for pitch_key in pitch_keys:
+            bits |= 1 << pitch_key
+        return PitchDomain(bits)
+
+    @staticmethod
+    def from_pitches(pitches):
+        return PitchDomain.from_pitch_keys(pitch.pitch_key for pitch in pitches)
+
+    @staticmethod
+    def from_notes(notes):
+        """
+        Domain of the pitches of a collection of notes.  Rests (notes without pitch) are ignored.
+        :param notes: iterable of Note
+        :return: PitchDomain
+        """
+        return PitchDomain.from_pitch_keys(note.diatonic_pitch.pitch_key for note in notes
+                                           if note.diatonic_pitch is not None)
+
+    @property
+    def bits(self):
+        return self.__bits
+
+    def pitch_keys(self):
+        """
+        List of pitch keys in the domain, ascending.
+        """
+        keys = list()
+        bits = self.__bits
+        while bits:
+            low_bit = bits & -bits
+            keys.append(low_bit.bit_length() - 1)
+            bits ^= low_bit
+        return keys
+
+    def pitches(self):
+        """
+        List of DiatonicPitch's in the domain, in pitch key order.
+        """
+        return [DiatonicPitch.from_pitch_key(pitch_key) for pitch_key in self.pitch_keys()]
+
+    def intersection(self, other):
+        return PitchDomain(self.__bits & other.bits)
+
+    def union(self, other):
+        return PitchDomain(self.__bits | other.bits)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __len__(self):
+        return bin(self.__bits).count('1')
+
+    def __bool__(self):
+        return self.__bits != 0
+
+    def __iter__(self):
+        return iter(self.pitch_keys())
+
+    def __contains__(self, pitch_key):
+        return pitch_key >= 0 and (self.__bits >> pitch_key) & 1 == 1
+
+    def __eq__(self, other):
+        if not isinstance(other, PitchDomain):
+            return NotImplemented
+        return self.__bits == other.bits
+
+    def __hash__(self):
+        return hash(self.__bits)
+
+    def __str__(self):
+        return '{' + ', '.join(str(pitch) for pitch in self.pitches()) + '}'
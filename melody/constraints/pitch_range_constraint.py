@@ -6,8 +6,8 @@ Purpose: An N-note constraint directing that actor notes fall within a specific
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from structure.note import Note
-from tonalmodel.pitch_scale import PitchScale
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
 from misc.ordered_set import OrderedSet
 
 
@@ -47,18 +47,19 @@ class PitchRangeConstraint(AbstractConstraint):
         unassigned = p_map.unassigned_actors(self)
         if v_note in unassigned:
             tonality = p_map[v_note].policy_context.harmonic_context.tonality
-            pitches = PitchScale.compute_tonal_pitches(tonality, self.pitch_range)
-            answer = OrderedSet()
-            for p in pitches:
-                answer.add(Note(p, v_note.base_duration, v_note.num_dots))
-            return answer
-            # return {Note(p, v_note.base_duration, v_note.num_dots) for p in pitches}
+            return PitchValueTables.notes(PitchValueTables.tonal_pitch_keys(tonality, self.pitch_range), v_note)
 
         if v_note in assigned:
             return OrderedSet([p_map[v_note].note])
 
         raise Exception('{0} is not in actor list for pitch range constraints.'.format(v_note.note))
 
+    def value_domain(self, p_map, v_note):
+        if v_note not in p_map.unassigned_actors(self):
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+        tonality = p_map[v_note].policy_context.harmonic_context.tonality
+        return PitchDomain.from_pitch_keys(PitchValueTables.tonal_pitch_keys(tonality, self.pitch_range))
+
     def __str__(self):
         note_str = ','.join([str(x) for x in self.actors])
         return 'p.r.p{0}: {1}'.format(note_str, self.pitch_range)
@@ -6,7 +6,9 @@ Purpose: Constraint that compute a second pitch from the first based on a number
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from tonalmodel.pitch_scale import PitchScale
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
+from tonalmodel.diatonic_pitch import DiatonicPitch
 from structure.note import Note
 from misc.ordered_set import OrderedSet
 
@@ -68,18 +70,13 @@ class PitchStepConstraint(AbstractConstraint):
                 str(second_contextual_note.policy_context.harmonic_context.tonality):
             raise Exception('Note one and two of tonal step constraints must match')
 
-        pitch_scale = PitchScale(first_contextual_note.policy_context.harmonic_context.tonality,
-                                 first_contextual_note.policy_context.pitch_range)
-        scale = pitch_scale.pitch_scale
-
         if first_contextual_note.note is None or second_contextual_note.note is None:
             return False
 
-        first_pitch = first_contextual_note.note.diatonic_pitch
-        second_pitch = second_contextual_note.note.diatonic_pitch
-
-        first_index = scale.index(first_pitch) if first_pitch in scale else None
-        second_index = scale.index(second_pitch) if second_pitch in scale else None
+        scale_index = PitchValueTables.tonal_pitch_index(first_contextual_note.policy_context.harmonic_context.tonality,
+                                                         first_contextual_note.policy_context.pitch_range)
+        first_index = scale_index.get(first_contextual_note.note.diatonic_pitch.pitch_key)
+        second_index = scale_index.get(second_contextual_note.note.diatonic_pitch.pitch_key)
 
         if first_index is None or second_index is None:
             return False
@@ -87,14 +84,7 @@ class PitchStepConstraint(AbstractConstraint):
         return second_index - first_index == self.n_steps * (1 if self.up_down == PitchStepConstraint.UP else -1)
 
     def values(self, p_map, v_target_note):
-        if v_target_note == self.note_two:
-            up_down = self.up_down
-            v_source_note = self.note_one
-        elif v_target_note == self.note_one:
-            up_down = not self.up_down
-            v_source_note = self.note_two
-        else:
-            raise Exception('v_note specification does not match any v_note in constraints.')
+        v_source_note, up_down = self._orientation(v_target_note)
 
         if p_map[v_target_note].note is not None:
             return OrderedSet([p_map[v_target_note].note])
@@ -111,6 +101,34 @@ class PitchStepConstraint(AbstractConstraint):
 
         return self.compute_result(arg_contextual_note, target_contextual_note, up_down)
 
+    def value_domain(self, p_map, v_target_note):
+        v_source_note, up_down = self._orientation(v_target_note)
+        if p_map[v_target_note].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_target_note)
+
+        arg_contextual_note = p_map[v_source_note]
+        target_contextual_note = p_map[v_target_note]
+
+        if arg_contextual_note.note is None:
+            policy_context = target_contextual_note.policy_context
+            return PitchDomain.from_pitch_keys(PitchValueTables.tonal_pitch_keys(
+                policy_context.harmonic_context.tonality, policy_context.pitch_range))
+
+        pitch_key = self._compute_pitch_key(arg_contextual_note, target_contextual_note, up_down)
+        return PitchDomain() if pitch_key is None else PitchDomain.from_pitch_keys([pitch_key])
+
+    def _orientation(self, v_target_note):
+        """
+        Determine the source note and step direction for computing v_target_note's values.
+        :param v_target_note:
+        :return: (v_source_note, up_down)
+        """
+        if v_target_note == self.note_two:
+            return self.note_one, self.up_down
+        if v_target_note == self.note_one:
+            return self.note_two, not self.up_down
+        raise Exception('v_note specification does not match any v_note in constraints.')
+
     def compute_result(self, arg_contextual_note, target_contextual_note, up_down):
         """
         Compute the target note from the arg note basecd on up_down and self.n_steps.
@@ -120,16 +138,22 @@ class PitchStepConstraint(AbstractConstraint):
         :param up_down: 
         :return: 
         """
+        pitch_key = self._compute_pitch_key(arg_contextual_note, target_contextual_note, up_down)
+        if pitch_key is None:
+            return None
+        return OrderedSet([Note(DiatonicPitch.from_pitch_key(pitch_key), self.note_two.base_duration,
+                                self.note_two.num_dots)])
+
+    def _compute_pitch_key(self, arg_contextual_note, target_contextual_note, up_down):
         if str(arg_contextual_note.policy_context.harmonic_context.tonality) != \
                 str(target_contextual_note.policy_context.harmonic_context.tonality):
             raise Exception('Note one and two of tonal step constraints must match on tonality')
 
-        starting_pitch = arg_contextual_note.note.diatonic_pitch
-
-        pitch_scale = PitchScale(target_contextual_note.policy_context.harmonic_context.tonality,
-                                 target_contextual_note.policy_context.pitch_range)
-        scale = pitch_scale.pitch_scale
-        pitch_index = scale.index(starting_pitch) if starting_pitch in scale else None
+        tonality = target_contextual_note.policy_context.harmonic_context.tonality
+        pitch_range = target_contextual_note.policy_context.pitch_range
+        scale = PitchValueTables.tonal_pitch_keys(tonality, pitch_range)
+        pitch_index = PitchValueTables.tonal_pitch_index(tonality, pitch_range).get(
+            arg_contextual_note.note.diatonic_pitch.pitch_key)
         if pitch_index is None:
             return None
 
@@ -137,5 +161,4 @@ class PitchStepConstraint(AbstractConstraint):
         if end_index not in range(0, len(scale)):
             return None
 
-        end_pitch = scale[end_index]
-        return OrderedSet([Note(end_pitch, self.note_two.base_duration, self.note_two.num_dots)])
+        return scale[end_index]
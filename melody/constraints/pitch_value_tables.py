@@ -0,0 +1,130 @@
+"""
+
+File: pitch_value_tables.py
+
+Purpose: Cache of precompiled candidate pitch tables used by constraint values() and verify() computations.
+
+"""
+from structure.note import Note
+from tonalmodel.chromatic_scale import ChromaticScale
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_scale import PitchScale
+from misc.ordered_set import OrderedSet
+
+
+class PitchValueTables(object):
+    """
+    Cache of candidate pitch tables, each a tuple of pitch keys (see DiatonicPitch.pitch_key).  A table is compiled
+    once per tonality or tone list, and pitch range, so that constraints reduce their per-call work to lookups
+    and filtering over the table.
+
+    Tables are keyed by value, not identity, so that equal tonalities or ranges held in different objects
+    share tables.
+    The cache is implemented as a singleton.  The constructor is meant to be 'private', and not called externally.
+    All access should be through the static methods.
+    """
+
+    VALUE_TABLES = None
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        # (tonality key, range key) --> tuple of pitch keys of the tonality's scale in the range, ascending.
+        self.tonal_map = dict()
+        # (tonality key, range key) --> dict of pitch key --> index in the corresponding tonal_map tuple.
+        self.tonal_index_map = dict()
+        # (tuple of tone symbols, range key) --> tuple of pitch keys for the tones in the range, by tone then octave.
+        self.tone_map = dict()
+
+    @staticmethod
+    def get_tables():
+        if PitchValueTables.VALUE_TABLES is None:
+            PitchValueTables.VALUE_TABLES = PitchValueTables()
+        return PitchValueTables.VALUE_TABLES
+
+    @staticmethod
+    def clear():
+        PitchValueTables.VALUE_TABLES = None
+
+    @staticmethod
+    def range_key(pitch_range):
+        return pitch_range.start_index, pitch_range.end_index
+
+    @staticmethod
+    def tonal_pitch_keys(tonality, pitch_range):
+        """
+        Pitch keys for the pitches of the tonality's scale within pitch_range, in ascending order.
+        Same as the pitches of PitchScale(tonality, pitch_range).pitch_scale.
+        :param tonality: Tonality
+        :param pitch_range: PitchRange
+        :return: tuple of pitch keys
+        """
+        tables = PitchValueTables.get_tables()
+        key = (tonality.value_key, PitchValueTables.range_key(pitch_range))
+        table = tables.tonal_map.get(key)
+        if table is None:
+            table = tuple(pitch.pitch_key for pitch in PitchScale(tonality, pitch_range).pitch_scale)
+            tables.tonal_map[key] = table
+            tables.tonal_index_map[key] = {pitch_key: i for i, pitch_key in enumerate(table)}
+        return table
+
+    @staticmethod
+    def tonal_pitch_index(tonality, pitch_range):
+        """
+        Map of pitch key to scale index, for the table given by tonal_pitch_keys(tonality, pitch_range).
+        :param tonality: Tonality
+        :param pitch_range: PitchRange
+        :return: dict pitch key --> index
+        """
+        PitchValueTables.tonal_pitch_keys(tonality, pitch_range)
+        key = (tonality.value_key, PitchValueTables.range_key(pitch_range))
+        return PitchValueTables.get_tables().tonal_index_map[key]
+
+    @staticmethod
+    def tone_pitch_keys(tones, pitch_range):
+        """
+        Pitch keys for all octaves of the given tones within pitch_range, ordered by tone, then by octave.
+        :param tones: list of DiatonicTone
+        :param pitch_range: PitchRange
+        :return: tuple of pitch keys
+        """
+        tables = PitchValueTables.get_tables()
+        key = (tuple(tone.diatonic_symbol for tone in tones), PitchValueTables.range_key(pitch_range))
+        table = tables.tone_map.get(key)
+        if table is None:
+            # Tones like Cb or B# lie outside their nominal partition, so look one partition beyond each end.
+            start_partition = max(ChromaticScale.index_to_location(pitch_range.start_index)[0] - 1, 0)
+            end_partition = min(ChromaticScale.index_to_location(pitch_range.end_index)[0] + 1,
+                                ChromaticScale.CHROMATIC_END[0])
+            keys = list()
+            for tone in tones:
+                for i in range(start_partition, end_partition + 1):
+                    pitch = DiatonicPitch(i, tone)
+                    if pitch_range.is_inbounds(pitch.chromatic_distance):
+                        keys.append(pitch.pitch_key)
+            table = tuple(keys)
+            tables.tone_map[key] = table
+        return table
+
+    @staticmethod
+    def pitches(pitch_keys):
+        """
+        Convert pitch keys to DiatonicPitch's.
+        :param pitch_keys: iterable of pitch keys
+        :return: list of DiatonicPitch
+        """
+        return [DiatonicPitch.from_pitch_key(pitch_key) for pitch_key in pitch_keys]
+
+    @staticmethod
+    def notes(pitch_keys, actor):
+        """
+        Build candidate notes for actor, one per pitch key, having actor's duration.
+        :param pitch_keys: iterable of pitch keys
+        :param actor: Note
+        :return: OrderedSet of Note
+        """
+        result = OrderedSet()
+        for pitch_key in pitch_keys:
+            result.add(Note(DiatonicPitch.from_pitch_key(pitch_key), actor.base_duration, actor.num_dots))
+        return result
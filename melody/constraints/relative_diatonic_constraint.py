@@ -6,7 +6,8 @@ Purpose: Constraint that compute a second pitch from the first based on interval
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from tonalmodel.pitch_scale import PitchScale
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
 from tonalmodel.pitch_range import PitchRange
 from structure.note import Note
 from misc.ordered_set import OrderedSet
@@ -82,18 +83,7 @@ class RelativeDiatonicConstraint(AbstractConstraint):
               from the inequalities, t-a<=y<t+b - so the reverse map is
               [y-b, y+a] <-- y, which is exactly what happens below.
         """
-        if v_note == self.note_two:
-            source = self.note_one
-            target = self.note_two
-            up_intvl = self.up_interval
-            down_intvl = self.down_interval
-        elif v_note == self.note_one:
-            source = self.note_two
-            target = self.note_one
-            up_intvl = self.down_interval
-            down_intvl = self.up_interval
-        else:
-            raise Exception('v_note specification does not match any v_note in constraints.')
+        source, target, up_intvl, down_intvl = self._orientation(v_note)
 
         if p_map[target].note is not None:
             return OrderedSet([p_map[target].note])
@@ -111,6 +101,33 @@ class RelativeDiatonicConstraint(AbstractConstraint):
 
         return self.compute_result(arg_contextual_note, target_contextual_note, up_intvl, down_intvl)
 
+    def value_domain(self, p_map, v_note):
+        source, target, up_intvl, down_intvl = self._orientation(v_note)
+        if p_map[target].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+
+        arg_contextual_note = p_map[source]
+        target_contextual_note = p_map[target]
+        if arg_contextual_note.note is None:
+            policy_context = target_contextual_note.policy_context
+            return PitchDomain.from_pitch_keys(PitchValueTables.tonal_pitch_keys(
+                policy_context.harmonic_context.tonality, policy_context.pitch_range))
+
+        return PitchDomain.from_pitch_keys(self._compute_pitch_keys(arg_contextual_note, target_contextual_note,
+                                                                    up_intvl, down_intvl))
+
+    def _orientation(self, v_note):
+        """
+        Determine source and target notes, and the intervals to apply, for computing v_note's values.
+        :param v_note:
+        :return: (source, target, up_intvl, down_intvl)
+        """
+        if v_note == self.note_two:
+            return self.note_one, self.note_two, self.up_interval, self.down_interval
+        if v_note == self.note_one:
+            return self.note_two, self.note_one, self.down_interval, self.up_interval
+        raise Exception('v_note specification does not match any v_note in constraints.')
+
     def compute_result(self, arg_contextual_note, target_contextual_note, up_intvl, down_intvl):
         """
         
@@ -120,6 +137,13 @@ class RelativeDiatonicConstraint(AbstractConstraint):
         :param down_intvl: 
         :return: 
         """
+        pitch_keys = self._compute_pitch_keys(arg_contextual_note, target_contextual_note, up_intvl, down_intvl)
+        if len(pitch_keys) == 0:
+            return OrderedSet()
+        return PitchValueTables.notes(pitch_keys, self.note_two)
+
+    @staticmethod
+    def _compute_pitch_keys(arg_contextual_note, target_contextual_note, up_intvl, down_intvl):
 
         starting_pitch = arg_contextual_note.note.diatonic_pitch
         chromatic_distance_start = starting_pitch.chromatic_distance - down_intvl.chromatic_distance
@@ -129,15 +153,7 @@ class RelativeDiatonicConstraint(AbstractConstraint):
         r_end = min(chromatic_distance_end, target_contextual_note.policy_context.pitch_range.end_index)
 
         if r_start > r_end:
-            return OrderedSet()
-
-        pitch_range = PitchRange(r_start, r_end)
-        pitch_scale = PitchScale(target_contextual_note.policy_context.harmonic_context.tonality, pitch_range)
-
-        result = OrderedSet()
-        for pitch in pitch_scale.pitch_scale:
-            result.add(Note(pitch, self.note_two.base_duration, self.note_two.num_dots))
-        # v_result = {Note(pitch, self.note_two.base_duration, self.note_two.num_dots)
-        #             for pitch in pitch_scale.pitch_scale}
+            return ()
 
-        return result
+        return PitchValueTables.tonal_pitch_keys(target_contextual_note.policy_context.harmonic_context.tonality,
+                                                 PitchRange(r_start, r_end))
@@ -6,9 +6,8 @@ Purpose: Constraint to ensure that some note must be scale to the contextual ton
 
 """
 from melody.constraints.abstract_constraint import AbstractConstraint
-from structure.note import Note
-from tonalmodel.chromatic_scale import ChromaticScale
-from tonalmodel.diatonic_pitch import DiatonicPitch
+from melody.constraints.pitch_value_tables import PitchValueTables
+from melody.constraints.pitch_domain import PitchDomain
 from misc.ordered_set import OrderedSet
 
 
@@ -58,26 +57,24 @@ class ScalarPitchConstraint(AbstractConstraint):
             raise Exception('v_note {0} not in ScalarConstraint actors.'.format(v_note.note))
 
         policy_context = p_map[self.actor_note].policy_context
-        tones = list(policy_context.harmonic_context.tonality.annotation)
-        tones = tones[:-1]   # remove final note (same as first)
-        if len(self.scalar_roles) != 0:
-            tones = [tones[i] for i in self.scalar_roles]
+        tones = self._tones(policy_context)
         if p_map[v_note].note is not None:
             tone = p_map[v_note].note.diatonic_pitch.diatonic_tone
             return OrderedSet([self.actor_note]) if tone in tones else None
 
-        pitch_range = policy_context.pitch_range
-        start_partition = max(ChromaticScale.index_to_location(pitch_range.start_index)[0] - 1, 0)
-        end_partition = min(ChromaticScale.index_to_location(pitch_range.end_index)[0] + 1,
-                            ChromaticScale.CHROMATIC_END[0])
-
-        valid_set = OrderedSet()
+        pitch_keys = PitchValueTables.tone_pitch_keys(tones, policy_context.pitch_range)
+        return PitchValueTables.notes(pitch_keys, self.actor_note)
 
-        for tone in tones:
-            for j in range(start_partition, end_partition + 1):
-                pitch = DiatonicPitch(j, tone)
-                if pitch_range.is_pitch_inbounds(pitch):
-                    note = Note(pitch, self.actor_note.base_duration, self.actor_note.num_dots)
-                    valid_set.add(note)
+    def value_domain(self, p_map, v_note):
+        if v_note != self.actor_note or p_map[v_note].note is not None:
+            return AbstractConstraint.value_domain(self, p_map, v_note)
+        policy_context = p_map[v_note].policy_context
+        return PitchDomain.from_pitch_keys(PitchValueTables.tone_pitch_keys(self._tones(policy_context),
+                                                                            policy_context.pitch_range))
 
-        return valid_set
+    def _tones(self, policy_context):
+        tones = list(policy_context.harmonic_context.tonality.annotation)
+        tones = tones[:-1]   # remove final note (same as first)
+        if len(self.scalar_roles) != 0:
+            tones = [tones[i] for i in self.scalar_roles]
+        return tones
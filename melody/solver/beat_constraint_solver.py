@@ -5,10 +5,13 @@ File: beat_constraint_solver.py
 Purpose: Class whose purpose is to reposition notes on a line to mean a set of OnBeat Constraints.
 
 """
+import time
+
 from melody.constraints.on_beat_constraint import OnBeatConstraint
 from structure.line import Line
 
 from melody.solver.position_delta_info import PositionDeltaInfo
+from misc.tracing import traced
 
 
 class BeatConstraintSolver(object):
@@ -38,6 +41,7 @@ class BeatConstraintSolver(object):
         self.node_constraint_map = {constraint.actor: constraint for constraint in on_beat_constraints}
 
         self.__results = None
+        self.__statistics = None
 
     @staticmethod
     def create(lite_score, on_beat_constraints):
@@ -78,15 +82,29 @@ class BeatConstraintSolver(object):
     def hct(self):
         return self.__hct
 
-    def solve(self):
+    @traced()
+    def solve(self, statistics=None):
         """
         Solve for the on-beat constraints by modifying the time-line.
+        :param statistics: SolveStatistics to record the search in, or None, its seconds adding the time of the
+                           search.  Results are computed once, so only the first solve() is recorded.
         :return: A set of PDI's that solve the constraints.
                  Empty if initially solves the constraints.
                  None if no solution is found.
         """
         if self.results is None:
-            self.__results = self._compute_coverage()
+            self.__statistics = statistics
+            try:
+                if statistics is None:
+                    self.__results = self._compute_coverage()
+                else:
+                    start = time.perf_counter()
+                    with statistics.phase('beat search'):
+                        self.__results = self._compute_coverage()
+                    statistics.seconds += time.perf_counter() - start
+                    statistics.num_beat_results += len(self.__results) if self.__results is not None else 0
+            finally:
+                self.__statistics = None
         return self.results
 
     def _compute_coverage(self):
@@ -96,6 +114,7 @@ class BeatConstraintSolver(object):
                                                 self.line))
 
     def _visit(self, coverage_list_index, pdi):
+        statistics = self.__statistics
         results = list()
         for i in range(coverage_list_index, len(self.coverage_node_list)):
             cover = self.coverage_node_list[i]
@@ -112,10 +131,16 @@ class BeatConstraintSolver(object):
                 continue
 
             deltas = constraint.values(pdi, cover_note)
+            if statistics is not None:
+                statistics.count_values(constraint)
+                statistics.add_domain(i + 1, len(deltas))
             successful_delta = False
             for delta in deltas:
                 new_pdi = pdi.clone()
                 new_pdi.alter_at(cover, delta)
+                if statistics is not None:
+                    statistics.node()
+                    statistics.num_replicates += 1
                 # test of all notes in cover are solved
                 bad_constraint = None
                 for n in self.reverse_coverage_map[cover]:
@@ -133,6 +158,8 @@ class BeatConstraintSolver(object):
                 else:
                     results.append(new_pdi)
             if not successful_delta:
+                if statistics is not None:
+                    statistics.num_backtracks += 1
                 return None
             break
 
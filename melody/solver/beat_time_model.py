@@ -0,0 +1,169 @@
+"""
+
+File: beat_time_model.py
+
+Purpose: Time model for the beat constraint solver, giving corrected positions and beat positions for a set of
+         cover deltas without rebuilding event sequences or time conversions.
+
+"""
+from bisect import bisect_left, bisect_right
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from structure.tempo import Tempo
+from structure.time_signature import TimeSignature
+from timemodel.duration import Duration
+from timemodel.event_sequence import EventSequence
+from timemodel.position import Position
+from timemodel.tempo_event import TempoEvent
+from timemodel.tempo_event_sequence import TempoEventSequence
+from timemodel.time_signature_event import TimeSignatureEvent
+
+
+class BeatTimeModel(object):
+    """
+    The unchanging part of a beat solve: the positions of the coverage nodes (the line's top level note structures
+    holding on beat notes), and the time signatures, tempos and harmonic contexts, all at their original positions.
+
+    A solve state is a list of cover deltas, held in a PersistentSumTree indexed by cover, in coverage order.
+    Moving a cover by its delta moves everything at or after the cover's start.  So the position of anything is its
+    original position plus a prefix sum of deltas, and the time signature grid is shifted lazily, on lookup:
+      - a time signature or tempo event at t moves by the deltas of covers at or before t.
+      - a harmonic context takes the deltas of the covers starting in it into its duration.
+
+    This matches PositionDeltaInfo's former eager updates, for covers altered in coverage order, as the solver does.
+    """
+
+    def __init__(self, coverage_node_list, tempo_seq, ts_seq, hct, line):
+        """
+        Constructor
+        :param coverage_node_list: List of note structures that are affected by on beat constraints, in order.
+        :param tempo_seq: TempoEventSequence
+        :param ts_seq: EventSequence of TimeSignatures
+        :param hct: HarmonicContextTrack
+        :param line: Line
+        """
+        self.__coverage_node_list = coverage_node_list
+        self.__line = line
+        self.__cover_index = {cover: i for i, cover in enumerate(coverage_node_list)}
+        self.__cover_positions = [cover.get_absolute_position().position for cover in coverage_node_list]
+        self.__line_duration = line.duration.duration
+
+        # (original time, TimeSignature or Tempo, number of covers at or before time)
+        self.__ts_events = [(e.time.position, e.object, bisect_right(self.__cover_positions, e.time.position))
+                            for e in ts_seq.sequence_list]
+        self.__tempo_events = [(e.time.position, e.object, bisect_right(self.__cover_positions, e.time.position))
+                               for e in tempo_seq.sequence_list]
+        if len(self.__ts_events) == 0:
+            raise Exception('Time signature sequence must be non-empty for beat solving.')
+
+        # (harmonic context, first cover index, end cover index) for the covers starting in each harmonic context.
+        # As with HarmonicContextTrack lookup, covers past the end of the track fall into the last context.
+        hc_list = hct.hc_list()
+        self.__hcs = list()
+        for i, hc in enumerate(hc_list):
+            first = 0 if i == 0 else bisect_left(self.__cover_positions, hc.position.position)
+            end = len(self.__cover_positions) if i == len(hc_list) - 1 else \
+                bisect_left(self.__cover_positions, hc_list[i + 1].position.position)
+            self.__hcs.append((hc, first, end))
+
+        # note --> original absolute position, as a Fraction.
+        self.__note_positions = dict()
+
+    @property
+    def coverage_node_list(self):
+        return self.__coverage_node_list
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def line_duration(self):
+        return self.__line_duration
+
+    def cover_index(self, cover):
+        return self.__cover_index[cover]
+
+    def note_position(self, note):
+        """
+        The original absolute position of a note, as a Fraction.  The line does not change during a solve, so
+        these are cached.
+        """
+        position = self.__note_positions.get(note)
+        if position is None:
+            position = note.get_absolute_position().position
+            self.__note_positions[note] = position
+        return position
+
+    def shift(self, deltas, position):
+        """
+        The total move of a position.  As PositionDeltaInfo has always done, covers are taken in order while they
+        start at or before the position moved so far.
+        :param deltas: PersistentSumTree of cover deltas.
+        :param position: Fraction, original position.
+        :return: Fraction
+        """
+        positions = self.__cover_positions
+        k = bisect_right(positions, position)
+        total = deltas.prefix_sum(k)
+        while k < len(positions) and positions[k] <= position + total:
+            total += deltas[k]
+            k += 1
+        return total
+
+    def beat_at(self, deltas, position):
+        """
+        Find the beat at a corrected position.
+        :param deltas: PersistentSumTree of cover deltas.
+        :param position: Fraction, corrected position.
+        :return: (TimeSignature, beat number), the beat number being a Fraction, origin 0 within the measure,
+                 with a fractional part for positions off the beat.
+        """
+        # Find the last time signature event at or before position; moved event times are in order.
+        events = self.__ts_events
+        lo = 1
+        hi = len(events)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            time, _, count = events[mid]
+            if time + deltas.prefix_sum(count) <= position:
+                lo = mid + 1
+            else:
+                hi = mid
+        time, ts, count = events[lo - 1]
+        num_beats = (position - time - deltas.prefix_sum(count)) / ts.beat_duration.duration
+        return ts, num_beats - int(num_beats / ts.beats_per_measure) * ts.beats_per_measure
+
+    def ts_event_sequence(self, deltas):
+        """
+        Build the time signature sequence, moved by deltas.
+        :param deltas: PersistentSumTree of cover deltas.
+        :return: EventSequence of new TimeSignatureEvent's.
+        """
+        return EventSequence([TimeSignatureEvent(TimeSignature(ts.beats_per_measure, ts.beat_duration,
+                                                               ts.beat_pattern),
+                                                 Position(time + deltas.prefix_sum(count)))
+                              for time, ts, count in self.__ts_events])
+
+    def tempo_event_sequence(self, deltas):
+        """
+        Build the tempo sequence, moved by deltas.
+        :param deltas: PersistentSumTree of cover deltas.
+        :return: TempoEventSequence of new TempoEvent's.
+        """
+        return TempoEventSequence([TempoEvent(Tempo(tempo.tempo, tempo.beat_duration),
+                                              Position(time + deltas.prefix_sum(count)))
+                                   for time, tempo, count in self.__tempo_events])
+
+    def hct(self, deltas):
+        """
+        Build the harmonic context track, with harmonic contexts lengthened by deltas.
+        :param deltas: PersistentSumTree of cover deltas.
+        :return: HarmonicContextTrack of new HarmonicContext's.
+        """
+        hct = HarmonicContextTrack()
+        hct.extend([HarmonicContext(hc.tonality, hc.chord,
+                                    Duration(hc.duration.duration + deltas.prefix_sum(end) - deltas.prefix_sum(first)))
+                    for hc, first, end in self.__hcs])
+        return hct
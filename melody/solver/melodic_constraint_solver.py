@@ -10,14 +10,18 @@ from melody.constraints.contextual_note import ContextualNote
 from melody.constraints.on_beat_constraint import OnBeatConstraint
 from melody.constraints.policy_context import PolicyContext
 from melody.solver.beat_constraint_solver import BeatConstraintSolver
+from melody.solver.melodic_solve_session import MelodicSolveSession
 from melody.solver.msc_results import MCSResults
 from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.solver.solve_statistics import SolveStatistics
 
+import time
 from collections import OrderedDict
 from misc.ordered_set import OrderedSet
 
 from structure.note import Note
 from tonalmodel.diatonic_pitch import DiatonicPitch
+from misc.tracing import traced
 
 
 class MelodicConstraintSolver(object):
@@ -84,22 +88,53 @@ class MelodicConstraintSolver(object):
     def pitch_range(self):
         return self.__pitch_range
 
-    def solve(self, partial_pitch_results=None, num_solutions=-1):
+    @traced()
+    def solve(self, partial_pitch_results=None, num_solutions=-1, parallel=1, budget=None, statistics=None):
+        """
+        Solve the beat constraints, then the pitch constraints.
+        :param partial_pitch_results: dict of Note (constraint actor) to DiatonicPitch, pre-assigned pitches.
+        :param num_solutions: Maximum number of pitch solutions, -1 == unbounded.
+        :param parallel: Number of worker processes for the pitch solver, see PitchConstraintSolver.solve().
+        :param budget: SolveBudget or None, limiting the pitch search.  If it runs out, the results found so far are
+                       returned, marked truncated.
+        :param statistics: SolveStatistics to record the beat and pitch searches in, or None.  Without one, the
+                           results carry only the totals of the pitch search.
+        :return: MCSResults
+        """
+        start = time.perf_counter()
         if partial_pitch_results is not None:
             if not isinstance(partial_pitch_results, dict):
                 raise Exception('partial_pitch_results argument must be a dict.')
 
-        beat_solver = BeatConstraintSolver(self.line, self.tempo_event_sequence,
-                                           self.ts_event_sequence, self.hct, self.on_beat_constraints)
-        beat_results = beat_solver.solve()   # list of PositionDeltaInfo's
+        results_statistics = statistics if statistics is not None else SolveStatistics()
+        # The beat and pitch solvers add their own times; seconds is set to the time of the whole solve instead.
+        prior_seconds = results_statistics.seconds
+
+        with results_statistics.phase('beat'):
+            beat_solver = BeatConstraintSolver(self.line, self.tempo_event_sequence,
+                                               self.ts_event_sequence, self.hct, self.on_beat_constraints)
+            beat_results = beat_solver.solve(statistics)   # list of PositionDeltaInfo's
+
+        with results_statistics.phase('pitch'):
+            pitch_solver = PitchConstraintSolver(self.pitch_constraints)
+            p_map_dict = self._build_p_map_dict(partial_pitch_results)
+            full_results, pitch_results = pitch_solver.solve(p_map_dict, num_solutions, parallel=parallel,
+                                                             budget=budget, statistics=statistics)
 
-        pitch_solver = PitchConstraintSolver(self.pitch_constraints)
-        p_map_dict = self._build_p_map_dict(partial_pitch_results)
-        full_results, pitch_results = pitch_solver.solve(p_map_dict, num_solutions)
+        if statistics is None:
+            results_statistics.add_search(pitch_solver)
+        results_statistics.seconds = prior_seconds + time.perf_counter() - start
 
         return MCSResults(self.line, self.tempo_event_sequence, self.ts_event_sequence, self.hct,
                           beat_results,
-                          full_results)
+                          full_results, results_statistics)
+
+    def create_session(self):
+        """
+        Create a session for incremental solving of this problem under edits, see MelodicSolveSession.
+        :return: MelodicSolveSession
+        """
+        return MelodicSolveSession(self)
 
     def _build_p_map_dict(self, partial_pitch_results=None):
         actors = OrderedSet()
@@ -0,0 +1,254 @@
+"""
+
+File: melodic_solve_session.py
+
+Purpose: Incremental solving of a MelodicConstraintSolver problem under small edits, re-solving only the
+         parts of the pitch constraint graph affected by each edit.
+
+"""
+from collections import OrderedDict
+
+from melody.constraints.contextual_note import ContextualNote
+from melody.constraints.on_beat_constraint import OnBeatConstraint
+from melody.constraints.policy_context import PolicyContext
+from melody.solver.beat_constraint_solver import BeatConstraintSolver
+from melody.solver.msc_results import MCSResults
+from melody.solver.p_map import PMap
+from melody.solver.p_map_solutions import PMapProduct
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from misc.ordered_set import OrderedSet
+from structure.note import Note
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from misc.tracing import traced
+
+
+class MelodicSolveSession(object):
+    """
+    A solve session over the problem of a MelodicConstraintSolver, that accepts edits (add/remove constraint,
+    fix/unfix a note's pitch, harmonic context changes) and re-solves after each.
+
+    Pitch constraints are partitioned into connected components, two constraints being connected if they
+    share an actor.  Components do not interact, so the session keeps the pitch solutions of each component,
+    and on solve() only re-solves components touched by an edit since the last solve.  The full pitch results
+    are the Cartesian product of the component solutions.  Beat results are kept until an on-beat
+    constraint or the harmonic context track changes.
+
+    Note: With num_solutions unbounded, full results are the same as those of MelodicConstraintSolver.solve() over
+    the session's constraints, but may be ordered differently.  Component solutions are found as in
+    PitchConstraintSolver.solve(), visiting nodes in p_map order on ties.
+    """
+
+    def __init__(self, melodic_constraint_solver):
+        """
+        Constructor.
+        :param melodic_constraint_solver: MelodicConstraintSolver, giving the problem to start with.
+        """
+        solver = melodic_constraint_solver
+        self.__line = solver.line
+        self.__tempo_event_sequence = solver.tempo_event_sequence
+        self.__ts_event_sequence = solver.ts_event_sequence
+        self.__hct = solver.hct
+        self.__pitch_range = solver.pitch_range
+
+        self.__on_beat_constraints = list(solver.on_beat_constraints)
+        self.__pitch_constraints = list(solver.pitch_constraints)
+        self.__fixed_pitches = OrderedDict()
+
+        # actor --> HarmonicContext, as last looked up in the hct.
+        self.__harmonic_contexts = dict()
+        # frozenset of constraints --> (solution limit, list of solution keys over the component's actors)
+        self.__component_solutions = dict()
+        # Actors touched by edits since the last solve.
+        self.__dirty_actors = set()
+
+        self.__beat_results = None
+        self.__last_results = None
+
+    @property
+    def line(self):
+        return self.__line
+
+    @property
+    def hct(self):
+        return self.__hct
+
+    @property
+    def pitch_range(self):
+        return self.__pitch_range
+
+    @property
+    def constraints(self):
+        return self.__on_beat_constraints + self.__pitch_constraints
+
+    @property
+    def on_beat_constraints(self):
+        return list(self.__on_beat_constraints)
+
+    @property
+    def pitch_constraints(self):
+        return list(self.__pitch_constraints)
+
+    @property
+    def fixed_pitches(self):
+        return OrderedDict(self.__fixed_pitches)
+
+    @property
+    def last_results(self):
+        return self.__last_results
+
+    def add_constraint(self, constraint):
+        """
+        Add a constraint to the problem.
+        :param constraint: AbstractConstraint
+        :return:
+        """
+        if isinstance(constraint, OnBeatConstraint):
+            self.__on_beat_constraints.append(constraint)
+            self.__beat_results = None
+        else:
+            self.__pitch_constraints.append(constraint)
+            self.__dirty_actors.update(constraint.actors)
+
+    def remove_constraint(self, constraint):
+        """
+        Remove a constraint from the problem.
+        :param constraint: AbstractConstraint
+        :return:
+        """
+        if isinstance(constraint, OnBeatConstraint):
+            constraints = self.__on_beat_constraints
+        else:
+            constraints = self.__pitch_constraints
+        for i in range(0, len(constraints)):
+            if constraints[i] is constraint:
+                break
+        else:
+            raise Exception('Constraint \'{0}\' is not in the session.'.format(constraint))
+        del constraints[i]
+        if isinstance(constraint, OnBeatConstraint):
+            self.__beat_results = None
+        else:
+            self.__dirty_actors.update(constraint.actors)
+
+    def fix_note(self, note, pitch):
+        """
+        Pre-assign the pitch of an actor, see partial_pitch_results in MelodicConstraintSolver.solve().
+        :param note: Note, a constraint actor.
+        :param pitch: DiatonicPitch
+        :return:
+        """
+        if not isinstance(note, Note):
+            raise Exception('fixed note must be a Note.')
+        if not isinstance(pitch, DiatonicPitch):
+            raise Exception('fixed pitch must be a DiatonicPitch.')
+        self.__fixed_pitches[note] = pitch
+        self.__dirty_actors.add(note)
+
+    def unfix_note(self, note):
+        """
+        Remove a pre-assigned pitch, see fix_note().
+        :param note: Note
+        :return:
+        """
+        if note not in self.__fixed_pitches:
+            raise Exception('Note \'{0}\' is not fixed.'.format(note))
+        del self.__fixed_pitches[note]
+        self.__dirty_actors.add(note)
+
+    def update_hct(self, hct=None):
+        """
+        Take up harmonic context changes, either a new harmonic context track, or edits made in place to the
+        current one.  Actors whose harmonic context changed are re-solved.
+        :param hct: HarmonicContextTrack, None meaning the current hct was edited in place.
+        :return:
+        """
+        if hct is not None:
+            self.__hct = hct
+        for actor, hc in self.__harmonic_contexts.items():
+            if self._lookup_hc(actor) is not hc:
+                self.__dirty_actors.add(actor)
+        self.__harmonic_contexts = dict()
+        self.__beat_results = None
+
+    @traced()
+    def solve(self, num_solutions=-1, parallel=1):
+        """
+        Solve the beat and pitch constraints, reusing prior results for parts of the problem that are
+        unchanged since the last solve.
+        :param num_solutions: Maximum number of pitch solutions, -1 == unbounded.
+        :param parallel: Number of worker processes for the pitch solver, see PitchConstraintSolver.solve().
+        :return: MCSResults
+        """
+        if self.__beat_results is None:
+            beat_solver = BeatConstraintSolver(self.line, self.__tempo_event_sequence, self.__ts_event_sequence,
+                                               self.hct, self.__on_beat_constraints)
+            self.__beat_results = beat_solver.solve()
+
+        p_map = self._build_p_map()
+
+        component_solutions = dict()
+        component_keys = list()
+        for actors, constraints in MelodicSolveSession.components(self.__pitch_constraints):
+            key = frozenset(constraints)
+            cached = self.__component_solutions.get(key)
+            if cached is None or any(actor in self.__dirty_actors for actor in actors) or \
+                    not MelodicSolveSession._covers(cached, num_solutions):
+                cached = (num_solutions, self._solve_component(p_map, actors, constraints, num_solutions, parallel))
+            component_solutions[key] = cached
+            component_keys.append((actors, cached[1]))
+        self.__component_solutions = component_solutions
+        self.__dirty_actors = set()
+
+        full_results = PMapProduct(p_map, component_keys, num_solutions)
+
+        self.__last_results = MCSResults(self.line, self.__tempo_event_sequence, self.__ts_event_sequence, self.hct,
+                                         self.__beat_results, full_results)
+        return self.__last_results
+
+    @staticmethod
+    def components(constraints):
+        """
+        Partition constraints into connected components, see PitchConstraintSolver.components().
+        :param constraints: list of AbstractConstraint
+        :return: list of tuples (list of actors, list of constraints), in order of first appearance.
+        """
+        return PitchConstraintSolver.components(constraints)
+
+    @staticmethod
+    def _covers(cached, num_solutions):
+        limit, keys = cached
+        if limit == -1 or len(keys) < limit:
+            return True   # All solutions are held.
+        return num_solutions != -1 and num_solutions <= limit
+
+    def _solve_component(self, p_map, actors, constraints, num_solutions, parallel):
+        """
+        Solve the pitch constraints of one component.
+        :return: list of solution keys, over the component's actors.
+        """
+        return PitchConstraintSolver.solve_component(p_map, actors, constraints, num_solutions, parallel)
+
+    def _build_p_map(self):
+        actors = OrderedSet()
+        for p in self.__pitch_constraints:
+            actors = actors.union(p.actors)
+
+        d = OrderedDict()
+        for note in actors:
+            hc = self.__harmonic_contexts.get(note)
+            if hc is None:
+                hc = self._lookup_hc(note)
+                if hc is None:
+                    raise Exception('Cannot locate harmonic context for note \'{0}\''.format(note))
+                self.__harmonic_contexts[note] = hc
+            d[note] = ContextualNote(PolicyContext(hc, self.pitch_range))
+
+        for k, v in self.__fixed_pitches.items():
+            if k not in d:
+                raise Exception('Note \'{0}\' of fixed pitches is not a constraint actor.'.format(k))
+            d[k].note = Note(v, k.base_duration, k.num_dots)
+
+        return PMap(d)
+
+    def _lookup_hc(self, note):
+        return self.hct[note.get_absolute_position().position]
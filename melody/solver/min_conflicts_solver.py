@@ -0,0 +1,327 @@
+"""
+
+File: min_conflicts_solver.py
+
+Purpose: Stochastic local search (min-conflicts with a tabu list) for pitch constraints, for problems too large
+         for the exhaustive search of PitchConstraintSolver.
+
+"""
+import random
+from collections import OrderedDict
+
+from melody.solver.p_map_solutions import PMapSolutions
+from melody.constraints.pitch_domain import PitchDomain
+from structure.note import Note
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from misc.ordered_set import OrderedSet
+from misc.tracing import annotate, traced
+
+
+class MinConflictsSolver(object):
+    """
+    Local search over complete pitch assignments.  Each unassigned actor starts at a greedily chosen pitch from its
+    domain, the pitches its policies allow with only the pre-assigned actors known.  Each step then takes a random
+    violated policy, one of its unassigned actors, and moves that actor to the pitch violating the fewest of its
+    policies, ties broken at random.  Recently left pitches are tabu for a few steps, unless moving back would give
+    fewer violations than the best assignment so far; with a small probability a random pitch is taken instead, to
+    walk off plateaus.  A run that stalls is restarted from a new greedy assignment.
+
+    Policies are used only through verify() and value_domain(), as in PitchConstraintSolver, so any policy set that
+    solver takes works here.  The search is incomplete: it finds solutions quickly on satisfiable problems, but
+    cannot prove there are none.  When none is found, best holds the assignment with the fewest violated policies.
+
+    Given a seed, the search is deterministic.
+    """
+
+    # Default maximum number of steps of a solve.
+    MAX_STEPS = 20000
+    # Number of steps without improving on a run's best before restarting.
+    RESTART_STEPS = 2000
+    # Number of steps a pitch left by an actor stays tabu for it.
+    TABU_TENURE = 8
+    # Probability of a random walk step.
+    NOISE = 0.05
+    # Policies over more actors than this are checked only on candidate solutions, see _search().
+    DEFER_ARITY = 8
+
+    def __init__(self, policies, seed=None):
+        """
+        Constructor.
+        :param policies: non-null set of policies
+        :param seed: seed for the random choices of each solve, for reproducible results; None for system entropy.
+        """
+        if policies is None or (not isinstance(policies, set) and not isinstance(policies, list) and
+                                not isinstance(policies, OrderedSet)):
+            raise Exception('Policies must be non-null and a Set')
+
+        self._policies = OrderedSet(policies)
+        self.v_policy_map = dict()
+        for p in self._policies:
+            for v_note in p.actors:
+                self.v_policy_map.setdefault(v_note, []).append(p)
+
+        self.__seed = seed
+        self.__random = None
+
+        self.__full_results = list()
+        self.__best_key = None
+        self.__best_violations = None
+        self.__template = None
+        self.__num_steps = 0
+        self.__num_restarts = 0
+        self.__truncated = False
+
+    @property
+    def policies(self):
+        return [p for p in self._policies]
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    @property
+    def full_results(self):
+        return self.__full_results
+
+    @property
+    def num_steps(self):
+        """
+        The number of local search steps, moves and (re)starts, made by the last solve().
+        """
+        return self.__num_steps
+
+    @property
+    def num_restarts(self):
+        return self.__num_restarts
+
+    @property
+    def truncated(self):
+        """
+        True if the last solve() ran out of its SolveBudget before finding the solutions asked for.
+        """
+        return self.__truncated
+
+    @property
+    def num_violations(self):
+        """
+        The number of policies violated by best, 0 if a solution was found; None if the last solve() found a policy
+        that cannot be met.
+        """
+        return self.__best_violations
+
+    @property
+    def best(self):
+        """
+        The assignment with the fewest violated policies found by the last solve(), as a PMap; None if none.
+        """
+        if self.__best_key is None:
+            return None
+        return self.__template.from_solution_key(self.__best_key)
+
+    def violated_policies(self, p_map):
+        """
+        The policies not satisfied by p_map.
+        :param p_map: PMap
+        :return: list of policies
+        """
+        return [p for p in self._policies if not p.verify(p_map)]
+
+    @traced()
+    def solve(self, p_map_param, instance_limit=1, max_steps=None, budget=None):
+        """
+        Search for solutions.
+        :param p_map_param: PMap, or a dict from actor to ContextualNote.  Actors with notes are held fixed.
+        :param instance_limit: Number of distinct solutions to search for; -1 to search until max_steps.
+        :param max_steps: Maximum number of steps, None for MAX_STEPS.
+        :param budget: SolveBudget, or None; each step is charged as a search node.
+        :return: PMapSolutions of the solutions found.
+        """
+        from melody.solver.p_map import PMap
+        p_map = p_map_param if isinstance(p_map_param, PMap) else PMap(p_map_param)
+        for key in self.v_policy_map.keys():
+            if key not in p_map.keys():
+                raise Exception('PMap keys and policy actor keys do not match.')
+
+        max_steps = MinConflictsSolver.MAX_STEPS if max_steps is None else max_steps
+        self.__template = p_map
+        self.__full_results = PMapSolutions(p_map)
+        self.__best_key = None
+        self.__best_violations = None
+        self.__num_steps = 0
+        self.__num_restarts = 0
+        self.__truncated = False
+        # Reseeded per solve, so that solves with a seed repeat.
+        self.__random = random.Random(self.__seed)
+        if budget is not None:
+            budget.start()
+            instance_limit = budget.solution_limit(instance_limit)
+
+        free = [actor for actor in p_map.keys() if actor in self.v_policy_map and p_map[actor].note is None]
+        original = [(actor, p_map[actor].note) for actor in free]
+        try:
+            self._search(p_map, free, instance_limit, max_steps, budget)
+        finally:
+            for actor, note in original:
+                p_map[actor].note = note
+        if self.__best_key is not None and self.__best_violations != 0:
+            # The search counts only the policies it tracks.
+            self.__best_violations = len(self.violated_policies(self.best))
+        if budget is not None:
+            budget.add_solutions(len(self.__full_results))
+        annotate(actors=len(free), steps=self.__num_steps, violations=self.__best_violations,
+                 solutions=len(self.__full_results))
+        return self.__full_results
+
+    def _search(self, p_map, free, instance_limit, max_steps, budget):
+        free_set = set(free)
+        fixed_policies = {id(p) for p in self._policies if not any(actor in free_set for actor in p.actors)}
+        if any(not p.verify(p_map) for p in self._policies if id(p) in fixed_policies):
+            return
+
+        # Domains are computed with only the fixed actors assigned.
+        domains = OrderedDict()
+        for actor in free:
+            domain = self._policy_values(p_map, actor)
+            if len(domain) == 0:
+                return
+            domains[actor] = domain.pitch_keys()
+        if len(free) == 0:
+            self.__best_violations = 0
+            self.__best_key = p_map.solution_key()
+            self.__full_results.add_key(self.__best_key)
+            return
+
+        rand = self.__random
+        notes = dict()
+        values = dict()
+
+        def assign(a, pitch_key):
+            note = notes.get((a, pitch_key))
+            if note is None:
+                note = Note(DiatonicPitch.from_pitch_key(pitch_key), a.base_duration, a.num_dots)
+                notes[(a, pitch_key)] = note
+            p_map[a].note = note
+            values[a] = pitch_key
+
+        # Policies over many actors are costly to verify on every candidate pitch, and are often met by any pitches
+        # from the domains (e.g. PitchRangeConstraint).  They are deferred: checked only when all other policies are
+        # met, and from then on tracked like the rest if found violated.
+        deferred = OrderedDict((id(p), p) for p in self._policies
+                               if id(p) not in fixed_policies and len(p.actors) > MinConflictsSolver.DEFER_ARITY)
+        active = {actor: [p for p in self.v_policy_map[actor] if id(p) not in deferred] for actor in free}
+
+        def conflicts(a):
+            return sum(1 for p in active[a] if not p.verify(p_map))
+
+        while True:
+            if instance_limit != -1 and len(self.__full_results) >= instance_limit:
+                return
+            if self.__num_steps >= max_steps:
+                return
+            if budget is not None and not budget.add_node():
+                self.__truncated = True
+                return
+            self.__num_steps += 1
+            if self.__best_key is not None:
+                self.__num_restarts += 1
+
+            # Greedy start: each actor in turn takes a pitch violating the fewest policies over assigned actors.
+            for actor in free:
+                p_map[actor].note = None
+            for actor in free:
+                best_count, best_keys = None, None
+                policies = [p for p in active[actor]
+                            if all(other is actor or p_map[other].note is not None for other in p.actors)]
+                for pitch_key in domains[actor]:
+                    assign(actor, pitch_key)
+                    count = sum(1 for p in policies if not p.verify(p_map))
+                    if best_count is None or count < best_count:
+                        best_count, best_keys = count, [pitch_key]
+                    elif count == best_count:
+                        best_keys.append(pitch_key)
+                assign(actor, rand.choice(best_keys))
+
+            # id(policy) --> violated policy, in policy order.  (Policies hash by their number of actors.)
+            violated = OrderedDict((id(p), p) for p in self._policies
+                                   if id(p) not in fixed_policies and id(p) not in deferred and not p.verify(p_map))
+            tabu = dict()
+            run_best = None
+            run_best_step = self.__num_steps
+
+            while True:
+                if len(violated) == 0:
+                    for p in [p for p in deferred.values() if not p.verify(p_map)]:
+                        del deferred[id(p)]
+                        for a in p.actors:
+                            if a in free_set:
+                                active[a].append(p)
+                        violated[id(p)] = p
+                self._record(p_map, len(violated))
+                if len(violated) == 0:
+                    self.__full_results.add_key(p_map.solution_key())
+                    break
+                if run_best is None or len(violated) < run_best:
+                    run_best, run_best_step = len(violated), self.__num_steps
+                elif self.__num_steps - run_best_step >= MinConflictsSolver.RESTART_STEPS:
+                    break
+
+                if self.__num_steps >= max_steps:
+                    return
+                if budget is not None and not budget.add_node():
+                    self.__truncated = True
+                    return
+                self.__num_steps += 1
+
+                policy = rand.choice(list(violated.values()))
+                actor = rand.choice([a for a in policy.actors if a in free_set])
+                old_key = values[actor]
+                domain = domains[actor]
+                if rand.random() < MinConflictsSolver.NOISE:
+                    new_key = rand.choice(domain)
+                else:
+                    # Only actor's policies change with its pitch.
+                    current = conflicts(actor)
+                    best_count, best_keys = None, list()
+                    for pitch_key in domain:
+                        if pitch_key == old_key:
+                            continue
+                        assign(actor, pitch_key)
+                        count = conflicts(actor)
+                        if tabu.get((actor, pitch_key), 0) > self.__num_steps and \
+                                len(violated) - current + count >= self.__best_violations:
+                            continue
+                        if best_count is None or count < best_count:
+                            best_count, best_keys = count, [pitch_key]
+                        elif count == best_count:
+                            best_keys.append(pitch_key)
+                    new_key = rand.choice(best_keys) if len(best_keys) != 0 else old_key
+
+                assign(actor, new_key)
+                if new_key != old_key:
+                    tabu[(actor, old_key)] = self.__num_steps + MinConflictsSolver.TABU_TENURE
+                    for p in active[actor]:
+                        if p.verify(p_map):
+                            violated.pop(id(p), None)
+                        else:
+                            violated[id(p)] = p
+
+    def _record(self, p_map, num_violations):
+        if self.__best_violations is None or num_violations < self.__best_violations:
+            self.__best_violations = num_violations
+            self.__best_key = p_map.solution_key()
+
+    def _policy_values(self, p_map, v_note):
+        """
+        For v_note, find all pitch values for its target that satisfy all policies in which v_note is involved,
+        given the actors assigned in p_map.
+        :param p_map: PMap
+        :param v_note: ContextualNote
+        :return: PitchDomain
+        """
+        domain = None
+        for p in self.v_policy_map[v_note]:
+            p_domain = p.value_domain(p_map, v_note)
+            domain = p_domain if domain is None else domain & p_domain
+            if not domain:
+                break
+        return domain if domain is not None else PitchDomain()
@@ -5,11 +5,13 @@ File: msc_results.py
 Purpose: Maintains results from MelodicConstraintSolver.solve().
 
 """
+from misc.tracing import traced
 
 
 class MCSResults(object):
 
-    def __init__(self, line, tempo_event_sequence, ts_event_sequence, hct, beat_results, pitch_results):
+    def __init__(self, line, tempo_event_sequence, ts_event_sequence, hct, beat_results, pitch_results,
+                 statistics=None):
         """
         Constructor.
         :param line: Line
@@ -17,7 +19,8 @@ class MCSResults(object):
         :param ts_event_sequence: EventSequence fo TimeSignatureEvents
         :param hct: HarmonicContextTrack
         :param beat_results: List of PositionDeltaInfo's
-        :param pitch_results: List of PMap's
+        :param pitch_results: Sequence of PMap's, e.g. PMapSolutions
+        :param statistics: SolveStatistics of the solve, or None
         """
         self.__line = line
         self.__tempo_event_sequence = tempo_event_sequence
@@ -26,6 +29,7 @@ class MCSResults(object):
 
         self.__beat_results = beat_results
         self.__pitch_results = pitch_results
+        self.__statistics = statistics
 
     @property
     def line(self):
@@ -47,6 +51,18 @@ class MCSResults(object):
     def pitch_results(self):
         return self.__pitch_results
 
+    @property
+    def statistics(self):
+        return self.__statistics
+
+    @property
+    def truncated(self):
+        """
+        True if the solve ran out of its SolveBudget, so that pitch_results may be incomplete.
+        """
+        return self.__statistics is not None and self.__statistics.truncated
+
+    @traced()
     def apply(self, beat_result=None, pitch_result=None, line_copy=True):
         """
         Produce a line based on a PositionDeltaInfo and a PMap, and specify if applied to original line or copy.
@@ -0,0 +1,86 @@
+"""
+
+File: nogood_store.py
+
+Purpose: Bounded store of nogoods, partial assignments known to have no solution, for pruning repeated
+         failures in the pitch constraint solver search.
+
+"""
+from collections import OrderedDict
+
+
+class NogoodStore(object):
+    """
+    LRU store of nogoods.  A nogood is a frozenset of (actor, pitch key) pairs, no assignment including all of which
+    extends to a solution.  Nogoods are indexed by each of their pairs, so that the search can check, as it is about
+    to assign a pitch to an actor, whether the assignment would complete a nogood.  The least recently added or
+    matched nogoods are dropped once there are more than limit.
+    """
+
+    def __init__(self, limit=1024):
+        """
+        Constructor.
+        :param limit: maximum number of nogoods held.
+        """
+        self.__limit = limit
+        # nogood --> None, in order of least to most recent use.
+        self.__nogoods = OrderedDict()
+        # (actor, pitch key) --> set of nogoods including it.
+        self.__index = dict()
+
+    @property
+    def limit(self):
+        return self.__limit
+
+    def __len__(self):
+        return len(self.__nogoods)
+
+    def __contains__(self, nogood):
+        return nogood in self.__nogoods
+
+    def add(self, nogood):
+        """
+        Add a nogood, dropping the least recently used if over the limit.
+        :param nogood: frozenset of (actor, pitch key)
+        :return:
+        """
+        if nogood in self.__nogoods:
+            self.__nogoods.move_to_end(nogood)
+            return
+        self.__nogoods[nogood] = None
+        for pair in nogood:
+            self.__index.setdefault(pair, set()).add(nogood)
+        if len(self.__nogoods) > self.__limit:
+            dropped, _ = self.__nogoods.popitem(last=False)
+            for pair in dropped:
+                nogoods = self.__index[pair]
+                nogoods.discard(dropped)
+                if len(nogoods) == 0:
+                    del self.__index[pair]
+
+    def find(self, p_map, actor, pitch_key):
+        """
+        Find a nogood that assigning pitch_key to actor would complete, given the other assignments in p_map.
+        :param p_map: PMap
+        :param actor: actor about to be assigned.
+        :param pitch_key: pitch key about to be assigned.
+        :return: nogood, or None
+        """
+        nogoods = self.__index.get((actor, pitch_key))
+        if nogoods is None:
+            return None
+        for nogood in nogoods:
+            for other, other_key in nogood:
+                if other is actor:
+                    continue
+                note = p_map[other].note
+                if note is None or note.diatonic_pitch is None or note.diatonic_pitch.pitch_key != other_key:
+                    break
+            else:
+                self.__nogoods.move_to_end(nogood)
+                return nogood
+        return None
+
+    def clear(self):
+        self.__nogoods = OrderedDict()
+        self.__index = dict()
@@ -3,17 +3,21 @@
 File: p_map.py
 
 Purpose: Wrapper for solver parameter map, that allow a form of replication not found in usual dict structures. 
+         Assignments made through assign() are recorded on a trail, so that a solver can backtrack in place
+         with undo() rather than replicating the map at each step.
 
 """
 from collections import OrderedDict
 
-from tonalmodel.pitch_scale import PitchScale
 from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
 from melody.constraints.policy_context import PolicyContext
 from melody.constraints.contextual_note import ContextualNote
+from melody.constraints.pitch_value_tables import PitchValueTables
 from harmoniccontext.harmonic_context import HarmonicContext
 from harmoniccontext.harmonic_context_track import HarmonicContextTrack
 from timemodel.duration import Duration
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from structure.note import Note
 
 
 class PMap(object):
@@ -30,6 +34,9 @@ class PMap(object):
         """
         self._p_map = OrderedDict() if p_map is None else p_map
 
+        # Undo stack of (actor, prior note) pairs, recorded by assign().
+        self._trail = list()
+
     @property
     def p_map(self):
         return self._p_map
@@ -74,6 +81,58 @@ class PMap(object):
             p_map[k] = None if k not in self.p_map else self.p_map[k].replicate()
         return PMap(p_map)
 
+    def assign(self, key, note):
+        """
+        Assign note as the target of actor key, recording the prior target on the trail.
+        :param key: actor
+        :param note: Note or None
+        :return:
+        """
+        contextual_note = self._p_map[key]
+        self._trail.append((contextual_note, contextual_note.note))
+        contextual_note.note = note
+
+    def mark(self):
+        """
+        Return a marker for the current trail position, for use with undo().
+        :return: int
+        """
+        return len(self._trail)
+
+    def undo(self, mark=0):
+        """
+        Roll back all assignments made after mark, in reverse order.
+        :param mark: a value returned by mark(); 0 rolls back all trailed assignments.
+        :return:
+        """
+        trail = self._trail
+        while len(trail) > mark:
+            contextual_note, note = trail.pop()
+            contextual_note.note = note
+
+    def solution_key(self):
+        """
+        Compact snapshot of the targets, as a tuple of pitch keys in actor order.  Unassigned targets
+        (or rests) are represented by None.
+        :return: tuple
+        """
+        return tuple(None if cn.note is None or cn.note.diatonic_pitch is None else cn.note.diatonic_pitch.pitch_key
+                     for cn in self._p_map.values())
+
+    def from_solution_key(self, solution_key):
+        """
+        Build a new PMap over the same actors and policy contexts as this one, with targets taken from
+        a solution key, see solution_key().
+        :param solution_key: tuple of pitch keys in actor order.
+        :return: PMap
+        """
+        p_map = OrderedDict()
+        for (actor, contextual_note), pitch_key in zip(self._p_map.items(), solution_key):
+            note = None if pitch_key is None else \
+                Note(DiatonicPitch.from_pitch_key(pitch_key), actor.base_duration, actor.num_dots)
+            p_map[actor] = ContextualNote(contextual_note.policy_context, note)
+        return PMap(p_map)
+
     def __getitem__(self, key):
         return self._p_map[key]
 
@@ -102,8 +161,8 @@ class PMap(object):
         if target is None:
             raise Exception('Internal construction error, v_note target is None.')
         policy_context = target.policy_context
-        return PitchScale.compute_tonal_pitches(policy_context.harmonic_context.tonality,
-                                                policy_context.pitch_range)
+        return PitchValueTables.pitches(PitchValueTables.tonal_pitch_keys(policy_context.harmonic_context.tonality,
+                                                                          policy_context.pitch_range))
 
     def apply(self, line, line_copy=True):
         """
@@ -181,9 +240,17 @@ class PMap(object):
         return PMap(d)
 
     def __hash__(self):
-        return hash(len(self.actors))
+        # Content based, so a PMap should not be assigned to while held in a set or as a dict key.
+        return hash(self.solution_key())
 
     def __eq__(self, other):
+        """
+        PMaps are equal when over the same actors, in the same order, with the same target pitches.
+        """
         if not isinstance(other, PMap):
             return NotImplemented
-        return self is other
+        if self is other:
+            return True
+        return len(self._p_map) == len(other.p_map) and \
+            all(a is b for a, b in zip(self._p_map.keys(), other.p_map.keys())) and \
+            self.solution_key() == other.solution_key()
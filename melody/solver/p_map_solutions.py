@@ -0,0 +1,236 @@
+"""
+
+File: p_map_solutions.py
+
+Purpose: Read-only sequences of PMap solutions held compactly as solution keys, with each PMap built only
+         when accessed: PMapSolutions for a list of solutions, and PMapProduct for the combinations of the
+         solutions of independent parts of a problem.
+
+"""
+import collections.abc
+from itertools import islice, product
+
+from melody.solver.p_map import PMap
+
+
+class PMapResults(collections.abc.Sequence):
+    """
+    Base for sequences of solutions over the actors of a template PMap.  A solution is identified by its solution
+    key (a tuple of pitch keys in actor order, see PMap.solution_key()).  Membership tests on PMaps are by content.
+    """
+
+    def __init__(self, template):
+        """
+        Constructor.
+        :param template: PMap giving the actors and policy contexts of the solutions.
+        """
+        self._template = template
+        self._actors = template.actors
+
+    @property
+    def template(self):
+        return self._template
+
+    def key_index(self, solution_key):
+        """
+        Find the index of a solution key.
+        :param solution_key: tuple of pitch keys, in template actor order.
+        :return: index, or -1 if not held.
+        """
+        raise NotImplementedError('key_index must be implemented in subclass.')
+
+    def index_of(self, p_map):
+        """
+        Find the index of a PMap's solution.
+        :param p_map: PMap
+        :return: index, or -1 if p_map is not over the template actors or its solution is not held.
+        """
+        if not isinstance(p_map, PMap) or len(p_map.p_map) != len(self._actors) or \
+                any(a is not b for a, b in zip(p_map.keys(), self._actors)):
+            return -1
+        return self.key_index(p_map.solution_key())
+
+    def __contains__(self, p_map):
+        return self.index_of(p_map) != -1
+
+    def index(self, p_map, start=0, stop=None):
+        i = self.index_of(p_map)
+        if i == -1 or i < start or (stop is not None and i >= stop):
+            raise ValueError('PMap is not in solutions.')
+        return i
+
+    def count(self, p_map):
+        return 1 if p_map in self else 0
+
+
+class PMapSolutions(PMapResults):
+    """
+    Sequence of solutions, each held as a solution key.  Keys are deduplicated, keeping the first occurrence.
+    A PMap is built from its key on first access, and kept, so repeated access gives the same PMap.
+
+    Membership tests on PMaps take O(1) rather than a scan of the solutions.
+    """
+
+    def __init__(self, template, solution_keys=None):
+        """
+        Constructor.
+        :param template: PMap giving the actors and policy contexts of the solutions.
+        :param solution_keys: iterable of solution keys (tuples or lists of pitch keys in template actor order).
+        """
+        PMapResults.__init__(self, template)
+        # solution key --> index, in order of insertion.
+        self.__index = dict()
+        self.__keys = list()
+        self.__p_maps = list()
+        if solution_keys is not None:
+            for solution_key in solution_keys:
+                self.add_key(solution_key)
+
+    @property
+    def solution_keys(self):
+        return self.__keys
+
+    def add_key(self, solution_key):
+        """
+        Add a solution by key, unless already held.
+        :param solution_key: tuple or list of pitch keys, in template actor order.
+        :return: True if added, False if a duplicate.
+        """
+        solution_key = tuple(solution_key)
+        if solution_key in self.__index:
+            return False
+        self.__index[solution_key] = len(self.__keys)
+        self.__keys.append(solution_key)
+        self.__p_maps.append(None)
+        return True
+
+    def key_index(self, solution_key):
+        return self.__index.get(solution_key, -1)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        p_map = self.__p_maps[index]
+        if p_map is None:
+            p_map = self._template.from_solution_key(self.__keys[index])
+            self.__p_maps[index] = p_map
+        return p_map
+
+    def __str__(self):
+        return 'PMapSolutions({0} solutions over {1} actors)'.format(len(self), len(self._actors))
+
+
+class PMapProduct(PMapResults):
+    """
+    Sequence of the solutions of a problem made of independent components, each component being a set of actors
+    with its own solutions.  The full solutions are the Cartesian product of the component solutions, taken in the
+    order of itertools.product(), i.e. the last component varies fastest.  Nothing is enumerated up front: the
+    number of solutions is the product of the component counts, and the i-th solution is decoded from i, so taking
+    the first few of an astronomically large product stays cheap.
+
+    Actors of the template not in any component keep their template targets.
+    """
+
+    def __init__(self, template, component_solutions, limit=-1):
+        """
+        Constructor.
+        :param template: PMap giving the actors and policy contexts of the solutions.
+        :param component_solutions: list of (list of actors, list of solution keys over those actors, in that order).
+        :param limit: Maximum number of solutions, the first in product order; -1 no limit.
+        """
+        PMapResults.__init__(self, template)
+        actor_index = {actor: i for i, actor in enumerate(self._actors)}
+        # list of (template indices of the component's actors, component solution keys)
+        self.__components = [([actor_index[actor] for actor in actors], [tuple(key) for key in keys])
+                             for actors, keys in component_solutions]
+        self.__base_key = template.solution_key()
+
+        num_solutions = 1
+        for _, keys in self.__components:
+            num_solutions *= len(keys)
+        self.__num_solutions = num_solutions if limit == -1 else min(num_solutions, limit)
+
+        # index --> PMap, for those accessed.
+        self.__p_maps = dict()
+        # Per component, solution key --> index, built on the first membership test.
+        self.__key_indices = None
+
+    @property
+    def num_solutions(self):
+        """
+        The number of solutions, which unlike len() may exceed sys.maxsize.
+        """
+        return self.__num_solutions
+
+    @property
+    def solution_keys(self):
+        """
+        All solution keys, in order.  This enumerates the whole product.
+        """
+        return list(self.iter_solution_keys())
+
+    def iter_solution_keys(self):
+        """
+        Generate the solution keys, in order.
+        """
+        combinations = product(*[keys for _, keys in self.__components])
+        for combination in islice(combinations, self.__num_solutions):
+            yield self._combine(combination)
+
+    def solution_key_at(self, index):
+        """
+        Decode the solution key at an index.
+        :param index: origin 0 index, in [0, num_solutions).
+        :return: tuple of pitch keys, in template actor order.
+        """
+        combination = list()
+        for _, keys in reversed(self.__components):
+            index, i = divmod(index, len(keys))
+            combination.append(keys[i])
+        combination.reverse()
+        return self._combine(combination)
+
+    def _combine(self, combination):
+        solution_key = list(self.__base_key)
+        for (indices, _), component_key in zip(self.__components, combination):
+            for i, pitch_key in zip(indices, component_key):
+                solution_key[i] = pitch_key
+        return tuple(solution_key)
+
+    def key_index(self, solution_key):
+        if self.__key_indices is None:
+            self.__key_indices = [{key: i for i, key in enumerate(keys)} for _, keys in self.__components]
+
+        in_component = set()
+        index = 0
+        for (indices, keys), key_indices in zip(self.__components, self.__key_indices):
+            i = key_indices.get(tuple(solution_key[j] for j in indices))
+            if i is None:
+                return -1
+            index = index * len(keys) + i
+            in_component.update(indices)
+        if any(solution_key[j] != self.__base_key[j] for j in range(len(solution_key)) if j not in in_component):
+            return -1
+        return index if index < self.__num_solutions else -1
+
+    def __len__(self):
+        return self.__num_solutions
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__num_solutions))]
+        if index < 0:
+            index += self.__num_solutions
+        if index < 0 or index >= self.__num_solutions:
+            raise IndexError('Solution index out of range.')
+        p_map = self.__p_maps.get(index)
+        if p_map is None:
+            p_map = self._template.from_solution_key(self.solution_key_at(index))
+            self.__p_maps[index] = p_map
+        return p_map
+
+    def __str__(self):
+        return 'PMapProduct({0} solutions over {1} components)'.format(self.__num_solutions, len(self.__components))
@@ -6,9 +6,19 @@ Purpose: For a melody define as a p_map, and a set of policy constraints, solve
          satisfying constraints, as a set of p_map's.
 
 """
+import pickle
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
 from melody.solver.p_map import PMap
+from melody.solver.p_map_solutions import PMapResults, PMapSolutions, PMapProduct
+from melody.constraints.pitch_domain import PitchDomain
 from structure.note import Note
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from melody.solver.nogood_store import NogoodStore
 from misc.ordered_set import OrderedSet
+from misc.tracing import annotate, traced
 
 
 class PitchConstraintSolver(object):
@@ -16,11 +26,13 @@ class PitchConstraintSolver(object):
     Implementation class for a constraint solver that attempts to find pitch solutions to pitch constraints.
     """
 
-    def __init__(self, policies):
+    def __init__(self, policies, backjumping=None):
         """
         Constructor.
         
         :param policies: non-null set of policies
+        :param backjumping: Boolean, True for conflict directed backjumping and nogood learning in search, see
+                            _search(); None for the class default, BACKJUMPING.
         """
         if policies is None or (not isinstance(policies, set) and not isinstance(policies, list) and
                                 not isinstance(policies, OrderedSet)):
@@ -34,6 +46,18 @@ class PitchConstraintSolver(object):
         self.__instance_limit = 0
         self.__num_instances = 0
         self.__full_results = list()
+        self.__solutions = None
+        self.__partials = None
+
+        self.__backjumping = PitchConstraintSolver.BACKJUMPING if backjumping is None else backjumping
+        self.__num_nodes = 0
+        self.__num_pruned = 0
+        self.__nogoods = None
+        self.__fixed = set()
+        self.__budget = None
+        self.__budget_limited = False
+        self.__truncated = False
+        self.__statistics = None
 
     @property
     def policies(self):
@@ -51,46 +75,252 @@ class PitchConstraintSolver(object):
     def full_results(self):
         return self.__full_results
 
-    def solve(self, p_map_param, instance_limit=-1, accept_partials=False):
+    @property
+    def backjumping(self):
+        return self.__backjumping
+
+    @property
+    def num_nodes(self):
+        """
+        The number of search nodes, i.e. pitch assignments tried, in the last solve().
+        """
+        return self.__num_nodes
+
+    @property
+    def num_pruned(self):
+        """
+        The number of pitch assignments skipped in the last solve() for completing a learned nogood.
+        """
+        return self.__num_pruned
+
+    @property
+    def truncated(self):
+        """
+        True if the last solve() stopped with search remaining for running out of its SolveBudget.
+        """
+        return self.__truncated
+
+    @traced()
+    def solve(self, p_map_param, instance_limit=-1, accept_partials=False, parallel=1, budget=None,
+              statistics=None):
         """
         Solve the constraints constraint system using p_map_param as the start.
+
+        Policies are partitioned into connected components (see components()), which share no actors and so
+        do not interact.  When there are several, each is searched on its own, and the full results are the lazy
+        Cartesian product of the component results, rather than a search over the product.  Each component search
+        visits nodes in the order of a search over all components, so that the full results are the same, though
+        some policies' values depend on the order in which their actors are assigned.  With an instance_limit, the
+        results are the first of the product, and may differ from those of a search over all components.
+
         :param p_map_param:  Initial PMap to fill out.
         :param instance_limit: Number of full results to limit search; -1 no limit
-        :param accept_partials: Boolean, True means return some partial results
-        :return:
+        :param accept_partials: Boolean, True means return some partial results: the assignments reached at dead
+                                ends of the search, where a node has no values.  Partial results come of a search
+                                over all components together.
+        :param parallel: Number of worker processes.  Values > 1 search subtrees of the search in a process pool,
+                         which requires policies and p_map to be picklable.
+                         Searches accepting partials, or with a budget, are not run in parallel.
+        :param budget: SolveBudget, or None.  When the budget runs out the search stops, returning the results found
+                       so far, and truncated is set.
+        :param statistics: SolveStatistics to record the search in, or None.  The time of the solve is added to its
+                           seconds.  Parallel workers report only their node and prune counts.
+        :return: (full results, partial results), each a sequence of distinct PMaps built on access, the full
+                 results being a PMapProduct for more than one component, otherwise a PMapSolutions.
         """
+        start = time.perf_counter()
         p_map = p_map_param if isinstance(p_map_param, PMap) else PMap(p_map_param)
         self._check_p_map(p_map)
 
+        self._reset(p_map, instance_limit, budget, statistics)
+
+        with self._phase('pitch setup'):
+            # list of tuples (v_note, {solution to v_note's policies}) sorted by low number of solutions.
+            unsolved_nodes = [t[0] for t in self._build_potential_values(p_map, p_map.keys())]
+            if len(unsolved_nodes) == 0:
+                raise Exception('Policies insufficient for solution or parameter map is full.')
+
+            components = PitchConstraintSolver.components(self.policies) if not accept_partials else None
+
+        with self._phase('pitch search'):
+            if components is not None and len(components) > 1:
+                self._solve_components(p_map, components, parallel)
+            else:
+                self._solve_search(p_map, unsolved_nodes, accept_partials, parallel)
+
+        if budget is not None:
+            budget.add_solutions(self.__num_instances)
+        if statistics is not None:
+            statistics.seconds += time.perf_counter() - start
+            statistics.end_search(self.__num_instances, self.__truncated)
+        annotate(actors=len(p_map.actors), policies=len(self._policies), nodes=self.__num_nodes,
+                 solutions=self.__num_instances)
+
+        # Solutions are held as pitch key tuples, and only built out as PMaps on access.
+        return self.full_results, self.__partials if accept_partials else list()
+
+    def _phase(self, name):
+        return nullcontext() if self.__statistics is None else self.__statistics.phase(name)
+
+    def _reset(self, p_map, instance_limit, budget=None, statistics=None):
+        self.__budget = budget
+        self.__statistics = statistics
+        self.__truncated = False
+        self.__budget_limited = False
+        if budget is not None:
+            budget.start()
+            limit = budget.solution_limit(instance_limit)
+            self.__budget_limited = limit != instance_limit
+            instance_limit = limit
         self.__instance_limit = instance_limit
-        self.__num_instances = 0  # reset
-        self.__full_results = list()
+        self.__num_instances = 0
+        self.__solutions = PMapSolutions(p_map)
+        self.__partials = PMapSolutions(p_map)
+        self.__full_results = self.__solutions
+        self.__value_notes = dict()
+        self.__num_nodes = 0
+        self.__num_pruned = 0
+        self.__nogoods = NogoodStore(PitchConstraintSolver.NOGOOD_LIMIT) if self.backjumping else None
+        self.__fixed = {actor for actor in p_map.keys() if p_map[actor].note is not None}
+
+    def _solve_search(self, p_map, unsolved_nodes, accept_partials, parallel):
+        mark = p_map.mark()
+        try:
+            if parallel is not None and parallel > 1 and not accept_partials and self.__budget is None:
+                self._parallel_search(p_map, unsolved_nodes, parallel)
+            else:
+                self._search(p_map, unsolved_nodes, accept_partials)
+        finally:
+            p_map.undo(mark)
+
+    def _solve_components(self, p_map, components, parallel):
+        """
+        Solve each component separately, taking the full results as the product of the component results.
+        :param p_map: PMap
+        :param components: list of (list of actors, list of policies), see components().
+        :param parallel: Number of worker processes, for each component search.
+        :return:
+        """
+        component_solutions = list()
+        # As with a search over all components, an unassigned actor without policies leaves no full results.
+        if all(p_map[actor].note is not None for actor in p_map.keys() if actor not in self.v_policy_map):
+            for actors, policies in components:
+                solution_keys, solver = PitchConstraintSolver._search_component(p_map, actors, policies,
+                                                                                self.instance_limit, parallel,
+                                                                                self.backjumping, self.__budget,
+                                                                                self.__statistics)
+                if solver is not None:
+                    self.__num_nodes += solver.num_nodes
+                    self.__num_pruned += solver.num_pruned
+                    self.__truncated = self.__truncated or solver.truncated
+                if len(solution_keys) == 0:
+                    component_solutions = list()
+                    break
+                component_solutions.append((actors, solution_keys))
+
+        if len(component_solutions) == 0:
+            return
+        self.__full_results = PMapProduct(p_map, component_solutions, self.instance_limit)
+        self.__num_instances = self.__full_results.num_solutions
+        if self.__budget_limited:
+            num_combinations = 1
+            for _, solution_keys in component_solutions:
+                num_combinations *= len(solution_keys)
+            self.__truncated = self.__truncated or num_combinations > self.__num_instances
+
+    @staticmethod
+    def solve_component(p_map, actors, policies, instance_limit=-1, parallel=1, backjumping=None, budget=None):
+        """
+        Solve the policies of one component.
+        :param p_map: PMap, over (at least) the actors.
+        :param actors: list of the actors of the policies.
+        :param policies: list of policies, whose actors are among actors.
+        :param instance_limit: Number of results to limit search; -1 no limit
+        :param parallel: Number of worker processes, see solve().
+        :param backjumping: see the constructor.
+        :param budget: SolveBudget or None, charged with the search nodes but not the solutions.
+        :return: list of distinct solution keys over actors, in the order of actors.
+        """
+        return PitchConstraintSolver._search_component(p_map, actors, policies, instance_limit, parallel, backjumping,
+                                                       budget)[0]
 
-        partial_results = [p_map]
-        # list of tuples (v_note, {solution to v_note's policies}) sorted by low number of solutions.
-        unsolved_nodes = [t[0] for t in self._build_potential_values(p_map, p_map.keys())]
+    @staticmethod
+    def _search_component(p_map, actors, policies, instance_limit, parallel, backjumping, budget, statistics=None):
+        """
+        See solve_component().
+        :param statistics: SolveStatistics or None, recording the search but not its end.
+        :return: (list of solution keys, the PitchConstraintSolver that searched, or None if no search was needed)
+        """
+        component_p_map = PMap(OrderedDict((actor, p_map[actor]) for actor in actors))
+        if statistics is not None:
+            statistics.num_replicates += 1
+        if len(component_p_map.unassigned()) == 0:
+            # All pitches are fixed, leaving only to check them.
+            for policy in policies:
+                if not policy.verify(component_p_map):
+                    return list(), None
+            return [component_p_map.solution_key()], None
+
+        solver = PitchConstraintSolver(policies, backjumping)
+        solver._reset(component_p_map, instance_limit, budget, statistics)
+        # Nodes are visited in the order of a search over all components, i.e. with ties in p_map order, as some
+        # policies' values depend on the order in which their actors are assigned.
+        actor_set = set(actors)
+        unsolved_nodes = [t[0] for t in solver._build_potential_values(component_p_map,
+                                                                        [actor for actor in p_map.keys()
+                                                                         if actor in actor_set])]
         if len(unsolved_nodes) == 0:
-            raise Exception('Policies insufficient for solution or parameter map is full.')
-
-        while len(unsolved_nodes) != 0:
-            v_node = unsolved_nodes[0]
-            results_prime = list()
-            for p_map in partial_results:
-                if p_map[v_node] is None or p_map[v_node].note is None:
-                    visit_results = self._visit(p_map, v_node)
-                    if len(visit_results) == 0:
-                        if accept_partials:  # if accept partials, keep in partial results.
-                            results_prime.append(p_map)
-                    else:
-                        results_prime.extend(visit_results)  # note: contains possible extensions of pmap
-                else:  # v_note already filled, keep it in partial_results.
-                    results_prime.append(p_map)
-            partial_results = results_prime
-            if self.instance_limit != -1 and len(partial_results) >= self.instance_limit:
-                break
-            unsolved_nodes.remove(v_node)
+            return list(), None
+        solver._solve_search(component_p_map, unsolved_nodes, False, parallel)
+        return list(solver.solution_keys), solver
 
-        return self.full_results, partial_results if accept_partials else list()
+    @staticmethod
+    def components(policies):
+        """
+        Partition policies into connected components, policies being connected when they share an actor.
+        :param policies: list of policies
+        :return: list of tuples (list of actors, list of policies), in order of first appearance.
+        """
+        parent = dict()
+
+        def find(actor):
+            while parent[actor] is not actor:
+                parent[actor] = parent[parent[actor]]
+                actor = parent[actor]
+            return actor
+
+        for policy in policies:
+            root = None
+            for actor in policy.actors:
+                if actor not in parent:
+                    parent[actor] = actor
+                if root is None:
+                    root = find(actor)
+                else:
+                    other = find(actor)
+                    if other is not root:
+                        parent[other] = root
+
+        components = OrderedDict()
+        for policy in policies:
+            if len(policy.actors) == 0:
+                continue
+            root = find(next(iter(policy.actors)))
+            if root not in components:
+                components[root] = (OrderedSet(), list())
+            components[root][1].append(policy)
+        for actors, component_policies in components.values():
+            for policy in component_policies:
+                for actor in policy.actors:
+                    actors.add(actor)
+        return [(list(actors), component_policies) for actors, component_policies in components.values()]
+
+    @property
+    def solution_keys(self):
+        """
+        The full results of the last solve(), as distinct tuples of pitch keys in p_map actor order.
+        """
+        return self.__full_results.solution_keys if isinstance(self.__full_results, PMapResults) else list()
 
     def _check_p_map(self, p_map):
         for key in self.v_policy_map.keys():
@@ -107,74 +337,330 @@ class PitchConstraintSolver(object):
         return True
         # return len([v_note for v_note in p_map.keys() if p_map[v_note].note is None]) == 0
 
-    def _visit(self, p_map, v_note):
+    def _limit_reached(self):
+        return self.instance_limit != -1 and self.__num_instances >= self.instance_limit
+
+    # Agenda task codes, see _search().
+    _OUTER = 0
+    _PEERS = 1
+    _FOUND = 2
+
+    # Marker for _search() to stop at a branching choice point.
+    _PROBE = object()
+
+    # For parallel search, the number of subtree tasks per worker process to aim for.
+    TASKS_PER_WORKER = 4
+
+    # Default for conflict directed backjumping and nogood learning, see _search().
+    BACKJUMPING = True
+
+    # The number of nogoods kept, and the largest nogood (number of actors) kept.
+    NOGOOD_LIMIT = 1024
+    NOGOOD_MAX_SIZE = 4
+
+    class _ChoicePoint(object):
         """
-        Recursive method used to derive sets of solution to the constraints constraint problem.
+        Search stack entry: the values (pitch keys) for v_note still to be tried, the trail mark to undo to
+        between values, and the agenda to continue with after v_note and its peers are assigned.
 
-        :param p_map: PMap
-        :param v_note: ContextualNote, source key of PMap
-        :return: A set of pmaps
+        For backjumping, conflicts is the set of earlier assigned actors whose values account for the failures of
+        v_note's values so far.  chronological marks a choice point whose failures cannot be so accounted for,
+        e.g. one below which a solution was found, which so backtracks to the choice point just before it.
         """
 
-        if p_map[v_note].note is not None:  # setting means visited
-            return {}
+        def __init__(self, v_note, values, mark, agenda, on_exhausted=None, conflicts=None):
+            self.v_note = v_note
+            self.values = values
+            self.index = 0
+            self.mark = mark
+            self.agenda = agenda
+            self.on_exhausted = on_exhausted
+            self.found = False
+            self.conflicts = conflicts
+            self.chronological = False
+
+    def _search(self, p_map, unsolved_nodes, accept_partials, split=None):
+        """
+        Depth first search over p_map, assigning in place and backtracking through the p_map trail.
+
+        The agenda is a linked list (task, rest) of work remaining on the current branch:
+           (_OUTER, i): visit the first unassigned node of unsolved_nodes at or beyond i.
+           (_PEERS, peers, i): visit the first unassigned peer at or beyond i.
+           (_FOUND, choice_point): mark choice_point as having extended to the rest of the agenda.
+        Visiting a node pushes a choice point over its values.  For each value, the node's unassigned peers
+        (actors of the node's policies) are visited before continuing with the agenda.
+
+        With backjumping (except when accepting partials), each failure is put down to a conflict set of actors:
+        for a node without values, the assigned actors of its policies; for a full p_map, the actors of a violated
+        policy.  When a node's values are exhausted, the search jumps back to the latest actor of its conflict
+        set, passing over choice points that had no part in the failure, and the assignments of the conflict set
+        are recorded as a nogood, so that later branches repeating them are pruned as the last is assigned.
+        Which nodes are visited, and in what order, depends only on which actors are assigned, not their values,
+        so skipped branches would fail in the same way.
 
-        results = OrderedSet()
+        :param p_map: PMap
+        :param unsolved_nodes: list of actors, in visit order.
+        :param accept_partials: Boolean, True means record partial results.
+        :param split: For parallel search, see _parallel_search(). A path (tuple) of pitch keys, one per choice
+                      point with more than one value, in search order, restricting each to the one value.
+                      A path ending in _PROBE stops the search at the choice point it would apply to.
+        :return: The choice point the search stopped at when probing, otherwise None.
+        """
+        split = list(split) if split is not None else list()
+        budget = self.__budget
+        statistics = self.__statistics
+        backjumping = self.backjumping and not accept_partials
+        nogoods = self.__nogoods if backjumping else None
+        num_unsolved = len(unsolved_nodes)
+        stack = list()
+        agenda = ((PitchConstraintSolver._OUTER, 0), None)
+        while True:
+            # Advance along the agenda until a choice point is pushed or the branch ends.
+            while agenda is not None:
+                task, rest = agenda
+                code = task[0]
+                if code == PitchConstraintSolver._PEERS:
+                    peers = task[1]
+                    index = task[2]
+                    while index < len(peers) and p_map[peers[index]].note is not None:
+                        index += 1
+                    if index == len(peers):
+                        agenda = rest
+                        continue
+                    stack.append(self._choice_point(p_map, peers[index],
+                                                    ((PitchConstraintSolver._PEERS, peers, index + 1), rest),
+                                                    backjumping=backjumping))
+                    if statistics is not None:
+                        statistics.add_domain(len(stack), len(stack[-1].values))
+                    if accept_partials and len(stack[-1].values) == 0:
+                        # Dead end: the peer has no values, so the branch so far is a partial result, and
+                        # the choice points above it have extended, as with the recursive search.
+                        self.__partials.add_key(p_map.solution_key())
+                        for choice_point in stack:
+                            choice_point.found = True
+                    agenda = None
+                elif code == PitchConstraintSolver._OUTER:
+                    index = task[1]
+                    while index < num_unsolved and p_map[unsolved_nodes[index]].note is not None:
+                        index += 1
+                    if index == num_unsolved:
+                        # End of branch without a full valid solution.
+                        if accept_partials:
+                            self.__partials.add_key(p_map.solution_key())
+                        elif len(stack) != 0:
+                            stack[-1].chronological = True
+                        agenda = None
+                        continue
+                    stack.append(self._outer_choice_point(p_map, unsolved_nodes, index, accept_partials,
+                                                          backjumping))
+                    if statistics is not None:
+                        statistics.add_domain(len(stack), len(stack[-1].values))
+                    agenda = None
+                else:  # _FOUND
+                    task[1].found = True
+                    agenda = rest
+
+            # Backtrack to the most recent choice point with values remaining, and take the next value.
+            while agenda is None:
+                if len(stack) == 0:
+                    return None
+                if self._limit_reached():
+                    if self.__budget_limited and any(cp.index < len(cp.values) for cp in stack):
+                        self.__truncated = True
+                    return None
+                choice_point = stack[-1]
+                p_map.undo(choice_point.mark)
+                if choice_point.index == len(choice_point.values):
+                    stack.pop()
+                    if statistics is not None:
+                        statistics.num_backtracks += 1
+                    if choice_point.on_exhausted is not None and not choice_point.found:
+                        agenda = choice_point.on_exhausted
+                    elif backjumping:
+                        self._backjump(p_map, stack, choice_point)
+                    continue
+
+                if budget is not None and budget.exhausted:
+                    self.__truncated = True
+                    return None
+
+                if len(split) != 0 and len(choice_point.values) > 1:
+                    split_key = split.pop(0)
+                    if split_key is PitchConstraintSolver._PROBE:
+                        return choice_point
+                    choice_point.values = [split_key]
+                    # The other values are left to other searches, so failure here accounts for nothing.
+                    choice_point.chronological = True
+
+                pitch_key = choice_point.values[choice_point.index]
+                choice_point.index += 1
+                if nogoods is not None:
+                    nogood = nogoods.find(p_map, choice_point.v_note, pitch_key)
+                    if nogood is not None:
+                        self.__num_pruned += 1
+                        if statistics is not None:
+                            statistics.num_pruned += 1
+                        choice_point.conflicts.update(actor for actor, _ in nogood)
+                        continue
+
+                p_map.assign(choice_point.v_note, self._value_note(choice_point.v_note, pitch_key))
+                self.__num_nodes += 1
+                if budget is not None:
+                    budget.add_node()
+                if statistics is not None:
+                    statistics.node()
+
+                peer_candidates = self._candidate_closure(p_map, choice_point.v_note)
+                if len(peer_candidates) != 0:
+                    agenda = ((PitchConstraintSolver._PEERS, list(peer_candidates), 0), choice_point.agenda)
+                elif not backjumping:
+                    if self._full_check_and_validate(p_map):
+                        # We reached the end of a branch with a solution, save it unless found before.
+                        if self.__solutions.add_key(p_map.solution_key()):
+                            self.__num_instances = self.__num_instances + 1
+                    else:
+                        agenda = choice_point.agenda
+                elif PitchConstraintSolver.pmap_full(p_map):
+                    violated = self._violated_policy(p_map)
+                    if violated is None:
+                        if self.__solutions.add_key(p_map.solution_key()):
+                            self.__num_instances = self.__num_instances + 1
+                        choice_point.chronological = True
+                    else:
+                        choice_point.conflicts.update(violated.actors)
+                else:
+                    agenda = choice_point.agenda
 
-        # list of tuples (v_note, {solution to v_note's policies})
-        result_values = self._build_potential_values(p_map, {v_note})
-        if len(result_values) == 0:
-            return results
+    def _backjump(self, p_map, stack, choice_point):
+        """
+        On exhausting the values of choice_point, popped from stack, record its conflict set as a nogood, and pop
+        choice points back to the latest actor of the conflict set, which takes on the conflict set.
+        :param p_map: PMap, as of just before choice_point's node was assigned.
+        :param stack: list of _ChoicePoint
+        :param choice_point: _ChoicePoint
+        """
+        if choice_point.chronological:
+            if len(stack) != 0:
+                stack[-1].chronological = True
+            return
+
+        conflicts = choice_point.conflicts
+        conflicts.discard(choice_point.v_note)
+        conflicts.difference_update(self.__fixed)
+        if 0 < len(conflicts) <= PitchConstraintSolver.NOGOOD_MAX_SIZE:
+            self.__nogoods.add(frozenset((actor, p_map[actor].note.diatonic_pitch.pitch_key)
+                                         for actor in conflicts))
+        while len(stack) != 0 and stack[-1].v_note not in conflicts:
+            stack.pop()
+        if len(stack) != 0:
+            stack[-1].conflicts.update(conflicts)
+
+    def _choice_point(self, p_map, v_note, agenda, on_exhausted=None, backjumping=False):
+        if v_note not in self.v_policy_map:
+            return PitchConstraintSolver._ChoicePoint(v_note, [], p_map.mark(), agenda, on_exhausted, set())
+        values = self._policy_values(p_map, v_note).pitch_keys()
+        conflicts = None
+        if backjumping:
+            # The values are limited by the assigned actors of v_note's policies.
+            conflicts = set()
+            for policy in self.v_policy_map[v_note]:
+                conflicts.update(p_map.assigned_actors(policy))
+        return PitchConstraintSolver._ChoicePoint(v_note, values, p_map.mark(), agenda, on_exhausted, conflicts)
+
+    def _value_note(self, v_note, pitch_key):
+        """
+        The note assigned to v_note's target for pitch_key during search.  Notes are built once per actor and
+        pitch, and shared across branches; solutions are built out with their own notes, see PMap.from_solution_key.
+        """
+        note = self.__value_notes.get((v_note, pitch_key))
+        if note is None:
+            note = Note(DiatonicPitch.from_pitch_key(pitch_key), v_note.base_duration, v_note.num_dots)
+            self.__value_notes[(v_note, pitch_key)] = note
+        return note
 
-        for value in result_values[0][1]:  # [0] is for v_note; [1] is the set of values.
-            p_map[v_note].note = value
-            value_results = OrderedSet()  # results for this value for v_note + solutions for ALL peers to v_note
+    def _outer_choice_point(self, p_map, unsolved_nodes, index, fallback, backjumping=False):
+        """
+        Build the choice point for unsolved_nodes[index], continuing with the unsolved nodes after it.
+        If fallback, the search continues past the node, unassigned, when none of its values extend.
+        """
+        next_agenda = ((PitchConstraintSolver._OUTER, index + 1), None)
+        choice_point = self._choice_point(p_map, unsolved_nodes[index], None, next_agenda if fallback else None,
+                                          backjumping)
+        choice_point.agenda = ((PitchConstraintSolver._FOUND, choice_point), next_agenda)
+        return choice_point
 
-            # Advantage in the following, setting above partially solves each policy v_note is involved in.
-            # For this 'value' for v_note, dive depth first through all v_note peers (all policies v_note is in)
-            #    which collectively we call a branch.
-            # peer_candidates are all unassigned actors in v_note's policies.
-            peer_candidates = self._candidate_closure(p_map, v_note)
-            if len(peer_candidates) == 0:
+    def _parallel_search(self, p_map, unsolved_nodes, parallel):
+        """
+        Search the subtrees below the choice points having more than one value, each as a separate task
+        in a process pool.  The search is deterministic, so each worker replays it from the start, taking the one
+        value given for each of those choice points along its path.  Paths are expanded a level at a time until
+        there are enough tasks to keep the pool busy.  Results are merged in path order, so they match those of
+        a sequential search, and merging stops once instance_limit full results are in hand.
 
-                # We reached the end of a branch, save the result.
-                if self._full_check_and_validate(p_map):
-                    if self.instance_limit != -1 and self.__num_instances >= self.instance_limit:
-                        return results
-                    self.full_results.append(p_map.replicate())
-                    self.__num_instances = self.__num_instances + 1
+        :param p_map: PMap
+        :param unsolved_nodes: list of actors, in visit order.
+        :param parallel: Number of worker processes.
+        :return:
+        """
+        paths = [tuple()]
+        while len(paths) < PitchConstraintSolver.TASKS_PER_WORKER * parallel:
+            expanded_paths = list()
+            for path in paths:
+                self.__num_instances = 0
+                self.__solutions = PMapSolutions(p_map)
+                mark = p_map.mark()
+                branch = self._search(p_map, unsolved_nodes, False, path + (PitchConstraintSolver._PROBE,))
+                p_map.undo(mark)
+                if branch is None:  # The search below path completes without branching.
+                    expanded_paths.append(path)
                 else:
-                    value_results.add(p_map.replicate())  # We only need a shallow copy
+                    expanded_paths.extend(path + (pitch_key,) for pitch_key in branch.values)
+            if len(expanded_paths) == len(paths):
+                break
+            paths = expanded_paths
 
-            else:
-                for c_note in peer_candidates:
-                    if self.instance_limit != -1 and self.__num_instances >= self.instance_limit:
-                        results = results.union(value_results)
-                        return results
-
-                    if len(value_results) == 0:  # first time through this loop per value, visit with p_map!
-                        value_results = self._visit(p_map, c_note)
-                        if len(value_results) == 0:  # Indicates failure to assign c_note, move to next value.
-                            break  # If one peer fails, they all will, for this 'value'!
-                    else:
-                        value_results_copy = value_results.copy()
-                        # for peer c_note, if all r below fails (len(cand_results) == 0) should we also move on to
-                        # next value? Add 'found' flag, set after union, after loop, check if False, to break
-                        found = False
-                        for r in value_results_copy:
-                            if r[c_note].note is None:
-                                cand_results = self._visit(r, c_note)
-                                if len(cand_results) != 0:
-                                    value_results = value_results.union(cand_results)
-                                    found = True
-                                value_results.remove(r)  # r has no c_note assigned, what was returned did!
-                                # If not, r's peers cannot be assigned!
-                        if found is False:  # Same as if part, if c_note produces no results, it cannot be assigned.
-                            break  # If one peer fails, they all will!
-            results = results.union(value_results)
-
-        p_map[v_note].note = None
-        return results
+        # Discard results found while probing; the workers find them again.
+        self.__solutions = PMapSolutions(p_map)
+        self.__full_results = self.__solutions
+        self.__num_instances = 0
+
+        # Imported here, as multiprocessing is costly to import and is used only by parallel solves.
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Pickle the problem once; actor identities are preserved within the one pickle.
+        problem = pickle.dumps((self.policies, p_map, unsolved_nodes))
+        if self.__statistics is not None:
+            self.__statistics.num_replicates += len(paths)
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            futures = [executor.submit(_solve_subtree, problem, path, self.instance_limit, self.backjumping)
+                       for path in paths]
+            try:
+                for future in futures:
+                    solution_keys, num_nodes, num_pruned = future.result()
+                    self.__num_nodes += num_nodes
+                    self.__num_pruned += num_pruned
+                    if self.__statistics is not None:
+                        self.__statistics.num_nodes += num_nodes
+                        self.__statistics.num_pruned += num_pruned
+                    for solution_key in solution_keys:
+                        if self.__solutions.add_key(solution_key):
+                            self.__num_instances = self.__num_instances + 1
+                            if self._limit_reached():
+                                break
+                    if self._limit_reached():
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _solve_subtree(self, p_map, unsolved_nodes, path, instance_limit):
+        """
+        Worker side of _parallel_search(): search the subtree below path.
+        :return: (list of solution keys, number of search nodes, number of nogood prunes)
+        """
+        self._reset(p_map, instance_limit)
+        self._search(p_map, unsolved_nodes, False, path)
+        return self.__solutions.solution_keys, self.__num_nodes, self.__num_pruned
 
     def _build_v_policy_map(self):
         for p in self.policies:
@@ -185,14 +671,14 @@ class PitchConstraintSolver(object):
 
     def _build_potential_values(self, p_map, v_notes):
         """
-        Compute a list of tuples (v_note, {solution to v_note's policies}), the list being sorted by the number of
-        solution values.
+        Compute a list of tuples (v_note, PitchDomain of solutions to v_note's policies), the list being sorted by
+        the number of solution values.
         
         :param p_map: PMap
         :param v_notes: list/set of ContextualNote sources to PMap
-        :return: list of tuples (v_note, {solution to v_note's policies})
+        :return: list of tuples (v_note, PitchDomain of solutions to v_note's policies)
         """
-        ranked_list = list()  # A list of tuples (v_note, {solution values})
+        ranked_list = list()  # A list of tuples (v_note, PitchDomain of solution values)
         for v_note in v_notes:
             if p_map[v_note] is not None and p_map[v_note].note is not None:
                 continue
@@ -208,26 +694,21 @@ class PitchConstraintSolver(object):
 
     def _policy_values(self, p_map, v_note):
         """
-        For v_note, find all note values for its target that satisfy all policies in which v_note is involved.
+        For v_note, find all pitch values for its target that satisfy all policies in which v_note is involved.
         :param p_map: PMap
         :param v_note: ContextualNote
-        :return: A set of notes with same duration as v_note, varying in pitch.
+        :return: PitchDomain of pitches for v_note's target.
         """
-        pitches = None
+        domain = None
+        statistics = self.__statistics
         for p in self.v_policy_map[v_note]:
-            p_values = p.values(p_map, v_note)
-            if p_values is None:
-                returned_pitches = OrderedSet()  # None means p cannot be satisfied!
-            else:
-                returned_pitches = OrderedSet()
-                for n in p_values:
-                    returned_pitches.add(n.diatonic_pitch)
-            pitches = returned_pitches if pitches is None else pitches.intersection(returned_pitches)
-
-        retset = OrderedSet()
-        for p in pitches:
-            retset.add(Note(p, v_note.base_duration, v_note.num_dots))
-        return retset
+            if statistics is not None:
+                statistics.count_values(p)
+            p_domain = p.value_domain(p_map, v_note)
+            domain = p_domain if domain is None else domain & p_domain
+            if not domain:
+                break
+        return domain if domain is not None else PitchDomain()
 
     def _candidate_closure(self, p_map, v_note):
         """
@@ -243,6 +724,17 @@ class PitchConstraintSolver(object):
             candidates = candidates.union(p_map.unassigned_actors(p))
         return candidates
 
+    def _violated_policy(self, p_map):
+        """
+        Find the first policy not satisfied by p_map.
+        :param p_map: full p_map
+        :return: policy, or None
+        """
+        for p in self._policies:
+            if not p.verify(p_map):
+                return p
+        return None
+
     def _full_check_and_validate(self, p_map):
         """
         Check if p_map parameter is full and if so, satisfies all policies.
@@ -263,7 +755,7 @@ class PitchConstraintSolver(object):
         lst = list()
         for t in starting_nodes:
             s = t[1]
-            s_text = '[]' if len(s) == 0 else ', '.join('{0}'.format(n.diatonic_pitch) for n in s)
+            s_text = '[]' if len(s) == 0 else ', '.join('{0}'.format(DiatonicPitch.from_pitch_key(k)) for k in s)
             full_text = '{0} <== {1}'.format(t[0], s_text)
             lst.append((t[0], full_text))
 
@@ -272,3 +764,17 @@ class PitchConstraintSolver(object):
         for i in range(0, len(ss)):
             s = ss[i]
             print('[{0}] {1}'.format(i, s[1]))
+
+
+def _solve_subtree(problem, path, instance_limit, backjumping):
+    """
+    Process pool entry point for PitchConstraintSolver parallel search.
+    :param problem: pickled (policies, p_map, unsolved_nodes)
+    :param path: tuple of pitch keys, values to take at the choice points having more than one value.
+    :param instance_limit: Number of full results to limit search; -1 no limit
+    :param backjumping: Boolean, see PitchConstraintSolver.
+    :return: (list of solution keys, number of search nodes, number of nogood prunes)
+    """
+    policies, p_map, unsolved_nodes = pickle.loads(problem)
+    solver = PitchConstraintSolver(policies, backjumping)
+    return solver._solve_subtree(p_map, unsolved_nodes, path, instance_limit)
@@ -5,18 +5,12 @@ File: position_delta_info.py
 Purpose: Contextual object used by BeatCoverageEngine to solve OnBeatConstraints.
 
 """
-from harmoniccontext.harmonic_context import HarmonicContext
-from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from melody.solver.beat_time_model import BeatTimeModel
+from misc.persistent_sum_tree import PersistentSumTree
 from structure.abstract_note_collective import AbstractNoteCollective
 from structure.line import Line
-from structure.tempo import Tempo
-from structure.time_signature import TimeSignature
 from timemodel.duration import Duration
 from timemodel.position import Position
-from timemodel.tempo_event import TempoEvent
-from timemodel.tempo_event_sequence import TempoEventSequence
-from timemodel.time_signature_event import TimeSignatureEvent
-from timemodel.event_sequence import EventSequence
 
 
 class PositionDeltaInfo(object):
@@ -24,6 +18,12 @@ class PositionDeltaInfo(object):
     This class hold information about the movement of various note structures in a line that in sum
     make all the OnBeat constraints work. This class not only records those movements, but is able to either
     create an image of the original line with movements made, or alter the original with the movements.
+
+    The movements are held as cover deltas over a BeatTimeModel shared by all the PositionDeltaInfo's of a solve.
+    The deltas are a PersistentSumTree, so a clone shares them, and altering a clone copies O(log n) nodes rather
+    than any events.  Positions and beats are computed from the deltas directly.  The moved time signature, tempo
+    and harmonic context sequences, and the coverage_node_deltas map, are built only when asked for, normally just
+    for the solutions found.
     """
 
     def __init__(self, coverage_node_list, tempo_seq, ts_seq, hct, line):
@@ -35,103 +35,89 @@ class PositionDeltaInfo(object):
         :param hct: HarmonicContextTrack
         :param line: Line
         """
-        self.__coverage_node_list = coverage_node_list
-
-        self.__coverage_node_aggregates = dict()
-        self.__coverage_node_deltas = dict()
-
-        # duplicate time signature event sequence
-        new_ts_list = []
-        for e in ts_seq.sequence_list:
-            new_ts_list.append(TimeSignatureEvent(TimeSignature(e.object.beats_per_measure, e.object.beat_duration,
-                                                                e.object.beat_pattern),
-                                                  e.time))
-        self.__ts_event_sequence = EventSequence(new_ts_list)
-
-        # duplicate tempo event sequence
-        new_tempo_list = []
-        for e in tempo_seq.sequence_list:
-            new_tempo_list.append(TempoEvent(Tempo(e.object.tempo, e.object.beat_duration), e.time))
-        self.__tempo_event_sequence = TempoEventSequence(new_tempo_list)
-
-        self.__line = line
+        self.__set_state(BeatTimeModel(coverage_node_list, tempo_seq, ts_seq, hct, line),
+                         PersistentSumTree(len(coverage_node_list)))
 
-        self.__hct = HarmonicContextTrack()
-        for hc in hct.hc_list():
-            self.__hct.append(HarmonicContext(hc.tonality, hc.chord, Duration(hc.duration), Position(hc.position)))
-
-        for n in self.coverage_node_list:
-            self.__coverage_node_aggregates[n] = 0
-            self.__coverage_node_deltas[n] = 0
+    def __set_state(self, model, deltas):
+        self.__model = model
+        # cover delta (Fraction) by cover index; immutable, so shared with clones.
+        self.__deltas = deltas
+        # cover --> delta, and (ts event sequence, tempo event sequence, hct), built on demand.
+        self.__coverage_node_deltas = None
+        self.__views = None
 
     @property
     def coverage_node_list(self):
-        return self.__coverage_node_list
+        return self.__model.coverage_node_list
 
     @property
     def line(self):
-        return self.__line
+        return self.__model.line
+
+    @property
+    def model(self):
+        return self.__model
 
     @property
     def hct(self):
-        return self.__hct
+        return self._views()[2]
 
     @property
     def ts_event_sequence(self):
-        return self.__ts_event_sequence
+        return self._views()[0]
 
     @property
     def tempo_event_sequence(self):
-        return self.__tempo_event_sequence
+        return self._views()[1]
 
     @property
     def coverage_node_deltas(self):
+        if self.__coverage_node_deltas is None:
+            self.__coverage_node_deltas = {cover: self.__deltas[i] for i, cover in enumerate(self.coverage_node_list)}
         return self.__coverage_node_deltas
 
+    def _views(self):
+        if self.__views is None:
+            self.__views = (self.__model.ts_event_sequence(self.__deltas),
+                            self.__model.tempo_event_sequence(self.__deltas),
+                            self.__model.hct(self.__deltas))
+        return self.__views
+
     def line_duration(self):
-        return Duration(self.correct_position(self.line.duration).position)
+        duration = self.__model.line_duration
+        return Duration(duration + self.__model.shift(self.__deltas, duration))
 
     def correct_position(self, position):
         # Adjust position by the set aggregates on structure.
-        p_prime = Position(position)
-        for cover in self.coverage_node_list:
-            if cover.get_absolute_position() > p_prime:
-                break
-            p_prime = p_prime + self.coverage_node_deltas[cover]
-        return p_prime
+        p = Position(position).position
+        return Position(p + self.__model.shift(self.__deltas, p))
+
+    def correct_note_position(self, note):
+        """
+        The moved position of a note of the line.
+        :param note: Note
+        :return: Fraction
+        """
+        p = self.__model.note_position(note)
+        return p + self.__model.shift(self.__deltas, p)
+
+    def beat_at(self, position):
+        """
+        Find the beat at a moved position.
+        :param position: Position or Fraction, after movement.
+        :return: (TimeSignature, beat number) - see BeatTimeModel.beat_at().
+        """
+        return self.__model.beat_at(self.__deltas, position.position if isinstance(position, Position) else position)
 
     def alter_at(self, cover, delta):
-        self.coverage_node_deltas[cover] = delta.duration
-
-        changed = list()
-        for tse in self.ts_event_sequence.sequence_list:
-            if tse.time >= self.correct_position(cover.get_absolute_position()) - delta.duration:
-                changed.append(tse)
-
-        for tse in changed:
-            self.ts_event_sequence.remove(tse)
-            tse.time += delta
-            self.ts_event_sequence.add(tse)
-
-        changed = list()
-        for te in self.tempo_event_sequence.sequence_list:
-            if te.time >= self.correct_position(cover.get_absolute_position()) - delta.duration:
-                changed.append(te)
-
-        for te in changed:
-            self.tempo_event_sequence.remove(te)
-            te.time += delta
-            self.tempo_event_sequence.add(te)
-
-        cover_start_position = self.correct_position(cover.get_absolute_position()) - delta.duration
-        hc = self.hct[cover_start_position]
-        if hc is not None:
-            hc.duration = hc.duration + delta
-            hc_list = self.hct.hc_list()
-            index = hc_list.index(hc)
-            for i in range(index + 1, len(hc_list)):
-                hc_list[i].position = hc_list[i].position + delta
-            self.hct.reset()
+        """
+        Set the movement of a cover, moving everything from the start of the cover on.
+        :param cover: note structure in coverage_node_list.
+        :param delta: Duration
+        """
+        self.__deltas = self.__deltas.set(self.__model.cover_index(cover), delta.duration)
+        self.__coverage_node_deltas = None
+        self.__views = None
 
     def apply(self, line_copy=True):
         if line_copy:
@@ -175,11 +161,8 @@ class PositionDeltaInfo(object):
         return line_map
 
     def clone(self):
-        c = PositionDeltaInfo(self.coverage_node_list, self.tempo_event_sequence, self.ts_event_sequence,
-                              self.hct, self.line)
-        for n in self.coverage_node_list:
-            c.__coverage_node_aggregates[n] = self.__coverage_node_aggregates[n]
-            c.__coverage_node_deltas[n] = self.__coverage_node_deltas[n]
+        c = PositionDeltaInfo.__new__(PositionDeltaInfo)
+        c.__set_state(self.__model, self.__deltas)
         return c
 
     def __str__(self):
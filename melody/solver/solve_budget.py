@@ -0,0 +1,126 @@
+"""
+
+File: solve_budget.py
+
+Purpose: Limits on a solve, in wall-clock time, search nodes and solutions, for anytime solving: a solve that
+         runs out of budget stops and returns the results found so far.
+
+"""
+import time
+
+
+class SolveBudget(object):
+    """
+    Limits on a solve: a time limit (seconds from the start of the solve), a maximum number of search nodes, and a
+    maximum number of solutions.  Any may be None, for no limit.
+
+    One budget is shared by all the searches of a solve, e.g. the pitch search per beat result in TReshape, and is
+    charged by each.  It starts on first use, so the time limit covers all the work from there on.  Once any limit is
+    reached the budget is exhausted, and searches stop, marking their results as truncated.
+    """
+
+    # The clock is read once per this many search nodes.
+    CHECK_INTERVAL = 64
+
+    def __init__(self, time_limit=None, max_nodes=None, max_solutions=None):
+        """
+        Constructor.
+        :param time_limit: Number of seconds, or None.
+        :param max_nodes: Maximum number of search nodes (pitch assignments tried), or None.
+        :param max_solutions: Maximum number of solutions, or None.
+        """
+        for name, value in [('time_limit', time_limit), ('max_nodes', max_nodes), ('max_solutions', max_solutions)]:
+            if value is not None and value < 0:
+                raise Exception('Budget {0} must be non-negative, not {1}.'.format(name, value))
+        self.__time_limit = time_limit
+        self.__max_nodes = max_nodes
+        self.__max_solutions = max_solutions
+
+        self.__start = None
+        self.__deadline = None
+        self.__num_nodes = 0
+        self.__num_solutions = 0
+        self.__exhausted = False
+
+    @property
+    def time_limit(self):
+        return self.__time_limit
+
+    @property
+    def max_nodes(self):
+        return self.__max_nodes
+
+    @property
+    def max_solutions(self):
+        return self.__max_solutions
+
+    @property
+    def num_nodes(self):
+        return self.__num_nodes
+
+    @property
+    def num_solutions(self):
+        return self.__num_solutions
+
+    @property
+    def exhausted(self):
+        return self.__exhausted
+
+    @property
+    def elapsed(self):
+        """
+        Seconds since the budget started, 0 if not started.
+        """
+        return 0 if self.__start is None else time.monotonic() - self.__start
+
+    def start(self):
+        """
+        Start the clock, if not already started.
+        """
+        if self.__start is None:
+            self.__start = time.monotonic()
+            if self.__time_limit is not None:
+                self.__deadline = self.__start + self.__time_limit
+                self.__exhausted = self.__exhausted or self.__time_limit == 0
+            if self.__max_nodes == 0:
+                self.__exhausted = True
+
+    def check_time(self):
+        """
+        Read the clock, exhausting the budget if past the time limit.
+        :return: True if the budget is not exhausted.
+        """
+        if self.__deadline is not None and not self.__exhausted and time.monotonic() >= self.__deadline:
+            self.__exhausted = True
+        return not self.__exhausted
+
+    def add_node(self):
+        """
+        Charge a search node.
+        :return: True if the budget is not exhausted.
+        """
+        self.__num_nodes += 1
+        if self.__max_nodes is not None and self.__num_nodes >= self.__max_nodes:
+            self.__exhausted = True
+        elif self.__num_nodes % SolveBudget.CHECK_INTERVAL == 0:
+            self.check_time()
+        return not self.__exhausted
+
+    def add_solutions(self, num_solutions):
+        """
+        Charge solutions found.
+        :param num_solutions: Number of solutions.
+        :return:
+        """
+        self.__num_solutions += num_solutions
+
+    def solution_limit(self, instance_limit=-1):
+        """
+        Combine a search's own solution limit with the solutions remaining in the budget.
+        :param instance_limit: Number of solutions, -1 for no limit.
+        :return: The lesser of the two, -1 for no limit.
+        """
+        if self.__max_solutions is None:
+            return instance_limit
+        remaining = max(0, self.__max_solutions - self.__num_solutions)
+        return remaining if instance_limit == -1 else min(instance_limit, remaining)
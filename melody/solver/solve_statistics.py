@@ -0,0 +1,157 @@
+"""
+
+File: solve_statistics.py
+
+Purpose: Statistics of a solve, gathered over its beat and pitch searches, for seeing where a solve spends its
+         effort.
+
+"""
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class SolveStatistics(object):
+    """
+    Totals over the searches of a solve: the number of searches, search nodes (pitch assignments or beat deltas
+    tried), backtracks, nogood prunes and solutions, the time taken, and whether any search was truncated by a
+    SolveBudget.
+
+    A SolveStatistics given to a solver's solve() is populated during the search, adding:
+        values_calls: constraint class name --> number of values()/value_domain() calls.
+        domain_sizes: search depth --> [number of choice points, total of their domain sizes, largest domain size].
+        num_replicates: number of PMap or PositionDeltaInfo copies made.
+        phase_seconds: phase name --> seconds, e.g. 'beat', 'pitch', and within 'pitch', 'pitch setup' and
+                       'pitch search'.
+    A callback, if given, is called with the statistics every progress_interval search nodes and at the end of
+    each search, for live progress.
+
+    seconds is the total time of the solves given the statistics: each of PitchConstraintSolver.solve() and
+    BeatConstraintSolver.solve() adds its own time, and MelodicConstraintSolver.solve() adds the time of the whole
+    solve in place of those of its beat and pitch searches.
+
+    Solvers given no SolveStatistics record nothing in the search, so that the statistics cost next to nothing
+    when not asked for.
+    """
+
+    # Default number of search nodes between progress callbacks.
+    PROGRESS_INTERVAL = 1000
+
+    def __init__(self, callback=None, progress_interval=None):
+        """
+        Constructor.
+        :param callback: function taking this SolveStatistics, called with progress; or None.
+        :param progress_interval: number of search nodes between callbacks, None for PROGRESS_INTERVAL.
+        """
+        self.callback = callback
+        self.progress_interval = SolveStatistics.PROGRESS_INTERVAL if progress_interval is None \
+            else progress_interval
+
+        self.num_searches = 0
+        self.num_nodes = 0
+        self.num_backtracks = 0
+        self.num_pruned = 0
+        self.num_solutions = 0
+        self.num_beat_results = 0
+        self.num_replicates = 0
+        self.values_calls = dict()
+        self.domain_sizes = dict()
+        self.phase_seconds = OrderedDict()
+        self.seconds = 0
+        self.truncated = False
+
+    def add_search(self, pitch_solver):
+        """
+        Add the statistics of a PitchConstraintSolver's last solve(), for a solve made without statistics.
+        :param pitch_solver: PitchConstraintSolver
+        :return:
+        """
+        self.num_searches += 1
+        self.num_nodes += pitch_solver.num_nodes
+        self.num_pruned += pitch_solver.num_pruned
+        self.num_solutions += pitch_solver.num_instances
+        self.truncated = self.truncated or pitch_solver.truncated
+
+    def end_search(self, num_solutions, truncated=False):
+        """
+        Record the end of a search, whose nodes were recorded as it ran.
+        :param num_solutions: Number of solutions found.
+        :param truncated: True if the search ran out of budget.
+        :return:
+        """
+        self.num_searches += 1
+        self.num_solutions += num_solutions
+        self.truncated = self.truncated or truncated
+        if self.callback is not None:
+            self.callback(self)
+
+    def node(self):
+        """
+        Record a search node.
+        """
+        self.num_nodes += 1
+        if self.callback is not None and self.num_nodes % self.progress_interval == 0:
+            self.callback(self)
+
+    def count_values(self, constraint):
+        """
+        Record a values() or value_domain() call on a constraint.
+        :param constraint: AbstractConstraint
+        """
+        name = type(constraint).__name__
+        self.values_calls[name] = self.values_calls.get(name, 0) + 1
+
+    def add_domain(self, depth, size):
+        """
+        Record a choice point.
+        :param depth: search depth of the choice point, origin 1.
+        :param size: number of values to choose from.
+        """
+        sizes = self.domain_sizes.get(depth)
+        if sizes is None:
+            self.domain_sizes[depth] = [1, size, size]
+        else:
+            sizes[0] += 1
+            sizes[1] += size
+            if size > sizes[2]:
+                sizes[2] = size
+
+    def mean_domain_size(self, depth):
+        sizes = self.domain_sizes.get(depth)
+        return 0 if sizes is None else sizes[1] / sizes[0]
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager adding the time spent within it to phase_seconds[name].
+        :param name: phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0) + time.perf_counter() - start
+
+    def report(self):
+        """
+        A multi-line text report of the statistics.
+        :return: str
+        """
+        lines = [str(self)]
+        if self.num_backtracks or self.num_replicates or self.num_beat_results:
+            lines.append('backtracks={0} replicates={1} beat results={2}'.format(
+                self.num_backtracks, self.num_replicates, self.num_beat_results))
+        for name, seconds in self.phase_seconds.items():
+            lines.append('phase {0:<24} {1:.3f}s'.format(name, seconds))
+        for name in sorted(self.values_calls.keys()):
+            lines.append('values {0:<40} {1}'.format(name, self.values_calls[name]))
+        for depth in sorted(self.domain_sizes.keys()):
+            count, _, largest = self.domain_sizes[depth]
+            lines.append('depth {0:>4}: choice points={1} mean domain={2:.1f} max domain={3}'.format(
+                depth, count, self.mean_domain_size(depth), largest))
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return 'searches={0} nodes={1} pruned={2} solutions={3} seconds={4:.3f}{5}'.format(
+            self.num_searches, self.num_nodes, self.num_pruned, self.num_solutions, self.seconds,
+            ' truncated' if self.truncated else '')
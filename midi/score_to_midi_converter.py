@@ -5,13 +5,10 @@ File: score_to_midi_converter.py
 Purpose: Provides a means to convert a score to a midi file. 
 
 """
-from mido import MidiFile, MidiTrack, Message
-
 from fractions import Fraction
 
 from timemodel.tempo_event import TempoEvent
 from timemodel.time_signature_event import TimeSignatureEvent
-from mido.midifiles import MetaMessage
 
 from structure.dynamics import Dynamics
 from structure.tempo import Tempo
@@ -31,7 +28,12 @@ from timemodel.dynamics_function_event import DynamicsFunctionEvent
 from misc.utility import convert_to_numeric
 from timemodel.time_conversion import TimeConversion
 from timemodel.tempo_function_event import TempoFunctionEvent
+from misc.lazy import LazyModule
 from timemodel.tempo_event_sequence import TempoEventSequence
+from misc.tracing import span, traced
+
+# mido is imported on first use, sparing its import cost for processes that do not write midi files.
+mido = LazyModule('mido')
 
 
 class ScoreToMidiConverter(object):
@@ -72,6 +74,7 @@ class ScoreToMidiConverter(object):
         self.fine_tempo_sequence = None
         self.time_conversion = None
         
+    @traced()
     def create(self, filename, trace=False):
         """
         Create a midi file from the score, with midi filename provided.
@@ -82,7 +85,7 @@ class ScoreToMidiConverter(object):
         self.__filename = filename
         self.__trace = trace
         
-        self.mid = MidiFile(type=1)
+        self.mid = mido.MidiFile(type=1)
         
         self.mid.ticks_per_beat = ScoreToMidiConverter.TICKS_PER_BEAT
         
@@ -92,15 +95,19 @@ class ScoreToMidiConverter(object):
         # used for assigning channels to each voice.
         self.channel_assignment = 1
                        
-        (self.fine_tempo_sequence, self.time_conversion) = self._build_time_conversion()
+        with span('ScoreToMidiConverter time conversion'):
+            (self.fine_tempo_sequence, self.time_conversion) = self._build_time_conversion()
                    
-        meta_track = MidiTrack()
-        self.mid.tracks.append(meta_track)
-        self._fill_meta_track(meta_track)
+        with span('ScoreToMidiConverter meta track'):
+            meta_track = mido.MidiTrack()
+            self.mid.tracks.append(meta_track)
+            self._fill_meta_track(meta_track)
         
-        self._assign_voices_tracks()
+        with span('ScoreToMidiConverter voice tracks'):
+            self._assign_voices_tracks()
         
-        self.mid.save(self.filename)
+        with span('ScoreToMidiConverter save', filename=filename):
+            self.mid.save(self.filename)
         
     @property
     def score(self):
@@ -111,6 +118,7 @@ class ScoreToMidiConverter(object):
         return self.__filename
     
     @staticmethod
+    @traced()
     def convert_score(score, filename):
         """
         Static method to convert a Score to a midi file.
@@ -123,6 +131,7 @@ class ScoreToMidiConverter(object):
         smc.create(filename)
         
     @staticmethod 
+    @traced()
     def convert_line(line, filename, tempo=Tempo(60, Duration(1, 4)),
                      time_signature=TimeSignature(4, Duration(1, 4)), instrument_name='piano'):
         """
@@ -177,7 +186,7 @@ class ScoreToMidiConverter(object):
         voice_note_map = inst_voice.get_all_notes()
         
         for voice, notes in voice_note_map.items():
-            track = MidiTrack()
+            track = mido.MidiTrack()
             track.name = inst_voice.instrument.name
             self.mid.tracks.append(track)
             # For each note
@@ -270,7 +279,7 @@ class ScoreToMidiConverter(object):
                 tempo_value = int((60.0 / tempo_event.object.tempo) * beat_ratio * 1000000)
                 
                 ticks = int(current_tick_time - last_tick_time)
-                msg = MetaMessage('set_tempo', tempo=tempo_value, time=ticks)
+                msg = mido.MetaMessage('set_tempo', tempo=tempo_value, time=ticks)
                 meta_track.append(msg)   
                 last_tick_time = current_tick_time
             elif isinstance(tempo_event, TempoFunctionEvent):
@@ -295,7 +304,7 @@ class ScoreToMidiConverter(object):
                 
                     # tempo_value = (60/BMP) * (ts_beat / tempo_beat)
                     tempo_value = int((60.0 / tempo) * beat_ratio * 1000000)
-                    msg = MetaMessage('set_tempo', tempo=tempo_value, time=ticks)
+                    msg = mido.MetaMessage('set_tempo', tempo=tempo_value, time=ticks)
                     meta_track.append(msg)                      
                     
                     t1 += delta_wnt
@@ -392,8 +401,8 @@ class NoteMessage(MidiMessage):
         return self.__velocity
     
     def to_midi_message(self, ticks_from_prior_msg):
-        return Message(self.msg_type, note=self.note_value, velocity=self.velocity, time=ticks_from_prior_msg,
-                       channel=self.channel)
+        return mido.Message(self.msg_type, note=self.note_value, velocity=self.velocity, time=ticks_from_prior_msg,
+                            channel=self.channel)
     
     def __str__(self):
         return '{0} {1}[{2}]:pv=({3}, {4})'.format(self.abs_tick_time, self.msg_type, self.channel, self.note_value,
@@ -411,8 +420,8 @@ class ExpressionVelocityMessage(MidiMessage):
         return self.__velocity
     
     def to_midi_message(self, ticks_from_prior_msg):
-        return Message(self.msg_type, control=11, value=self.velocity, time=ticks_from_prior_msg,
-                       channel=self.channel)
+        return mido.Message(self.msg_type, control=11, value=self.velocity, time=ticks_from_prior_msg,
+                            channel=self.channel)
     
     def __str__(self):
         return '{0} {1}/{2}({3})'.format(self.abs_tick_time, self.msg_type, self.channel, self.velocity)
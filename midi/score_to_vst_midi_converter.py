@@ -29,6 +29,7 @@ from timemodel.tempo_event_sequence import TempoEventSequence
 
 from timemodel.dynamics_event import DynamicsEvent
 from timemodel.dynamics_function_event import DynamicsFunctionEvent
+from misc.tracing import traced
 
 
 class ScoreToVstMidiConverter(object):
@@ -75,6 +76,7 @@ class ScoreToVstMidiConverter(object):
 
         (self.fine_tempo_sequence, self.time_conversion) = self._build_time_conversion()
 
+    @traced()
     def create(self, channel_assignments=None, fps=42100):
         """
         Create midi information from the score.
@@ -104,6 +106,7 @@ class ScoreToVstMidiConverter(object):
         return meta_track, self.tracks
 
     @staticmethod
+    @traced()
     def convert_score(score, channel_assignments=None, fps=42100):
         """
         Static method to convert a Score to a midi file.
@@ -120,6 +123,7 @@ class ScoreToVstMidiConverter(object):
         return smc.create(channel_assignments, fps)
 
     @staticmethod
+    @traced()
     def convert_line(line, tempo=Tempo(60, Duration(1, 4)),
                      time_signature=TimeSignature(4, Duration(1, 4)), channel_assignments=None, fps=42100):
         """
@@ -108,10 +108,62 @@ class IntervalTree(object):
                     node.parent.parent.color = RBNode.Red
                     node.parent.parent.left_rotate()
     
-        self.root.color = RBNode.Black 
-        
+        self.root.color = RBNode.Black
+
         return node
-        
+
+    # Below this many intervals, put_all() puts them one at a time.
+    BULK_PUT_MINIMUM = 16
+
+    def put_all(self, interval_values):
+        """
+        Put a number of intervals at once.  Larger sets are added by relinking all the nodes, old and new, into a
+        balanced tree, in O(n) for n nodes plus a sort of the new nodes, rather than by repeated rebalancing.
+        Existing nodes are kept, so IntervalInfo's from earlier queries remain valid for delete().
+
+        Args:
+          interval_values: list of (Interval, value)
+        """
+        if len(interval_values) < IntervalTree.BULK_PUT_MINIMUM:
+            for interval, value in interval_values:
+                self.put(interval, value)
+            return
+
+        new_nodes = [RBNode(interval, value, self) for interval, value in interval_values]
+        nodes = list()
+        if self.root != self.nil:
+            self._in_order_nodes(self.root, nodes)
+        # Existing nodes are in key order, and the sort is stable, so equal keys stay in insertion order.
+        nodes.extend(new_nodes)
+        nodes.sort(key=lambda n: n.key)
+
+        max_depth = len(nodes).bit_length() - 1
+        self.root = self._link_balanced(nodes, 0, len(nodes), self.nil, 0, max_depth)
+        self.root.color = RBNode.Black
+
+    def _in_order_nodes(self, node, nodes):
+        if node.left != self.nil:
+            self._in_order_nodes(node.left, nodes)
+        nodes.append(node)
+        if node.right != self.nil:
+            self._in_order_nodes(node.right, nodes)
+
+    def _link_balanced(self, nodes, lo, hi, parent, depth, max_depth):
+        """
+        Link nodes[lo:hi] as a balanced subtree.  All leaves are at depth max_depth or max_depth - 1; coloring the
+        nodes at max_depth red and all others black satisfies the red-black properties.
+        """
+        if lo >= hi:
+            return self.nil
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.parent = parent
+        node.left = self._link_balanced(nodes, lo, mid, node, depth + 1, max_depth)
+        node.right = self._link_balanced(nodes, mid + 1, hi, node, depth + 1, max_depth)
+        node.color = RBNode.Red if depth == max_depth else RBNode.Black
+        node.update_min_max()
+        return node
+
     def query_point(self, point):
         """
         Query for all intervals that intersect a point.
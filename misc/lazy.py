@@ -0,0 +1,75 @@
+"""
+
+File: lazy.py
+
+Purpose: Deferred construction of class level tables, and deferred import of modules, so their cost is paid on
+         first use rather than at import.
+
+"""
+import importlib
+
+
+class LazyClassAttribute(object):
+    """
+    A class attribute whose value is built on first access.  For example:
+
+        class ChordTemplate(object):
+            PATTERN = LazyClassAttribute(re.compile, PATTERN_STRING)
+
+    On first access, through the class or an instance, the value is built as factory(*args), and replaces this
+    descriptor on the class that defined it, so later accesses are plain attribute lookups.
+    """
+
+    def __init__(self, factory, *args):
+        """
+        Constructor.
+        :param factory: callable building the attribute value.
+        :param args: arguments for factory.
+        """
+        self.__factory = factory
+        self.__args = args
+        self.__owner = None
+        self.__name = None
+
+    def __set_name__(self, owner, name):
+        self.__owner = owner
+        self.__name = name
+
+    def __get__(self, instance, owner=None):
+        value = self.__factory(*self.__args)
+        setattr(self.__owner, self.__name, value)
+        return value
+
+
+class LazyModule(object):
+    """
+    A module imported on first attribute access.  For example, at module level:
+
+        mido = LazyModule('mido')
+
+    then mido.Message imports mido on first use.  Each attribute, once read, is kept on the LazyModule, so later
+    reads are plain attribute lookups.
+    """
+
+    def __init__(self, name):
+        """
+        Constructor.
+        :param name: module name.
+        """
+        self.__name = name
+        self.__module = None
+
+    @property
+    def module(self):
+        """
+        The module, imported if not already.
+        """
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return self.__module
+
+    def __getattr__(self, name):
+        # Called only for attributes not yet kept.
+        value = getattr(self.module, name)
+        setattr(self, name, value)
+        return value
@@ -6,6 +6,7 @@ Purpose: Observable in an observer pattern.  In short, provides a means for
          an object to provide notification of event based on something 'happening' to it.
 
 """
+from contextlib import contextmanager
 
 
 class Observable(object):
@@ -13,6 +14,8 @@ class Observable(object):
     Implementation of observer in Observer pattern.  The class defines a means
     of notifying clients of changes to the observable, as calls to the observer's 
     'notification' method.
+
+    Notifications can be batched, see batch().
     """
 
     def __init__(self):
@@ -20,6 +23,36 @@ class Observable(object):
         Constructor
         """
         self.observers = set()
+        self.__batch_depth = 0
+        # (message_type, message, data) events held back by batch().
+        self.__batch_events = []
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that holds back notifications, e.g.
+
+            with line.batch():
+                for note in notes:
+                    line.append(note)
+
+        Within the batch, update() records each event rather than delivering it.  On leaving the outermost
+        batch, the recorded events are delivered together through update_batch(), so that observers can apply
+        them in one step.  Batches nest.
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0 and len(self.__batch_events) != 0:
+                events = self.__batch_events
+                self.__batch_events = []
+                self.update_batch(events)
+
+    @property
+    def in_batch(self):
+        return self.__batch_depth != 0
         
     def register(self, observer):
         """
@@ -71,5 +104,22 @@ class Observable(object):
           message: (string) any associated message about the event.
           data: (any type) any associated data about the event.
         """
+        if self.__batch_depth != 0:
+            self.__batch_events.append((message_type, message, data))
+            return
         for observer in self.observers:
             observer.notification(self, message_type, message, data)
+
+    def update_batch(self, events):
+        """
+        Deliver a list of events to all the observable's clients in one call, as their batch_notification.
+        Within a batch, the events are recorded for later delivery.
+
+        Args:
+          events: list of (message_type, message, data), in the order they happened.
+        """
+        if self.__batch_depth != 0:
+            self.__batch_events.extend(events)
+            return
+        for observer in self.observers:
+            observer.batch_notification(self, events)
@@ -32,4 +32,17 @@ class Observer(object):
           message: (string) any associated message about the event.
           data: (any type) any associated data about the event.
         """
-        pass   
\ No newline at end of file
+        pass
+
+    def batch_notification(self, observable, events):
+        """
+        Called with the events of a batch (see Observable.batch()).  By default, each event is passed to
+        notification() in turn.  Observers that can apply a set of changes more cheaply than one at a time should
+        override this.
+
+        Args:
+          observable: (Observable) the observable issuing the notification.
+          events: list of (message_type, message, data), in the order they happened.
+        """
+        for message_type, message, data in events:
+            self.notification(observable, message_type, message, data)   
\ No newline at end of file
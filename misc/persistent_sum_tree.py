@@ -0,0 +1,90 @@
+"""
+
+File: persistent_sum_tree.py
+
+Purpose: Defines an immutable list of numbers with prefix sums, where a changed copy shares all but a few nodes
+         with the original.
+
+"""
+
+
+class PersistentSumTree(object):
+    """
+    Immutable list of a fixed number of values, initially 0, held as a segment tree of partial sums.  set() returns
+    a new tree, copying only the O(log n) nodes on the path to the changed value; the rest are shared.  So keeping
+    many versions, e.g. one per search node, costs O(log n) per version.  Prefix sums and value lookups take
+    O(log n).  Values may be any numbers, e.g. Fraction's.
+
+    Nodes are tuples (sum, left, right), with None for a subtree of zeros.
+    """
+
+    def __init__(self, size, root=None):
+        """
+        Constructor.
+        :param size: number of values.
+        :param root: root node; None for all zeros.
+        """
+        self.__size = size
+        self.__root = root
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, index):
+        if index < 0 or index >= self.__size:
+            raise IndexError('Index {0} out of range [0, {1}).'.format(index, self.__size))
+        node = self.__root
+        lo = 0
+        hi = self.__size
+        while node is not None and hi - lo > 1:
+            mid = (lo + hi) // 2
+            if index < mid:
+                node, hi = node[1], mid
+            else:
+                node, lo = node[2], mid
+        return 0 if node is None else node[0]
+
+    def set(self, index, value):
+        """
+        Change a value.
+        :param index: origin 0 index of the value.
+        :param value: new value.
+        :return: new PersistentSumTree; this one is unchanged.
+        """
+        if index < 0 or index >= self.__size:
+            raise IndexError('Index {0} out of range [0, {1}).'.format(index, self.__size))
+        return PersistentSumTree(self.__size, PersistentSumTree._set(self.__root, 0, self.__size, index, value))
+
+    @staticmethod
+    def _set(node, lo, hi, index, value):
+        if hi - lo == 1:
+            return value, None, None
+        mid = (lo + hi) // 2
+        left, right = (None, None) if node is None else (node[1], node[2])
+        if index < mid:
+            left = PersistentSumTree._set(left, lo, mid, index, value)
+        else:
+            right = PersistentSumTree._set(right, mid, hi, index, value)
+        return (0 if left is None else left[0]) + (0 if right is None else right[0]), left, right
+
+    def prefix_sum(self, count):
+        """
+        Sum the first count values.
+        :param count: number of values, from index 0.
+        :return: the sum, 0 if count is 0.
+        """
+        total = 0
+        node = self.__root
+        lo = 0
+        hi = self.__size
+        while node is not None and count > lo:
+            if count >= hi:
+                return total + node[0]
+            mid = (lo + hi) // 2
+            if count <= mid:
+                node, hi = node[1], mid
+            else:
+                if node[1] is not None:
+                    total += node[1][0]
+                node, lo = node[2], mid
+        return total
@@ -305,14 +305,14 @@ class RBNode(object):
         
     def node_minimum(self):
         x = self
-        while self.left != self.nil:
-            x = self.left()
+        while x.left != self.nil:
+            x = x.left
         return x
     
     def node_maximum(self):
         x = self
-        while self.right != self.nil:
-            x = self.right()
+        while x.right != self.nil:
+            x = x.right
         return x
     
     def node_successor(self):
@@ -327,71 +327,56 @@ class RBNode(object):
             
     def delete_node(self, rb_node):
         """
-        Best description is in Cormen ( p. 251):
-        
+        Best description is in Cormen (3rd ed., p. 324, RB-DELETE):
+
         The procedure for deleting a given node z from a binary search tree takes as an argument a pointer to z.
-        The procedure considers the three cases shown in Figure 13.4.  If z has no children, we modify its parent p[z]
-        to replace z with NIL as its child.  If the node has only a single child, we "splice out" z by making a 
-        new link between its child and its parent.  Finally, if the node has two children,
-        we splice out z's successor y,
-        which has no left child ... and replace the contents of z with the contents of y. 
-        
+        If z has at most one child, z is replaced by that child (or nil).  If z has two children, z's successor y,
+        which has no left child, is spliced out of its position and takes z's place, parent, children and color.
+
         In order to key prior search results valid (ref. IntervalInfo), we ALWAYS want to get rid of z.  So in the third
-        case, we really want to replace rb_node with its successor, moving left, right from rb_node to the successor and
-        re-assigning the parentage.
+        case, we really replace rb_node with its successor node, rather than copying the successor's contents.
+
+        As in Cormen, the parent of nil is set by the transplant, so that the fixup can start from nil.
         """
-        if rb_node.left == self.nil or rb_node.right == self.nil:
-            x = rb_node.left if rb_node.left != self.nil else rb_node.right
-            x.parent = rb_node.parent
-            if rb_node.parent == self.nil:
-                self.interval_tree.root = x
-            else:
-                if rb_node == rb_node.parent.left:
-                    rb_node.parent.left = x
-                else:
-                    rb_node.parent.right = x
-            # Please test to see if this fixes spans
-            if rb_node.parent != self.nil:
-                rb_node.parent.apply_update()
-            if x != self.nil and rb_node.color == RBNode.Black:
-                self._rb_delete_fixup(x)
+        z = rb_node
+        y = z
+        y_original_color = y.color
+        if z.left == self.nil:
+            x = z.right
+            self._transplant(z, z.right)
+        elif z.right == self.nil:
+            x = z.left
+            self._transplant(z, z.left)
         else:
-            y = rb_node.node_successor()
-            x = y.left if y.left != self.nil else y.right 
-            if x != self.nil:
-                x.parent = y.parent if y.parent != rb_node else y
-            if y.parent == self.nil:
-                self.interval_tree.root = x
+            y = z.right.node_minimum()
+            y_original_color = y.color
+            x = y.right
+            if y.parent == z:
+                x.parent = y
             else:
-                if y.parent != rb_node:
-                    if y == y.parent.left:
-                        y.parent.left = x
-                    else:
-                        y.parent.right = x  
-                    
-            # replace rb_node with y
-            
-            y.left = rb_node.left 
-            if y.left != self.nil:
-                y.left.parent = y
-            y.right = rb_node.right if y.parent != rb_node else y.right
-            if y.right != self.nil:
+                self._transplant(y, y.right)
+                y.right = z.right
                 y.right.parent = y
-            y.color = rb_node.color
-            y.parent = rb_node.parent
-            if rb_node.parent == self.nil:
-                self.interval_tree.root = y
-            else:
-                if rb_node == rb_node.parent.left:
-                    rb_node.parent.left = y
-                else:
-                    rb_node.parent.right = y
-            # Please test to see if this fixes spans
-            # I think the span for y should be computed immediately, then y.apply_update()
-            if y != self.nil:
-                y.apply_update()
-            if y.color == RBNode.Black and x != self.nil:
-                self._rb_delete_fixup(x)    
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.color = z.color
+
+        # Recompute spans from the lowest changed node up.
+        if x.parent != self.nil:
+            x.parent.apply_update()
+
+        if y_original_color == RBNode.Black:
+            self._rb_delete_fixup(x)
+
+    def _transplant(self, u, v):
+        if u.parent == self.nil:
+            self.interval_tree.root = v
+        elif u == u.parent.left:
+            u.parent.left = v
+        else:
+            u.parent.right = v
+        v.parent = u.parent
 
     def _rb_delete_fixup(self, x):
         while x != self.interval_tree.root and x.color == RBNode.Black:
@@ -404,11 +389,13 @@ class RBNode(object):
                     w = x.parent.right
                 if w.left.color == RBNode.Black and w.right.color == RBNode.Black:
                     w.color = RBNode.Red
+                    x = x.parent
                 else:
                     if w.right.color == RBNode.Black:
                         w.left.color = RBNode.Black
                         w.color = RBNode.Red
                         w.right_rotate()
+                        w = x.parent.right
                     w.color = x.parent.color
                     x.parent.color = RBNode.Black
                     w.right.color = RBNode.Black
@@ -423,11 +410,13 @@ class RBNode(object):
                     w = x.parent.left
                 if w.right.color == RBNode.Black and w.left.color == RBNode.Black:
                     w.color = RBNode.Red
+                    x = x.parent
                 else:
                     if w.left.color == RBNode.Black:
                         w.right.color = RBNode.Black
                         w.color = RBNode.Red
                         w.left_rotate()
+                        w = x.parent.left
                     w.color = x.parent.color
                     x.parent.color = RBNode.Black
                     w.left.color = RBNode.Black
@@ -0,0 +1,298 @@
+"""
+
+File: tracing.py
+
+Purpose: Lightweight span tracing, for seeing where the time of a transformation, solve, search or MIDI
+         conversion goes.  Spans are recorded only while a Tracer is installed, and export to Chrome trace_event
+         JSON (for chrome://tracing or Perfetto) or to an aggregated text report.
+
+Usage:
+    with Tracer() as tracer:
+        t_retrograde.apply(...)
+    tracer.write_chrome_trace('retrograde.json')
+    print(tracer.report())
+
+    Code is instrumented with the traced decorator, or with span() for parts of a function:
+        @traced()
+        def apply(self, ...):
+            with span('build constraints', notes=len(notes)) as s:
+                ...
+                s.set('constraints', len(constraints))
+
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class Span(object):
+    """
+    A timed, named part of a run, with attributes.  A Span is a context manager, recorded in its tracer on exit.
+    """
+
+    __slots__ = ('tracer', 'name', 'category', 'attributes', 'start', 'end', 'thread_id', 'depth', 'child_seconds')
+
+    def __init__(self, tracer, name, category, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.start = None
+        self.end = None
+        self.thread_id = None
+        self.depth = 0
+        # Time spent in nested spans, for self time.
+        self.child_seconds = 0
+
+    @property
+    def seconds(self):
+        return 0 if self.end is None else self.end - self.start
+
+    @property
+    def self_seconds(self):
+        return self.seconds - self.child_seconds
+
+    def set(self, key, value):
+        """
+        Set an attribute.
+        :param key: str
+        :param value: JSON serializable value
+        """
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.tracer._start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self.tracer._finish(self)
+        return False
+
+    def __str__(self):
+        return '{0} {1:.6f}s'.format(self.name, self.seconds)
+
+
+class _NullSpan(object):
+    """
+    The span given when no tracer is installed, doing nothing.
+    """
+
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer(object):
+    """
+    Records spans while installed (see install(), or use the tracer as a context manager).  Spans nest per thread.
+    """
+
+    def __init__(self):
+        self.__spans = list()
+        # thread id --> stack of open spans
+        self.__stacks = dict()
+        self.__origin = time.perf_counter()
+        self.__previous = None
+        self.__lock = threading.Lock()
+
+    @property
+    def spans(self):
+        """
+        The finished spans, in order of finishing.
+        """
+        return list(self.__spans)
+
+    def span(self, name, category='', **attributes):
+        """
+        Create a span, to be used as a context manager.
+        :param name: str
+        :param category: str, e.g. the package instrumented.
+        :param attributes: attribute values.
+        :return: Span
+        """
+        return Span(self, name, category, attributes)
+
+    def current(self):
+        """
+        The innermost open span of the calling thread, or None.
+        """
+        stack = self.__stacks.get(threading.get_ident())
+        return stack[-1] if stack else None
+
+    def _start(self, span):
+        thread_id = threading.get_ident()
+        stack = self.__stacks.get(thread_id)
+        if stack is None:
+            stack = self.__stacks.setdefault(thread_id, list())
+        span.thread_id = thread_id
+        span.depth = len(stack)
+        stack.append(span)
+        span.start = time.perf_counter()
+
+    def _finish(self, span):
+        span.end = time.perf_counter()
+        stack = self.__stacks[span.thread_id]
+        # Spans close in order; an exception may unwind several together.
+        while stack and stack.pop() is not span:
+            pass
+        if stack:
+            stack[-1].child_seconds += span.seconds
+        with self.__lock:
+            self.__spans.append(span)
+
+    def install(self):
+        """
+        Make this the tracer that spans are recorded in, keeping the prior one to restore on uninstall().
+        :return: self
+        """
+        global _tracer
+        self.__previous = _tracer
+        _tracer = self
+        return self
+
+    def uninstall(self):
+        global _tracer
+        if _tracer is self:
+            _tracer = self.__previous
+        self.__previous = None
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        return False
+
+    def clear(self):
+        self.__spans = list()
+
+    def chrome_trace(self):
+        """
+        The spans as Chrome trace_event complete events.
+        :return: dict, in the JSON object format.
+        """
+        pid = os.getpid()
+        events = list()
+        for span in sorted(self.__spans, key=lambda s: s.start):
+            events.append({'name': span.name,
+                           'cat': span.category,
+                           'ph': 'X',
+                           'ts': round((span.start - self.__origin) * 1e6, 3),
+                           'dur': round(span.seconds * 1e6, 3),
+                           'pid': pid,
+                           'tid': span.thread_id,
+                           'args': {key: Tracer._json_value(value) for key, value in span.attributes.items()}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, filename):
+        """
+        Write the spans as a Chrome trace_event JSON file.
+        :param filename: str
+        """
+        with open(filename, 'w') as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+
+    @staticmethod
+    def _json_value(value):
+        return value if value is None or isinstance(value, (bool, int, float, str)) else str(value)
+
+    def aggregate(self):
+        """
+        Totals of the spans by name.
+        :return: OrderedDict name --> [count, total seconds, self seconds, max seconds], by decreasing total.
+        """
+        totals = dict()
+        for span in self.__spans:
+            entry = totals.get(span.name)
+            if entry is None:
+                totals[span.name] = [1, span.seconds, span.self_seconds, span.seconds]
+            else:
+                entry[0] += 1
+                entry[1] += span.seconds
+                entry[2] += span.self_seconds
+                entry[3] = max(entry[3], span.seconds)
+        return OrderedDict(sorted(totals.items(), key=lambda item: -item[1][1]))
+
+    def report(self):
+        """
+        A flat text report of the spans aggregated by name.
+        :return: str
+        """
+        lines = ['{0:<56} {1:>7} {2:>11} {3:>11} {4:>11}'.format('span', 'count', 'total ms', 'self ms', 'max ms')]
+        for name, (count, total, self_total, largest) in self.aggregate().items():
+            lines.append('{0:<56} {1:>7} {2:>11.3f} {3:>11.3f} {4:>11.3f}'.format(
+                name, count, total * 1e3, self_total * 1e3, largest * 1e3))
+        return '\n'.join(lines)
+
+
+# The installed tracer, or None.
+_tracer = None
+
+
+def current_tracer():
+    return _tracer
+
+
+def span(name, category='', **attributes):
+    """
+    A span in the installed tracer, or a span doing nothing if none is installed.
+    :param name: str
+    :param category: str
+    :param attributes: attribute values.
+    :return: Span or NULL_SPAN
+    """
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, category, attributes)
+
+
+def annotate(**attributes):
+    """
+    Set attributes on the innermost open span, if tracing.
+    :param attributes: attribute values.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return
+    current = tracer.current()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def traced(name=None, category=None):
+    """
+    Decorator tracing each call of a function as a span.
+    :param name: span name, by default the function's qualified name, e.g. 'TRetrograde.apply'.
+    :param category: span category, by default the function's package, e.g. 'transformation.retrograde'.
+    :return: decorator
+    """
+    def decorate(function):
+        span_name = name if name is not None else function.__qualname__
+        span_category = category if category is not None else \
+            (function.__module__.rpartition('.')[0] or function.__module__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+            with Span(tracer, span_name, span_category, dict()):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
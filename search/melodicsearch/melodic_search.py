@@ -13,6 +13,7 @@ from structure.line import Line
 from timemodel.position import Position
 from tonalmodel.interval import Interval
 from search.melodicsearch.melodic_search_analysis import NotePairInformation
+from misc.tracing import annotate, traced
 
 
 class MelodicSearch(object):
@@ -33,13 +34,14 @@ class MelodicSearch(object):
         self.__analysis = MelodicSearchAnalysis(self.pattern_line, self.pattern_hct)
 
     @staticmethod
+    @traced()
     def create(pattern_string):
         """
         Constructor for MelodicSearch using a text string representation for the pattern.
         :param pattern_string:
         :return:
         """
-        line, hct = LineGrammarExecutor().parse(pattern_string)
+        line, hct = LineGrammarExecutor(use_cache=True).parse(pattern_string)
         return MelodicSearch(line, hct)
 
     @property
@@ -54,6 +56,7 @@ class MelodicSearch(object):
     def analysis(self):
         return self.__analysis
 
+    @traced()
     def search(self, target_line, target_hct, search_options=GlobalSearchOptions()):
         """
         Search a target_line/target_hct for matches to the pattern, ala GlobalSearchOptions.
@@ -77,6 +80,7 @@ class MelodicSearch(object):
             if search_answers is not None and len(search_answers) != 0:
                 position_answers.extend(search_answers)
 
+        annotate(matches=len(position_answers))
         return position_answers
 
     def search_notes(self, target_line, target_hct, target_hc_index, search_options):
@@ -291,6 +295,11 @@ class MelodicSearch(object):
 
     @staticmethod
     def hc_meets_options(p_hc_information, t_hc, search_options):
+        # Harmonic contexts with the same harmony meet every option.  Tonalities and chords are interned,
+        # so this is usually an identity check.
+        if p_hc_information.hc.is_same_harmony(t_hc):
+            return True
+
         if search_options.hct_match_tonality_key_tone:
             if p_hc_information.hc.tonality.diatonic_tone != t_hc.tonality.diatonic_tone:
                 return False
@@ -0,0 +1,279 @@
+"""
+File: fast_line_grammar_parser.py
+
+Purpose: Hand-written tokenizer and recursive descent parser for the LineGrammar notation (see
+         resources/LineGrammar.g4), as a fast alternative to the ANTLR generated parser.
+"""
+
+from structure.LineGrammar.core.line_constructor import LineConstructor
+
+
+class FastLineGrammarParser(object):
+    """
+    Parser for LineGrammar text that drives LineConstructor exactly as the ANTLR generated LineGrammarParser does,
+    and so builds identical lines and harmonic context tracks.
+
+    Tokenization follows the ANTLR lexer: the longest match wins, with ties going to the token defined first
+    in the grammar, e.g. 'bb' is an ALTERATION, not NOTELETTERS.  Unlike the ANTLR parser, which reports syntax
+    errors and recovers, this parser raises an Exception on the first syntax error.
+    """
+
+    INT = 'INT'
+    COMMON = 'COMMON_DURATION_CHORD_NUMERAL_LETTERS'
+    DURATIONLETTER = 'DURATIONLETTER'
+    ALTERATION = 'ALTERATION'
+    MODALITY = 'MODALITY'
+    CHORDNUMERAL = 'CHORDNUMERAL'
+    CHORDMODALITY = 'CHORDMODALITY'
+    NOTELETTERS = 'NOTELETTERS'
+    END = 'EOF'
+
+    SYSTEM_MODALITIES = ['Major', 'Natural', 'Melodic', 'Harmonic', 'Minor',
+                         'NaturalMinor', 'MelodicMinor', 'HarmonicMinor', 'HarmonicMajor',
+                         'Ionian', 'Dorian', 'Phrygian', 'Lydian', 'Myxolydian', 'Aeolian', 'Locrian',
+                         'WholeTone',
+                         'MajorPentatonic', 'EgyptianPentatonic', 'MinorBluesPentatonic', 'MajorBluesPentatonic',
+                         'MinorPentatonic',
+                         'HWOctatonic', 'WHOctatonic', 'MajorBlues', 'MinorBlues']
+
+    # Fixed text tokens, in grammar order.  Literal tokens have their text as token type.
+    TOKEN_LITERALS = [
+        ('[', ['[']), (']', [']']), ('(', ['(']), (',', [',']), (')', [')']), (':', [':']), ('/', ['/']),
+        ('<', ['<']), ('>', ['>']), ('@', ['@']), ('-', ['-']), ('{', ['{']), ('}', ['}']),
+        (COMMON, ['I', 'i']),
+        (DURATIONLETTER, list('WwHhQqSsTtXx')),
+        (ALTERATION, ['bb', '#', '##']),
+        (MODALITY, SYSTEM_MODALITIES),
+        (CHORDNUMERAL, ['II', 'III', 'IV', 'V', 'VI', 'VII', 'ii', 'iii', 'iv', 'v', 'vi', 'vii']),
+        (CHORDMODALITY, ['Maj7', 'Min7', 'Dom7', 'Maj', 'Min', 'Aug', 'Dim', 'HalfDim7', 'It']),
+        (NOTELETTERS, [letter + alteration for alteration in ['', 'b', 'bb', '#', '##']
+                       for letter in 'CDEFGABcdefgab'] + ['R', 'r']),
+    ]
+
+    # token text --> token type, for fixed text tokens.
+    LITERAL_MAP = {text: token_type for token_type, texts in reversed(TOKEN_LITERALS) for text in texts}
+    # first character --> lengths of fixed text tokens starting with it, longest first.
+    LITERAL_LENGTHS = dict()
+    for _text in sorted(LITERAL_MAP, key=len, reverse=True):
+        if len(_text) not in LITERAL_LENGTHS.setdefault(_text[0], []):
+            LITERAL_LENGTHS[_text[0]].append(len(_text))
+    del _text
+
+    WHITESPACE = ' \t'
+    DIGITS = '0123456789'
+
+    def __init__(self, line_text):
+        """
+        Constructor.
+        :param line_text: LineGrammar text.
+        """
+        self.__tokens = FastLineGrammarParser.tokenize(line_text)
+        self.__index = 0
+        self.lc = LineConstructor()
+
+    @staticmethod
+    def parse(line_text):
+        """
+        Parse LineGrammar text.
+        :param line_text: LineGrammar text.
+        :return: LineConstructor holding the parsed line and harmonic context track.
+        """
+        parser = FastLineGrammarParser(line_text)
+        parser.motif()
+        return parser.lc
+
+    @staticmethod
+    def tokenize(text):
+        """
+        Split LineGrammar text into tokens.
+        :param text: LineGrammar text.
+        :return: list of (token type, token text), ending with an END token.  As with the ANTLR parser, text
+                 after the closing '}' is tokenized but not parsed.
+        """
+        tokens = list()
+        literal_map = FastLineGrammarParser.LITERAL_MAP
+        literal_lengths = FastLineGrammarParser.LITERAL_LENGTHS
+        i = 0
+        n = len(text)
+        while i < n:
+            c = text[i]
+            if c in FastLineGrammarParser.WHITESPACE:
+                i += 1
+                continue
+            if c in FastLineGrammarParser.DIGITS:
+                j = i + 1
+                while j < n and text[j] in FastLineGrammarParser.DIGITS:
+                    j += 1
+                tokens.append((FastLineGrammarParser.INT, text[i:j]))
+                i = j
+                continue
+            if c == '!':
+                # User modality: '!' followed by letters.
+                j = i + 1
+                while j < n and ('a' <= text[j] <= 'z' or 'A' <= text[j] <= 'Z'):
+                    j += 1
+                if j > i + 1:
+                    tokens.append((FastLineGrammarParser.MODALITY, text[i:j]))
+                    i = j
+                    continue
+            for length in literal_lengths.get(c, []):
+                token_type = literal_map.get(text[i:i + length])
+                if token_type is not None:
+                    tokens.append((token_type, text[i:i + length]))
+                    i += length
+                    break
+            else:
+                raise Exception('Parsing error: unrecognized character \'{0}\' at {1} in \'{2}\'.'.format(c, i, text))
+        tokens.append((FastLineGrammarParser.END, ''))
+        return tokens
+
+    def _peek(self, ahead=0):
+        return self.__tokens[min(self.__index + ahead, len(self.__tokens) - 1)][0]
+
+    def _match(self, token_type):
+        token = self.__tokens[self.__index]
+        if token[0] != token_type:
+            raise Exception('Parsing error: expected {0} but found \'{1}\' at token {2}.'.format(
+                token_type, token[1], self.__index))
+        self.__index += 1
+        return token[1]
+
+    # motif: LINEBEGIN ( motificElement )+ LINEEND;
+    def motif(self):
+        self._match('{')
+        self.motific_element()
+        while self._peek() != '}':
+            self.motific_element()
+        self._match('}')
+
+    # motificElement: ( (primitiveNote | harmonicTag) | beam | tuplet);
+    def motific_element(self):
+        token_type = self._peek()
+        if token_type == '[':
+            self.beam()
+        elif token_type == '<':
+            self.harmonic_tag()
+        elif token_type == '(' and self._peek(1) != FastLineGrammarParser.INT:
+            # A note duration fraction starts '(' INT, a tuplet '(' duration.
+            self.tuplet()
+        else:
+            self.lc.add_note(self.primitive_note())
+
+    # primitiveNote: (duration ( DOT )*)? pitch ( TIE )?;
+    def primitive_note(self):
+        dots = 0
+        dur = None
+        ties = False
+        if self._peek() != FastLineGrammarParser.NOTELETTERS:
+            dur = self.duration()
+            while self._peek() == '@':
+                self._match('@')
+                dots += 1
+        p = self.pitch()
+        if self._peek() == '-':
+            self._match('-')
+            ties = True
+        return self.lc.construct_note(p, dur, dots, ties)
+
+    # beam: '[' ( motificElement )+ ']';
+    def beam(self):
+        self._match('[')
+        self.lc.start_level()
+        self.motific_element()
+        while self._peek() != ']':
+            self.motific_element()
+        self._match(']')
+        self.lc.end_level()
+
+    # tuplet: '(' duration ',' dur_int=INT ')' '[' ( motificElement )+ ']';
+    def tuplet(self):
+        self._match('(')
+        d = self.duration()
+        self._match(',')
+        dur_int = int(self._match(FastLineGrammarParser.INT))
+        self._match(')')
+        self._match('[')
+        self.lc.start_level(d, dur_int=dur_int)
+        self.motific_element()
+        while self._peek() != ']':
+            self.motific_element()
+        self._match(']')
+        self.lc.end_level()
+
+    # pitch: tone (':' INT)?;
+    def pitch(self):
+        tt = self.tone()
+        reg = None
+        if self._peek() == ':':
+            self._match(':')
+            reg = int(self._match(FastLineGrammarParser.INT))
+        return self.lc.construct_pitch(tt, reg)
+
+    # tone: NOTELETTERS;
+    def tone(self):
+        return LineConstructor.construct_tone_from_tone_letters(self._match(FastLineGrammarParser.NOTELETTERS))
+
+    # duration: DURATIONLETTER | COMMON_DURATION_CHORD_NUMERAL_LETTERS | '(' durationFraction ')';
+    def duration(self):
+        token_type = self._peek()
+        if token_type == FastLineGrammarParser.DURATIONLETTER or token_type == FastLineGrammarParser.COMMON:
+            return LineConstructor.construct_duration_by_shorthand(self._match(token_type))
+        self._match('(')
+        numerator = int(self._match(FastLineGrammarParser.INT))
+        self._match(':')
+        denominator = int(self._match(FastLineGrammarParser.INT))
+        self._match(')')
+        return LineConstructor.construct_duration(numerator, denominator)
+
+    # tonality: tone '-' MODALITY ('(' INT ')')?;
+    def tonality(self):
+        t = self.tone()
+        self._match('-')
+        modality = self._match(FastLineGrammarParser.MODALITY)
+        modal_index = 0
+        if self._peek() == '(':
+            self._match('(')
+            modal_index = int(self._match(FastLineGrammarParser.INT))
+            self._match(')')
+        return self.lc.construct_tonality(t, modality, modal_index)
+
+    # chordTemplate: (tone '-' CHORDMODALITY)
+    #                | ((CHORDNUMERAL | COMMON) CHORDMODALITY? ('/' (CHORDNUMERAL | COMMON) ('-' MODALITY)?)?);
+    def chord_template(self):
+        if self._peek() == FastLineGrammarParser.NOTELETTERS:
+            t = self.tone()
+            self._match('-')
+            return self.lc.construct_chord_template(t, None, self._match(FastLineGrammarParser.CHORDMODALITY))
+
+        token_type = self._peek()
+        if token_type != FastLineGrammarParser.COMMON:
+            token_type = FastLineGrammarParser.CHORDNUMERAL
+        numeral = self._match(token_type)
+        cm = None
+        if self._peek() == FastLineGrammarParser.CHORDMODALITY:
+            cm = self._match(FastLineGrammarParser.CHORDMODALITY)
+        ctemplate = self.lc.construct_chord_template(None, numeral, cm)
+
+        if self._peek() == '/':
+            self._match('/')
+            token_type = self._peek()
+            if token_type != FastLineGrammarParser.COMMON:
+                token_type = FastLineGrammarParser.CHORDNUMERAL
+            secondary_numeral = self._match(token_type)
+            secondary_modality = None
+            if self._peek() == '-':
+                self._match('-')
+                secondary_modality = self._match(FastLineGrammarParser.MODALITY)
+            ctemplate = self.lc.construct_secondary_chord_template(ctemplate, secondary_numeral, secondary_modality)
+        return ctemplate
+
+    # harmonicTag: '<' (( tonality ':' chordTemplate) | ( ':' chordTemplate)) '>';
+    def harmonic_tag(self):
+        self._match('<')
+        tonality = None
+        if self._peek() != ':':
+            tonality = self.tonality()
+        self._match(':')
+        ctemplate = self.chord_template()
+        self.lc.construct_harmonic_tag(tonality, ctemplate)
+        self._match('>')
@@ -11,6 +11,7 @@ from harmoniccontext.harmonic_context import HarmonicContext
 from harmoniccontext.harmonic_context_track import HarmonicContextTrack
 from harmonicmodel.chord_template import ChordTemplate
 from harmonicmodel.secondary_chord_template import SecondaryChordTemplate
+from misc.lazy import LazyClassAttribute
 from structure.note import Note
 from structure.line import Line
 from structure.line import Tuplet
@@ -66,7 +67,7 @@ class LineConstructor(object):
 
     DEFAULT_BEAM_DURATION = Duration(1, 8)
     DEFAULT_LINE_DURATION = Duration(1, 4)
-    DEFAULT_TONALITY = Tonality.create(ModalityType.Major, DiatonicToneCache.get_tone('C'))
+    DEFAULT_TONALITY = LazyClassAttribute(Tonality.create, ModalityType.Major, 'C')
 
     def __init__(self):
         """
@@ -4,10 +4,8 @@ File: line_grammar_executor.py
 Purpose: Convenience class allowing execution of parsing line grammar strings into line and harmonic context track.
 """
 
-import antlr4
-
-from structure.LineGrammar.LineGrammarParser import LineGrammarParser
-from structure.LineGrammar.LineGrammarLexer import LineGrammarLexer
+from structure.LineGrammar.core.fast_line_grammar_parser import FastLineGrammarParser
+from structure.LineGrammar.core.line_parse_cache import LineParseCache
 
 
 class LineGrammarExecutor(object):
@@ -15,8 +13,23 @@ class LineGrammarExecutor(object):
     Class to parse a string into a line and an hct.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, use_fast_parser=False, use_cache=False):
+        """
+        Constructor.
+        :param use_fast_parser: If True, parse with the hand-written FastLineGrammarParser, which builds the same
+                                line and hct as the ANTLR parser, but raises on the first syntax error.
+        :param use_cache: If True, parse through the shared LineParseCache, returning clones of cached parses.
+        """
+        self.__use_fast_parser = use_fast_parser
+        self.__use_cache = use_cache
+
+    @property
+    def use_fast_parser(self):
+        return self.__use_fast_parser
+
+    @property
+    def use_cache(self):
+        return self.__use_cache
 
     def parse(self, line_text):
         """
@@ -24,6 +37,18 @@ class LineGrammarExecutor(object):
         :param line_text:
         :return: (line, hct)
         """
+        if self.use_cache:
+            return LineParseCache.get_cache().parse(line_text, self.use_fast_parser)
+
+        if self.use_fast_parser:
+            lc = FastLineGrammarParser.parse(line_text)
+            return lc.line, lc.hct
+
+        # The ANTLR runtime and generated parser are costly to import, and are loaded only when used.
+        import antlr4
+        from structure.LineGrammar.LineGrammarParser import LineGrammarParser
+        from structure.LineGrammar.LineGrammarLexer import LineGrammarLexer
+
         lexer = LineGrammarLexer(antlr4.InputStream(line_text))
         stream = antlr4.CommonTokenStream(lexer)
         parser = LineGrammarParser(stream)
@@ -0,0 +1,105 @@
+"""
+File: line_parse_cache.py
+
+Purpose: LRU cache of LineGrammar parses, keyed by the source text.
+"""
+from collections import OrderedDict
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+
+
+class LineParseCache(object):
+    """
+    LRU cache of parsed lines and harmonic context tracks, keyed by the LineGrammar text (and the parser used).
+
+    The cache holds the parsed line and hct, and returns clones of them, so callers are free to modify what they
+    get.  Cloning is several times faster than parsing.  The clones share pitches, tonalities and chords with the
+    cached parse; these are not modified in place.
+
+    Parse failures are not cached.
+
+    The cache is implemented as a singleton.  Access should be through get_cache().
+    """
+
+    DEFAULT_CAPACITY = 256
+
+    PARSE_CACHE = None
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Constructor.
+        :param capacity: maximum number of parses held.
+        """
+        self.__capacity = capacity
+        # (line text, use fast parser) --> (line, hct), least recently used first.
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def get_cache():
+        if LineParseCache.PARSE_CACHE is None:
+            LineParseCache.PARSE_CACHE = LineParseCache()
+        return LineParseCache.PARSE_CACHE
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        self.__capacity = capacity
+        self.__evict()
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def parse(self, line_text, use_fast_parser=False):
+        """
+        Parse LineGrammar text, through the cache.
+        :param line_text: LineGrammar text.
+        :param use_fast_parser: see LineGrammarExecutor.
+        :return: (line, hct), clones of the cached parse.
+        """
+        key = (line_text, use_fast_parser)
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+            entry = LineGrammarExecutor(use_fast_parser=use_fast_parser).parse(line_text)
+            self.__entries[key] = entry
+            self.__evict()
+        else:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+        line, hct = entry
+        return line.clone(), LineParseCache.clone_hct(hct)
+
+    def clear(self):
+        self.__entries.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __evict(self):
+        while len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    @staticmethod
+    def clone_hct(hct):
+        """
+        Copy a harmonic context track, with new harmonic contexts sharing the tonalities and chords of hct.
+        :param hct: HarmonicContextTrack
+        :return: HarmonicContextTrack
+        """
+        new_hct = HarmonicContextTrack()
+        new_hct.extend([HarmonicContext(hc.tonality, hc.chord, hc.duration) for hc in hct.hc_list()])
+        return new_hct
@@ -222,3 +222,11 @@ class AbstractNoteCollective(AbstractNote, Observer, Observable):
             self.update(AbstractNote.NOTES_ADDED_EVENT, None, data)
         elif message_type == Line.LINE_NOTES_ADDED_EVENT:
             self.update(Line.LINE_NOTES_ADDED_EVENT, None, data)
+
+    def batch_notification(self, observable, events):
+        # Pass a batch up as one batch, with the same events that notification() passes up.
+        from structure.line import Line
+        events = [(message_type, None, data) for message_type, _, data in events
+                  if message_type == AbstractNote.NOTES_ADDED_EVENT or message_type == Line.LINE_NOTES_ADDED_EVENT]
+        if len(events) != 0:
+            self.update_batch(events)
@@ -77,10 +77,7 @@ class Line(AbstractNoteCollective):
                 offset += n.duration
         else:
             self._append_note(note_structure, offset)
-            
-        # sort by relative offset    Pins can happen any where, this helps maintains some sequential order to the line 
-        sorted(self.sub_notes, key=lambda n1: n1.relative_position)
-            
+
         self.update(Line.LINE_NOTES_ADDED_EVENT, None, note_structure) 
             
     def _append_note(self, note, offset):
@@ -100,10 +97,7 @@ class Line(AbstractNoteCollective):
                 self._remove_note(n)
         else:
             self._remove_note(note_structure)
-            
-        # sort by relative offset    Unpins can happen any where, this helps maintains some sequential order to the line 
-        sorted(self.sub_notes, key=lambda n1: n1.relative_position)
-            
+
         self.update(Line.LINE_NOTES_REMOVED_EVENT, None, note_structure) 
         
     def _remove_note(self, note):
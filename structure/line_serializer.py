@@ -0,0 +1,363 @@
+"""
+
+File: line_serializer.py
+
+Purpose: Compact binary serialization of lines with their harmonic context tracks, and a corpus file format
+         of such records that can be loaded through a memory map.
+
+"""
+import mmap
+import pickle
+import struct
+from fractions import Fraction
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from structure.beam import Beam
+from structure.line import Line
+from structure.note import Note
+from structure.tuplet import Tuplet
+from timemodel.duration import Duration
+from timemodel.offset import Offset
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.modality import ModalityType
+from tonalmodel.tonality import Tonality
+
+
+class LineSerializer(object):
+    """
+    Serializer of lines and their harmonic context tracks to compact binary records.
+
+    A serializer holds a harmony table, the list of distinct (modality type name, root tone symbol, modal index,
+    chord template) of the records it has written, which records reference by index.  The table is shared by all
+    records of a corpus, and is written once, pickled.  A record holds:
+        header: format version, number of harmonic contexts.
+        harmonic contexts: (harmony table index, duration) each, in track order.
+        note tree: pre-order list of items, each starting with an op code:
+            NOTE (tied, dots, pitch key or -1 for a rest, duration), BEAM, TUPLET (unit duration, unit duration
+            factor), LINE, END (closes the latest BEAM, TUPLET or LINE), OFFSET (offset of the next item within
+            its Line, when it does not directly follow the prior item).
+    Note durations are stored as 16 bit numerator, denominator pairs, other durations and offsets as 32 bit pairs,
+    so that a note takes 7 bytes.  Notes are rebuilt with their pitch from DiatonicPitch.from_pitch_key(), and
+    tonalities and chords are built once per table entry and shared by the records loaded.
+
+    serialize() and deserialize() handle a single line and track, with its own harmony table.
+
+    Line instruments are not serialized.  As the harmony table is pickled, only load data from trusted sources.
+    """
+
+    VERSION = 1
+
+    # Op codes, in the low 3 bits of an item's first byte.  Note items hold the tie flag and dots in the high bits.
+    NOTE, BEAM, TUPLET, LINE, END, OFFSET = range(6)
+    OP_MASK = 0x07
+    TIED = 0x08
+    DOTS_SHIFT = 4
+    MAX_DOTS = 15
+    MAX_NOTE_TERM = 0xFFFF
+
+    HEADER = struct.Struct('<BI')
+    HC = struct.Struct('<HII')
+    OP = struct.Struct('<B')
+    NOTE_ITEM = struct.Struct('<BhHH')
+    TUPLET_ITEM = struct.Struct('<BIIII')
+    OFFSET_ITEM = struct.Struct('<BII')
+    TABLE_LENGTH = struct.Struct('<I')
+
+    REST_KEY = -1
+
+    def __init__(self, harmony_table=None):
+        """
+        Constructor.
+        :param harmony_table: pickled harmony table (see harmony_table()) of the records to load, or None.
+        """
+        self.__harmonies = list() if harmony_table is None else pickle.loads(harmony_table)
+        # harmony key --> index into harmonies
+        self.__harmony_index = dict()
+        # index into harmonies --> (tonality, chord), built on first use.
+        self.__loaded_harmonies = dict()
+
+    def harmony_table(self):
+        """
+        The harmony table of the records written or to be loaded.
+        :return: bytes, pickled.
+        """
+        return pickle.dumps(self.__harmonies)
+
+    def dumps(self, line, hct=None):
+        """
+        Serialize a line and harmonic context track, adding its harmonies to the harmony table.
+        :param line: Line
+        :param hct: HarmonicContextTrack, or None for an empty track.
+        :return: bytes
+        """
+        hc_list = hct.hc_list() if hct is not None else []
+        parts = [LineSerializer.HEADER.pack(LineSerializer.VERSION, len(hc_list))]
+        for hc in hc_list:
+            d = hc.duration.duration
+            parts.append(LineSerializer.HC.pack(self.__harmony_id(hc), d.numerator, d.denominator))
+        LineSerializer.__dump_structure(line, parts)
+        return b''.join(parts)
+
+    def loads(self, data, offset=0):
+        """
+        Deserialize a line and harmonic context track.
+        :param data: bytes, or any buffer, e.g. mmap, holding a record.
+        :param offset: byte offset of the record in data.
+        :return: (line, hct)
+        """
+        version, num_hcs = LineSerializer.HEADER.unpack_from(data, offset)
+        if version != LineSerializer.VERSION:
+            raise Exception('Unsupported line serialization version {0}.'.format(version))
+        offset += LineSerializer.HEADER.size
+
+        hc_list = list()
+        for _ in range(0, num_hcs):
+            index, numerator, denominator = LineSerializer.HC.unpack_from(data, offset)
+            offset += LineSerializer.HC.size
+            tonality, chord = self.__harmony(index)
+            hc_list.append(HarmonicContext(tonality, chord, Duration(numerator, denominator)))
+        hct = HarmonicContextTrack()
+        hct.extend(hc_list)
+
+        line, _ = LineSerializer.__load_structure(data, offset)
+        return line, hct
+
+    @staticmethod
+    def serialize(line, hct=None):
+        """
+        Serialize a line and harmonic context track, with its own harmony table.
+        :param line: Line
+        :param hct: HarmonicContextTrack, or None for an empty track.
+        :return: bytes
+        """
+        serializer = LineSerializer()
+        record = serializer.dumps(line, hct)
+        table = serializer.harmony_table()
+        return LineSerializer.TABLE_LENGTH.pack(len(table)) + table + record
+
+    @staticmethod
+    def deserialize(data):
+        """
+        Deserialize the output of serialize().
+        :param data: bytes
+        :return: (line, hct)
+        """
+        table_length = LineSerializer.TABLE_LENGTH.unpack_from(data, 0)[0]
+        table_start = LineSerializer.TABLE_LENGTH.size
+        serializer = LineSerializer(data[table_start:table_start + table_length])
+        return serializer.loads(data, table_start + table_length)
+
+    def __harmony_id(self, hc):
+        key = hc.harmony_key
+        index = self.__harmony_index.get(key)
+        if index is None:
+            index = len(self.__harmonies)
+            self.__harmony_index[key] = index
+            tonality = hc.tonality
+            self.__harmonies.append((tonality.modality_type.name, tonality.diatonic_tone.diatonic_symbol,
+                                     tonality.modal_index, hc.chord.chord_template if hc.chord is not None else None))
+        return index
+
+    def __harmony(self, index):
+        harmony = self.__loaded_harmonies.get(index)
+        if harmony is None:
+            modality_type_name, root_symbol, modal_index, chord_template = self.__harmonies[index]
+            tonality = Tonality.intern(Tonality.create(ModalityType(modality_type_name), root_symbol, modal_index))
+            harmony = (tonality, chord_template.create_chord(tonality) if chord_template is not None else None)
+            self.__loaded_harmonies[index] = harmony
+        return harmony
+
+    @staticmethod
+    def __dump_structure(note_structure, parts):
+        if isinstance(note_structure, Note):
+            d = note_structure.base_duration.duration / note_structure.contextual_reduction_factor
+            if d.numerator > LineSerializer.MAX_NOTE_TERM or d.denominator > LineSerializer.MAX_NOTE_TERM or \
+                    note_structure.num_dots > LineSerializer.MAX_DOTS:
+                raise Exception('Note {0} cannot be serialized.'.format(note_structure))
+            pitch_key = LineSerializer.REST_KEY if note_structure.is_rest else note_structure.diatonic_pitch.pitch_key
+            op = LineSerializer.NOTE | (LineSerializer.TIED if note_structure.is_tied_to else 0) | \
+                (note_structure.num_dots << LineSerializer.DOTS_SHIFT)
+            parts.append(LineSerializer.NOTE_ITEM.pack(op, pitch_key, d.numerator, d.denominator))
+            return
+
+        if isinstance(note_structure, Line):
+            parts.append(LineSerializer.OP.pack(LineSerializer.LINE))
+            # Offsets are written only for children that do not follow on from the prior child.
+            next_offset = Fraction(0)
+            for s in note_structure.sub_notes:
+                o = s.relative_position.offset
+                if o != next_offset:
+                    parts.append(LineSerializer.OFFSET_ITEM.pack(LineSerializer.OFFSET, o.numerator, o.denominator))
+                next_offset = o + s.duration.duration
+                LineSerializer.__dump_structure(s, parts)
+        else:
+            if isinstance(note_structure, Tuplet):
+                u = note_structure.unit_duration.duration
+                f = Fraction(note_structure.unit_duration_factor)
+                parts.append(LineSerializer.TUPLET_ITEM.pack(LineSerializer.TUPLET, u.numerator, u.denominator,
+                                                             f.numerator, f.denominator))
+            elif isinstance(note_structure, Beam):
+                parts.append(LineSerializer.OP.pack(LineSerializer.BEAM))
+            else:
+                raise Exception('Cannot serialize type {0}.'.format(type(note_structure)))
+            for s in note_structure.sub_notes:
+                LineSerializer.__dump_structure(s, parts)
+        parts.append(LineSerializer.OP.pack(LineSerializer.END))
+
+    @staticmethod
+    def __load_structure(data, offset):
+        # The record's note tree, starting at offset, as (line, offset past the tree).
+        # stack of [collective, offset of its next child if a Line]
+        stack = list()
+        tied_notes = list()
+        while True:
+            op = data[offset]
+            code = op & LineSerializer.OP_MASK
+            if code == LineSerializer.NOTE:
+                _, pitch_key, numerator, denominator = LineSerializer.NOTE_ITEM.unpack_from(data, offset)
+                offset += LineSerializer.NOTE_ITEM.size
+                note = Note(None if pitch_key == LineSerializer.REST_KEY else DiatonicPitch.from_pitch_key(pitch_key),
+                            Duration(numerator, denominator), op >> LineSerializer.DOTS_SHIFT)
+                if op & LineSerializer.TIED:
+                    tied_notes.append(note)
+                LineSerializer.__add(stack, note)
+            elif code == LineSerializer.OFFSET:
+                _, numerator, denominator = LineSerializer.OFFSET_ITEM.unpack_from(data, offset)
+                offset += LineSerializer.OFFSET_ITEM.size
+                stack[-1][1] = Fraction(numerator, denominator)
+            elif code == LineSerializer.END:
+                offset += LineSerializer.OP.size
+                collective = stack.pop()[0]
+                if len(stack) == 0:
+                    break
+                LineSerializer.__add(stack, collective)
+            else:
+                if code == LineSerializer.TUPLET:
+                    _, u_num, u_den, f_num, f_den = LineSerializer.TUPLET_ITEM.unpack_from(data, offset)
+                    offset += LineSerializer.TUPLET_ITEM.size
+                    collective = Tuplet(Duration(u_num, u_den), f_num if f_den == 1 else Fraction(f_num, f_den))
+                elif code == LineSerializer.BEAM:
+                    offset += LineSerializer.OP.size
+                    collective = Beam()
+                elif code == LineSerializer.LINE:
+                    offset += LineSerializer.OP.size
+                    collective = Line()
+                else:
+                    raise Exception('Corrupt line serialization: unknown op code {0}.'.format(op))
+                stack.append([collective, Fraction(0)])
+
+        for note in tied_notes:
+            note.tie()
+        return collective, offset
+
+    @staticmethod
+    def __add(stack, note_structure):
+        entry = stack[-1]
+        if isinstance(entry[0], Line):
+            entry[0].pin(note_structure, Offset(entry[1]))
+            entry[1] += note_structure.duration.duration
+        else:
+            entry[0].append(note_structure)
+
+    def write_corpus(self, file_name, lines_and_hcts):
+        """
+        Write a corpus file of serialized lines and harmonic context tracks, see LineCorpus.
+        :param file_name: path of the file to write.
+        :param lines_and_hcts: iterable of (line, hct)
+        :return: number of records written.
+        """
+        records = [self.dumps(line, hct) for line, hct in lines_and_hcts]
+        return LineCorpus.write(file_name, self.harmony_table(), records)
+
+
+class LineCorpus(object):
+    """
+    Read access to a corpus file of LineSerializer records.  The file holds a header (magic, version, number of
+    records, harmony table length), the harmony table, a table of record end offsets, and the records.  Records
+    are deserialized on access, so only the records used are loaded.  With use_mmap, the file is memory mapped
+    rather than read into memory.
+
+    LineCorpus is a context manager, closing the file on exit.
+    """
+
+    MAGIC = b'MRLC'
+    VERSION = 1
+
+    HEADER = struct.Struct('<4sBII')
+    RECORD_END = struct.Struct('<Q')
+
+    def __init__(self, file_name, use_mmap=True):
+        """
+        Constructor.
+        :param file_name: path of a corpus file, see LineSerializer.write_corpus().
+        :param use_mmap: memory map the file if True, else read the file into memory.
+        """
+        self.__file = open(file_name, 'rb')
+        if use_mmap:
+            self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.__data = self.__file.read()
+
+        magic, version, self.__num_records, table_length = LineCorpus.HEADER.unpack_from(self.__data, 0)
+        if magic != LineCorpus.MAGIC or version != LineCorpus.VERSION:
+            self.close()
+            raise Exception('\'{0}\' is not a line corpus file of version {1}.'.format(file_name, LineCorpus.VERSION))
+        self.__serializer = LineSerializer(self.__data[LineCorpus.HEADER.size:LineCorpus.HEADER.size + table_length])
+        self.__record_ends_start = LineCorpus.HEADER.size + table_length
+        self.__records_start = self.__record_ends_start + self.__num_records * LineCorpus.RECORD_END.size
+
+    @staticmethod
+    def write(file_name, harmony_table, records):
+        """
+        Write a corpus file.
+        :param file_name: path of the file to write.
+        :param harmony_table: harmony table of the serializer of the records.
+        :param records: list of LineSerializer records (bytes).
+        :return: number of records written.
+        """
+        with open(file_name, 'wb') as f:
+            f.write(LineCorpus.HEADER.pack(LineCorpus.MAGIC, LineCorpus.VERSION, len(records), len(harmony_table)))
+            f.write(harmony_table)
+            end = 0
+            for record in records:
+                end += len(record)
+                f.write(LineCorpus.RECORD_END.pack(end))
+            for record in records:
+                f.write(record)
+        return len(records)
+
+    def __len__(self):
+        return self.__num_records
+
+    def __getitem__(self, index):
+        """
+        Deserialize a record.
+        :param index: record index.
+        :return: (line, hct)
+        """
+        if index < 0:
+            index += self.__num_records
+        if not 0 <= index < self.__num_records:
+            raise IndexError('Record index {0} out of range.'.format(index))
+        start = 0 if index == 0 else self.__record_end(index - 1)
+        return self.__serializer.loads(self.__data, self.__records_start + start)
+
+    def __iter__(self):
+        for i in range(0, self.__num_records):
+            yield self[i]
+
+    def __record_end(self, index):
+        return LineCorpus.RECORD_END.unpack_from(self.__data,
+                                                 self.__record_ends_start + index * LineCorpus.RECORD_END.size)[0]
+
+    def close(self):
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -137,6 +137,7 @@ class Voice(Observer):
         self._remove_notes_from_tree(line.get_all_notes())
             
     def _add_notes_to_tree(self, notes):
+        interval_values = []
         for note in notes:
             
             # check of note is in range of the voice's instrument..
@@ -144,9 +145,9 @@ class Voice(Observer):
                note.diatonic_pitch.chromatic_distance > self.instrument.sounding_high.chromatic_distance:
                 raise Exception('Note {0} not in instrument {1} sounding range'.format(note, self.instrument)) 
             
-            interval = Interval(note.get_absolute_position(), 
-                                note.get_absolute_position() + note.duration)
-            self.interval_tree.put(interval, note)
+            position = note.get_absolute_position()
+            interval_values.append((Interval(position, position + note.duration), note))
+        self.interval_tree.put_all(interval_values)
             
     def _remove_notes_from_tree(self, notes):
         # remove all intervals from the old line
@@ -254,6 +255,28 @@ class Voice(Observer):
             elif message_type == AbstractNote.NOTES_ADDED_EVENT:
                 self._add_notes_to_tree(Voice._extract_all_notes(data))
 
+    def batch_notification(self, observable, events):
+        """
+        Apply the events of a line batch in one step.  Removals are applied as they come; notes added are
+        collected, less any removed later in the batch, and put into the interval tree together, at their
+        positions at the end of the batch.
+        """
+        from structure.abstract_note import AbstractNote
+        if not isinstance(observable, Line):
+            return
+        # Ordered, as a dict, so notes go into the tree in the order added.
+        added = dict()
+        for message_type, _, data in events:
+            if message_type == Line.LINE_NOTES_ADDED_EVENT or message_type == AbstractNote.NOTES_ADDED_EVENT:
+                for note in Voice._extract_all_notes(data):
+                    added[note] = None
+            elif message_type == Line.LINE_NOTES_REMOVED_EVENT:
+                notes = Voice._extract_all_notes(data)
+                for note in notes:
+                    added.pop(note, None)
+                self._remove_notes_from_tree(notes)
+        self._add_notes_to_tree(list(added))
+
     @staticmethod
     def _extract_all_notes(data):
         notes = []
@@ -0,0 +1,37 @@
+import unittest
+
+from benchmarks import suite_benchmark
+from benchmarks.synthetic_score import SyntheticScoreGenerator
+
+
+class TestSuiteBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_setups(self):
+        # Each benchmark builds and runs on a small workload.
+        for name, setup in suite_benchmark.BENCHMARKS:
+            bench = setup(SyntheticScoreGenerator(0), 2)
+            bench()
+
+    def test_run(self):
+        results = suite_benchmark.run(['small'], ['parse', 'dilation'], repeat=1)
+        self.assertEqual(['parse/small', 'dilation/small'], list(results.keys()))
+        for result in results.values():
+            self.assertTrue(result['seconds'] > 0)
+            self.assertEqual(suite_benchmark.SIZES['small'], result['measures'])
+
+    def test_compare(self):
+        baseline = {'results': {'a/small': {'seconds': 1.0}, 'b/small': {'seconds': 1.0}}}
+        results = {'a/small': {'seconds': 1.1}, 'b/small': {'seconds': 1.5}, 'c/small': {'seconds': 1.0}}
+        comparison = suite_benchmark.compare(results, baseline, 0.2)
+        self.assertEqual([('a/small', 1.1, 1.0, 1.1, False), ('b/small', 1.5, 1.0, 1.5, True),
+                          ('c/small', 1.0, None, None, False)], comparison)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from fractions import Fraction
+
+from benchmarks.synthetic_score import SyntheticScoreGenerator
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.modality import ModalityType
+from tonalmodel.tonality import Tonality
+
+
+class TestSyntheticScore(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = LineGrammarExecutor(use_fast_parser=True)
+
+    def tearDown(self):
+        pass
+
+    def test_seeded(self):
+        a = SyntheticScoreGenerator(7).line(12).expression()
+        b = SyntheticScoreGenerator(7).line(12).expression()
+        c = SyntheticScoreGenerator(8).line(12).expression()
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_line(self):
+        for seed in range(5):
+            synthetic_line = SyntheticScoreGenerator(seed).line(16)
+            self.assertEqual(16, len(synthetic_line.measures))
+            self.assertIsNotNone(synthetic_line.measures[0][0])
+
+            line, hct = self.executor.parse(synthetic_line.expression())
+            self.assertEqual(synthetic_line.duration, line.duration.duration)
+            self.assertEqual(synthetic_line.duration, hct.duration.duration)
+            self.assertEqual(len([m for m in synthetic_line.measures if m[0] is not None]), len(hct))
+            # Neighboring chords differ.
+            chords = [str(hc.chord) for hc in hct.hc_list()]
+            self.assertTrue(all(a != b for a, b in zip(chords, chords[1:])))
+
+    def test_rhythms(self):
+        synthetic_line = SyntheticScoreGenerator(1).line(64)
+        expression = synthetic_line.expression()
+        self.assertIn('[s', expression)
+        self.assertIn('(i, 2)[', expression)
+        self.assertIn('- ', expression)
+
+        line, _ = synthetic_line.parse()
+        notes = line.get_all_notes()
+        self.assertEqual(expression.count('- '), len(synthetic_line.ties))
+        self.assertEqual(len(synthetic_line.ties), sum(1 for note in notes if note.is_tied_to))
+        for index in synthetic_line.ties:
+            self.assertTrue(notes[index + 1].is_tied_from)
+        self.assertTrue(any(note.duration.duration == Fraction(1, 12) for note in notes))
+
+    def test_sub_expression(self):
+        synthetic_line = SyntheticScoreGenerator(3).line(8)
+        line, hct = self.executor.parse(synthetic_line.expression(2, 5))
+        self.assertEqual(Fraction(sum(synthetic_line.time_signatures[2:5]), 4), line.duration.duration)
+        self.assertEqual(line.duration, hct.duration)
+
+    def test_tonality(self):
+        tonality = Tonality.create(ModalityType.NaturalMinor, DiatonicToneCache.get_tone('E'))
+        synthetic_line = SyntheticScoreGenerator(0).line(4, tonality)
+        _, hct = self.executor.parse(synthetic_line.expression())
+        self.assertEqual(tonality, hct.hc_list()[0].tonality)
+
+    def test_secondary_chords(self):
+        for seed in range(5):
+            generator = SyntheticScoreGenerator(seed, secondary_chords=False)
+            for _ in range(4):
+                synthetic_line = generator.line(16, Tonality.create(ModalityType.Major,
+                                                                    DiatonicToneCache.get_tone('G')))
+                self.assertTrue(all(numeral is None or '/' not in numeral
+                                    for numeral, _ in synthetic_line.measures))
+
+    def test_lite_score(self):
+        score, synthetic_line = SyntheticScoreGenerator(2).lite_score(16, 3, 2)
+        self.assertEqual(4, len(score.tempo_sequence.sequence_list))
+        self.assertEqual(len(score.time_signature_sequence.sequence_list),
+                         1 + sum(1 for a, b in zip(synthetic_line.time_signatures, synthetic_line.time_signatures[1:])
+                                 if a != b))
+        self.assertEqual(synthetic_line.duration, score.duration.duration)
+        self.assertEqual('Violin', score.instrument.name)
+
+    def test_score(self):
+        score = SyntheticScoreGenerator(4).score(5, 8, 2, 1)
+        voices = score.instrument_voices
+        self.assertEqual(5, len(voices))
+        self.assertEqual(['Violin', 'Flute', 'Viola', 'Clarinet', 'Cello'], [v.instrument.name for v in voices])
+        durations = set(v.voice(0).lines[0].duration for v in voices)
+        self.assertEqual(1, len(durations))
+        self.assertEqual(3, len(score.tempo_sequence.sequence_list))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import unittest
+
+from harmonicmodel.chord_classification_tables import ChordClassificationTables
+from harmonicmodel.chord_classifier import ChordClassifier
+from harmonicmodel.quartal_chord import QuartalChord
+from harmonicmodel.quartal_chord_template import QuartalChordTemplate, QuartalChordType
+from harmonicmodel.secundal_chord import SecundalChord
+from harmonicmodel.secundal_chord_template import SecundalChordTemplate, SecundalChordType
+from harmonicmodel.tertian_chord import TertianChord
+from harmonicmodel.tertian_chord_template import TertianChordTemplate, TertianChordType
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.interval import Interval
+from tonalmodel.modality import ModalityType
+from tonalmodel.tonality import Tonality
+
+
+class SearchingChordClassifier(ChordClassifier):
+    """
+    A reference classifier for these tests, without the classification tables: each find_* method builds the
+    tones of every chord type of its family over the root, and keeps those of the most chord tones found among the
+    tones.  Tensions are listed in input tone order.
+    """
+
+    def find_tertian_chords(self):
+        answers = self.__best_answers(TertianChordTemplate.TERTIAN_CHORD_TYPE_MAP, TertianChordType, False)
+        chords = list()
+        for chord_type, chord_tones in answers:
+            inversion = chord_tones.index(self.chord_tones[0]) + 1
+            tensions = list()
+            for r in self.chord_tones:
+                if r in chord_tones or r in self.chord_tones[:self.chord_tones.index(r)]:
+                    continue
+                p1 = DiatonicPitch(4, self.root_tone)
+                p2 = DiatonicPitch(5 if DiatonicPitch.crosses_c(self.root_tone, r) else 4, r)
+                interval = Interval.create_interval(p1, p2)
+                if interval.diatonic_distance < 5:
+                    interval = Interval(interval.diatonic_distance + 8, interval.interval_type)
+                tensions.append(interval)
+            if self.tonality is not None:
+                if self.root_tone not in self.tonality.annotation:
+                    continue
+                template = TertianChordTemplate(None, self.tonality.annotation.index(self.root_tone) + 1, chord_type,
+                                                tensions, inversion)
+            else:
+                template = TertianChordTemplate(self.root_tone, None, chord_type, tensions, inversion)
+            chords.append(TertianChord(template, self.tonality))
+        return chords
+
+    def find_quartal_chords(self):
+        return [QuartalChord(QuartalChordTemplate(root, index, chord_type, list(), inversion), self.tonality)
+                for chord_type, root, index, inversion in
+                self.__untensioned(QuartalChordTemplate.QUARTAL_CHORD_TYPE_MAP, QuartalChordType)]
+
+    def find_secundal_chords(self):
+        return [SecundalChord(SecundalChordTemplate(root, index, chord_type, list(), inversion), self.tonality)
+                for chord_type, root, index, inversion in
+                self.__untensioned(SecundalChordTemplate.SECUNDAL_CHORD_TYPE_MAP, SecundalChordType)]
+
+    def __untensioned(self, chord_type_map, type_class):
+        results = list()
+        for chord_type, chord_tones in self.__best_answers(chord_type_map, type_class, True):
+            if set(self.chord_tones) - set(chord_tones):
+                continue
+            inversion = chord_tones.index(self.chord_tones[0]) + 1
+            if self.tonality is not None:
+                if self.root_tone not in self.tonality.annotation:
+                    raise Exception('Root tone {0} is not in tonality {1}'.format(self.root_tone, self.tonality))
+                results.append((chord_type, None, self.tonality.annotation.index(self.root_tone) + 1, inversion))
+            else:
+                results.append((chord_type, self.root_tone, None, inversion))
+        return results
+
+    def __best_answers(self, chord_type_map, type_class, successive):
+        results = list()
+        for chord_type, interval_list in chord_type_map.items():
+            chord_tones = list()
+            last_tone = self.root_tone
+            for interval in interval_list:
+                chord_tones.append(interval.get_end_tone(last_tone))
+                if successive:
+                    last_tone = chord_tones[-1]
+            if set(chord_tones) <= set(self.chord_tones):
+                if not successive and self.chord_tones[0] not in chord_tones:
+                    continue
+                results.append((type_class(chord_type), chord_tones))
+        results.sort(key=lambda x: len(x[1]), reverse=True)
+        return [x for x in results if len(x[1]) == len(results[0][1])]
+
+
+class TestChordClassificationTables(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_chord_tone_table(self):
+        table = ChordClassificationTables.chord_tone_table(ChordClassificationTables.TERTIAN,
+                                                           DiatonicToneCache.get_tone('D'))
+        entries = {chord_type: chord_tones for chord_type, chord_tones, _ in table}
+        assert [t.diatonic_symbol for t in entries[TertianChordType.Maj]] == ['D', 'F#', 'A']
+        assert [t.diatonic_symbol for t in entries[TertianChordType.Dom7]] == ['D', 'F#', 'A', 'C']
+        for _, chord_tones, mask in table:
+            assert mask == ChordClassificationTables.tone_mask(chord_tones)
+
+        # Chord types with tones beyond triple augmentation are omitted.
+        table = ChordClassificationTables.chord_tone_table(ChordClassificationTables.TERTIAN,
+                                                           DiatonicToneCache.get_tone('E###'))
+        assert TertianChordType.Maj not in [chord_type for chord_type, _, _ in table]
+
+    def test_answers(self):
+        tones = ChordClassifier.to_tones(['e', 'g', 'c', 'B'])
+        answers = ChordClassificationTables.answers(ChordClassificationTables.TERTIAN,
+                                                    DiatonicToneCache.get_tone('C'), tones)
+        assert [(chord_type, inversion) for chord_type, _, inversion in answers] == [(TertianChordType.Maj7, 2)]
+
+        # Answers are indexed by tone set and bass, regardless of the order of the other tones.
+        other = ChordClassificationTables.answers(ChordClassificationTables.TERTIAN,
+                                                  DiatonicToneCache.get_tone('C'),
+                                                  ChordClassifier.to_tones(['e', 'B', 'c', 'g']))
+        assert other is answers
+
+        answers = ChordClassificationTables.answers(ChordClassificationTables.QUARTAL,
+                                                    DiatonicToneCache.get_tone('E'),
+                                                    ChordClassifier.to_tones(['e', 'a', 'd']))
+        assert [(chord_type, inversion) for chord_type, _, inversion in answers] == [(QuartalChordType.PerPer, 1)]
+
+        # Quartal chords do not take tensions.
+        answers = ChordClassificationTables.answers(ChordClassificationTables.QUARTAL,
+                                                    DiatonicToneCache.get_tone('E'),
+                                                    ChordClassifier.to_tones(['e', 'a', 'd', 'Bb']))
+        assert len(answers) == 0
+
+    def test_tension_interval(self):
+        root = DiatonicToneCache.get_tone('C')
+        assert str(ChordClassificationTables.tension_interval(root, DiatonicToneCache.get_tone('D'))) == 'M:9'
+        assert str(ChordClassificationTables.tension_interval(root, DiatonicToneCache.get_tone('F#'))) == 'A:11'
+        assert str(ChordClassificationTables.tension_interval(root, DiatonicToneCache.get_tone('A'))) == 'M:6'
+
+    def test_classifier(self):
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+        chords = ChordClassifier.classify(['e', 'a', 'c', 'g', 'B'], 'a', tonality)
+        assert [str(chord) for chord in chords] == ['TVIMin7M:9@3 [E, A, C, G, B]', 'TVIDom7Sus2m:10@3 [E, A, B, G, C]']
+        assert [str(t) for t in chords[0].chord_template.tension_intervals] == ['M:9']
+
+    def test_tension_order(self):
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+
+        # Tensions are in input tone order.
+        chords = ChordClassifier.classify(['C', 'F', 'Ab', 'Ebb', 'G#'], 'F', tonality)
+        assert [str(chord) for chord in chords] == ['TIVMind:7 A:9@3 [C, F, Ab, Ebb, G#]']
+        assert [str(t) for t in chords[0].chord_template.tension_intervals] == ['d:7', 'A:9']
+        chords = ChordClassifier.classify(['C', 'F', 'Ab', 'G#', 'Ebb'], 'F', tonality)
+        assert [str(t) for t in chords[0].chord_template.tension_intervals] == ['A:9', 'd:7']
+        chords = ChordClassifier.classify(['C', 'E', 'G', 'F#', 'D', 'D'], 'C')
+        assert [str(t) for t in chords[0].chord_template.tension_intervals] == ['A:11', 'M:9']
+
+        # Of enharmonic tensions, the first given is kept.
+        chords = ChordClassifier.classify(['C', 'E', 'G', 'C#', 'Db'], 'C', tonality)
+        assert [str(chord) for chord in chords] == ['TIMajA:8 [C, E, G, C#]']
+        chords = ChordClassifier.classify(['C', 'E', 'G', 'Db', 'C#'], 'C', tonality)
+        assert [str(chord) for chord in chords] == ['TIMajm:9 [C, E, G, Db]']
+
+    def test_classifier_parity(self):
+        # Every chord type of each family over several roots, inverted, and with added tones, including
+        # enharmonic pairs, classifies as with the reference classifier.
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+        added_tones = [[], ['D'], ['F#'], ['Bb'], ['G#', 'Eb'], ['C#', 'Db'], ['Ab', 'G#'], ['A', 'Gb', 'F#']]
+        chord_type_maps = [(TertianChordTemplate.TERTIAN_CHORD_TYPE_MAP, False),
+                           (QuartalChordTemplate.QUARTAL_CHORD_TYPE_MAP, True),
+                           (SecundalChordTemplate.SECUNDAL_CHORD_TYPE_MAP, True)]
+        num_chords = 0
+        for root in ['C', 'E', 'F', 'B', 'Bb', 'F#']:
+            root_tone = DiatonicToneCache.get_tone(root)
+            for chord_type_map, successive in chord_type_maps:
+                for interval_list in chord_type_map.values():
+                    chord_tones = list()
+                    last_tone = root_tone
+                    for interval in interval_list:
+                        chord_tones.append(interval.get_end_tone(last_tone))
+                        if successive:
+                            last_tone = chord_tones[-1]
+                    for inverted in [chord_tones, chord_tones[1:] + chord_tones[:1]]:
+                        for added in added_tones:
+                            tones = inverted + ChordClassifier.to_tones(added)
+                            for t in [None, tonality]:
+                                assert self.__classify(ChordClassifier, tones, root_tone, t) == \
+                                    self.__classify(SearchingChordClassifier, tones, root_tone, t), \
+                                    '{0} over {1}'.format([tone.diatonic_symbol for tone in tones], root)
+                                num_chords += 1
+        assert num_chords > 1000
+
+    @staticmethod
+    def __classify(classifier_class, tones, root_tone, tonality):
+        try:
+            return [str(chord) for chord in classifier_class(tones, root_tone, tonality).classify_tones_as_chord()]
+        except Exception as e:
+            return str(e)
+
+
+if __name__ == "__main__":
+    unittest.main()
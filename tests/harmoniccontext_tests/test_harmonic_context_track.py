@@ -117,3 +117,24 @@ class TestInterval(unittest.TestCase):
         assert len(hc_track) == 2
         assert hc_track[Position(0)].duration == Duration(1, 2)
         assert hc_track[Position(1, 2)].duration == Duration(1, 3)
+
+    def test_same_harmony(self):
+        c_major = Tonality.create(ModalityType.Major, DiatonicTone("C"))
+        chord_a = TertianChordTemplate.parse('tIV').create_chord(c_major)
+        chord_b = TertianChordTemplate.parse('tIV').create_chord(Tonality.create(ModalityType.Major, DiatonicTone("C")))
+        chord_c = TertianChordTemplate.parse('tV').create_chord(c_major)
+        assert chord_a is not chord_b and chord_a == chord_b and chord_a != chord_c
+
+        hc_a = HarmonicContext(c_major, chord_a, Duration(1, 2))
+        hc_b = HarmonicContext(Tonality.create(ModalityType.Major, DiatonicTone("C")), chord_b, Duration(1, 4))
+        hc_c = HarmonicContext(c_major, chord_c, Duration(1, 2))
+
+        # Tonalities and chords are interned.
+        assert hc_a.tonality is hc_b.tonality
+        assert hc_a.chord is hc_b.chord
+        assert hc_a.harmony_key == hc_b.harmony_key
+
+        assert hc_a.is_same_harmony(hc_b)
+        assert not hc_a.is_equal(hc_b)
+        assert not hc_a.is_same_harmony(hc_c)
+        assert hc_a.is_equal(HarmonicContext(c_major, chord_b, Duration(1, 2)))
@@ -0,0 +1,79 @@
+import unittest
+
+from harmoniccontext.vertical_harmony_analyzer import VerticalHarmonyAnalyzer
+from instruments.instrument_catalog import InstrumentCatalog
+from structure.instrument_voice import InstrumentVoice
+from structure.line import Line
+from structure.note import Note
+from structure.score import Score
+from timemodel.duration import Duration
+from timemodel.offset import Offset
+from timemodel.position import Position
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.modality import ModalityType
+from tonalmodel.tonality import Tonality
+
+
+class TestVerticalHarmonyAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_verticalities(self):
+        notes = TestVerticalHarmonyAnalyzer.create_lines(['C:4', 'C:4', 'D:4', 'R'],
+                                                         ['E:4', 'E:4', 'F:4', 'G:4'],
+                                                         ['G:3', 'G:3', 'B:3', 'R'])
+        spans = VerticalHarmonyAnalyzer.verticalities(n for line in notes for n in line.get_all_notes())
+        assert [(str(s), str(e), [t.diatonic_symbol for t in tones]) for s, e, tones in spans] == \
+            [('0', '1/2', ['G', 'C', 'E']), ('1/2', '3/4', ['B', 'D', 'F']), ('3/4', '1', ['G'])]
+
+        # Silence is omitted.
+        notes = TestVerticalHarmonyAnalyzer.create_lines(['C:4', 'R', 'C:4'])
+        spans = VerticalHarmonyAnalyzer.verticalities(n for line in notes for n in line.get_all_notes())
+        assert [(str(s), str(e)) for s, e, _ in spans] == [('0', '1/4'), ('1/2', '3/4')]
+
+    def test_analyze(self):
+        c = InstrumentCatalog.instance()
+        score = Score()
+        lines = TestVerticalHarmonyAnalyzer.create_lines(['G:4', 'C:5', 'D:5', 'G:4', 'R', 'G:4', 'R'],
+                                                         ['E:4', 'G:4', 'B:3', 'D:4', 'R', 'E:4', 'E:4'],
+                                                         ['C:3', 'E:3', 'G:3', 'B:2', 'R', 'C:3', 'C:3'])
+        for name, line in zip(['violin', 'clarinet', 'cello'], lines):
+            instrument_voice = InstrumentVoice(c.get_instrument(name))
+            instrument_voice.voice(0).pin(line)
+            score.add_instrument_voice(instrument_voice)
+
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+        hct = VerticalHarmonyAnalyzer(tonality).analyze(score)
+
+        # I, I@2, V, V@2, then I again after the rest.
+        hc_list = hct.hc_list()
+        assert [str(hc.position.position) for hc in hc_list] == ['0', '1/4', '1/2', '3/4', '5/4']
+        assert [hc.chord.chord_template.inversion for hc in hc_list] == [1, 2, 1, 2, 1]
+        assert hc_list[4].chord is hc_list[0].chord
+        assert str(hct.duration.duration) == '7/4'
+
+        # The rest continues the prior context, as does the unclassified C-E dyad at the end.
+        assert str(hc_list[3].duration.duration) == '1/2'
+        assert hct[Position(9, 8)] is hc_list[3]
+        assert str(hc_list[4].duration.duration) == '1/2'
+
+    @staticmethod
+    def create_lines(*pitch_lists):
+        lines = list()
+        for pitch_list in pitch_lists:
+            # Rests are left as gaps in the line.
+            line = Line()
+            for i, p in enumerate(pitch_list):
+                if p != 'R':
+                    line.pin(Note(DiatonicPitch.parse(p), Duration(1, 4)), Offset(i, 4))
+            lines.append(line)
+        return lines
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
+import os
+import shutil
+import tempfile
 import unittest
+import instruments
 from instruments.instrument_catalog import InstrumentCatalog, InstrumentClass, InstrumentFamily, Instrument
 from tonalmodel.interval import Interval, IntervalType
+from tonalmodel.diatonic_pitch import DiatonicPitch
 import logging
 
 
@@ -87,6 +92,83 @@ class TestInstrumentCatalog(unittest.TestCase):
         assert c1 == catalog
     '''
 
+    def test_snapshot(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            snapshot_dir = os.path.join(temp_dir, 'cache')
+            parsed = InstrumentCatalog(snapshot_directory=snapshot_dir)
+            snapshots = os.listdir(snapshot_dir)
+            assert len(snapshots) == 1
+            snapshot_path = os.path.join(snapshot_dir, snapshots[0])
+            if hasattr(os, 'getuid'):
+                assert os.stat(snapshot_dir).st_mode & 0o777 == 0o700
+                assert os.stat(snapshot_path).st_mode & 0o777 == 0o600
+            loaded = InstrumentCatalog(snapshot_directory=snapshot_dir)
+
+            assert [c.name for c in loaded.instrument_classes()] == [c.name for c in parsed.instrument_classes()]
+            assert sorted(loaded.instrument_map.keys()) == sorted(parsed.instrument_map.keys())
+            for name, instrument in parsed.instrument_map.items():
+                other = loaded.get_instrument(name)
+                assert str(other) == str(instrument)
+                assert [a.name for a in other.get_articulations()] == [a.name for a in instrument.get_articulations()]
+            # Loaded instrument classes are parented to the loading catalog.
+            for inst_class in loaded.instrument_classes():
+                assert inst_class.parent is loaded
+
+            # A snapshot for other xml content is not loaded.
+            assert not loaded._load_snapshot(snapshot_dir, 'other')
+
+            # A snapshot writable by others is not trusted.
+            if hasattr(os, 'getuid'):
+                os.chmod(snapshot_path, 0o666)
+                assert not loaded._load_snapshot(snapshot_dir, snapshots[0][len('instruments-'):-len('.snapshot')])
+                os.chmod(snapshot_path, 0o600)
+
+            # A corrupt snapshot is ignored.
+            with open(snapshot_path, 'wb') as snapshot:
+                snapshot.write(b'not a snapshot')
+            assert InstrumentCatalog(snapshot_directory=snapshot_dir).get_instrument('Violin') is not None
+
+            # A user xml file is parsed, and not snapshot, beside it or in the cache.
+            xml_dir = os.path.join(temp_dir, 'xml')
+            os.mkdir(xml_dir)
+            xml_path = os.path.join(xml_dir, 'instruments.xml')
+            shutil.copy(os.path.join(os.path.dirname(instruments.__file__), InstrumentCatalog.DATA_DIRECTORY,
+                                     InstrumentCatalog.INSTRUMENT_FILE), xml_path)
+            with open(xml_path) as xml:
+                content = xml.read()
+            with open(xml_path, 'w') as xml:
+                xml.write(content.replace('name="Violin"', 'name="Fiddle"'))
+            changed = InstrumentCatalog(xml_file=xml_path, snapshot_directory=snapshot_dir)
+            assert changed.get_instrument('Violin') is None
+            assert changed.get_instrument('Fiddle') is not None
+            assert os.listdir(xml_dir) == ['instruments.xml']
+            assert os.listdir(snapshot_dir) == snapshots
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_family_lookup(self):
+        c = InstrumentCatalog.instance()
+        instf = c.get_instruments('flute')
+        assert [inst.name for inst in instf] == ['Flute', 'Alto Flute']
+        assert c.get_instruments('Kazoo') is None
+        assert c.get_instrument('Kazoo') is None
+
+    def test_sounding_index(self):
+        c = InstrumentCatalog.instance()
+        all_instruments = [inst for inst_class in c.instrument_classes() for family in inst_class.families
+                           for inst in family.instruments]
+        for pitch_text in ['A:0', 'C:2', 'E:3', 'C:4', 'Bb:4', 'G:5', 'C:7', 'C:8']:
+            pitch = DiatonicPitch.parse(pitch_text)
+            expected = [inst for inst in all_instruments
+                        if inst.sounding_low.chromatic_distance <= pitch.chromatic_distance <=
+                        inst.sounding_high.chromatic_distance]
+            found = c.instruments_sounding(pitch)
+            assert sorted(i.name for i in found) == sorted(i.name for i in expected)
+            assert [i.name for i in c.instruments_sounding(pitch.chromatic_distance)] == [i.name for i in found]
+        assert 'Violin' in [inst.name for inst in c.instruments_sounding(DiatonicPitch.parse('A:4'))]
+        assert 'Violin' not in [inst.name for inst in c.instruments_sounding(DiatonicPitch.parse('C:3'))]
+
     def test_print_catalog(self):
         c = InstrumentCatalog.instance()
         c.print_catalog()
@@ -0,0 +1,102 @@
+import unittest
+from tonalmodel.tonality import Tonality
+from harmoniccontext.harmonic_context import HarmonicContext
+from melody.constraints.policy_context import PolicyContext
+from melody.constraints.contextual_note import ContextualNote
+from tonalmodel.modality import ModalityType
+from tonalmodel.diatonic_tone import DiatonicTone
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from timemodel.duration import Duration
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.interval import Interval, IntervalType
+from structure.note import Note
+from melody.solver.p_map import PMap
+from melody.constraints.pitch_domain import PitchDomain
+from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.scalar_pitch_constraint import ScalarPitchConstraint
+from melody.constraints.fixed_tone_constraint import FixedToneConstraint
+from melody.constraints.pitch_range_constraint import PitchRangeConstraint
+from melody.constraints.pitch_step_constraint import PitchStepConstraint
+from melody.constraints.relative_diatonic_constraint import RelativeDiatonicConstraint
+from melody.constraints.comparative_pitch_constraint import ComparativePitchConstraint
+
+
+class TestPitchDomain(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_set_operations(self):
+        a = PitchDomain.from_pitches([DiatonicPitch.parse(p) for p in ['E:4', 'C:4', 'G:4', 'Bb:3']])
+        b = PitchDomain.from_pitches([DiatonicPitch.parse(p) for p in ['G:4', 'C:4', 'D:4']])
+
+        assert len(a) == 4
+        assert [str(p) for p in a.pitches()] == ['Bb:3', 'C:4', 'E:4', 'G:4']
+        assert [str(p) for p in (a & b).pitches()] == ['C:4', 'G:4']
+        assert [str(p) for p in (a | b).pitches()] == ['Bb:3', 'C:4', 'D:4', 'E:4', 'G:4']
+        assert DiatonicPitch.parse('E:4').pitch_key in a
+        assert DiatonicPitch.parse('E:4').pitch_key not in b
+        assert list(a) == a.pitch_keys()
+
+        # Enharmonics are distinct pitches.
+        c = PitchDomain.from_pitches([DiatonicPitch.parse('C#:4')])
+        d = PitchDomain.from_pitches([DiatonicPitch.parse('Db:4')])
+        assert not (c & d)
+        assert c == PitchDomain.from_pitches([DiatonicPitch.parse('C#:4')])
+
+        empty = PitchDomain()
+        assert len(empty) == 0
+        assert not empty
+        assert empty.pitch_keys() == []
+
+    def test_from_notes(self):
+        notes = [Note(DiatonicPitch.parse('A:4'), Duration(1, 4)), Note(None, Duration(1, 4)),
+                 Note(DiatonicPitch.parse('F#:3'), Duration(1, 8))]
+        assert [str(p) for p in PitchDomain.from_notes(notes).pitches()] == ['F#:3', 'A:4']
+
+    def test_constraint_value_domains(self):
+        policy_context = TestPitchDomain.policy_creator(ModalityType.Major, DiatonicTone('Ab'), 'tIV', 'C:3', 'C:6')
+        actors = [Note(DiatonicPitch.parse(p), Duration(1, 8)) for p in ['C:5', 'D:5', 'E:5']]
+        p_map = PMap({actor: ContextualNote(policy_context) for actor in actors})
+
+        policies = [ChordalPitchConstraint(actors[0]),
+                    ScalarPitchConstraint(actors[0], [0, 2, 4]),
+                    FixedToneConstraint(actors[0], DiatonicTone('Eb')),
+                    PitchRangeConstraint(actors, PitchRange.create('E:4', 'G:5')),
+                    PitchStepConstraint(actors[0], actors[1], 2, PitchStepConstraint.UP),
+                    RelativeDiatonicConstraint(actors[1], actors[2], Interval(3, IntervalType.Minor),
+                                               Interval(5, IntervalType.Perfect)),
+                    ComparativePitchConstraint(actors[0], actors[2], ComparativePitchConstraint.GREATER_THAN)]
+
+        def check():
+            for policy in policies:
+                for actor in policy.actors:
+                    if p_map[actor].note is not None:
+                        continue
+                    values = policy.values(p_map, actor)
+                    expected = PitchDomain() if values is None else PitchDomain.from_notes(values)
+                    assert policy.value_domain(p_map, actor) == expected, '{0} {1}'.format(policy, actor)
+
+        check()
+        p_map[actors[0]].note = Note(DiatonicPitch.parse('Db:4'), Duration(1, 8))
+        check()
+        p_map[actors[1]].note = Note(DiatonicPitch.parse('F:4'), Duration(1, 8))
+        check()
+
+    @staticmethod
+    def policy_creator(modality_type, modality_tone, tertian_chord_txt, low_pitch_txt, hi_pitch_txt):
+        diatonic_tonality = Tonality.create(modality_type, modality_tone)
+        chord = TertianChordTemplate.parse(tertian_chord_txt).create_chord(diatonic_tonality)
+        hc = HarmonicContext(diatonic_tonality, chord, Duration(1, 2))
+
+        pitch_range = PitchRange(DiatonicPitch.parse(low_pitch_txt).chromatic_distance,
+                                 DiatonicPitch.parse(hi_pitch_txt).chromatic_distance)
+        return PolicyContext(hc, pitch_range)
+
+
+if __name__ == "__main__":
+    unittest.main()
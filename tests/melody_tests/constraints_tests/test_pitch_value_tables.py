@@ -0,0 +1,60 @@
+import unittest
+from tonalmodel.tonality import Tonality
+from tonalmodel.modality import ModalityType
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.pitch_scale import PitchScale
+from timemodel.duration import Duration
+from structure.note import Note
+from melody.constraints.pitch_value_tables import PitchValueTables
+
+
+class TestPitchValueTables(unittest.TestCase):
+
+    def setUp(self):
+        PitchValueTables.clear()
+
+    def tearDown(self):
+        pass
+
+    def test_tonal_pitch_keys(self):
+        for modality_type, tone_text in [(ModalityType.Major, 'Eb'), (ModalityType.MelodicMinor, 'C#'),
+                                         (ModalityType.Major, 'Cb')]:
+            tonality = Tonality.create(modality_type, DiatonicToneCache.get_tone(tone_text))
+            for low, high in [('C:2', 'C:8'), ('B:3', 'C:5'), ('F#:4', 'G:4')]:
+                pitch_range = PitchRange.create(low, high)
+                keys = PitchValueTables.tonal_pitch_keys(tonality, pitch_range)
+                expected = PitchScale(tonality, pitch_range).pitch_scale
+                assert PitchValueTables.pitches(keys) == expected
+
+                index = PitchValueTables.tonal_pitch_index(tonality, pitch_range)
+                for i, pitch in enumerate(expected):
+                    assert index[pitch.pitch_key] == i
+
+        # Tables are shared for equal, but distinct, tonalities and ranges.
+        t1 = Tonality.create(ModalityType.Major, 'Eb')
+        t2 = Tonality.create(ModalityType.Major, 'Eb')
+        assert PitchValueTables.tonal_pitch_keys(t1, PitchRange.create('C:4', 'C:5')) is \
+            PitchValueTables.tonal_pitch_keys(t2, PitchRange.create('C:4', 'C:5'))
+
+    def test_tone_pitch_keys(self):
+        tones = [DiatonicToneCache.get_tone(t) for t in ['G', 'B', 'D']]
+        keys = PitchValueTables.tone_pitch_keys(tones, PitchRange.create('A:3', 'C:5'))
+        assert [str(p) for p in PitchValueTables.pitches(keys)] == ['G:4', 'B:3', 'B:4', 'D:4']
+
+        # Cb:5 sounds as B:4, so is within the range though outside its nominal partition.
+        keys = PitchValueTables.tone_pitch_keys([DiatonicToneCache.get_tone('Cb')], PitchRange.create('C:4', 'B:4'))
+        assert [str(p) for p in PitchValueTables.pitches(keys)] == ['Cb:5']
+
+    def test_notes(self):
+        actor = Note(DiatonicPitch.parse('C:4'), Duration(1, 8), 1)
+        keys = [DiatonicPitch.parse(p).pitch_key for p in ['E:4', 'F#:4']]
+        notes = PitchValueTables.notes(keys, actor)
+        assert [str(n.diatonic_pitch) for n in notes] == ['E:4', 'F#:4']
+        for n in notes:
+            assert n.duration == actor.duration
+
+
+if __name__ == "__main__":
+    unittest.main()
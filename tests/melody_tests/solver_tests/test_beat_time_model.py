@@ -0,0 +1,99 @@
+import unittest
+from fractions import Fraction
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from melody.solver.position_delta_info import PositionDeltaInfo
+from structure.line import Line
+from structure.note import Note
+from structure.tempo import Tempo
+from structure.time_signature import TimeSignature
+from timemodel.duration import Duration
+from timemodel.event_sequence import EventSequence
+from timemodel.offset import Offset
+from timemodel.position import Position
+from timemodel.tempo_event import TempoEvent
+from timemodel.tempo_event_sequence import TempoEventSequence
+from timemodel.time_conversion import TimeConversion
+from timemodel.time_signature_event import TimeSignatureEvent
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.modality import ModalityType
+from tonalmodel.tonality import Tonality
+
+
+class TestBeatTimeModel(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    @staticmethod
+    def create_pdi():
+        # Notes of 3/8 at 0, 3/8, 3/4, ...; the covers are the notes at 3/8 and 3/2.
+        line = Line()
+        notes = [Note(DiatonicPitch.parse('C:4'), Duration(3, 8)) for _ in range(0, 8)]
+        for i, note in enumerate(notes):
+            line.pin(note, Offset(3 * i, 8))
+
+        tempo_seq = TempoEventSequence([TempoEvent(Tempo(60, Duration(1, 4)), Position(0)),
+                                        TempoEvent(Tempo(90, Duration(1, 4)), Position(2))])
+        ts_seq = EventSequence([TimeSignatureEvent(TimeSignature(4, Duration(1, 4), 'swww'), Position(0)),
+                                TimeSignatureEvent(TimeSignature(3, Duration(1, 4), 'sww'), Position(1))])
+
+        tonality = Tonality.create(ModalityType.Major, 'C')
+        chord = TertianChordTemplate.parse('tI').create_chord(tonality)
+        hct = HarmonicContextTrack()
+        for _ in range(0, 3):
+            hct.append(HarmonicContext(tonality, chord, Duration(1)))
+
+        covers = [notes[1], notes[4]]
+        return PositionDeltaInfo(covers, tempo_seq, ts_seq, hct, line), notes
+
+    def test_positions(self):
+        pdi, notes = TestBeatTimeModel.create_pdi()
+        assert pdi.correct_position(Position(3, 8)) == Position(3, 8)
+        assert pdi.line_duration() == Duration(3)
+
+        pdi.alter_at(notes[1], Duration(1, 8))
+        assert pdi.correct_position(Position(1, 4)) == Position(1, 4)
+        assert pdi.correct_position(Position(3, 8)) == Position(1, 2)
+        assert pdi.correct_note_position(notes[3]) == Fraction(5, 4)
+
+        c = pdi.clone()
+        c.alter_at(notes[4], Duration(1, 4))
+        assert c.correct_note_position(notes[5]) == Fraction(15, 8) + Fraction(3, 8)
+        assert c.line_duration() == Duration(27, 8)
+        # The original is unchanged.
+        assert pdi.correct_note_position(notes[5]) == Fraction(15, 8) + Fraction(1, 8)
+        assert pdi.coverage_node_deltas[notes[4]] == 0
+
+    def test_beats_and_views(self):
+        pdi, notes = TestBeatTimeModel.create_pdi()
+        pdi.alter_at(notes[1], Duration(1, 8))
+        pdi.alter_at(notes[4], Duration(1, 4))
+
+        ts_list = pdi.ts_event_sequence.sequence_list
+        assert [e.time for e in ts_list] == [Position(0), Position(9, 8)]
+        assert [e.time for e in pdi.tempo_event_sequence.sequence_list] == [Position(0), Position(19, 8)]
+        hc_list = pdi.hct.hc_list()
+        assert [hc.duration for hc in hc_list] == [Duration(9, 8), Duration(5, 4), Duration(1)]
+        assert [hc.position for hc in hc_list] == [Position(0), Position(9, 8), Position(19, 8)]
+
+        # Beats agree with a time conversion over the moved sequences.
+        conversion = TimeConversion(pdi.tempo_event_sequence, pdi.ts_event_sequence, Position(pdi.line_duration()))
+        for note in notes:
+            position = pdi.correct_note_position(note)
+            ts, beat_number = pdi.beat_at(position)
+            assert str(ts) == str(pdi.ts_event_sequence.floor_event(Position(position)).object)
+            assert beat_number == conversion.position_to_bp(Position(position)).beat_number
+
+        # Views are rebuilt after a change.
+        pdi.alter_at(notes[4], Duration(1, 2))
+        assert [hc.duration for hc in pdi.hct.hc_list()] == [Duration(9, 8), Duration(3, 2), Duration(1)]
+
+
+if __name__ == "__main__":
+    unittest.main()
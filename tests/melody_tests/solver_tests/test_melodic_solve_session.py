@@ -0,0 +1,160 @@
+import unittest
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.pitch_step_constraint import PitchStepConstraint
+from melody.constraints.step_sequence_constraint import StepSequenceConstraint
+from melody.solver.melodic_constraint_solver import MelodicConstraintSolver
+from melody.solver.melodic_solve_session import MelodicSolveSession
+from structure.line import Line
+from structure.note import Note
+from structure.tempo import Tempo
+from structure.time_signature import TimeSignature
+from timemodel.duration import Duration
+from timemodel.event_sequence import EventSequence
+from timemodel.offset import Offset
+from timemodel.position import Position
+from timemodel.tempo_event import TempoEvent
+from timemodel.tempo_event_sequence import TempoEventSequence
+from timemodel.time_signature_event import TimeSignatureEvent
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.modality import ModalityType
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.tonality import Tonality
+
+
+class CountingSession(MelodicSolveSession):
+
+    def __init__(self, solver):
+        MelodicSolveSession.__init__(self, solver)
+        self.component_solves = 0
+
+    def _solve_component(self, p_map, actors, constraints, num_solutions, parallel):
+        self.component_solves += 1
+        return MelodicSolveSession._solve_component(self, p_map, actors, constraints, num_solutions, parallel)
+
+
+class TestMelodicSolveSession(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_components(self):
+        notes = TestMelodicSolveSession.create_notes()
+        c1 = StepSequenceConstraint(notes[0:3], [1, 1])
+        c2 = ChordalPitchConstraint(notes[5])
+        c3 = PitchStepConstraint(notes[3], notes[4], 1, PitchStepConstraint.UP)
+        c4 = ChordalPitchConstraint(notes[2])
+        c5 = PitchStepConstraint(notes[4], notes[5], 2, PitchStepConstraint.UP)
+
+        components = MelodicSolveSession.components([c1, c2, c3, c4])
+        assert [c for _, c in components] == [[c1, c4], [c2], [c3]]
+        assert components[0][0] == notes[0:3]
+
+        components = MelodicSolveSession.components([c1, c2, c3, c4, c5])
+        assert [c for _, c in components] == [[c1, c4], [c2, c3, c5]]
+        assert components[1][0] == [notes[5], notes[3], notes[4]]
+
+    def test_incremental_solve(self):
+        notes = TestMelodicSolveSession.create_notes()
+        line, tempo_seq, ts_seq, hct = TestMelodicSolveSession.create_problem(notes)
+        pitch_range = PitchRange.create('C:4', 'C:5')
+
+        c1 = StepSequenceConstraint(notes[0:3], [1, 1])
+        c2 = ChordalPitchConstraint(notes[0])
+        c3 = PitchStepConstraint(notes[3], notes[4], 1, PitchStepConstraint.UP)
+        c4 = ChordalPitchConstraint(notes[5])
+        constraints = [c1, c2, c3, c4]
+
+        session = CountingSession(MelodicConstraintSolver(line, tempo_seq, ts_seq, hct, pitch_range, constraints))
+
+        def check(fixed):
+            solver = MelodicConstraintSolver(line, tempo_seq, ts_seq, session.hct, pitch_range,
+                                             session.constraints)
+            expected = solver.solve(fixed).pitch_results
+            results = session.last_results.pitch_results
+            assert len(results) == len(expected)
+            assert TestMelodicSolveSession.result_set(results) == TestMelodicSolveSession.result_set(expected)
+
+        session.solve()
+        assert session.component_solves == 3
+        check({})
+
+        # Resolving without edits reuses all components.
+        session.solve()
+        assert session.component_solves == 3
+
+        # Fixing a note re-solves only its component.
+        session.fix_note(notes[3], DiatonicPitch.parse('E:4'))
+        session.solve()
+        assert session.component_solves == 4
+        check({notes[3]: DiatonicPitch.parse('E:4')})
+
+        session.unfix_note(notes[3])
+        session.solve()
+        assert session.component_solves == 5
+        check({})
+
+        # Adding a constraint that joins two components re-solves the joined component.
+        c5 = PitchStepConstraint(notes[4], notes[5], 2, PitchStepConstraint.UP)
+        session.add_constraint(c5)
+        session.solve()
+        assert session.component_solves == 6
+        check({})
+
+        session.remove_constraint(c5)
+        session.solve()
+        assert session.component_solves == 8
+        check({})
+
+        # A harmonic context change in the second half re-solves the components there.
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+        chord = TertianChordTemplate.parse('tV').create_chord(tonality)
+        session.hct.replace(Position(1), HarmonicContext(tonality, chord, Duration(1)))
+        session.update_hct()
+        session.solve()
+        assert session.component_solves == 10
+        check({})
+
+        # Limited solutions.
+        results = session.solve(5).pitch_results
+        assert len(results) == 5
+        assert session.component_solves == 10
+
+    @staticmethod
+    def result_set(pitch_results):
+        return {tuple(str(pitch_result[actor].note.diatonic_pitch) for actor in pitch_result.actors)
+                for pitch_result in pitch_results}
+
+    @staticmethod
+    def create_notes():
+        return [Note(DiatonicPitch.parse(p), Duration(1, 4)) for p in ['C:4', 'D:4', 'E:4', 'F:4', 'G:4', 'A:4']]
+
+    @staticmethod
+    def create_problem(notes):
+        line = Line()
+        location = 0
+        for note in notes:
+            line.pin(note, Offset(location))
+            location += note.duration.duration
+
+        tempo_seq = TempoEventSequence()
+        ts_seq = EventSequence()
+        tempo_seq.add(TempoEvent(Tempo(60, Duration(1, 4)), Position(0)))
+        ts_seq.add(TimeSignatureEvent(TimeSignature(3, Duration(1, 4), 'sww'), Position(0)))
+
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('C'))
+        hct = HarmonicContextTrack()
+        hct.append(HarmonicContext(tonality, TertianChordTemplate.parse('tI').create_chord(tonality), Duration(1)))
+        hct.append(HarmonicContext(tonality, TertianChordTemplate.parse('tIV').create_chord(tonality), Duration(1)))
+        return line, tempo_seq, ts_seq, hct
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.comparative_pitch_constraint import ComparativePitchConstraint
+from melody.constraints.fixed_pitch_constraint import FixedPitchConstraint
+from melody.constraints.pitch_range_constraint import PitchRangeConstraint
+from melody.constraints.pitch_step_constraint import PitchStepConstraint
+from melody.constraints.relative_scalar_step_constraint import RelativeScalarStepConstraint
+from melody.solver.min_conflicts_solver import MinConflictsSolver
+from melody.solver.p_map import PMap
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.solver.solve_budget import SolveBudget
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_range import PitchRange
+
+
+class TestMinConflictsSolver(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    @staticmethod
+    def build_problem(num_bars):
+        chords = ['I', 'IV', 'V', 'I']
+        bars = ' '.join('<C-Major:{0}> qC:4 D E F'.format(chords[i % 4]) for i in range(num_bars))
+        p_map = PMap.create('{' + bars + '}', PitchRange.create('C:3', 'C:6'))
+        actors = p_map.actors
+        policies = [RelativeScalarStepConstraint(actors[i], actors[i + 1], -2, 2) for i in range(len(actors) - 1)]
+        policies.extend(ChordalPitchConstraint(actors[i]) for i in range(0, len(actors), 4))
+        # Downbeats rise over two bars, then fall.
+        for i in range(0, len(actors) - 4, 4):
+            policies.append(ComparativePitchConstraint(actors[i], actors[i + 4],
+                                                       ComparativePitchConstraint.LESS_THAN if (i // 4) % 3 else
+                                                       ComparativePitchConstraint.GREATER_THAN))
+        policies.append(PitchRangeConstraint(actors, PitchRange.create('E:3', 'A:5')))
+        return p_map, policies
+
+    def test_solve(self):
+        p_map, policies = TestMinConflictsSolver.build_problem(10)
+        solver = MinConflictsSolver(policies, seed=7)
+        results = solver.solve(p_map)
+        assert len(results) == 1
+        assert solver.num_violations == 0
+        assert solver.violated_policies(results[0]) == []
+        assert solver.best.solution_key() == results[0].solution_key()
+        assert p_map.unassigned() == p_map.actors
+
+        # A seed makes the search repeatable.
+        again = MinConflictsSolver(policies, seed=7)
+        again.solve(p_map)
+        assert again.full_results.solution_keys == results.solution_keys
+        assert again.num_steps == solver.num_steps
+        solver.solve(p_map)
+        assert solver.full_results.solution_keys == results.solution_keys
+
+    def test_solutions(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E F G}', PitchRange.create('C:4', 'C:5'))
+        a, e, b, c, d = p_map.actors
+        policies = [ChordalPitchConstraint(a),
+                    RelativeScalarStepConstraint(a, e, -3, 3),
+                    RelativeScalarStepConstraint(a, b, -1, 1),
+                    PitchStepConstraint(b, c, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(c, d, 1, PitchStepConstraint.UP),
+                    PitchRangeConstraint([d], PitchRange.create('C:4', 'F:4'))]
+        exhaustive = PitchConstraintSolver(policies)
+        exhaustive.solve(p_map)
+
+        solver = MinConflictsSolver(policies, seed=3)
+        results = solver.solve(p_map, instance_limit=5)
+        assert len(results) == 5
+        assert set(results.solution_keys) <= set(exhaustive.solution_keys)
+
+        # Fixed pitches are kept.
+        fixed = PMap.create('{<C-Major:I> qC:4 D E F G}', PitchRange.create('C:4', 'C:5'))
+        a, e, b, c, d = fixed.actors
+        policies = [FixedPitchConstraint(a, DiatonicPitch.parse('E:4')),
+                    PitchStepConstraint(b, a, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(c, b, 1, PitchStepConstraint.UP),
+                    RelativeScalarStepConstraint(c, d, 0, 2),
+                    RelativeScalarStepConstraint(d, e, -1, 1)]
+        results = MinConflictsSolver(policies, seed=3).solve(fixed)
+        assert len(results) == 1
+        assert [str(results[0][actor].note.diatonic_pitch) for actor in [a, b, c]] == ['E:4', 'D:4', 'C:4']
+
+    def test_unsatisfiable(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:4', 'C:5'))
+        a, b, c = p_map.actors
+        policies = [PitchStepConstraint(a, b, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(b, c, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(a, c, 3, PitchStepConstraint.UP)]
+        solver = MinConflictsSolver(policies, seed=1)
+        results = solver.solve(p_map, max_steps=200)
+        assert len(results) == 0
+        assert solver.num_steps == 200
+        assert solver.num_violations == 1
+        assert len(solver.violated_policies(solver.best)) == 1
+
+    def test_budget(self):
+        p_map, policies = TestMinConflictsSolver.build_problem(10)
+        solver = MinConflictsSolver(policies, seed=7)
+        budget = SolveBudget(max_nodes=3)
+        results = solver.solve(p_map, budget=budget)
+        assert solver.truncated
+        assert len(results) == 0
+        assert solver.num_steps == 2
+        assert solver.best is not None
+        assert solver.num_violations > 0
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from melody.solver.nogood_store import NogoodStore
+from melody.solver.p_map import PMap
+from structure.note import Note
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_range import PitchRange
+
+
+class TestNogoodStore(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_find(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:3', 'C:6'))
+        a, b, c = p_map.actors
+        c4, d4, e4 = [DiatonicPitch.parse(t).pitch_key for t in ['C:4', 'D:4', 'E:4']]
+
+        store = NogoodStore(4)
+        nogood = frozenset([(a, c4), (b, d4)])
+        store.add(nogood)
+        assert len(store) == 1
+        assert nogood in store
+
+        # Completes only with a assigned C:4.
+        assert store.find(p_map, b, d4) is None
+        p_map.assign(a, Note(DiatonicPitch.parse('C:4'), a.base_duration))
+        assert store.find(p_map, b, d4) == nogood
+        assert store.find(p_map, b, e4) is None
+        assert store.find(p_map, c, d4) is None
+        p_map.undo()
+        p_map.assign(a, Note(DiatonicPitch.parse('E:4'), a.base_duration))
+        assert store.find(p_map, b, d4) is None
+
+    def test_lru(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:3', 'C:6'))
+        a, b, _ = p_map.actors
+        keys = [DiatonicPitch.parse(t).pitch_key for t in ['C:4', 'D:4', 'E:4', 'F:4']]
+        p_map.assign(a, Note(DiatonicPitch.parse('C:4'), a.base_duration))
+
+        store = NogoodStore(3)
+        nogoods = [frozenset([(a, keys[0]), (b, key)]) for key in keys]
+        for nogood in nogoods[:3]:
+            store.add(nogood)
+        # Using the first makes the second the least recently used.
+        assert store.find(p_map, b, keys[0]) == nogoods[0]
+        store.add(nogoods[3])
+        assert len(store) == 3
+        assert nogoods[1] not in store
+        assert store.find(p_map, b, keys[1]) is None
+        assert store.find(p_map, b, keys[3]) == nogoods[3]
+
+        store.clear()
+        assert len(store) == 0
+        assert store.find(p_map, b, keys[3]) is None
+
+
+if __name__ == "__main__":
+    unittest.main()
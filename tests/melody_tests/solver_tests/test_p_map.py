@@ -129,6 +129,78 @@ class TestPMap(unittest.TestCase):
         assert pm is not None
         assert len(pm.keys()) == 12
 
+    def test_trail_assign_and_undo(self):
+        music_line = '{<C-Major:I> qC:4 D E F}'
+        pr = PitchRange.create('C:3', 'C:6')
+        pm = PMap.create(music_line, pr)
+        actors = pm.actors
+        pm[actors[0]].note = Note(DiatonicPitch.parse('E:4'), Duration(1, 4))
+
+        assert pm.solution_key() == (DiatonicPitch.parse('E:4').pitch_key, None, None, None)
+
+        mark = pm.mark()
+        pm.assign(actors[1], Note(DiatonicPitch.parse('F:4'), Duration(1, 4)))
+        inner_mark = pm.mark()
+        pm.assign(actors[2], Note(DiatonicPitch.parse('G:4'), Duration(1, 4)))
+        pm.assign(actors[0], Note(DiatonicPitch.parse('D:4'), Duration(1, 4)))
+        assert str(pm[actors[0]].note.diatonic_pitch) == 'D:4'
+        assert pm.unassigned() == [actors[3]]
+
+        pm.undo(inner_mark)
+        assert str(pm[actors[0]].note.diatonic_pitch) == 'E:4'
+        assert str(pm[actors[1]].note.diatonic_pitch) == 'F:4'
+        assert pm[actors[2]].note is None
+
+        pm.undo(mark)
+        assert str(pm[actors[0]].note.diatonic_pitch) == 'E:4'
+        assert pm.unassigned() == actors[1:]
+
+    def test_from_solution_key(self):
+        music_line = '{<C-Major:I> qC:4 iD E hF}'
+        pr = PitchRange.create('C:3', 'C:6')
+        pm = PMap.create(music_line, pr)
+        actors = pm.actors
+        for actor, pitch_txt in zip(actors, ['Cb:4', 'D#:4', 'E:5', 'Fbb:3']):
+            pm.assign(actor, Note(DiatonicPitch.parse(pitch_txt), actor.base_duration))
+        key = pm.solution_key()
+
+        copy_pm = pm.from_solution_key(key)
+        assert copy_pm.actors == actors
+        assert copy_pm.solution_key() == key
+        for actor in actors:
+            assert copy_pm[actor] is not pm[actor]
+            assert copy_pm[actor].policy_context is pm[actor].policy_context
+            assert copy_pm[actor].note.diatonic_pitch == pm[actor].note.diatonic_pitch
+            assert copy_pm[actor].note.duration == actor.duration
+
+        # Unassigned targets stay unassigned.
+        pm.undo()
+        assert pm.from_solution_key(pm.solution_key()).unassigned() == actors
+
+    def test_content_hash(self):
+        music_line = '{<C-Major:I> qC:4 D E F}'
+        pr = PitchRange.create('C:3', 'C:6')
+        pm = PMap.create(music_line, pr)
+        for actor, pitch_txt in zip(pm.actors, ['E:4', 'F:4', 'G:4', 'A:4']):
+            pm.assign(actor, Note(DiatonicPitch.parse(pitch_txt), actor.base_duration))
+
+        copy_pm = pm.from_solution_key(pm.solution_key())
+        assert copy_pm is not pm
+        assert copy_pm == pm
+        assert hash(copy_pm) == hash(pm)
+        assert len({pm, copy_pm}) == 1
+
+        other_pm = pm.from_solution_key(pm.solution_key()[:3] + (DiatonicPitch.parse('B:4').pitch_key,))
+        assert other_pm != pm
+        assert len({pm, copy_pm, other_pm}) == 2
+
+        # Same pitches over different actors are not equal.
+        other_actors_pm = PMap.create(music_line, pr)
+        for actor, pitch_txt in zip(other_actors_pm.actors, ['E:4', 'F:4', 'G:4', 'A:4']):
+            other_actors_pm.assign(actor, Note(DiatonicPitch.parse(pitch_txt), actor.base_duration))
+        assert other_actors_pm.solution_key() == pm.solution_key()
+        assert other_actors_pm != pm
+
     @staticmethod
     def policy_creator(modality_type, modality_tone, tertian_chord_txt, low_pitch_txt, hi_pitch_txt):
         diatonic_tonality = Tonality.create(modality_type, modality_tone)
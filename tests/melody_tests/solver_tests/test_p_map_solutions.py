@@ -0,0 +1,104 @@
+import unittest
+
+from melody.solver.p_map import PMap
+from melody.solver.p_map_solutions import PMapSolutions, PMapProduct
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.constraints.pitch_range_constraint import PitchRangeConstraint
+from structure.note import Note
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.pitch_range import PitchRange
+
+
+class TestPMapSolutions(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_keys_and_p_maps(self):
+        pm = PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:3', 'C:6'))
+        keys = [tuple(DiatonicPitch.parse(t).pitch_key for t in pitch_txts)
+                for pitch_txts in [('C:4', 'D:4', 'E:4'), ('E:4', 'D:4', 'C:4'), ('C:4', 'D:4', 'E:4')]]
+
+        solutions = PMapSolutions(pm, keys)
+        assert len(solutions) == 2
+        assert solutions.solution_keys == keys[:2]
+        assert not solutions.add_key(list(keys[1]))
+
+        first = solutions[0]
+        assert first is solutions[0]
+        assert first is solutions[-2]
+        assert first.solution_key() == keys[0]
+        assert [p.solution_key() for p in solutions] == keys[:2]
+        assert [p.solution_key() for p in solutions[1:]] == keys[1:2]
+
+        # Membership is by content.
+        copy_pm = pm.from_solution_key(keys[1])
+        assert copy_pm in solutions
+        assert solutions.index(copy_pm) == 1
+        assert solutions.count(copy_pm) == 1
+        assert pm not in solutions
+        assert PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:3', 'C:6')).from_solution_key(keys[0]) \
+            not in solutions
+        with self.assertRaises(ValueError):
+            solutions.index(pm)
+
+    def test_product(self):
+        pm = PMap.create('{<C-Major:I> qC:4 D E F}', PitchRange.create('C:3', 'C:6'))
+        actors = pm.actors
+        pm[actors[3]].note = Note(DiatonicPitch.parse('A:4'), actors[3].base_duration)
+
+        def keys(*pitch_txts):
+            return [tuple(DiatonicPitch.parse(t).pitch_key for t in txts) for txts in pitch_txts]
+
+        first = keys(('C:4', 'E:4'), ('D:4', 'F:4'))
+        second = keys(('G:4',), ('A:4',), ('B:4',))
+        products = PMapProduct(pm, [([actors[0], actors[2]], first), ([actors[1]], second)])
+        assert len(products) == 6
+        assert products.num_solutions == 6
+
+        a4 = DiatonicPitch.parse('A:4').pitch_key
+        expected = [(f[0], s[0], f[1], a4) for f in first for s in second]
+        assert products.solution_keys == expected
+        assert [products.solution_key_at(i) for i in range(0, 6)] == expected
+        assert [p.solution_key() for p in products] == expected
+        assert products[-1].solution_key() == expected[5]
+        assert products[2] is products[2]
+        with self.assertRaises(IndexError):
+            products[6]
+
+        for i, key in enumerate(expected):
+            assert products.index(pm.from_solution_key(key)) == i
+        assert pm.from_solution_key(expected[0][:3] + (None,)) not in products
+        assert pm.from_solution_key(keys(('C:4', 'C:4', 'C:4', 'A:4'))[0]) not in products
+
+        limited = PMapProduct(pm, [([actors[0], actors[2]], first), ([actors[1]], second)], 4)
+        assert len(limited) == 4
+        assert limited.solution_keys == expected[:4]
+        assert pm.from_solution_key(expected[4]) not in limited
+
+        assert len(PMapProduct(pm, [([actors[0], actors[2]], first), ([actors[1]], [])])) == 0
+
+    def test_solver_results(self):
+        pm = PMap.create('{<C-Major:I> qC:4 D E}', PitchRange.create('C:4', 'E:4'))
+        actors = pm.actors
+        policies = [PitchRangeConstraint([actor], PitchRange.create('C:4', 'E:4')) for actor in actors]
+        pm[actors[0]].note = Note(DiatonicPitch.parse('C:4'), actors[0].base_duration)
+
+        solver = PitchConstraintSolver(policies)
+        full_results, _ = solver.solve(pm)
+        assert isinstance(full_results, PMapProduct)
+        assert len(full_results) > 1
+        assert solver.num_instances == len(full_results)
+        assert len(set(full_results.solution_keys)) == len(full_results)
+        assert len(set(full_results)) == len(full_results)
+        for p_map in full_results:
+            assert p_map in full_results
+            for policy in policies:
+                assert policy.verify(p_map)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
+import random
 import unittest
+from fractions import Fraction
 from tonalmodel.tonality import Tonality
 from harmoniccontext.harmonic_context import HarmonicContext
 from melody.constraints.policy_context import PolicyContext
@@ -17,6 +19,7 @@ from melody.constraints.pitch_range_constraint import PitchRangeConstraint
 from melody.constraints.equal_pitch_constraint import EqualPitchConstraint
 from melody.constraints.relative_diatonic_constraint import RelativeDiatonicConstraint
 from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.relative_scalar_step_constraint import RelativeScalarStepConstraint
 from tonalmodel.interval import IntervalType, Interval
 from melody.solver.p_map import PMap
 
@@ -135,6 +138,191 @@ class TestPitchConstraintSolver(unittest.TestCase):
         for pm in full_results:
             print("{0}".format(pm))
 
+    def test_parallel_solve(self):
+        source_instance_expression = '{<C-Major:IV> [sC:5 B:4 A G] qF:4 [sA:4 B C:5 D] qD:5}'
+        pitch_range = PitchRange.create('C:4', 'C:5')
+        p_map = PMap.create(source_instance_expression, pitch_range, [('G-Major:V', 1)])
+        actors = p_map.actors
+
+        policies = OrderedSet()
+        policies.add(PitchStepConstraint(actors[0], actors[1], 1, PitchStepConstraint.Down))
+        policies.add(PitchStepConstraint(actors[1], actors[2], 1, PitchStepConstraint.Down))
+        policies.add(PitchStepConstraint(actors[2], actors[3], 1, PitchStepConstraint.Down))
+        policies.add(EqualPitchConstraint([actors[3], actors[4]]))
+        policies.add(ChordalPitchConstraint(actors[4]))
+        policies.add(PitchStepConstraint(actors[5], actors[6], 1, PitchStepConstraint.UP))
+        policies.add(ChordalPitchConstraint(actors[9]))
+
+        solver = PitchConstraintSolver(policies)
+        sequential_results, sequential_partials = solver.solve(p_map, accept_partials=True)
+        assert len(sequential_results) == 0
+
+        # Only some notes are constrained, so partial results are all that is found.
+        solver = PitchConstraintSolver(policies)
+        parallel_results, parallel_partials = solver.solve(p_map, accept_partials=True, parallel=2)
+        assert len(parallel_results) == 0
+        assert len(parallel_partials) == len(sequential_partials)  # searched sequentially
+
+        policies.add(StepSequenceConstraint([actors[6], actors[7], actors[8]], [1, 1]))
+        solver = PitchConstraintSolver(policies)
+        sequential_results, _ = solver.solve(p_map)
+        sequential_keys = list(solver.solution_keys)
+        assert len(sequential_results) > 2
+
+        solver = PitchConstraintSolver(policies)
+        parallel_results, _ = solver.solve(p_map, parallel=3)
+        assert sorted(solver.solution_keys) == sorted(sequential_keys)
+        for pm in parallel_results:
+            for policy in policies:
+                assert policy.verify(pm.p_map)
+
+        # instance_limit is honoured across subtrees.
+        solver = PitchConstraintSolver(policies)
+        limited_results, _ = solver.solve(p_map, instance_limit=2, parallel=3)
+        assert len(limited_results) == 2
+        assert set(solver.solution_keys) <= set(sequential_keys)
+
+        # p_map is left as it was given.
+        assert p_map.unassigned() == actors
+
+    def test_components(self):
+        source_instance_expression = '{<C-Major:IV> [sC:5 B:4 A G] qF:4 [sA:4 B C:5 D] qD:5}'
+        pitch_range = PitchRange.create('C:4', 'C:5')
+        p_map = PMap.create(source_instance_expression, pitch_range, [('G-Major:V', 1)])
+        actors = p_map.actors
+
+        policies = [PitchStepConstraint(actors[0], actors[1], 1, PitchStepConstraint.Down),
+                    PitchStepConstraint(actors[1], actors[2], 1, PitchStepConstraint.Down),
+                    StepSequenceConstraint([actors[5], actors[6], actors[7]], [1, 1]),
+                    PitchRangeConstraint([actors[3]], PitchRange.create('E:4', 'A:4')),
+                    PitchRangeConstraint([actors[4]], PitchRange.create('E:4', 'A:4')),
+                    ChordalPitchConstraint(actors[8]),
+                    ChordalPitchConstraint(actors[9]),
+                    PitchStepConstraint(actors[2], actors[3], 1, PitchStepConstraint.Down)]
+
+        components = PitchConstraintSolver.components(policies)
+        assert [c[0] for c in components] == [actors[0:4], actors[5:8], [actors[4]], [actors[8]], [actors[9]]]
+        assert [len(c[1]) for c in components] == [4, 1, 1, 1, 1]
+
+        solver = PitchConstraintSolver(policies)
+        results, _ = solver.solve(p_map)
+        counts = [len(PitchConstraintSolver.solve_component(p_map, c_actors, c_policies))
+                  for c_actors, c_policies in components]
+        expected = 1
+        for count in counts:
+            expected *= count
+        assert expected > 100
+        assert len(results) == expected
+        assert solver.num_instances == expected
+        assert len(set(solver.solution_keys)) == expected
+        for pm in results[:20] + results[-20:]:
+            assert pm in results
+            for policy in policies:
+                assert policy.verify(pm.p_map)
+        assert p_map.unassigned() == actors
+
+        # Taking the first few is cheap, however many solutions there are.
+        policies = [PitchRangeConstraint([actor], pitch_range) for actor in actors]
+        solver = PitchConstraintSolver(policies)
+        results, _ = solver.solve(p_map)
+        assert len(PitchConstraintSolver.solve_component(p_map, [actors[0]], policies[:1])) == 8
+        assert results.num_solutions == 8 ** len(actors)
+        assert [str(pm[actors[-1]].note.diatonic_pitch) for pm in results[:3]] == ['C:4', 'D:4', 'E:4']
+
+        limited_results, _ = PitchConstraintSolver(policies).solve(p_map, instance_limit=5)
+        assert len(limited_results) == 5
+        assert [pm.solution_key() for pm in limited_results] == [pm.solution_key() for pm in results[:5]]
+
+    def test_components_match_full_search(self):
+        # Step sequences across tonalities have values depending on the order their actors are assigned, so
+        # component searches must visit nodes as a search over all components does to find the same solutions.
+        hct_list = [('C-Major:I', Fraction(1, 4)), ('Eb-Major:V', Fraction(1, 4)), ('D-Minor:I', Fraction(1, 4)),
+                    ('A-Major:IV', Fraction(1, 4)), ('F#-Major:I', Fraction(1, 4))]
+        num_multi_component = 0
+        for seed in range(50):
+            rng = random.Random(seed)
+            p_map = PMap.create('{<C-Major:I> qC:4 D E G A}', PitchRange.create('C:4', 'G:5'), hct_list)
+            actors = list(p_map.actors)
+            policies = [PitchRangeConstraint([actor], PitchRange.create('C:4', 'B:4')) for actor in actors]
+            rng.shuffle(actors)
+            cut = rng.randint(2, 3)
+            for group in [actors[:cut], actors[cut:]]:
+                for _ in range(rng.randint(1, 3)):
+                    one, two = rng.sample(group, 2)
+                    kind = rng.randrange(4)
+                    if kind == 0:
+                        policies.append(StepSequenceConstraint(rng.sample(group, len(group)),
+                                                               [rng.choice([-2, -1, 1, 2])
+                                                                for _ in range(len(group) - 1)]))
+                    elif kind == 1:
+                        policies.append(PitchRangeConstraint([one], PitchRange.create('E:4', 'A:4')))
+                    elif kind == 2:
+                        policies.append(ChordalPitchConstraint(one))
+                    else:
+                        policies.append(EqualPitchConstraint([one, two]))
+            rng.shuffle(policies)
+
+            solver = PitchConstraintSolver(policies)
+            solver.solve(p_map)
+            full_search = PitchConstraintSolver(policies)
+            full_search.solve(p_map, accept_partials=True)   # partials are searched over all components
+            assert set(solver.solution_keys) == set(full_search.solution_keys), 'seed {0}'.format(seed)
+            if len(PitchConstraintSolver.components(policies)) > 1:
+                num_multi_component += 1
+        assert num_multi_component > 0
+
+    def test_backjumping(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E F G}', PitchRange.create('C:4', 'C:5'))
+        a, e, b, c, d = p_map.actors
+        # After a and e, b, c and d fail for most values of b, whatever the value of e.
+        policies = [ChordalPitchConstraint(a),
+                    RelativeScalarStepConstraint(a, e, -3, 3),
+                    RelativeScalarStepConstraint(a, b, -1, 1),
+                    PitchStepConstraint(b, c, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(c, d, 1, PitchStepConstraint.UP),
+                    PitchRangeConstraint([d], PitchRange.create('C:4', 'F:4'))]
+
+        chronological = PitchConstraintSolver(policies, False)
+        chronological.solve(p_map)
+        solver = PitchConstraintSolver(policies, True)
+        solver.solve(p_map)
+        assert len(solver.solution_keys) == 21
+        assert solver.solution_keys == chronological.solution_keys
+        assert solver.num_nodes < chronological.num_nodes
+        assert solver.num_pruned > 0
+        assert chronological.num_pruned == 0
+
+        limited = PitchConstraintSolver(policies, True)
+        limited.solve(p_map, instance_limit=5)
+        assert limited.solution_keys == chronological.solution_keys[:5]
+        assert p_map.unassigned() == p_map.actors
+
+    def test_partials(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E F}', PitchRange.create('C:4', 'C:5'), [('C-Major:I', 1)])
+        a, b, c, d = p_map.actors
+        # b has no values after a = C:5, and d none after c = A:4.
+        policies = [ChordalPitchConstraint(a),
+                    PitchStepConstraint(a, b, 1, PitchStepConstraint.UP),
+                    PitchRangeConstraint([b], PitchRange.create('C:4', 'A:4')),
+                    EqualPitchConstraint([b, c]),
+                    PitchStepConstraint(c, d, 1, PitchStepConstraint.UP),
+                    PitchRangeConstraint([d], PitchRange.create('C:4', 'A:4'))]
+
+        def pitches(pm):
+            return tuple(None if pm[actor].note is None else str(pm[actor].note.diatonic_pitch)
+                         for actor in p_map.actors)
+
+        solver = PitchConstraintSolver(policies)
+        full_results, partial_results = solver.solve(p_map, accept_partials=True)
+        assert [pitches(pm) for pm in full_results] == [('C:4', 'D:4', 'D:4', 'E:4'), ('E:4', 'F:4', 'F:4', 'G:4')]
+        # Each dead end is a partial result, as far as the search got.
+        assert sorted(pitches(pm) for pm in partial_results) == [('C:5', None, None, None),
+                                                                  ('G:4', 'A:4', 'A:4', None)]
+
+        _, partial_results = PitchConstraintSolver(policies).solve(p_map)
+        assert len(partial_results) == 0
+        assert p_map.unassigned() == p_map.actors
+
     def test_for_debugging(self):
         logging.debug('Start test_for_debugging')
 
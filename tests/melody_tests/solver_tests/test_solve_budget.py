@@ -0,0 +1,122 @@
+import unittest
+
+from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.pitch_range_constraint import PitchRangeConstraint
+from melody.constraints.pitch_step_constraint import PitchStepConstraint
+from melody.constraints.relative_scalar_step_constraint import RelativeScalarStepConstraint
+from melody.solver.p_map import PMap
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.solver.solve_budget import SolveBudget
+from melody.solver.solve_statistics import SolveStatistics
+from tonalmodel.pitch_range import PitchRange
+
+
+class TestSolveBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.p_map = PMap.create('{<C-Major:I> qC:4 D E F G}', PitchRange.create('C:4', 'C:5'))
+        a, e, b, c, d = self.p_map.actors
+        self.policies = [ChordalPitchConstraint(a),
+                         RelativeScalarStepConstraint(a, e, -3, 3),
+                         RelativeScalarStepConstraint(a, b, -1, 1),
+                         PitchStepConstraint(b, c, 1, PitchStepConstraint.UP),
+                         PitchStepConstraint(c, d, 1, PitchStepConstraint.UP),
+                         PitchRangeConstraint([d], PitchRange.create('C:4', 'F:4'))]
+
+        self.solver = PitchConstraintSolver(self.policies)
+        self.solver.solve(self.p_map)
+
+    def tearDown(self):
+        pass
+
+    def test_budget(self):
+        budget = SolveBudget(max_nodes=3, max_solutions=5)
+        assert not budget.exhausted
+        assert budget.solution_limit() == 5
+        assert budget.solution_limit(2) == 2
+        budget.add_solutions(4)
+        assert budget.solution_limit() == 1
+        budget.add_solutions(4)
+        assert budget.solution_limit(3) == 0
+
+        assert budget.add_node()
+        assert budget.add_node()
+        assert not budget.add_node()
+        assert budget.exhausted
+        assert budget.num_nodes == 3
+
+        assert SolveBudget().solution_limit() == -1
+
+        budget = SolveBudget(time_limit=0)
+        assert not budget.exhausted
+        budget.start()
+        assert budget.exhausted
+        assert not budget.check_time()
+
+        budget = SolveBudget(time_limit=60)
+        budget.start()
+        assert budget.check_time()
+        assert budget.elapsed < 60
+
+        with self.assertRaises(Exception):
+            SolveBudget(max_nodes=-1)
+
+    def test_unlimited(self):
+        budget = SolveBudget(time_limit=60, max_nodes=100000, max_solutions=1000)
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, budget=budget)
+        assert not solver.truncated
+        assert solver.solution_keys == self.solver.solution_keys
+        assert budget.num_nodes == solver.num_nodes
+        assert budget.num_solutions == len(solver.solution_keys)
+
+    def test_max_nodes(self):
+        budget = SolveBudget(max_nodes=20)
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, budget=budget)
+        assert solver.truncated
+        assert budget.exhausted
+        assert solver.num_nodes == 20
+        assert 0 < len(solver.solution_keys) < len(self.solver.solution_keys)
+        assert solver.solution_keys == self.solver.solution_keys[:len(solver.solution_keys)]
+        assert self.p_map.unassigned() == self.p_map.actors
+
+    def test_max_solutions(self):
+        budget = SolveBudget(max_solutions=5)
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, budget=budget)
+        assert solver.truncated
+        assert solver.solution_keys == self.solver.solution_keys[:5]
+
+        # The budget has no solutions left for a second solve.
+        solver.solve(self.p_map, budget=budget)
+        assert solver.truncated
+        assert len(solver.solution_keys) == 0
+
+        budget = SolveBudget(max_solutions=len(self.solver.solution_keys) + 1)
+        solver.solve(self.p_map, budget=budget)
+        assert not solver.truncated
+        assert solver.solution_keys == self.solver.solution_keys
+
+    def test_time_limit(self):
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, budget=SolveBudget(time_limit=0))
+        assert solver.truncated
+        assert len(solver.solution_keys) == 0
+        assert solver.num_nodes == 0
+
+    def test_statistics(self):
+        statistics = SolveStatistics()
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, budget=SolveBudget(max_nodes=20))
+        statistics.add_search(solver)
+        statistics.add_search(self.solver)
+        assert statistics.num_searches == 2
+        assert statistics.num_nodes == 20 + self.solver.num_nodes
+        assert statistics.num_solutions == len(solver.solution_keys) + len(self.solver.solution_keys)
+        assert statistics.truncated
+        assert 'truncated' in str(statistics)
+
+
+if __name__ == "__main__":
+    unittest.main()
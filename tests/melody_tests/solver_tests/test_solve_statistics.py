@@ -0,0 +1,178 @@
+import time
+import unittest
+
+from harmoniccontext.harmonic_context import HarmonicContext
+from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from harmonicmodel.tertian_chord_template import TertianChordTemplate
+from instruments.instrument_catalog import InstrumentCatalog
+from melody.constraints.chordal_pitch_constraint import ChordalPitchConstraint
+from melody.constraints.on_beat_constraint import OnBeatConstraint
+from melody.constraints.pitch_range_constraint import PitchRangeConstraint
+from melody.constraints.pitch_step_constraint import PitchStepConstraint
+from melody.constraints.relative_scalar_step_constraint import RelativeScalarStepConstraint
+from melody.constraints.step_sequence_constraint import StepSequenceConstraint
+from melody.solver.beat_constraint_solver import BeatConstraintSolver
+from melody.solver.melodic_constraint_solver import MelodicConstraintSolver
+from melody.solver.p_map import PMap
+from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.solver.solve_statistics import SolveStatistics
+from structure.line import Line
+from structure.lite_score import LiteScore
+from structure.note import Note
+from structure.tempo import Tempo
+from structure.time_signature import TimeSignature, BeatType
+from timemodel.duration import Duration
+from timemodel.event_sequence import EventSequence
+from timemodel.offset import Offset
+from timemodel.position import Position
+from timemodel.tempo_event import TempoEvent
+from timemodel.tempo_event_sequence import TempoEventSequence
+from timemodel.time_signature_event import TimeSignatureEvent
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.modality import ModalityType
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.tonality import Tonality
+
+
+class TestSolveStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.p_map = PMap.create('{<C-Major:I> qC:4 D E F G}', PitchRange.create('C:4', 'C:5'))
+        a, e, b, c, d = self.p_map.actors
+        self.policies = [ChordalPitchConstraint(a),
+                         RelativeScalarStepConstraint(a, e, -3, 3),
+                         RelativeScalarStepConstraint(a, b, -1, 1),
+                         PitchStepConstraint(b, c, 1, PitchStepConstraint.UP),
+                         PitchStepConstraint(c, d, 1, PitchStepConstraint.UP),
+                         PitchRangeConstraint([d], PitchRange.create('C:4', 'F:4'))]
+
+    def tearDown(self):
+        pass
+
+    def test_statistics(self):
+        progress = list()
+        statistics = SolveStatistics(lambda s: progress.append(s.num_nodes), progress_interval=3)
+        for _ in range(7):
+            statistics.node()
+        assert progress == [3, 6]
+
+        statistics.count_values(self.policies[0])
+        statistics.count_values(self.policies[3])
+        statistics.count_values(self.policies[4])
+        assert statistics.values_calls == {'ChordalPitchConstraint': 1, 'PitchStepConstraint': 2}
+
+        statistics.add_domain(1, 4)
+        statistics.add_domain(1, 2)
+        statistics.add_domain(2, 5)
+        assert statistics.domain_sizes == {1: [2, 6, 4], 2: [1, 5, 5]}
+        assert statistics.mean_domain_size(1) == 3
+        assert statistics.mean_domain_size(3) == 0
+
+        with statistics.phase('pitch'):
+            pass
+        with statistics.phase('pitch'):
+            pass
+        assert list(statistics.phase_seconds.keys()) == ['pitch']
+
+        statistics.end_search(4, True)
+        assert progress == [3, 6, 7]
+        assert statistics.num_searches == 1
+        assert statistics.num_solutions == 4
+        assert statistics.truncated
+        report = statistics.report()
+        assert 'PitchStepConstraint' in report
+        assert 'phase pitch' in report
+
+    def test_pitch_search(self):
+        statistics = SolveStatistics()
+        solver = PitchConstraintSolver(self.policies)
+        solver.solve(self.p_map, statistics=statistics)
+        assert statistics.num_searches == 1
+        assert statistics.num_nodes == solver.num_nodes
+        assert statistics.num_pruned == solver.num_pruned
+        assert statistics.num_solutions == len(solver.solution_keys)
+        assert statistics.num_backtracks > 0
+        assert set(statistics.values_calls.keys()) == {'ChordalPitchConstraint', 'RelativeScalarStepConstraint',
+                                                       'PitchStepConstraint', 'PitchRangeConstraint'}
+        assert sum(sizes[0] for sizes in statistics.domain_sizes.values()) > 0
+        assert list(statistics.phase_seconds.keys()) == ['pitch setup', 'pitch search']
+        assert statistics.seconds >= sum(statistics.phase_seconds.values()) > 0
+        seconds = statistics.seconds
+        PitchConstraintSolver(self.policies).solve(self.p_map, statistics=statistics)
+        assert statistics.num_searches == 2
+        assert statistics.seconds > seconds
+
+        # The same search without statistics.
+        plain = PitchConstraintSolver(self.policies)
+        plain.solve(self.p_map)
+        assert plain.solution_keys == solver.solution_keys
+        assert plain.num_nodes == solver.num_nodes
+
+    def test_components(self):
+        p_map = PMap.create('{<C-Major:I> qC:4 D E F}', PitchRange.create('C:4', 'C:5'))
+        a, b, c, d = p_map.actors
+        policies = [PitchStepConstraint(a, b, 1, PitchStepConstraint.UP),
+                    PitchStepConstraint(c, d, 2, PitchStepConstraint.UP)]
+        statistics = SolveStatistics()
+        solver = PitchConstraintSolver(policies)
+        results, _ = solver.solve(p_map, statistics=statistics)
+        assert statistics.num_searches == 1
+        assert statistics.num_replicates == 2
+        assert statistics.num_nodes == solver.num_nodes > 0
+        assert statistics.num_solutions == len(results)
+
+    def test_melodic_solve(self):
+        line = Line()
+        notes = [Note(DiatonicPitch.parse(p), Duration(1, 4)) for p in ['a:4', 'b:4', 'c:4', 'd:4']] + \
+                [Note(DiatonicPitch.parse(p), Duration(1, 2)) for p in ['e:4', 'f:4']]
+        location = 0
+        for note in notes:
+            line.pin(note, Offset(location))
+            location += note.duration.duration
+
+        tempo_seq = TempoEventSequence()
+        ts_seq = EventSequence()
+        tempo_seq.add(TempoEvent(Tempo(60, Duration(1, 4)), Position(0)))
+        ts_seq.add(TimeSignatureEvent(TimeSignature(3, Duration(1, 4), 'sww'), Position(0)))
+
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone("C"))
+        chord = TertianChordTemplate.parse('tIV').create_chord(tonality)
+        hc_track = HarmonicContextTrack()
+        hc_track.append(HarmonicContext(tonality, chord, Duration(2, 1)))
+
+        score = LiteScore(line, hc_track, InstrumentCatalog.instance().get_instrument("violin"), tempo_seq, ts_seq)
+        constraints = [OnBeatConstraint(notes[1], BeatType.Strong),
+                       StepSequenceConstraint(notes, [1, 1, 1, -1, -1])]
+        solver = MelodicConstraintSolver.create(score, constraints)
+        cheat = {notes[2]: DiatonicPitch.parse('E:5')}
+
+        statistics = SolveStatistics()
+        start = time.perf_counter()
+        results = solver.solve(cheat, statistics=statistics)
+        elapsed = time.perf_counter() - start
+        assert results.statistics is statistics
+        assert len(results.beat_results) == 1
+        assert len(results.pitch_results) == 1
+        assert statistics.num_beat_results == 1
+        assert statistics.values_calls['OnBeatConstraint'] == 1
+        assert statistics.num_replicates > 0
+        assert statistics.num_solutions == 1
+        for phase in ['beat', 'beat search', 'pitch', 'pitch search']:
+            assert phase in statistics.phase_seconds
+        # The time of the whole solve, not also those of its beat and pitch searches.
+        assert statistics.phase_seconds['beat'] + statistics.phase_seconds['pitch'] <= statistics.seconds <= elapsed
+
+        beat_statistics = SolveStatistics()
+        BeatConstraintSolver(line, tempo_seq, ts_seq, hc_track, [constraints[0]]).solve(beat_statistics)
+        assert beat_statistics.seconds >= beat_statistics.phase_seconds['beat search'] > 0
+
+        # Without statistics, the results carry the pitch search totals.
+        results = MelodicConstraintSolver.create(score, constraints).solve(cheat)
+        assert results.statistics.num_searches == 1
+        assert results.statistics.num_solutions == 1
+        assert len(results.statistics.values_calls) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
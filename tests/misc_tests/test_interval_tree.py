@@ -1,6 +1,8 @@
+import random
 import unittest
 from misc.interval_tree import IntervalTree
 from misc.interval import Interval
+from misc.rb_node import RBNode
 import logging
 
 
@@ -25,6 +27,86 @@ class TestInterval(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def test_put_all(self):
+        rand = random.Random(17)
+        entries = [(Interval(lo, lo + rand.randint(1, 20)), MyObject(i))
+                   for i, lo in enumerate(rand.randint(0, 100) for _ in range(0, 300))]
+
+        sequential = IntervalTree()
+        for interval, value in entries:
+            sequential.put(interval, value)
+
+        # Bulk into an empty tree, then bulk into a non-empty tree, keeping earlier query results valid.
+        bulk = IntervalTree()
+        bulk.put_all(entries[:100])
+        info = bulk.query_point(50)
+        bulk.put_all(entries[100:])
+        TestInterval.check_red_black(bulk, bulk.root)
+
+        for point in range(-1, 125):
+            assert sorted(i.value.idd for i in bulk.query_point(point)) == \
+                sorted(i.value.idd for i in sequential.query_point(point))
+        for lo, hi in [(0, 5), (10, 11), (40, 60), (99, 130)]:
+            assert sorted(i.value.idd for i in bulk.query_interval(Interval(lo, hi))) == \
+                sorted(i.value.idd for i in sequential.query_interval(Interval(lo, hi)))
+            assert sorted(i.value.idd for i in bulk.query_interval_start(Interval(lo, hi))) == \
+                sorted(i.value.idd for i in sequential.query_interval_start(Interval(lo, hi)))
+
+        for interval_info in info:
+            bulk.delete(interval_info)
+        assert len(bulk.query_point(50)) == len(sequential.query_point(50)) - len(info)
+
+        # Small sets are put one at a time.
+        small = IntervalTree()
+        small.put_all(entries[:5])
+        assert sorted(i.value.idd for i in small.query_interval(Interval(0, 200))) == list(range(0, 5))
+        TestInterval.check_red_black(small, small.root)
+
+    def test_random_delete(self):
+        for seed in range(0, 50):
+            rand = random.Random(seed)
+            entries = [(Interval(lo, lo + rand.randint(1, 5)), MyObject(i))
+                       for i, lo in enumerate(rand.randint(0, 50) for _ in range(0, 40))]
+            tree = IntervalTree()
+            if seed % 2 == 0:
+                tree.put_all(entries)
+            else:
+                for interval, value in entries:
+                    tree.put(interval, value)
+
+            remaining = list(entries)
+            for interval, value in rand.sample(entries, 30):
+                info = [i for i in tree.find_exact_interval(interval) if i.value == value]
+                assert len(info) == 1
+                tree.delete(info[0])
+                remaining.remove((interval, value))
+                TestInterval.check_red_black(tree, tree.root)
+                for point in range(0, 56, 5):
+                    assert sorted(i.value.idd for i in tree.query_point(point)) == \
+                        sorted(v.idd for iv, v in remaining if iv.contains(point))
+
+    @staticmethod
+    def check_red_black(tree, node):
+        """
+        Check red-black and interval tree properties of a subtree, returning its black height.
+        """
+        if node == tree.nil:
+            return 1
+        for child in [node.left, node.right]:
+            if child != tree.nil:
+                assert child.parent == node
+                if node.color == RBNode.Red:
+                    assert child.color == RBNode.Black
+        if node.left != tree.nil:
+            assert node.left.key <= node.key
+        if node.right != tree.nil:
+            assert node.right.key >= node.key
+        assert node.min == min([node.interval.lower] + [c.min for c in [node.left, node.right] if c != tree.nil])
+        assert node.max == max([node.interval.upper] + [c.max for c in [node.left, node.right] if c != tree.nil])
+        height = TestInterval.check_red_black(tree, node.left)
+        assert height == TestInterval.check_red_black(tree, node.right)
+        return height + (1 if node.color == RBNode.Black else 0)
+
     def test_simple_tree(self):
         print('simple tree text')
         tree = IntervalTree()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from misc.lazy import LazyClassAttribute, LazyModule
+
+
+class Table(object):
+    BUILDS = 0
+
+    @staticmethod
+    def build(size):
+        Table.BUILDS += 1
+        return list(range(0, size))
+
+    VALUES = LazyClassAttribute(build.__func__, 4)
+
+
+class TestLazy(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_class_attribute(self):
+        self.assertTrue(isinstance(Table.__dict__['VALUES'], LazyClassAttribute))
+        self.assertEqual(0, Table.BUILDS)
+
+        self.assertEqual([0, 1, 2, 3], Table().VALUES)
+        self.assertEqual(1, Table.BUILDS)
+
+        # Built once, then a plain class attribute.
+        self.assertEqual([0, 1, 2, 3], Table.VALUES)
+        self.assertEqual(1, Table.BUILDS)
+        self.assertTrue(isinstance(Table.__dict__['VALUES'], list))
+
+    def test_deferred_imports(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        checks = [('structure.LineGrammar.core.line_grammar_executor', 'antlr4'),
+                  ('melody.solver.pitch_constraint_solver', 'concurrent.futures.process'),
+                  ('midi.score_to_midi_converter', 'mido'),
+                  ('instruments.instrument_catalog', 'xml.etree.ElementTree')]
+        for module, deferred in checks:
+            code = 'import sys\nimport {0}\nprint(\'{1}\' in sys.modules)'.format(module, deferred)
+            output = subprocess.check_output([sys.executable, '-c', code], cwd=root, universal_newlines=True)
+            self.assertEqual('False', output.strip(), '{0} loads {1}'.format(module, deferred))
+
+    def test_lazy_module(self):
+        code = 'import sys\nfrom misc.lazy import LazyModule\ncolorsys = LazyModule(\'colorsys\')\n' \
+               'print(\'colorsys\' in sys.modules)\ncolorsys.rgb_to_hsv\nprint(\'colorsys\' in sys.modules)'
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=root, universal_newlines=True)
+        self.assertEqual(['False', 'True'], output.split())
+
+        import json
+        lazy_json = LazyModule('json')
+        self.assertIs(json, lazy_json.module)
+        self.assertNotIn('dumps', lazy_json.__dict__)
+        self.assertIs(json.dumps, lazy_json.dumps)
+        # Kept after first read.
+        self.assertIs(json.dumps, lazy_json.__dict__['dumps'])
+        with self.assertRaises(AttributeError):
+            lazy_json.no_such_attribute
+
+    def test_lazy_patterns(self):
+        from harmonicmodel.tertian_chord_template import TertianChordTemplate
+        template = TertianChordTemplate.parse('CMaj7')
+        self.assertEqual('TCMaj7', str(template))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,6 +44,18 @@ class MyObserver(Observer):
     def notification(self, observable, message_type, message=None, data=None):
         print('Observer {0} saw value Updated to {1} in \'{2}\''.format(self.name, data, observable.name))
         self.__last_observed = data
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        Observer.__init__(self)
+        self.batches = []
+
+    def notification(self, observable, message_type, message=None, data=None):
+        pass
+
+    def batch_notification(self, observable, events):
+        self.batches.append(list(events))
         
 
 class TestObservable(unittest.TestCase):
@@ -85,6 +97,39 @@ class TestObservable(unittest.TestCase):
         assert c.last_observed != 50
         assert d.last_observed != 50        
 
+    def test_batch(self):
+        o = MyObservable('thing', 5)
+        b = MyObserver('b')
+        r = RecordingObserver()
+        o.register(b)
+        o.register(r)
+
+        with o.batch():
+            o.count = 10
+            with o.batch():
+                o.count = 20
+            assert o.in_batch
+            # Nothing delivered within the batch.
+            assert b.last_observed == 0
+            assert len(r.batches) == 0
+            o.count = 30
+        assert not o.in_batch
+
+        # The default batch_notification passes each event to notification.
+        assert b.last_observed == 30
+        assert len(r.batches) == 1
+        assert [data for _, _, data in r.batches[0]] == [10, 20, 30]
+        assert r.batches[0][0] == (MyObservable.COUNT_UPDATE, MyObservable.COUNT_UPDATE_MSG, 10)
+
+        # An empty batch delivers nothing.
+        with o.batch():
+            pass
+        assert len(r.batches) == 1
+
+        o.count = 40
+        assert b.last_observed == 40
+        assert len(r.batches) == 1
+
 
 if __name__ == "__main__":
     unittest.main()
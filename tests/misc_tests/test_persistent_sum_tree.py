@@ -0,0 +1,57 @@
+import random
+import unittest
+from fractions import Fraction
+
+from misc.persistent_sum_tree import PersistentSumTree
+
+
+class TestPersistentSumTree(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_prefix_sums(self):
+        rand = random.Random(5)
+        for size in [1, 2, 7, 37]:
+            values = [0] * size
+            tree = PersistentSumTree(size)
+            assert len(tree) == size
+            for _ in range(0, 100):
+                index = rand.randrange(0, size)
+                value = Fraction(rand.randint(-8, 8), rand.randint(1, 8))
+                tree = tree.set(index, value)
+                values[index] = value
+                for count in range(0, size + 1):
+                    assert tree.prefix_sum(count) == sum(values[:count])
+            assert [tree[i] for i in range(0, size)] == values
+
+    def test_persistence(self):
+        rand = random.Random(11)
+        versions = [(PersistentSumTree(20), [0] * 20)]
+        for _ in range(0, 200):
+            tree, values = versions[rand.randrange(0, len(versions))]
+            index = rand.randrange(0, 20)
+            value = rand.randint(0, 10)
+            new_values = list(values)
+            new_values[index] = value
+            versions.append((tree.set(index, value), new_values))
+
+        # Every version keeps its own values.
+        for tree, values in versions:
+            assert [tree[i] for i in range(0, 20)] == values
+            assert tree.prefix_sum(20) == sum(values)
+            assert tree.prefix_sum(13) == sum(values[:13])
+
+    def test_index_range(self):
+        tree = PersistentSumTree(3)
+        with self.assertRaises(IndexError):
+            tree.set(3, 1)
+        with self.assertRaises(IndexError):
+            _ = tree[-1]
+
+
+if __name__ == "__main__":
+    unittest.main()
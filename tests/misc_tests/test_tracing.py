@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from misc import tracing
+from misc.tracing import Tracer, NULL_SPAN, span, annotate, traced, current_tracer
+
+
+class Traced(object):
+
+    @traced()
+    def work(self, n):
+        with span('inner', n=n):
+            time.sleep(0.002)
+        annotate(done=True)
+        return n + 1
+
+    @traced(name='named', category='custom')
+    def named(self):
+        return 'x'
+
+    @traced()
+    def fail(self):
+        raise ValueError('failed')
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_no_tracer(self):
+        self.assertIsNone(current_tracer())
+        self.assertIs(span('nothing'), NULL_SPAN)
+        with span('nothing') as s:
+            s.set('a', 1)
+        annotate(a=1)
+        self.assertEqual(4, Traced().work(3))
+
+    def test_nesting(self):
+        with Tracer() as tracer:
+            self.assertEqual(4, Traced().work(3))
+        spans = tracer.spans
+        self.assertEqual(['inner', 'Traced.work'], [s.name for s in spans])
+        inner, outer = spans
+        self.assertEqual(1, inner.depth)
+        self.assertEqual(0, outer.depth)
+        self.assertEqual({'n': 3}, inner.attributes)
+        self.assertEqual({'done': True}, outer.attributes)
+        self.assertEqual('tests.misc_tests', outer.category)
+        self.assertTrue(outer.start <= inner.start and inner.end <= outer.end)
+        self.assertTrue(inner.seconds >= 0.002)
+        self.assertAlmostEqual(outer.seconds - inner.seconds, outer.self_seconds)
+        self.assertIsNone(current_tracer())
+
+    def test_decorator_name(self):
+        with Tracer() as tracer:
+            self.assertEqual('x', Traced().named())
+        self.assertEqual([('named', 'custom')], [(s.name, s.category) for s in tracer.spans])
+        self.assertEqual('named', Traced.named.__name__)
+
+    def test_error(self):
+        with Tracer() as tracer:
+            with self.assertRaises(ValueError):
+                Traced().fail()
+            # The stack is unwound after the exception.
+            self.assertIsNone(tracer.current())
+        self.assertEqual('ValueError', tracer.spans[0].attributes['error'])
+
+    def test_install(self):
+        outer = Tracer().install()
+        try:
+            with Tracer() as inner:
+                self.assertIs(inner, current_tracer())
+                with span('a'):
+                    pass
+            self.assertIs(outer, current_tracer())
+            with span('b'):
+                pass
+        finally:
+            outer.uninstall()
+        self.assertIsNone(tracing.current_tracer())
+        self.assertEqual(['a'], [s.name for s in inner.spans])
+        self.assertEqual(['b'], [s.name for s in outer.spans])
+
+    def test_chrome_trace(self):
+        with Tracer() as tracer:
+            Traced().work(1)
+            with span('other', 'cat', value=object()):
+                pass
+        trace = tracer.chrome_trace()
+        events = trace['traceEvents']
+        self.assertEqual(['Traced.work', 'inner', 'other'], [e['name'] for e in events])
+        for event in events:
+            self.assertEqual('X', event['ph'])
+            self.assertEqual(os.getpid(), event['pid'])
+            self.assertTrue(event['dur'] >= 0)
+        self.assertTrue(events[0]['ts'] <= events[1]['ts'])
+        self.assertTrue(isinstance(events[2]['args']['value'], str))
+
+        handle, filename = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            tracer.write_chrome_trace(filename)
+            with open(filename) as trace_file:
+                self.assertEqual(3, len(json.load(trace_file)['traceEvents']))
+        finally:
+            os.remove(filename)
+
+    def test_aggregate(self):
+        with Tracer() as tracer:
+            for i in range(3):
+                Traced().work(i)
+        totals = tracer.aggregate()
+        self.assertEqual(['Traced.work', 'inner'], list(totals.keys()))
+        count, total, self_total, largest = totals['inner']
+        self.assertEqual(3, count)
+        self.assertTrue(largest <= total)
+        self.assertAlmostEqual(total, self_total)
+        report = tracer.report()
+        self.assertEqual(3, len(report.split('\n')))
+        self.assertIn('Traced.work', report)
+
+        tracer.clear()
+        self.assertEqual(0, len(tracer.spans))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import ast
+import contextlib
+import io
+import os
+import unittest
+
+from structure.LineGrammar.core.fast_line_grammar_parser import FastLineGrammarParser
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from structure.note import Note
+
+
+class TestFastLineGrammarParser(unittest.TestCase):
+    SAMPLES = [
+        '{ <E-Major:iv> C:5 D Eb F ((1:8), 2)[C:3 D:4 E] <:v> [i@C#:3 sBb D:4 Fbb]}',
+        '{<C-Major: I> iC:4 <:V/ii> qD:4 <:IV/V-Natural> E:4 <Eb-Dorian(1): IVDom7> hF:4-}',
+        '{(3:16)C:4 (1:8)@@D [iE F (q, 2)[G A B]] <:C-Maj> R r:4 C##:3 Dbb:5}',
+        '{ <Bb-MelodicMinor: i> [I@Bb:4 IC a]}',
+    ]
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_tokenize(self):
+        tokens = FastLineGrammarParser.tokenize('{bb IV Major Maj7 i Eb:4 (1:8)}')
+        assert [t for t, _ in tokens] == ['{', FastLineGrammarParser.ALTERATION, FastLineGrammarParser.CHORDNUMERAL,
+                                          FastLineGrammarParser.MODALITY, FastLineGrammarParser.CHORDMODALITY,
+                                          FastLineGrammarParser.COMMON, FastLineGrammarParser.NOTELETTERS, ':',
+                                          FastLineGrammarParser.INT, '(', FastLineGrammarParser.INT, ':',
+                                          FastLineGrammarParser.INT, ')', '}', FastLineGrammarParser.END]
+        assert [text for _, text in tokens][1:4] == ['bb', 'IV', 'Major']
+
+        with self.assertRaises(Exception):
+            FastLineGrammarParser.tokenize('{C:4 $}')
+
+    def test_syntax_errors(self):
+        executor = LineGrammarExecutor(use_fast_parser=True)
+        for s in ['{C:4', '{}', '{(q, 2)[C D}', '{<E-Major iv> C}', '{C:}']:
+            with self.assertRaises(Exception):
+                executor.parse(s)
+
+    def test_parse(self):
+        executor = LineGrammarExecutor(use_fast_parser=True)
+        assert executor.use_fast_parser
+        line, hct = executor.parse('{ <E-Major:iv> C:5 D Eb F ((1:8), 2)[C:3 D:4 E] <:v> [i@C#:3 sBb D:4 Fbb]}')
+        notes = line.get_all_notes()
+        assert [str(n.diatonic_pitch) for n in notes] == ['C:5', 'D:5', 'Eb:5', 'F:5', 'C:3', 'D:4', 'E:4',
+                                                          'C#:3', 'Bb:3', 'D:4', 'Fbb:4']
+        assert [str(hc.chord.chord_template) for hc in hct.hc_list()] == ['TIV', 'TV']
+        assert str(hct.hc_list()[1].position.position) == '5/4'
+
+    def test_conformance(self):
+        # The fast parser builds the same lines and harmonic context tracks as the ANTLR parser.
+        antlr_executor = LineGrammarExecutor()
+        fast_executor = LineGrammarExecutor(use_fast_parser=True)
+        compared = 0
+        for s in TestFastLineGrammarParser.SAMPLES + TestFastLineGrammarParser.line_grammar_test_strings():
+            expected = TestFastLineGrammarParser.describe_parse(antlr_executor, s)
+            if expected is None:
+                continue
+            assert TestFastLineGrammarParser.describe_parse(fast_executor, s) == expected, s
+            compared += 1
+        assert compared > 20
+
+    @staticmethod
+    def line_grammar_test_strings():
+        # LineGrammar string literals of test_line_grammar.py
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_line_grammar.py')
+        with open(path) as f:
+            tree = ast.parse(f.read())
+        return [node.value for node in ast.walk(tree)
+                if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.startswith('{')]
+
+    @staticmethod
+    def describe_parse(executor, s):
+        # Structural description of a parse, None if the ANTLR parser reports a syntax error, or an exception text.
+        err = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(err), contextlib.redirect_stdout(io.StringIO()):
+                line, hct = executor.parse(s)
+        except Exception as e:
+            return None if not executor.use_fast_parser and err.getvalue() else 'exception ' + str(e)
+        if err.getvalue():
+            return None
+        return (TestFastLineGrammarParser.describe(line),
+                [(str(hc.tonality), str(hc.chord), str(hc.duration), str(hc.position)) for hc in hct.hc_list()])
+
+    @staticmethod
+    def describe(note_structure):
+        if isinstance(note_structure, Note):
+            return (str(note_structure.diatonic_pitch), str(note_structure.duration), note_structure.num_dots,
+                    str(note_structure.relative_position), str(note_structure.get_absolute_position()))
+        return (type(note_structure).__name__, str(note_structure.duration), str(note_structure.relative_position),
+                [TestFastLineGrammarParser.describe(n) for n in note_structure.sub_notes])
+
+
+if __name__ == "__main__":
+    unittest.main()
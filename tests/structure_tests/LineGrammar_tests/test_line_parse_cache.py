@@ -0,0 +1,59 @@
+import unittest
+
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from structure.LineGrammar.core.line_parse_cache import LineParseCache
+
+
+class TestLineParseCache(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_parse(self):
+        cache = LineParseCache(capacity=2)
+        s = '{<C-Major: I> iC:4 D [E F G] <:V> qG:4 (q, 3)[iB:3 D:4 F]}'
+        line, hct = cache.parse(s)
+        line2, hct2 = cache.parse(s)
+        assert cache.misses == 1 and cache.hits == 1
+
+        # Each parse gets its own copy.
+        assert line is not line2 and hct is not hct2
+        assert str(line) == str(line2)
+        assert [str(hc) for hc in hct.hc_list()] == [str(hc) for hc in hct2.hc_list()]
+        assert hct.hc_list()[0] is not hct2.hc_list()[0]
+        assert hct.hc_list()[1].chord is hct2.hc_list()[1].chord
+
+        line.sub_notes[0].diatonic_pitch = None
+        line3, _ = cache.parse(s)
+        assert str(line3.get_all_notes()[0].diatonic_pitch) == 'C:4'
+
+        # Least recently used parses are evicted.
+        cache.parse('{C:4}')
+        cache.parse(s)
+        cache.parse('{D:4}')
+        assert len(cache) == 2
+        cache.parse(s)
+        assert cache.misses == 3
+        cache.parse('{C:4}')
+        assert cache.misses == 4
+
+    def test_executor(self):
+        cache = LineParseCache.get_cache()
+        cache.clear()
+        s = '{<E-Major: iv> qC:5 D Eb F}'
+        line, _ = LineGrammarExecutor(use_cache=True).parse(s)
+        line2, _ = LineGrammarExecutor(use_cache=True).parse(s)
+        assert cache.hits == 1 and cache.misses == 1
+        assert line is not line2 and str(line) == str(line2)
+
+        # Parse failures are not cached.
+        with self.assertRaises(Exception):
+            LineGrammarExecutor(use_fast_parser=True, use_cache=True).parse('{C:4')
+        assert len(cache) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from fractions import Fraction
+
+from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
+from structure.beam import Beam
+from structure.line import Line
+from structure.line_serializer import LineSerializer, LineCorpus
+from structure.note import Note
+from structure.tuplet import Tuplet
+from timemodel.duration import Duration
+from timemodel.offset import Offset
+from tonalmodel.diatonic_pitch import DiatonicPitch
+
+
+class TestLineSerializer(unittest.TestCase):
+    LINES = [
+        '{C:4 D:4 E:4 F:4 G:4 A:4 B:4}',
+        '{ <E-Major:iv> C:5 D Eb F ((1:8), 2)[C:3 D:4 E] <:v> [i@C#:3 sBb D:4 Fbb]}',
+        '{<C-Major: I> iC:4 <:V/ii> qD:4 <:IV/V-Natural> E:4 <Eb-Dorian(1): IVDom7> hF:4 R}',
+        '{<F-Major: I> qC:4 D E F <:IV> [iG:4 A B C:5] <:V> (q, 3)[iD:5 E F] hG:4 <:C-Maj7> wC:4}',
+    ]
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_round_trip(self):
+        lge = LineGrammarExecutor()
+        for s in TestLineSerializer.LINES:
+            line, hct = lge.parse(s)
+            new_line, new_hct = LineSerializer.deserialize(LineSerializer.serialize(line, hct))
+            assert TestLineSerializer.describe(new_line) == TestLineSerializer.describe(line), s
+            assert TestLineSerializer.describe_hct(new_hct) == TestLineSerializer.describe_hct(hct), s
+
+    def test_structure(self):
+        # Gaps in lines, nested lines, fractional tuplet factors, dots, and ties.
+        line = Line()
+        line.pin(Note(DiatonicPitch.parse('C:4'), Duration(1, 4), 1), Offset(1, 2))
+        sub_line = Line()
+        sub_line.pin(Note(DiatonicPitch.parse('E:4'), Duration(1, 8)), Offset(1, 8))
+        line.pin(sub_line, Offset(2))
+        line.pin(Tuplet(Duration(1, 8), Fraction(3, 2), [Note(DiatonicPitch.parse('G:4'), Duration(1, 8)),
+                                               Note(DiatonicPitch.parse('G:4'), Duration(1, 8)),
+                                               Note(None, Duration(1, 8))]), Offset(3))
+        beam = Beam([Note(DiatonicPitch.parse('A:4'), Duration(1, 8)),
+                     Note(DiatonicPitch.parse('A:4'), Duration(1, 8))])
+        line.pin(beam, Offset(4))
+        beam.sub_notes[0].tie()
+
+        new_line, new_hct = LineSerializer.deserialize(LineSerializer.serialize(line))
+        assert TestLineSerializer.describe(new_line) == TestLineSerializer.describe(line)
+        assert len(new_hct) == 0
+        new_notes = new_line.get_all_notes()
+        assert [n.is_tied_to for n in new_notes] == [n.is_tied_to for n in line.get_all_notes()]
+        assert new_notes[-2].tied_to is new_notes[-1]
+
+    def test_corpus(self):
+        lge = LineGrammarExecutor()
+        pairs = [lge.parse(s) for s in TestLineSerializer.LINES] * 3
+        file_name = os.path.join(tempfile.mkdtemp(), 'corpus.lc')
+        try:
+            assert LineSerializer().write_corpus(file_name, pairs) == len(pairs)
+            for use_mmap in [True, False]:
+                with LineCorpus(file_name, use_mmap=use_mmap) as corpus:
+                    assert len(corpus) == len(pairs)
+                    loaded = list(corpus)
+                    for (line, hct), (new_line, new_hct) in zip(pairs, loaded):
+                        assert TestLineSerializer.describe(new_line) == TestLineSerializer.describe(line)
+                        assert TestLineSerializer.describe_hct(new_hct) == TestLineSerializer.describe_hct(hct)
+                    assert TestLineSerializer.describe(corpus[-1][0]) == TestLineSerializer.describe(pairs[-1][0])
+                    with self.assertRaises(IndexError):
+                        _ = corpus[len(pairs)]
+
+                    # Harmonies are built once per corpus.
+                    assert loaded[0][1].hc_list()[0].chord is loaded[4][1].hc_list()[0].chord
+        finally:
+            os.remove(file_name)
+
+    @staticmethod
+    def describe(note_structure):
+        if isinstance(note_structure, Note):
+            return (str(note_structure.diatonic_pitch), str(note_structure.duration), note_structure.num_dots,
+                    str(note_structure.relative_position), str(note_structure.get_absolute_position()))
+        return (type(note_structure).__name__, str(note_structure.duration), str(note_structure.relative_position),
+                [TestLineSerializer.describe(n) for n in note_structure.sub_notes])
+
+    @staticmethod
+    def describe_hct(hct):
+        return [(str(hc.tonality), str(hc.chord), str(hc.duration), str(hc.position)) for hc in hct.hc_list()]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -209,6 +209,38 @@ class TestVoice(unittest.TestCase):
         notes = voice.get_notes_starting_in_interval(Interval(Position(0), Position(2, 1)))
         assert len(notes) == 0
         
+    def test_batch(self):
+        c = InstrumentCatalog.instance()
+        violin = c.get_instrument("violin")
+
+        line = Line()
+        line.pin(Note(DiatonicPitch(4, 'a'), Duration(1, 8)), Offset(0))
+        voice = Voice(violin)
+        voice.pin(line, Offset(0))
+
+        notes = [Note(DiatonicPitch(4, 'c'), Duration(1, 8)) for _ in range(0, 40)]
+        beam = Beam()
+        with line.batch():
+            for i, note in enumerate(notes[:20]):
+                line.pin(note, Offset(i + 1, 8))
+            line.pin(beam, Offset(21, 8))
+            for note in notes[20:]:
+                beam.append(note)
+            line.unpin([notes[0], notes[1]])
+            # Nothing reaches the voice until the batch ends.
+            assert len(voice.get_notes_starting_in_interval(Interval(Position(0), Position(20)))) == 1
+
+        found = voice.get_notes_starting_in_interval(Interval(Position(0), Position(20)))
+        assert len(found) == 39
+        assert notes[0] not in found and notes[1] not in found
+        for note in notes[2:]:
+            assert voice.get_notes_by_interval(TestVoice.compute_note_interval(note)).count(note) == 1
+
+        # Removing notes pinned before the batch.
+        with line.batch():
+            line.unpin(beam)
+        assert len(voice.get_notes_starting_in_interval(Interval(Position(0), Position(20)))) == 19
+
     def test_add_notes_to_line(self):
         c = InstrumentCatalog.instance()        
         violin = c.get_instrument("violin")
@@ -37,3 +37,25 @@ class TestDiatonicPitch(unittest.TestCase):
         print(pitch)
         pitch = DiatonicPitch.parse('Fb:3')
         print(pitch)
+
+    def test_pitch_key(self):
+        letters = list('CDEFGAB')
+        augmentations = ('bbb', 'bb', 'b', '', '#', '##', '###')
+        keys = set()
+        last_key = -1
+        for octave in range(0, 8):
+            for ltr in letters:
+                for aug in augmentations:
+                    diatonic_pitch = DiatonicPitch.parse('{0}{1}:{2}'.format(ltr, aug, octave))
+                    key = diatonic_pitch.pitch_key
+                    assert key > last_key
+                    last_key = key
+                    keys.add(key)
+
+                    restored = DiatonicPitch.from_pitch_key(key)
+                    assert restored == diatonic_pitch
+                    assert restored is DiatonicPitch.from_pitch_key(key)
+        assert len(keys) == 8 * 7 * 7
+
+        # Enharmonic spellings have distinct keys.
+        assert DiatonicPitch.parse('Cb:4').pitch_key != DiatonicPitch.parse('B:3').pitch_key
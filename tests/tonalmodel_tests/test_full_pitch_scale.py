@@ -0,0 +1,65 @@
+import unittest
+
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.modality import ModalityType
+from tonalmodel.pitch_range import PitchRange
+from tonalmodel.pitch_scale import PitchScale, FullPitchScale
+from tonalmodel.tonality import Tonality
+
+
+class TestFullPitchScale(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_cache(self):
+        a = FullPitchScale.get_full_scale(Tonality.create(ModalityType.Major, DiatonicTone('Eb')))
+        b = FullPitchScale.get_full_scale(Tonality.create(ModalityType.Major, DiatonicTone('Eb')))
+        assert a is b
+        c = FullPitchScale.get_full_scale(Tonality.create(ModalityType.NaturalMinor, DiatonicTone('Eb')))
+        assert a is not c
+
+        assert str(a.pitches[0]) == 'Bb:0'
+        assert str(a.pitches[-1]) == 'C:8'
+        assert a.chromatic_distances == tuple(p.chromatic_distance for p in a.pitches)
+
+    def test_index_of(self):
+        full_scale = FullPitchScale.get_full_scale(Tonality.create(ModalityType.Major, DiatonicTone('C')))
+        index = full_scale.index_of(DiatonicPitch.parse('C:4'))
+        assert str(full_scale.pitches[index]) == 'C:4'
+        assert str(full_scale.pitches[index + 1]) == 'D:4'
+        # Found by spelling only.
+        assert full_scale.index_of(DiatonicPitch.parse('B#:3')) is None
+        assert full_scale.index_of(DiatonicPitch.parse('C#:4')) is None
+
+    def test_ranges(self):
+        for modality_type in [ModalityType.Major, ModalityType.MelodicMinor, ModalityType.WholeTone]:
+            for tone_text in ['C', 'F#', 'Bb', 'Cb']:
+                tonality = Tonality.create(modality_type, DiatonicTone(tone_text))
+                full_scale = FullPitchScale.get_full_scale(tonality)
+                for start, end in [('C:2', 'C:3'), ('Bb:4', 'C#:6'), ('B#:3', 'Cb:5'), ('E:5', 'E:5')]:
+                    pitch_range = PitchRange.create(start, end)
+                    pitches = full_scale.pitches_in_range(pitch_range)
+                    assert len(pitches) > 0 or start == end
+                    for pitch in pitches:
+                        assert pitch_range.is_pitch_inbounds(pitch)
+                    assert list(pitches) == PitchScale(tonality, pitch_range).pitch_scale
+
+    def test_closest_and_tonal_range(self):
+        tonality = Tonality.create(ModalityType.Major, DiatonicTone('D'))
+        closest = PitchScale.compute_closest_scale_tones(tonality, DiatonicPitch.parse('G#:4'))
+        assert [str(p) for p in closest] == ['G:4', 'A:4']
+        closest = PitchScale.compute_closest_scale_tones(tonality, DiatonicPitch.parse('F#:4'))
+        assert [str(p) for p in closest] == ['F#:4']
+
+        pitches = PitchScale.compute_tonal_pitch_range(tonality, DiatonicPitch.parse('D:4'), -2, 9)
+        assert [str(p) for p in pitches] == ['B:3', 'C#:4', 'D:4', 'E:4', 'F#:4', 'G:4', 'A:4', 'B:4', 'C#:5',
+                                             'D:5', 'E:5', 'F#:5']
+
+
+if __name__ == "__main__":
+    unittest.main()
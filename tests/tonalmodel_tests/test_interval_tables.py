@@ -0,0 +1,85 @@
+import unittest
+
+from tonalmodel.interval import Interval, IntervalType
+from tonalmodel.interval_tables import IntervalTables
+from tonalmodel.diatonic_pitch import DiatonicPitch
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+
+
+class TestIntervalTables(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_end_pitch(self):
+        # Every representable end pitch has the interval's diatonic and chromatic distance from the start pitch.
+        intervals = list()
+        for d in list(range(-15, 0)) + list(range(1, 16)):
+            for interval_type in IntervalType:
+                try:
+                    intervals.append(Interval(d, interval_type))
+                except Exception:
+                    pass
+
+        for interval in intervals:
+            for tone in DiatonicToneCache.get_tones():
+                for octave in range(0, 9):
+                    pitch = DiatonicPitch(octave, tone)
+                    ends = [(1, interval.get_end_pitch(pitch)), (-1, interval.get_start_pitch(pitch))]
+                    for sign, end_pitch in ends:
+                        diatonic_distance = pitch.diatonic_distance() + sign * interval.diatonic_distance
+                        chromatic_distance = pitch.chromatic_distance + sign * interval.chromatic_distance
+                        if end_pitch is None:
+                            # Unrepresentable: beyond triple augmentation or outside octaves 0-8.
+                            natural = DiatonicPitch(diatonic_distance // 7,
+                                                    'CDEFGAB'[diatonic_distance % 7]) \
+                                if 0 <= diatonic_distance // 7 <= 8 else None
+                            assert natural is None or abs(chromatic_distance - natural.chromatic_distance) > 3
+                        else:
+                            assert end_pitch.diatonic_distance() == diatonic_distance
+                            assert end_pitch.chromatic_distance == chromatic_distance
+
+    def test_end_tone(self):
+        interval = Interval.parse('M:3')
+        assert interval.get_end_tone(DiatonicToneCache.get_tone('C')).diatonic_symbol == 'E'
+        assert interval.get_end_tone(DiatonicToneCache.get_tone('B')).diatonic_symbol == 'D#'
+        assert interval.get_start_tone(DiatonicToneCache.get_tone('C')).diatonic_symbol == 'Ab'
+        assert interval.get_end_tone(DiatonicToneCache.get_tone('E###')) is None
+
+        # Tones are interned.
+        assert interval.get_end_tone(DiatonicToneCache.get_tone('Db')) is DiatonicToneCache.get_tone('F')
+
+        interval = Interval.parse('-P:5')
+        assert interval.get_end_tone(DiatonicToneCache.get_tone('D')).diatonic_symbol == 'G'
+        pitch = interval.get_end_pitch(DiatonicPitch.parse('D:4'))
+        assert str(pitch) == 'G:3'
+        assert pitch is DiatonicPitch.from_pitch_key(pitch.pitch_key)
+
+    def test_pure_distance(self):
+        for t1 in DiatonicToneCache.get_tones():
+            for t2 in DiatonicToneCache.get_tones():
+                pitch1 = DiatonicPitch(4, t1)
+                pitch2 = DiatonicPitch(5 if DiatonicPitch.crosses_c(t1, t2, True) else 4, t2)
+                assert IntervalTables.pure_distance(t1, t2) == \
+                    ((t2.diatonic_index - t1.diatonic_index) % 7, pitch2.chromatic_distance - pitch1.chromatic_distance)
+
+    def test_interval_caches(self):
+        a = Interval.create_interval(DiatonicPitch.parse('C:4'), DiatonicPitch.parse('E:4'))
+        b = Interval.create_interval(DiatonicPitch.parse('F:2'), DiatonicPitch.parse('A:2'))
+        assert a is b
+        assert str(a) == 'M:3'
+
+        with self.assertRaises(Exception):
+            Interval.create_interval(DiatonicPitch.parse('C:4'), DiatonicPitch.parse('E###:4'))
+
+        interval = Interval.calculate_tone_interval(DiatonicToneCache.get_tone('A'), DiatonicToneCache.get_tone('C#'))
+        assert str(interval) == 'M:3'
+        assert Interval.calculate_tone_interval(DiatonicToneCache.get_tone('C'),
+                                                DiatonicToneCache.get_tone('E###')) is None
+
+
+if __name__ == "__main__":
+    unittest.main()
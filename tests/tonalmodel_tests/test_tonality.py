@@ -64,3 +64,19 @@ class TestTonality(unittest.TestCase):
         print('{0}:  [{1}]'.format(tonality_a, ','.join(tone.diatonic_symbol for tone in tonality_a.annotation)))
         print('{0}:  [{1}]'.format(tonality_b, ','.join(tone.diatonic_symbol for tone in tonality_b.annotation)))
         print('{0}:  [{1}]'.format(tonality_c, ','.join(tone.diatonic_symbol for tone in tonality_c.annotation)))
+
+    def test_value_key(self):
+        tonality_a = Tonality(ModalityFactory.create_modality(ModalityType.Major, 1), 'E')
+        tonality_b = Tonality.create(ModalityType.Major, 'E', 1)
+        tonality_c = Tonality.create(ModalityType.Major, 'E')
+
+        assert tonality_a is not tonality_b
+        assert tonality_a == tonality_b
+        assert hash(tonality_a) == hash(tonality_b)
+        assert tonality_a != tonality_c
+        assert len({tonality_a, tonality_b, tonality_c}) == 2
+
+        interned = Tonality.intern(tonality_a)
+        assert Tonality.intern(tonality_b) is interned
+        assert Tonality.intern(tonality_c) is not interned
+        assert Tonality.intern(None) is None
@@ -3,6 +3,7 @@ import logging
 
 from harmoniccontext.harmonic_context import HarmonicContext
 from harmoniccontext.harmonic_context_track import HarmonicContextTrack
+from melody.solver.solve_budget import SolveBudget
 from structure.LineGrammar.core.line_grammar_executor import LineGrammarExecutor
 from timemodel.duration import Duration
 from tonalmodel.diatonic_pitch import DiatonicPitch
@@ -35,6 +36,38 @@ class TestTHarmonicTranscription(unittest.TestCase):
 
         TestTHarmonicTranscription.print_results(results, t_sub.source_line)
 
+    def test_budget(self):
+        print('----- test budget -----')
+
+        source_expression = '{<C-Natural: i> q@C:4 iEb F# G <C-Natural: iv> Ab C <C-Melodic: V> iB:3}'
+
+        t_sub = THarmonicTranscription.create(source_expression)
+        target_harmonic_list = [('A-Melodic:iv', Duration(3, 4)),
+                                ('A-Natural:i', Duration(1, 4)),
+                                ('A-Melodic:V', Duration(1, 8))]
+        target_hct = TestTHarmonicTranscription.build_hct(target_harmonic_list)
+        tag_map = {0: DiatonicPitch.parse('D:4')}
+
+        results = t_sub.apply(target_hct, 'B:3', tag_map, t_sub.height + 5)
+        assert not results.truncated
+        assert results.statistics.num_solutions == len(results.pitch_results)
+        all_pitches = [TestTHarmonicTranscription.pitches(p_map) for p_map in results.pitch_results]
+
+        results = t_sub.apply(target_hct, 'B:3', tag_map, t_sub.height + 5, budget=SolveBudget(max_nodes=8))
+        assert results.truncated
+        assert results.statistics.num_nodes == 8
+        pitches = [TestTHarmonicTranscription.pitches(p_map) for p_map in results.pitch_results]
+        assert pitches == all_pitches[:len(pitches)]
+
+        results = t_sub.apply(target_hct, 'B:3', tag_map, t_sub.height + 5, budget=SolveBudget(time_limit=0))
+        assert results.truncated
+        assert len(results.pitch_results) == 0
+
+    @staticmethod
+    def pitches(p_map):
+        notes = sorted(p_map.keys(), key=lambda n: n.get_absolute_position())
+        return [str(p_map[note].note.diatonic_pitch) for note in notes]
+
     @staticmethod
     def build_hct(hc_expressed_list):
         parse_str = '{'
@@ -10,6 +10,8 @@ Reference:
 import math
 import re
 
+from misc.lazy import LazyClassAttribute
+
 
 class ChromaticScale(object):
 
@@ -22,7 +24,7 @@ class ChromaticScale(object):
 
     # (partition number, 12-based offset)
     CHROMATIC_FORM = r'([0-8]):(10|11|[0-9])' 
-    CHROMATIC_PATTERN = re.compile(CHROMATIC_FORM)
+    CHROMATIC_PATTERN = LazyClassAttribute(re.compile, CHROMATIC_FORM)
 
     @staticmethod
     def get_chromatic_scale(start_pitch, end_pitch):
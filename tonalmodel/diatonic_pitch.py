@@ -24,6 +24,12 @@ class DiatonicPitch(object):
     # Regex used for parsing diatonic pitch.
     DIATONIC_PATTERN = re.compile(r'([A-Ga-g])(bbb|bb|b|###|##|#)?:?([0-8])')
 
+    # Number of augmentations (bbb through ###) per letter, used in forming pitch keys.
+    NUM_AUGMENTATIONS = len(DiatonicTone.AUGMENTATIONS)
+
+    # Cache of pitch_key --> DiatonicPitch, see from_pitch_key().
+    PITCH_KEY_CACHE = dict()
+
     def __init__(self, octave, diatonic_tone):
         """
         Constructor
@@ -45,6 +51,8 @@ class DiatonicPitch(object):
         else:
             self.__diatonic_tone = DiatonicFoundation.get_tone(diatonic_tone)
         self.__chromatic_distance = 12 * octave + self.diatonic_tone.tonal_offset
+        self.__pitch_key = (7 * octave + self.diatonic_tone.diatonic_index) * DiatonicPitch.NUM_AUGMENTATIONS + \
+            self.diatonic_tone.augmentation_offset + 3
     
     @property
     def octave(self):
@@ -58,6 +66,31 @@ class DiatonicPitch(object):
     def chromatic_distance(self):
         return self.__chromatic_distance
 
+    @property
+    def pitch_key(self):
+        """
+        Compact integer key for this pitch, unique per spelling, e.g. Cb:4 and B:3 have different keys.
+        Keys ascend with diatonic distance, and within a letter, with augmentation.
+        """
+        return self.__pitch_key
+
+    @staticmethod
+    def from_pitch_key(pitch_key):
+        """
+        Inverse of pitch_key.  Pitches are shared from a cache, as DiatonicPitch is immutable.
+        :param pitch_key: integer pitch key
+        :return: DiatonicPitch
+        """
+        pitch = DiatonicPitch.PITCH_KEY_CACHE.get(pitch_key)
+        if pitch is None:
+            diatonic_distance, augmentation_index = divmod(pitch_key, DiatonicPitch.NUM_AUGMENTATIONS)
+            octave, diatonic_index = divmod(diatonic_distance, 7)
+            tone = DiatonicToneCache.get_tone(DiatonicTone.get_diatonic_letter(diatonic_index) +
+                                              DiatonicTone.AUGMENTATIONS[augmentation_index])
+            pitch = DiatonicPitch(octave, tone)
+            DiatonicPitch.PITCH_KEY_CACHE[pitch_key] = pitch
+        return pitch
+
     def enharmonics(self):
         return DiatonicFoundation.map_to_diatonic_scale(self.chromatic_distance)
     
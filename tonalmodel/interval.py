@@ -7,7 +7,8 @@ Purpose: Defines Interval and IntervalType classes.
 from tonalmodel.diatonic_tone import DiatonicTone
 from tonalmodel.diatonic_pitch import DiatonicPitch
 from tonalmodel.diatonic_tone_cache import DiatonicToneCache
-from tonalmodel.diatonic_foundation import DiatonicFoundation
+from tonalmodel.interval_tables import IntervalTables
+from misc.lazy import LazyClassAttribute
 
 import re
 from enum import Enum
@@ -132,6 +133,12 @@ class Interval(object):
         (7, IntervalType.Augmented),
     }
 
+    # (diatonic distance, chromatic distance) --> Interval, for intervals made by create_interval().
+    INTERVAL_CACHE = dict()
+
+    # (tone id, tone id) --> Interval or None, see calculate_tone_interval().
+    TONE_INTERVAL_CACHE = dict()
+
     def __init__(self, diatonic_distance, interval_type):
         """
         Constructor
@@ -156,6 +163,10 @@ class Interval(object):
          
         self.__chromatic_distance = Interval._sign(self.__diatonic_distance) * \
             (Interval.INVERSE_INTERVAL_MAP[(self.interval_type, d_d)]) + 12 * octave
+
+        # Octave reduced distances of this interval and its negation, for IntervalTables lookups. Set on first use.
+        self.__reduced_distances = None
+        self.__negation_reduced_distances = None
         
     @staticmethod
     def create_interval(pitch_a, pitch_b):
@@ -176,7 +187,17 @@ class Interval(object):
 
         if pitch_a is None or pitch_b is None:
             raise Exception('None passed as pitch argument.')
-        
+
+        key = (pitch_b.diatonic_distance() - pitch_a.diatonic_distance(),
+               pitch_b.chromatic_distance - pitch_a.chromatic_distance)
+        interval = Interval.INTERVAL_CACHE.get(key)
+        if interval is None:
+            interval = Interval._create_interval(pitch_a, pitch_b)
+            Interval.INTERVAL_CACHE[key] = interval
+        return interval
+
+    @staticmethod
+    def _create_interval(pitch_a, pitch_b):
         pitch_chromatic_distance = pitch_b.chromatic_distance - pitch_a.chromatic_distance         
         
         # This is just a subtraction of (a_index, a_octave) - (b_index, b_octave)
@@ -238,9 +259,7 @@ class Interval(object):
         Returns:
           DiatonicTone of upper tone
         """
-        
-        result = self.get_end_pitch(DiatonicPitch(4, diatonic_tone.diatonic_symbol))
-        return result.diatonic_tone if result else None      
+        return IntervalTables.end_tone(diatonic_tone, self._reduced_distances())
         
     def get_end_pitch(self, pitch):
         """
@@ -251,22 +270,10 @@ class Interval(object):
           pitch: DiatonicPitch
           
         Returns:
-          DiatonicPitch of end tone
+          DiatonicPitch of end tone, None if not representable, i.e. more than triply augmented, or outside
+          octaves 0 through 8.
         """
-        diatonic_dist = pitch.diatonic_distance() + self.diatonic_distance
-        tone_index = diatonic_dist % 7
-        end_pitch_string = DiatonicTone.get_diatonic_letter(tone_index) 
-        end_pitch_octave = diatonic_dist // 7
-        
-        chromatic_dist = pitch.chromatic_distance + self.chromatic_distance
-        
-        normal_pitch = DiatonicPitch(end_pitch_octave, DiatonicFoundation.get_tone(end_pitch_string))
-        
-        alteration = chromatic_dist - normal_pitch.chromatic_distance
-        
-        end_pitch_string += DiatonicTone.augmentation(alteration)
-        
-        return DiatonicPitch.parse(end_pitch_string + ':' + str(end_pitch_octave)) 
+        return IntervalTables.end_pitch(pitch, self.diatonic_distance, self._reduced_distances())
     
     def get_start_tone(self, diatonic_tone):
         """
@@ -279,8 +286,7 @@ class Interval(object):
         Returns:
           DiatonicTone of the lower tone
         """
-        result = self.get_start_pitch(DiatonicPitch(4, diatonic_tone.diatonic_symbol))
-        return result.diatonic_tone if result else None 
+        return IntervalTables.end_tone(diatonic_tone, self._negation_reduced_distances())
      
     def get_start_pitch(self, pitch):
         """
@@ -293,7 +299,18 @@ class Interval(object):
         Returns:
           DiatonicPitch of the lower tone
         """
-        return (self.negation()).get_end_pitch(pitch)
+        return IntervalTables.end_pitch(pitch, -self.diatonic_distance, self._negation_reduced_distances())
+
+    def _reduced_distances(self):
+        if self.__reduced_distances is None:
+            self.__reduced_distances = IntervalTables.reduce(self.diatonic_distance, self.chromatic_distance)
+        return self.__reduced_distances
+
+    def _negation_reduced_distances(self):
+        if self.__negation_reduced_distances is None:
+            self.__negation_reduced_distances = IntervalTables.reduce(-self.diatonic_distance,
+                                                                      -self.chromatic_distance)
+        return self.__negation_reduced_distances
     
     def semitones(self):
         """
@@ -406,7 +423,7 @@ class Interval(object):
     INTERVAL_SIGN_PART = '(' + INTERVAL_SIGN_TAG + INTERVAL_SIGN + ')'
     
     INTERVAL_PATTERN_STRING = INTERVAL_SIGN_PART + '?' + INTERVAL_TYPE_PART + ':' + DISTANCE_PART
-    INTERVAL_PATTERN = re.compile(INTERVAL_PATTERN_STRING)
+    INTERVAL_PATTERN = LazyClassAttribute(re.compile, INTERVAL_PATTERN_STRING)
     
     INTERVAL_LTR_MAP = {'P': IntervalType.Perfect,
                         'A': IntervalType.Augmented,
@@ -493,11 +510,7 @@ class Interval(object):
         :param tone2:
         :return:
         """
-        pitch1 = DiatonicPitch(4, tone1)
-        pitch2 = DiatonicPitch(5 if DiatonicPitch.crosses_c(tone1, tone2, True) else 4, tone2)
-        cc = pitch2.chromatic_distance - pitch1.chromatic_distance
-        dd = (tone2.diatonic_index - tone1.diatonic_index) % 7
-        return dd, cc
+        return IntervalTables.pure_distance(tone1, tone2)
 
     @staticmethod
     def calculate_tone_interval(tone1, tone2):
@@ -507,10 +520,13 @@ class Interval(object):
         :param tone2:
         :return:
         """
-        dd, cc = Interval.calculate_pure_distance(tone1, tone2)
-        if (dd, cc) not in Interval.INTERVAL_MAP:
-            return None
-        return Interval(dd + 1, Interval.INTERVAL_MAP[(dd, cc)])
+        key = (IntervalTables.tone_id(tone1), IntervalTables.tone_id(tone2))
+        if key in Interval.TONE_INTERVAL_CACHE:
+            return Interval.TONE_INTERVAL_CACHE[key]
+        dd, cc = IntervalTables.pure_distance(tone1, tone2)
+        interval = Interval(dd + 1, Interval.INTERVAL_MAP[(dd, cc)]) if (dd, cc) in Interval.INTERVAL_MAP else None
+        Interval.TONE_INTERVAL_CACHE[key] = interval
+        return interval
 
     @staticmethod
     def end_tone_from_pure_distance(tone, dd, cc, up_down=True):
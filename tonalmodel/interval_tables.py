@@ -0,0 +1,124 @@
+"""
+File: interval_tables.py
+
+Purpose: Precomputed integer tables for interval arithmetic over diatonic tones and pitches.
+
+"""
+from tonalmodel.diatonic_tone import DiatonicTone
+from tonalmodel.diatonic_tone_cache import DiatonicToneCache
+from tonalmodel.diatonic_pitch import DiatonicPitch
+
+
+class IntervalTables(object):
+    """
+    Tables for computing the end tone or pitch of an interval with integer arithmetic and lookups, in place of
+    building and parsing tone and pitch text.
+
+    Tones are identified by a tone id, 7 * diatonic index + augmentation offset + 3, covering the 49 tones of
+    DiatonicToneCache.  An interval is given by its diatonic and chromatic distances, which are reduced by whole
+    octaves to a diatonic distance in 0..6 and a chromatic distance relative to it, see reduce().
+
+    The tables are implemented as a singleton.  The constructor is meant to be 'private', and not called externally.
+    All access should be through the static methods.
+    """
+
+    INTERVAL_TABLES = None
+
+    # Lowest and highest octaves for end pitches, matching the octaves accepted by DiatonicPitch.parse().
+    LOWEST_OCTAVE = 0
+    HIGHEST_OCTAVE = 8
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        # tone id --> DiatonicTone, from DiatonicToneCache.
+        self.tones = [None] * (7 * DiatonicPitch.NUM_AUGMENTATIONS)
+        # (tone id, reduced diatonic distance, reduced chromatic distance) --> augmentation offset of end tone.
+        self.end_augmentation_map = dict()
+
+        self.__build_tables()
+
+    @staticmethod
+    def get_tables():
+        if IntervalTables.INTERVAL_TABLES is None:
+            IntervalTables.INTERVAL_TABLES = IntervalTables()
+        return IntervalTables.INTERVAL_TABLES
+
+    @staticmethod
+    def tone_id(tone):
+        return 7 * tone.diatonic_index + tone.augmentation_offset + 3
+
+    @staticmethod
+    def reduce(diatonic_distance, chromatic_distance):
+        """
+        Reduce an interval's distances by whole octaves, so that the diatonic distance is in 0..6.
+        :param diatonic_distance: origin 0 signed diatonic distance, e.g. Interval.diatonic_distance.
+        :param chromatic_distance: signed chromatic distance.
+        :return: (reduced diatonic distance, reduced chromatic distance)
+        """
+        octaves = diatonic_distance // 7
+        return diatonic_distance - 7 * octaves, chromatic_distance - 12 * octaves
+
+    @staticmethod
+    def end_tone(tone, reduced_distances):
+        """
+        The tone above tone by the interval with the given reduced distances.
+        :param tone: DiatonicTone
+        :param reduced_distances: pair of reduced distances, see reduce().
+        :return: DiatonicTone, or None if the end tone requires more than 3 augmentations.
+        """
+        tables = IntervalTables.get_tables()
+        tone_id = IntervalTables.tone_id(tone)
+        augmentation = tables.end_augmentation_map.get((tone_id,) + reduced_distances)
+        if augmentation is None:
+            return None
+        end_index = (tone.diatonic_index + reduced_distances[0]) % 7
+        return tables.tones[7 * end_index + augmentation + 3]
+
+    @staticmethod
+    def end_pitch(pitch, diatonic_distance, reduced_distances):
+        """
+        The pitch above pitch by an interval.
+        :param pitch: DiatonicPitch
+        :param diatonic_distance: origin 0 signed diatonic distance of the interval.
+        :param reduced_distances: pair of reduced distances of the interval, see reduce().
+        :return: DiatonicPitch, or None if the end pitch requires more than 3 augmentations, or lies outside
+                 octaves LOWEST_OCTAVE to HIGHEST_OCTAVE.
+        """
+        tone = pitch.diatonic_tone
+        augmentation = IntervalTables.get_tables().end_augmentation_map.get(
+            (IntervalTables.tone_id(tone),) + reduced_distances)
+        if augmentation is None:
+            return None
+        end_octave = (pitch.diatonic_distance() + diatonic_distance) // 7
+        if end_octave < IntervalTables.LOWEST_OCTAVE or end_octave > IntervalTables.HIGHEST_OCTAVE:
+            return None
+        return DiatonicPitch.from_pitch_key(pitch.pitch_key + DiatonicPitch.NUM_AUGMENTATIONS * diatonic_distance +
+                                            augmentation - tone.augmentation_offset)
+
+    @staticmethod
+    def pure_distance(tone1, tone2):
+        """
+        Diatonic and chromatic distances from tone1 up to the nearest tone2 at or above it.
+        :param tone1: DiatonicTone
+        :param tone2: DiatonicTone
+        :return: (diatonic distance in 0..6, chromatic distance)
+        """
+        octave = 12 if tone1.diatonic_index > tone2.diatonic_index else 0
+        return (tone2.diatonic_index - tone1.diatonic_index) % 7, tone2.tonal_offset + octave - tone1.tonal_offset
+
+    def __build_tables(self):
+        for tone in DiatonicToneCache.get_tones():
+            self.tones[IntervalTables.tone_id(tone)] = tone
+
+        for tone in self.tones:
+            tone_id = IntervalTables.tone_id(tone)
+            for reduced_diatonic in range(0, 7):
+                end_index = tone.diatonic_index + reduced_diatonic
+                end_letter = DiatonicTone.get_diatonic_letter(end_index % 7)
+                natural_distance = 12 * (end_index // 7) + DiatonicTone.CHROMATIC_OFFSETS[end_letter] - \
+                    tone.tonal_offset
+                for augmentation in range(-3, 4):
+                    self.end_augmentation_map[(tone_id, reduced_diatonic, natural_distance + augmentation)] = \
+                        augmentation
@@ -6,14 +6,84 @@ Purpose: To compute pitch scales over a given range on the chromatic scale.
          It is call TonalScale rather than PitchScale, as it relates more to tonality than tone.
 
 """
+from bisect import bisect_left, bisect_right
+
 from tonalmodel.chromatic_scale import ChromaticScale
 from tonalmodel.pitch_range import PitchRange
 from tonalmodel.diatonic_pitch import DiatonicPitch
 
 
+class FullPitchScale(object):
+    """
+    Immutable scale of a tonality over the full chromatic range, with an index from chromatic distance to scale
+    position.  Full scales are cached per tonality, and should be obtained through get_full_scale().
+    """
+
+    # tonality key --> FullPitchScale, see get_full_scale().
+    FULL_SCALE_CACHE = dict()
+
+    def __init__(self, pitches):
+        """
+        Constructor.
+        :param pitches: list of DiatonicPitch, the tonality's scale pitches in ascending order.
+        """
+        self.__pitches = tuple(pitches)
+        self.__chromatic_distances = tuple(pitch.chromatic_distance for pitch in self.__pitches)
+        self.__pitch_key_index = {pitch.pitch_key: i for i, pitch in enumerate(self.__pitches)}
+
+    @staticmethod
+    def get_full_scale(tonality):
+        """
+        The full range scale for a tonality.
+        :param tonality: Tonality
+        :return: FullPitchScale
+        """
+        key = tonality.value_key
+        full_scale = FullPitchScale.FULL_SCALE_CACHE.get(key)
+        if full_scale is None:
+            full_scale = FullPitchScale(PitchScale.compute_pitch_scale(
+                tonality, PitchRange(ChromaticScale.chromatic_start_index(), ChromaticScale.chromatic_end_index())))
+            FullPitchScale.FULL_SCALE_CACHE[key] = full_scale
+        return full_scale
+
+    @property
+    def pitches(self):
+        return self.__pitches
+
+    @property
+    def chromatic_distances(self):
+        return self.__chromatic_distances
+
+    def __len__(self):
+        return len(self.__pitches)
+
+    def index_of(self, pitch):
+        """
+        Scale position of a pitch, by spelling, e.g. B#:3 is not found in C major.
+        :param pitch: DiatonicPitch
+        :return: index into pitches, or None if pitch is not in the scale.
+        """
+        return self.__pitch_key_index.get(pitch.pitch_key)
+
+    def range_bounds(self, start_index, end_index):
+        """
+        Bounds of the scale positions of pitches with chromatic distance in [start_index, end_index].
+        :param start_index: chromatic distance
+        :param end_index: chromatic distance
+        :return: (lo, hi), where pitches[lo:hi] are the pitches in range.
+        """
+        return bisect_left(self.__chromatic_distances, start_index), \
+            bisect_right(self.__chromatic_distances, end_index)
+
+    def pitches_in_range(self, pitch_range):
+        lo, hi = self.range_bounds(pitch_range.start_index, pitch_range.end_index)
+        return self.__pitches[lo:hi]
+
+
 class PitchScale(object):
     """
     Tonality based class to build a set of DiatonicPitch's from the tonality for a chromatic range.
+    Pitches are taken from the tonality's cached FullPitchScale.
     """
 
     def __init__(self, tonality, pitch_range):
@@ -28,7 +98,7 @@ class PitchScale(object):
         self.__pitch_range = pitch_range
         
         self.__tone_scale = tonality.annotation
-        self.__pitch_scale = self.__compute_pitch_scale()
+        self.__pitch_scale = list(FullPitchScale.get_full_scale(tonality).pitches_in_range(pitch_range))
         
     @property
     def tonality(self):
@@ -60,15 +130,23 @@ class PitchScale(object):
         :param pitch_range: PitchRange
         :return:
         """
-        pitch_scale = PitchScale(tonality, pitch_range)
-        return pitch_scale.pitch_scale
-    
-    def __compute_pitch_scale(self):
-        (tone_index, pitch_index) = self.__find_lowest_tone()   # Determine the lowest tone in the range
+        return list(FullPitchScale.get_full_scale(tonality).pitches_in_range(pitch_range))
+
+    @staticmethod
+    def compute_pitch_scale(tonality, pitch_range):
+        """
+        Compute the scale pitches of tonality in pitch_range, by walking the tonality's incremental intervals up
+        from the lowest scale tone in range.  Used to build full scales, see FullPitchScale.
+        :param tonality: Tonality
+        :param pitch_range: PitchRange
+        :return: list of DiatonicPitch
+        """
+        tone_scale = tonality.annotation
+        (tone_index, pitch_index) = PitchScale.__find_lowest_tone(tone_scale, pitch_range)
         if tone_index == -1:
             return []
         scale = [DiatonicPitch(ChromaticScale.index_to_location(pitch_index)[0],
-                               self.tone_scale[tone_index].diatonic_symbol)]
+                               tone_scale[tone_index].diatonic_symbol)]
         
         # Given the first pitch, sync up with the incremental intervals on the tonality, and move forward, computing
         # each scale pitch until we are out of range.  
@@ -76,28 +154,29 @@ class PitchScale(object):
         prior_pitch = scale[0]
         while True:
             tone_index += 1
-            if tone_index > len(self.tone_scale) - 1:
+            if tone_index > len(tone_scale) - 1:
                 tone_index = 1  # skip 0 as that should be P:1
-            incremental_interval = self.tonality.modality.incremental_intervals[tone_index]
+            incremental_interval = tonality.modality.incremental_intervals[tone_index]
             current_pitch = incremental_interval.get_end_pitch(prior_pitch)
-            if current_pitch.chromatic_distance > self.pitch_range.end_index:
+            if current_pitch is None or current_pitch.chromatic_distance > pitch_range.end_index:
                 break
             scale.append(current_pitch)
             prior_pitch = current_pitch
             
         return scale
         
-    def __find_lowest_tone(self):
+    @staticmethod
+    def __find_lowest_tone(tone_scale, pitch_range):
         tone_index = -1
         pitch_index = 300
         # loop over scale tones
         #    for each, find the lowest chromatic index in range (if any), and set that as the 'find' 
-        for tone in self.tone_scale:
+        for tone in tone_scale:
             #  Get the lowest chromatic index in range, for the given tone
-            lowest_index = self.pitch_range.find_lowest_placement_in_range(tone.placement)
+            lowest_index = pitch_range.find_lowest_placement_in_range(tone.placement)
             if lowest_index != -1:
                 if lowest_index < pitch_index:
-                    tone_index = self.tone_scale.index(tone)
+                    tone_index = tone_scale.index(tone)
                     pitch_index = lowest_index
         return tone_index, pitch_index
 
@@ -110,69 +189,50 @@ class PitchScale(object):
         :return: an array with 1 element if exact match, otherwise closest lower and upper bound pitches
                  in given tonality.
         """
-        from tonalmodel.pitch_range import PitchRange
+        full_scale = FullPitchScale.get_full_scale(tonality)
+        index = PitchScale.__closest_scale_index(full_scale, tonality, pitch)
+        if full_scale.chromatic_distances[index] == pitch.chromatic_distance:
+            return [full_scale.pitches[index]]
+        return [full_scale.pitches[index - 1], full_scale.pitches[index]]
+
+    @staticmethod
+    def __closest_scale_index(full_scale, tonality, pitch):
+        """
+        Index of the lowest scale pitch at or above pitch, which must have a scale pitch below it if not equal.
+        """
         chromatic_index = pitch.chromatic_distance
-        pitch_range = PitchRange(max(chromatic_index - 12, ChromaticScale.chromatic_start_index()),
-                                 min(chromatic_index + 12, ChromaticScale.chromatic_end_index()))
-        pitch_scale = PitchScale(tonality, pitch_range)
-
-        for i in range(0, len(pitch_scale.pitch_scale)):
-            p = pitch_scale.pitch_scale[i]
-            if p.chromatic_distance < chromatic_index:
-                continue
-            if p.chromatic_distance == chromatic_index:
-                return [p]
-            if i == 0:
-                raise Exception(
-                    'unexpected logic issue in compute_closest_pitch_range {0}, {1]'.format(tonality, pitch))
-            return [pitch_scale.pitch_scale[i - 1], p]
-        raise Exception(
-            'unexpected logic fail in compute_closest_pitch_range {0}, {1]'.format(tonality, pitch))
+        index = bisect_left(full_scale.chromatic_distances, chromatic_index)
+        if index == len(full_scale):
+            raise Exception(
+                'unexpected logic fail in compute_closest_pitch_range {0}, {1}'.format(tonality, pitch))
+        if index == 0 and full_scale.chromatic_distances[0] != chromatic_index:
+            raise Exception(
+                'unexpected logic issue in compute_closest_pitch_range {0}, {1}'.format(tonality, pitch))
+        return index
 
     @staticmethod
     def compute_tonal_pitch_range(tonality, pitch, lower_index, upper_index):
         """
         Find all pitches within range of tonality based on an arbitrary pitch given as starting point.
         In all cases, look at the closest pitches (1 or 2) as origin 0, and the lower/upper as counting indices
-        below or up from them.
+        below or up from them.  Pitches beyond the ends of the chromatic scale are omitted.
         :param tonality:
         :param pitch:
         :param lower_index:
         :param upper_index:
         :return:
         """
-        import math
-        from tonalmodel.pitch_range import PitchRange
-        starting_points = PitchScale.compute_closest_scale_tones(tonality, pitch)
-
-        # Determine the number of octaves that will cover the given range.
-        up_chrom = max(0, int(math.ceil(float(abs(upper_index)) / len(tonality.annotation)) * 12) *
-                       (-1 if upper_index < 0 else 1))
-        down_chrom = min(0, int(math.ceil(float(abs(lower_index)) / len(tonality.annotation)) * 12) *
-                         (-1 if lower_index < 0 else 1))
-
-        # Compute all pitches within that range
-        low = max(starting_points[0].chromatic_distance + down_chrom, ChromaticScale.chromatic_start_index())
-        high = min((starting_points[0].chromatic_distance if len(starting_points) == 1
-                    else starting_points[1].chromatic_distance) + up_chrom, ChromaticScale.chromatic_end_index())
-
-        pitch_range = PitchRange(low, high)
-        pitch_scale = PitchScale(tonality, pitch_range).pitch_scale
-
-        # The first starting point is either the enharmonic equivalent to pitch, or the lower scale pitch to the pitch.
-        # lower_starting_index is the index in pitch_scale for that pitch.
-        lower_starting_index = [index for index in range(0, len(pitch_scale))
-                                if pitch_scale[index].chromatic_distance == starting_points[0].chromatic_distance][0]
-
-        if len(starting_points) == 1:
-            full_range = range(lower_starting_index + lower_index,
-                               min(lower_starting_index + upper_index + 1, len(pitch_scale)))
-            return [pitch_scale[i] for i in full_range]
+        full_scale = FullPitchScale.get_full_scale(tonality)
+        upper_starting_index = PitchScale.__closest_scale_index(full_scale, tonality, pitch)
+
+        if full_scale.chromatic_distances[upper_starting_index] == pitch.chromatic_distance:
+            lo = upper_starting_index + lower_index
+            hi = upper_starting_index + upper_index
         else:
-            upper_starting_index = [index for index in range(0, len(pitch_scale))
-                                    if pitch_scale[index].chromatic_distance ==
-                                    starting_points[1].chromatic_distance][0]
+            # pitch lies between two scale pitches, the lower of which is origin 0 for lower_index <= 0,
+            # and similarly the upper for upper_index >= 0.
+            lower_starting_index = upper_starting_index - 1
             lo = lower_index + (lower_starting_index if lower_index <= 0 else upper_starting_index)
             hi = upper_index + (lower_starting_index if upper_index < 0 else upper_starting_index)
-            full_range = range(lo, hi + 1)
-            return [pitch_scale[i] for i in full_range]
+
+        return list(full_scale.pitches[max(lo, 0):max(hi + 1, 0)])
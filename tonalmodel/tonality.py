@@ -5,6 +5,8 @@ File: tonality.py
 Purpose: to define the Tonality class.
 
 """
+from weakref import WeakValueDictionary
+
 from tonalmodel.modality import Modality
 from tonalmodel.modality_factory import ModalityFactory
 from tonalmodel.diatonic_tone_cache import DiatonicToneCache
@@ -14,8 +16,14 @@ class Tonality(object):
     """
     Tonality is a class that is based on a modality and a root diatonic tone.  So whereas modality might be 'Ionian', 
         tonality would be that, but rooted (first tone) at a given diatonic tone.
+
+    Tonalities are compared and hashed by value, see value_key.  intern() maps equal tonalities to one shared instance,
+    so that equal tonalities from different sources compare by identity.
     """
 
+    # value key --> Tonality, see intern().  Entries are dropped when no longer referenced.
+    TONALITY_POOL = WeakValueDictionary()
+
     def __init__(self, modality, diatonic_tone):
         """
         Constructor.
@@ -38,6 +46,7 @@ class Tonality(object):
         self.__annotation = self.modality.get_tonal_scale(self.diatonic_tone)
 
         self.__basis_tone = (self.annotation[:-1])[-self.modal_index]
+        self.__value_key = None
 
     @staticmethod
     def create(modality_type, diatonic_tone, modal_index=0):
@@ -93,6 +102,41 @@ class Tonality(object):
     def cardinality(self):
         return self.modality.get_number_of_tones()
     
+    @property
+    def value_key(self):
+        """
+        Hashable key identifying the tonality by value: modality type, modal index, root tone, and scale tones.
+        The scale tones distinguish user defined modalities that reuse a modality type name.
+        """
+        if self.__value_key is None:
+            self.__value_key = (str(self.modality_type), self.modal_index, self.diatonic_tone.diatonic_symbol,
+                                tuple(tone.diatonic_symbol for tone in self.annotation))
+        return self.__value_key
+
+    @staticmethod
+    def intern(tonality):
+        """
+        The shared instance of tonalities equal to the given tonality.
+        :param tonality: Tonality, or None.
+        :return: Tonality, the first interned tonality equal to tonality, or tonality itself.
+        """
+        if tonality is None:
+            return None
+        return Tonality.TONALITY_POOL.setdefault(tonality.value_key, tonality)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Tonality):
+            return False
+        return self.value_key == other.value_key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.value_key)
+
     def get_tone(self, index):
         if index < 0 or index >= len(self.annotation):
             return None
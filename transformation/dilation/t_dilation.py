@@ -17,6 +17,7 @@ from structure.note import Note
 from structure.beam import Beam
 from structure.tuplet import Tuplet
 from timemodel.duration import Duration
+from misc.tracing import traced
 
 
 class TDilation(Transformation):
@@ -53,6 +54,7 @@ class TDilation(Transformation):
     def dilation_factor(self):
         return self.__dilation_factor
 
+    @traced()
     def apply(self, dilation_factor=Fraction(1), apply_to_bpm=False, apply_to_notes=False):
         """
         Apply dilation to score.
@@ -25,6 +25,7 @@ from tonalmodel.diatonic_pitch import DiatonicPitch
 from tonalmodel.pitch_range import PitchRange
 from tonalmodel.interval import Interval, IntervalType
 from transformation.transformation import Transformation
+from misc.tracing import span, traced
 
 
 class THarmonicTranscription(Transformation):
@@ -55,8 +56,9 @@ class THarmonicTranscription(Transformation):
         Transformation.__init__(self)
 
     @staticmethod
+    @traced()
     def create(source_expression):
-        lge = LineGrammarExecutor()
+        lge = LineGrammarExecutor(use_cache=True)
 
         source_line, source_hct = lge.parse(source_expression)
         return THarmonicTranscription(source_line, source_hct)
@@ -85,12 +87,16 @@ class THarmonicTranscription(Transformation):
     def tunnel_half_interval(self):
         return self.__tunnel_half_interval
 
+    @traced()
     def apply(self, target_hct,
               window_anchor_pitch,
               tag_map=None,
               window_height=None,
               num_solutions=-1,
-              tunnel_half_interval=Interval(5, IntervalType.Perfect)):
+              tunnel_half_interval=Interval(5, IntervalType.Perfect),
+              parallel=1,
+              budget=None,
+              statistics=None):
         """
         Apply method for transformation.
         :param target_hct: Target hct for new target line.
@@ -99,6 +105,9 @@ class THarmonicTranscription(Transformation):
         :param window_height: Height of target pitch window (in semi-tones) - use source line height if None specified.
         :param num_solutions: Maximum number of solutions to return, -1 == unbounded.
         :param tunnel_half_interval: half-interval for pitch range on each target tone.
+        :param parallel: Number of worker processes for the pitch solver, 1 == search in process.
+        :param budget: SolveBudget or None, limiting the pitch search; see MelodicConstraintSolver.solve().
+        :param statistics: SolveStatistics to record the solve in, or None; see MelodicConstraintSolver.solve().
         :return: MCSResults
         """
         if self.source_hct.duration != target_hct.duration:
@@ -108,7 +117,8 @@ class THarmonicTranscription(Transformation):
         window_anchor_pitch = DiatonicPitch.parse(window_anchor_pitch) if isinstance(window_anchor_pitch, str) \
             else window_anchor_pitch
 
-        target_line = self._build_target_line()
+        with span('THarmonicTranscription build target line'):
+            target_line = self._build_target_line()
 
         self.__tunnel_half_interval = tunnel_half_interval
 
@@ -116,7 +126,9 @@ class THarmonicTranscription(Transformation):
         target_notes = target_line.get_all_notes()
         source_to_target = {source_note: target_note for source_note, target_note in zip(source_notes, target_notes)}
 
-        constraints = self._build_constraints(source_to_target, tag_map)
+        with span('THarmonicTranscription build constraints') as s:
+            constraints = self._build_constraints(source_to_target, tag_map)
+            s.set('constraints', len(constraints))
         ts_seq, tempo_seq = THarmonicTranscription._build_default_time_sig_tempo()
 
         height = window_height if window_height else self.height
@@ -126,7 +138,7 @@ class THarmonicTranscription(Transformation):
         solver = MelodicConstraintSolver(target_line, tempo_seq, ts_seq, target_hct, pitch_range, constraints)
 
         initial_map = {target_notes[k]: v for k, v in tag_map.items()} if tag_map else None
-        results = solver.solve(initial_map, num_solutions)
+        results = solver.solve(initial_map, num_solutions, parallel, budget, statistics)
         return results
 
     def _build_target_line(self):
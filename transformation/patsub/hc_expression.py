@@ -16,6 +16,7 @@ import logging
 from tonalmodel.modality import ModalityType
 from tonalmodel.tonality import Tonality
 from harmoniccontext.harmonic_context import HarmonicContext
+from misc.lazy import LazyClassAttribute
 
 
 class HCExpression(object):
@@ -98,7 +99,7 @@ class HCExpression(object):
 
     HC_EXPRESSION_STRING = KEY + MODALITY + CHORD + '$'
 
-    HC_EXPRESSION = re.compile(HC_EXPRESSION_STRING)
+    HC_EXPRESSION = LazyClassAttribute(re.compile, HC_EXPRESSION_STRING)
 
     def __init__(self, key, key_modality, chord_numeral, key_modifier, modality_index, chord_type):
         """
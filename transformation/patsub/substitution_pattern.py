@@ -46,7 +46,7 @@ class SubstitutionPattern(object):
         :param target_hc_exprs: HCExpression to build target instance from 'find' instances.
         :return:
         """
-        lge = LineGrammarExecutor()
+        lge = LineGrammarExecutor(use_cache=True)
         source_line, source_hct = lge.parse(source_pattern_expr)
         target_line, target_hct = lge.parse(target_pattern_expr)
 
@@ -22,6 +22,7 @@ from tonalmodel.diatonic_pitch import DiatonicPitch
 from transformation.harmonictranscription.t_harmonic_transcription import THarmonicTranscription
 from transformation.patsub.substitution_pattern import SubstitutionPattern
 from transformation.transformation import Transformation
+from misc.tracing import span, traced
 
 
 class TPatSub(Transformation):
@@ -39,6 +40,7 @@ class TPatSub(Transformation):
         Transformation.__init__(self)
 
     @staticmethod
+    @traced()
     def create(source_pattern_expr, target_pattern_expr, target_hc_exprs):
         substitution_pattern = SubstitutionPattern.create(source_pattern_expr, target_pattern_expr, target_hc_exprs)
         return TPatSub(substitution_pattern)
@@ -51,8 +53,9 @@ class TPatSub(Transformation):
     def target_height(self):
         return self.substitution_pattern.target_height
 
+    @traced()
     def apply(self, source_instance_line, source_instance_hct, window_anchor_pitch, tag_map=None,
-              window_height=None, num_solutions=-1):
+              window_height=None, num_solutions=-1, statistics=None):
         """
         Apply for TPatSub.
         :param source_instance_line:
@@ -61,18 +64,21 @@ class TPatSub(Transformation):
         :param tag_map:
         :param window_height:
         :param num_solutions:
+        :param statistics: SolveStatistics to record the solve in, or None; see MelodicConstraintSolver.solve().
         :return:  MCSResults, target hct.
         """
         window_anchor_pitch = DiatonicPitch.parse(window_anchor_pitch) if isinstance(window_anchor_pitch, str) \
             else window_anchor_pitch
 
-        target_hct = self._build_target_hct(source_instance_hct)
+        with span('TPatSub build target hct'):
+            target_hct = self._build_target_hct(source_instance_hct)
 
         transform = THarmonicTranscription(self.substitution_pattern.target_pattern_line,
                                            self.substitution_pattern.target_pattern_hct,
                                            self.substitution_pattern.target_melodic_form)
 
-        results = transform.apply(target_hct, window_anchor_pitch, tag_map, window_height, num_solutions)
+        results = transform.apply(target_hct, window_anchor_pitch, tag_map, window_height, num_solutions,
+                                  statistics=statistics)
 
         return results, target_hct
 
@@ -23,6 +23,7 @@ from harmonicmodel.secondary_chord import SecondaryChord
 from tonalmodel.diatonic_pitch import DiatonicPitch
 
 from itertools import islice
+from misc.tracing import traced
 
 
 class TChromaticReflection(Transformation):
@@ -52,8 +53,9 @@ class TChromaticReflection(Transformation):
         Transformation.__init__(self)
 
     @staticmethod
+    @traced()
     def create(source_expression, cue_pitch, flip_type=FlipType.CenterTone):
-        lge = LineGrammarExecutor()
+        lge = LineGrammarExecutor(use_cache=True)
         source_line, source_hct = lge.parse(source_expression)
         return TChromaticReflection(source_line, source_hct, cue_pitch, flip_type)
 
@@ -81,6 +83,7 @@ class TChromaticReflection(Transformation):
     def hc_flip_map(self):
         return self.__hc_flip_map
 
+    @traced()
     def apply(self, temporal_extent=None, cue_pitch=None, flip_type=None, as_copy=True):
         """
         Apply the TFlip transform to a tempoaral extent.
@@ -23,6 +23,7 @@ from harmonicmodel.secondary_chord import SecondaryChord
 from tonalmodel.diatonic_pitch import DiatonicPitch
 
 from itertools import islice
+from misc.tracing import traced
 
 
 class TDiatonicReflection(Transformation):
@@ -52,8 +53,9 @@ class TDiatonicReflection(Transformation):
         Transformation.__init__(self)
 
     @staticmethod
+    @traced()
     def create(source_expression, default_cue_pitch):
-        lge = LineGrammarExecutor()
+        lge = LineGrammarExecutor(use_cache=True)
         source_line, source_hct = lge.parse(source_expression)
         return TDiatonicReflection(source_line, source_hct, default_cue_pitch)
 
@@ -77,6 +79,7 @@ class TDiatonicReflection(Transformation):
     def default_flip_type(self):
         return self.__default_flip_type
 
+    @traced()
     def apply(self, temporal_extent=None, cue_pitch=None, flip_type=None, as_copy=True):
         """
         Apply the TFlip transform to a tempoaral extent.
@@ -15,12 +15,15 @@ from melody.constraints.policy_context import PolicyContext
 from melody.solver.beat_constraint_solver import BeatConstraintSolver
 from melody.solver.p_map import PMap
 from melody.solver.pitch_constraint_solver import PitchConstraintSolver
+from melody.solver.solve_statistics import SolveStatistics
 from structure.lite_score import LiteScore
 from tonalmodel.pitch_range import PitchRange
 from transformation.functions.pitchfunctions.pitch_fit_function import PitchFitFunction
 from transformation.transformation import Transformation
 
+import time
 from collections import OrderedDict
+from misc.tracing import traced
 
 
 class TReshape(Transformation):
@@ -43,6 +46,7 @@ class TReshape(Transformation):
         self.__time_range = time_range
         self.__melodic_form = melodic_form
         self.__optimize = optimize
+        self.__statistics = None
 
         self.pitch_fit_function = PitchFitFunction(self.pitch_function, self.score.tempo_sequence,
                                                    self.score.time_signature_sequence, self.score.hct)
@@ -72,23 +76,42 @@ class TReshape(Transformation):
     def optimize(self):
         return self.__optimize
 
-    def apply(self):
+    @property
+    def statistics(self):
+        """
+        SolveStatistics of the pitch searches of the last apply(), or None.
+        """
+        return self.__statistics
+
+    @traced()
+    def apply(self, budget=None, statistics=None):
         """
         Apply the TReshape transformation.
+        :param budget: SolveBudget or None, shared by the pitch searches over all beat results.  If it runs out, the
+                       results found so far are returned, and statistics.truncated is set.
+        :param statistics: SolveStatistics to record the beat and pitch searches in, or None.  Without one,
+                           statistics holds only the totals of the pitch searches.
         :return: A list of LiteScore's of valid application of the transformation.
         """
+        start = time.perf_counter()
+        self.__statistics = statistics if statistics is not None else SolveStatistics()
         constraints = self._get_melodic_form_constraints()
 
         on_beat_constraints = [constraint for constraint in constraints
                                if isinstance(constraint, OnBeatConstraint)]
-        beat_score_results = self._build_on_beat_solution(on_beat_constraints) if len(on_beat_constraints) > 0 else None
+        with self.__statistics.phase('beat'):
+            beat_score_results = self._build_on_beat_solution(on_beat_constraints, statistics) \
+                if len(on_beat_constraints) > 0 else None
 
         pitch_constraints = {constraint for constraint in constraints if not isinstance(constraint, OnBeatConstraint)}
 
         if self.optimize:
             pitch_constraints = pitch_constraints.union(self._reshape_optimize(pitch_constraints, self.score))
 
-        return self._build_pitch_solutions(beat_score_results, pitch_constraints)
+        with self.__statistics.phase('pitch'):
+            results = self._build_pitch_solutions(beat_score_results, pitch_constraints, budget, statistics)
+        self.__statistics.seconds += time.perf_counter() - start
+        return results
 
     def _generate_reshape_constraints(self, line, tempo_sequence, time_signature_sequence, ignore_notes):
         constraints = list()
@@ -137,15 +160,16 @@ class TReshape(Transformation):
                 constraints.append(constraint)
         return constraints
 
-    def _build_on_beat_solution(self, on_beat_constraints):
+    def _build_on_beat_solution(self, on_beat_constraints, statistics=None):
         """
         Solve the on-beat constraints
         :param on_beat_constraints:get_hc_by_position
+        :param statistics: SolveStatistics or None
         :return: Set of (PositionDeltaInfo, LiteScore)'s that are solutions to the on-beat constraints.
         """
         beat_solver = BeatConstraintSolver(self.score.line, self.score.tempo_sequence,
                                            self.score.time_signature_sequence, self.score.hct, on_beat_constraints)
-        results = beat_solver.solve()  # list of PositionDeltaInfo's
+        results = beat_solver.solve(statistics)  # list of PositionDeltaInfo's
 
         score_beat_results = []
         if results is not None:
@@ -157,24 +181,33 @@ class TReshape(Transformation):
 
         return score_beat_results
 
-    def _build_pitch_solutions(self, beat_score_results, pitch_constraints):
+    def _build_pitch_solutions(self, beat_score_results, pitch_constraints, budget=None, statistics=None):
         """
         Build the final results using the beat results, then the pitch results, then the reshape constraints.
         :param beat_score_results: Set of (PositionDeltaInfo, LiteScore)'s
         :param pitch_constraints: Set of Constraints
+        :param budget: SolveBudget or None
+        :param statistics: SolveStatistics to record the pitch searches in, or None to record only their totals.
         :return:
         """
         final_results = list()
         pitch_results = list()
+        summary = self.__statistics if self.__statistics is not None else SolveStatistics()
 
         # Solve the pitch constraints using the beat constraint results.
         if beat_score_results is not None:
             for beat_result_pdi, beat_result_score in beat_score_results:
+                if budget is not None and budget.exhausted:
+                    # Beat results remain unsearched.
+                    summary.truncated = True
+                    break
                 revised_constraints = TReshape._regenerate_constraints(pitch_constraints,
                                                                        self.score.line, beat_result_score.line)
                 pitch_solver = PitchConstraintSolver(revised_constraints)
                 p_map_dict = PMap(self._build_p_map_dict(beat_result_pdi.hct, revised_constraints))
-                pitch_solver_results, _ = pitch_solver.solve(p_map_dict)
+                pitch_solver_results, _ = pitch_solver.solve(p_map_dict, budget=budget, statistics=statistics)
+                if statistics is None:
+                    summary.add_search(pitch_solver)
                 for pitch_pmap in pitch_solver_results:
                     line = pitch_pmap.apply(beat_result_score.line)
                     pitch_results.append((pitch_pmap, beat_result_score,
@@ -187,7 +220,9 @@ class TReshape(Transformation):
         else:
             pitch_solver = PitchConstraintSolver(pitch_constraints)
             p_map_dict = PMap(self._build_p_map_dict(self.score.hct, pitch_constraints))
-            pitch_solver_results, _ = pitch_solver.solve(p_map_dict)
+            pitch_solver_results, _ = pitch_solver.solve(p_map_dict, budget=budget, statistics=statistics)
+            if statistics is None:
+                summary.add_search(pitch_solver)
             for pitch_pmap in pitch_solver_results:
                 line = pitch_pmap.apply(self.score.line)
                 pitch_results.append((pitch_pmap, self.score, LiteScore(line, self.score.hct, self.score.instrument,
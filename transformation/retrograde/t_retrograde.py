@@ -12,6 +12,7 @@ from fractions import Fraction
 from misc.interval import Interval as NumericInterval
 from tonalmodel.diatonic_pitch import DiatonicPitch
 from structure.note import Note
+from misc.tracing import span, traced
 
 
 class TRetrograde(Transformation):
@@ -29,6 +30,7 @@ class TRetrograde(Transformation):
         self.__score = score
         self.__reverse_harmony = True
         self.__time_interval = None
+        self.__statistics = None
 
         Transformation.__init__(self)
 
@@ -44,13 +46,25 @@ class TRetrograde(Transformation):
     def time_interval(self):
         return self.__time_interval
 
-    def apply(self, reverse_harmony=True, time_interval=None, transcription=True, results_sample_size=200):
+    @property
+    def statistics(self):
+        """
+        SolveStatistics of the harmonic transcription of the last apply(), or None if none was made.
+        """
+        return self.__statistics
+
+    @traced()
+    def apply(self, reverse_harmony=True, time_interval=None, transcription=True, results_sample_size=200,
+              budget=None, statistics=None):
         """
         Extract and reverse a melodic segment of the score.
         :param reverse_harmony: Boolean indicating if harmony should be reversed.
         :param time_interval: Interval (numeric) bounds of the melody to be reversed
         :param transcription: True means apply harmonic transcription, only whenever_harmony==False.
         :param results_sample_size: Number of results from which to generate a best.
+        :param budget: SolveBudget or None, limiting the harmonic transcription search.  If it runs out, the best of
+                       the results found so far is returned, and statistics.truncated is set.
+        :param statistics: SolveStatistics to record the harmonic transcription in, or None.
         :return: reversed line, hct
         Note: if reverse_harmony is False, a Harmonic Transcription is applied to the line.
         Note: as to assist when reverse_harmony is False, we make 2 optimization on harmonic transcription:
@@ -60,17 +74,21 @@ class TRetrograde(Transformation):
         from tonalmodel.interval import Interval, IntervalType
 
         self.__reverse_harmony = reverse_harmony
+        self.__statistics = None
         self.__time_interval = time_interval if time_interval is not None else \
             NumericInterval(Fraction(0), self.score.line.duration.duration)
 
-        reduced_line, first_position, duration = self.score.line.sub_line(self.time_interval)
-        reduced_reversed_line = reduced_line.clone()
-        reduced_reversed_line.reverse()
+        with span('TRetrograde sub line'):
+            reduced_line, first_position, duration = self.score.line.sub_line(self.time_interval)
+        with span('TRetrograde reverse line'):
+            reduced_reversed_line = reduced_line.clone()
+            reduced_reversed_line.reverse()
 
-        reduced_hct = self.score.hct.sub_hct(NumericInterval(first_position.position,
-                                                             first_position.position + duration.duration))
+        with span('TRetrograde reverse hct'):
+            reduced_hct = self.score.hct.sub_hct(NumericInterval(first_position.position,
+                                                                 first_position.position + duration.duration))
 
-        reduced_reversed_hct = reduced_hct.reverse()
+            reduced_reversed_hct = reduced_hct.reverse()
 
         # If reversing harmony OR if reversing harmony and not doing transposition
         # These cases do not require transcription:
@@ -95,10 +113,13 @@ class TRetrograde(Transformation):
         results = t_ht.apply(reduced_hct,
                              lowest_pitch,
                              tag_map, t_ht.height + 6, results_sample_size,
-                             tunnel_half_interval=Interval(4, IntervalType.Perfect))
+                             tunnel_half_interval=Interval(4, IntervalType.Perfect),
+                             budget=budget, statistics=statistics)
+        self.__statistics = results.statistics
 
-        filtered_results = MinContourFilter(reduced_reversed_line, results.pitch_results)
-        scored_filtered_results = filtered_results.scored_results
+        with span('TRetrograde filter', results=len(results.pitch_results)):
+            filtered_results = MinContourFilter(reduced_reversed_line, results.pitch_results)
+            scored_filtered_results = filtered_results.scored_results
 
         if len(scored_filtered_results) == 0:
             return None, None
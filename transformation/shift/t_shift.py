@@ -25,6 +25,7 @@ from transformation.transformation import Transformation
 from transformation.functions.pitchfunctions.cross_tonality_shift_pitch_function import CrossTonalityShiftPitchFunction
 
 from itertools import islice
+from misc.tracing import traced
 
 
 class TShift(Transformation):
@@ -65,8 +66,9 @@ class TShift(Transformation):
         Transformation.__init__(self)
 
     @staticmethod
+    @traced()
     def create(source_expression, default_root_shift_interval=None, default_range_modality_type=None):
-        lge = LineGrammarExecutor()
+        lge = LineGrammarExecutor(use_cache=True)
         source_line, source_hct = lge.parse(source_expression)
         return TShift(source_line, source_hct, default_root_shift_interval, default_range_modality_type)
 
@@ -104,6 +106,7 @@ class TShift(Transformation):
     def default_range_modality_type(self):
         return self.__default_range_modality_type
 
+    @traced()
     def apply(self, temporal_extent=None, root_shift_interval=None, modal_index=None, range_modality_type=None,
               as_copy=True):
         """
@@ -210,8 +213,10 @@ class TShift(Transformation):
         return new_hct
 
     def _build_shift_function(self, hc):
-        if hc in self.hc_pitch_function_map.keys():   # reuse
-            return self.hc_pitch_function_map[hc]
+        # Keyed by harmony value, so equal harmonies share shift functions.
+        key = hc.harmony_key
+        if key in self.hc_pitch_function_map:   # reuse
+            return self.hc_pitch_function_map[key]
 
         if not isinstance(hc.chord, SecondaryChord):
             f = CrossTonalityShiftPitchFunction(hc.tonality,
@@ -244,7 +249,7 @@ class TShift(Transformation):
                                                 root_tone_interval,
                                                 hc.chord.secondary_tonality.modality_type,
                                                 hc.chord.secondary_tonality.modal_index)
-        self.hc_pitch_function_map[hc] = (f, range_tonality)
+        self.hc_pitch_function_map[key] = (f, range_tonality)
         return f, range_tonality
 
     @staticmethod
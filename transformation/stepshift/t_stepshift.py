@@ -16,6 +16,7 @@ from harmonicmodel.secondary_chord_template import SecondaryChordTemplate
 from harmonicmodel.tertian_chord_template import TertianChordTemplate
 
 from itertools import islice
+from misc.tracing import traced
 
 
 class SecondaryShiftType(enum.Enum):
@@ -61,6 +62,7 @@ class TStepShift(Transformation):
     def secondary_shift_type(self):
         return self.__secondary_shift_type
 
+    @traced()
     def apply(self, step_increment=0, temporal_extent=None, secondary_shift_type=None):
         """
         Do an apply action for this transform.